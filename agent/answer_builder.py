@@ -18,6 +18,8 @@ from shared.models import (
     RelevesImportResult,
     RelevesSearchResult,
     RelevesSumResult,
+    RelevesTrendGranularity,
+    RelevesTrendResult,
     ToolError,
     ToolErrorCode,
 )
@@ -236,6 +238,21 @@ def _build_aggregate_reply(result: RelevesAggregateResult) -> str:
     return "\n".join([f"Voici vos dépenses agrégées par {group_by_label} :", *lines]) + note
 
 
+def _build_trend_reply(result: RelevesTrendResult) -> str:
+    currency = result.currency or "CHF"
+    if not any(result.transaction_count):
+        return "Je n'ai trouvé aucune opération sur cette période."
+
+    period_label = "semaine" if result.granularity == RelevesTrendGranularity.WEEK else "mois"
+    lines = [
+        f"- {label}: {format_money(spending, currency)} de dépenses, net {format_money(net, currency)}"
+        for label, spending, net in zip(result.periods, result.spending, result.net_cashflow)
+    ]
+    top_category = next(iter(result.categories), None)
+    summary = f"\nPremière catégorie sur la période : {top_category}." if top_category else ""
+    return "\n".join([f"Voici l'évolution de vos dépenses par {period_label} :", *lines]) + summary
+
+
 def _format_category(item: ProfileCategory) -> str:
     if item.exclude_from_totals:
         return f"- {item.name} (exclue des totaux)"
@@ -420,6 +437,9 @@ def build_final_reply(*, plan: ToolCallPlan, tool_result: object) -> str:
     if isinstance(tool_result, RelevesAggregateResult):
         return _build_aggregate_reply(tool_result)
 
+    if isinstance(tool_result, RelevesTrendResult):
+        return _build_trend_reply(tool_result)
+
     if isinstance(tool_result, RelevesSearchResult):
         count = len(tool_result.items)
         examples: list[str] = []
@@ -12,10 +12,12 @@ import asyncio
 import secrets
 import unicodedata
 import calendar
+import threading
 import time
+from contextlib import asynccontextmanager
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from functools import lru_cache
-from typing import Any
+from typing import Any, Iterator
 from datetime import date, datetime
 from uuid import UUID, uuid4
 
@@ -28,11 +30,28 @@ from pydantic import BaseModel
 
 from shared import config as _config
 from agent.backend_client import BackendClient
-from agent.llm_planner import LLMPlanner
+from agent.llm_planner import LLMPlanner, warm_tool_definitions
 from agent.loop import AgentLoop
 from agent.memory import period_payload_from_message
+from agent.message_features import analyze_message, ascii_text, basic_text
+from agent.name_index import NameIndex
+from agent.report_cache import CachedReport, ReportCache, ReportCacheKey, content_etag, etag_matches
+from agent.report_precompute import PrecomputeStep, ReportPrecomputer, months_in_range
+from agent.report_store import ReportArtifactStore, build_report_store
+from agent.responses import CodecJSONResponse
+from agent.tool_cache import bump_profile_data_version, shared_tool_result_cache
 from agent.tool_router import ToolRouter
+from agent.warmup import start_warmup
 from agent.bank_catalog import extract_canonical_banks
+from agent.chat_stream import (
+    ChatStateWriteBuffer,
+    buffered_chat_state,
+    chat_event_sink,
+    emit_chat_event,
+    format_sse,
+    reply_chunks,
+    with_chat_state_buffer,
+)
 from agent.merchant_cleanup import MerchantSuggestion, run_merchant_cleanup
 from agent.merchant_alias_resolver import resolve_pending_map_alias
 from agent.import_label_normalizer import extract_observed_alias_from_label
@@ -43,15 +62,20 @@ from agent.loops.router import parse_loop_context, route_message, serialize_loop
 from agent.loops.types import LoopContext
 from backend.factory import build_backend_tool_service
 from backend.services.classification.decision_engine import normalize_merchant_alias
+from backend.services.merchant_categorizer import load_default_merchant_categorizer
 from backend.services.releves_import.bank_detector import detect_bank_from_csv_bytes
+from backend.services.releves_export import RelevesExportFormat, encode_releves_export
 from backend.services.releves_import.classification import resolve_system_category_label
 from backend.reporting import (
     SpendingCategoryRow,
     SpendingReportData,
     SpendingTransactionRow,
     generate_spending_report_pdf,
+    preload_renderers,
 )
+from backend.reporting.render_pool import ReportRenderPool, ReportRenderUnavailable
 from backend.auth.supabase_auth import UnauthorizedError, extract_bearer_token, get_user_from_bearer_token
+from backend.db.read_memo import current_read_memo, request_read_memo
 from backend.db.supabase_client import SupabaseClient, SupabaseRequestError, SupabaseSettings
 from backend.repositories.profiles_repository import ProfilesRepository, SupabaseProfilesRepository
 from backend.repositories.share_rules_repository import ShareRulesRepository, SupabaseShareRulesRepository
@@ -59,65 +83,106 @@ from backend.repositories.shared_expenses_repository import SharedExpensesReposi
 from backend.repositories.import_jobs_repository import SupabaseImportJobsRepository
 from backend.services.shared_expenses.effective_spending_adapter import compute_effective_spending_summary_safe
 from backend.services.shared_expenses.suggestion_generator import generate_initial_shared_expense_suggestions
-from shared.models import DateRange, RelevesDirection, RelevesImportMode, RelevesImportRequest, ToolError, ToolErrorCode
+from shared.json_codec import json_dumps
+from shared.models import (
+    DateRange,
+    RelevesDirection,
+    RelevesImportMode,
+    RelevesImportRequest,
+    RelevesTrendGranularity,
+    ToolError,
+    ToolErrorCode,
+)
+from shared.tracing import LLM_SPAN, current_trace, set_llm_usage, start_trace, trace_span
 
 
 logger = logging.getLogger(__name__)
 
 
-_SPENDING_PDF_CACHE_TTL_SECONDS = 10 * 60
-_SPENDING_PDF_CACHE_MAX_ENTRIES = 32
-_SPENDING_PDF_CACHE: dict[str, tuple[float, bytes]] = {}
-
-
-def _build_spending_pdf_cache_key(*, profile_id: UUID, period_start: date, period_end: date, bank_account_id: str | None) -> str:
-    """Return the in-memory PDF cache key."""
-
-    return f"{profile_id}:{period_start.isoformat()}:{period_end.isoformat()}:{bank_account_id or ''}"
+_SPENDING_REPORT_CACHE = ReportCache()
 
 
-def _purge_spending_pdf_cache(now_ts: float | None = None) -> None:
-    """Remove expired cache entries and evict oldest records above max size."""
+def _spending_report_cache_key(
+    *, profile_id: UUID, period_start: date, period_end: date, bank_account_id: str | None
+) -> ReportCacheKey:
+    """Return the report cache key at the profile's current data version."""
 
-    now = now_ts if isinstance(now_ts, float) else time.time()
-    expired_keys = [key for key, (created_at, _bytes) in _SPENDING_PDF_CACHE.items() if now - created_at >= _SPENDING_PDF_CACHE_TTL_SECONDS]
-    for key in expired_keys:
-        _SPENDING_PDF_CACHE.pop(key, None)
-
-    while len(_SPENDING_PDF_CACHE) > _SPENDING_PDF_CACHE_MAX_ENTRIES:
-        oldest_key = next(iter(_SPENDING_PDF_CACHE), None)
-        if oldest_key is None:
-            break
-        _SPENDING_PDF_CACHE.pop(oldest_key, None)
+    return ReportCacheKey(
+        profile_id=str(profile_id),
+        start_date=period_start.isoformat(),
+        end_date=period_end.isoformat(),
+        bank_account_id=bank_account_id or "",
+        data_version=shared_tool_result_cache().data_version(profile_id),
+    )
 
 
-def _get_or_create_spending_pdf_bytes(
+def _get_or_build_spending_report(
     *,
     profile_id: UUID,
     period_start: date,
     period_end: date,
     bank_account_id: str | None,
-    report_payload: dict[str, Any],
-) -> bytes:
-    """Return spending report PDF bytes from cache or generate and cache them."""
+) -> tuple[ReportCacheKey, CachedReport]:
+    """Return the spending report from cache, computing and caching it on a miss."""
 
-    now_ts = time.time()
-    _purge_spending_pdf_cache(now_ts)
-    cache_key = _build_spending_pdf_cache_key(
+    cache_key = _spending_report_cache_key(
         profile_id=profile_id,
         period_start=period_start,
         period_end=period_end,
         bank_account_id=bank_account_id,
     )
-    cached_entry = _SPENDING_PDF_CACHE.get(cache_key)
-    if cached_entry and now_ts - cached_entry[0] < _SPENDING_PDF_CACHE_TTL_SECONDS:
-        return cached_entry[1]
+    cached_report = _SPENDING_REPORT_CACHE.get(cache_key)
+    if cached_report is not None:
+        return cache_key, cached_report
+
+    report_payload = _build_spending_report_payload(
+        profile_id=profile_id,
+        period_start=period_start,
+        period_end=period_end,
+        bank_account_id=bank_account_id,
+    )
+    body = json_dumps(jsonable_encoder(report_payload))
+    return cache_key, _SPENDING_REPORT_CACHE.put_payload(cache_key, report_payload, body)
+
+
+def _report_validator_headers(etag: str | None) -> dict[str, str]:
+    """Let clients keep reports but revalidate them with ``If-None-Match`` on every use."""
+
+    headers = {"Cache-Control": "private, no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    return headers
+
 
-    pdf_bytes = generate_spending_report_pdf(_build_spending_report_pdf_data(report_payload))
-    _SPENDING_PDF_CACHE.pop(cache_key, None)
-    _SPENDING_PDF_CACHE[cache_key] = (time.time(), pdf_bytes)
-    _purge_spending_pdf_cache()
-    return pdf_bytes
+def _get_or_render_spending_pdf(cache_key: ReportCacheKey, report: CachedReport) -> CachedReport:
+    """Return ``report`` with its PDF, from the shared artifact store or rendered once."""
+
+    if report.pdf is not None:
+        return report
+    # Payload hashes are identical across workers, unlike data versions; the
+    # day is part of the key because the PDF prints its generation date.
+    content_hash = report.etag.strip('"')
+    artifact_key = f"spending/{date.today().isoformat()}/{content_hash}.pdf"
+    pdf_bytes = get_report_store().get_or_create(artifact_key, lambda: _render_spending_pdf(report.payload))
+    return _SPENDING_REPORT_CACHE.put_pdf(cache_key, report, pdf_bytes)
+
+
+def _render_spending_pdf(report_payload: dict[str, Any]) -> bytes:
+    """Render the PDF in the render pool, or inline when the pool is disabled."""
+
+    data = _build_spending_report_pdf_data(report_payload)
+    render_pool = get_report_render_pool()
+    if render_pool is None:
+        return generate_spending_report_pdf(data)
+    try:
+        return render_pool.render(data)
+    except ReportRenderUnavailable as exc:
+        logger.warning("spending_report_pdf_render_unavailable reason=%s", exc)
+        raise HTTPException(
+            status_code=503,
+            detail="Report rendering is busy, retry shortly",
+            headers={"Retry-After": "5"},
+        ) from exc
 
 
 def _warm_spending_pdf_cache(
@@ -127,22 +192,16 @@ def _warm_spending_pdf_cache(
     period_end: date,
     bank_account_id: str | None,
 ) -> None:
-    """Warm spending report PDF cache on a best-effort basis."""
+    """Warm the spending report cache (JSON and PDF) on a best-effort basis."""
 
     try:
-        report_payload = _build_spending_report_payload(
+        cache_key, report = _get_or_build_spending_report(
             profile_id=profile_id,
             period_start=period_start,
             period_end=period_end,
             bank_account_id=bank_account_id,
         )
-        _get_or_create_spending_pdf_bytes(
-            profile_id=profile_id,
-            period_start=period_start,
-            period_end=period_end,
-            bank_account_id=bank_account_id,
-            report_payload=report_payload,
-        )
+        _get_or_render_spending_pdf(cache_key, report)
     except Exception:
         logger.exception(
             "spending_report_pdf_cache_warmup_failed",
@@ -154,6 +213,46 @@ def _warm_spending_pdf_cache(
         )
 
 
+def _schedule_import_report_precompute(
+    *,
+    profile_id: UUID,
+    import_start: date,
+    import_end: date,
+) -> None:
+    """Pre-compute the reports of the imported months in the background.
+
+    JSON payloads of every month come first, most recent month first; PDFs
+    follow when ``AGENT_REPORT_PRECOMPUTE_PDF`` is enabled.
+    """
+
+    precomputer = get_report_precomputer()
+    months = months_in_range(import_start, import_end, max_months=_config.report_precompute_max_months())
+    if precomputer is None or not months:
+        return
+
+    steps: list[PrecomputeStep] = []
+    for period_start, period_end in months:
+        steps.append(
+            lambda period_start=period_start, period_end=period_end: _get_or_build_spending_report(
+                profile_id=profile_id,
+                period_start=period_start,
+                period_end=period_end,
+                bank_account_id=None,
+            )
+        )
+    if _config.report_precompute_pdf_enabled():
+        for period_start, period_end in months:
+            steps.append(
+                lambda period_start=period_start, period_end=period_end: _warm_spending_pdf_cache(
+                    profile_id=profile_id,
+                    period_start=period_start,
+                    period_end=period_end,
+                    bank_account_id=None,
+                )
+            )
+    precomputer.schedule(profile_id, steps)
+
+
 def _is_debug_request(request: Request, x_debug: str | None = None) -> bool:
     """Return whether debug error details should be included in responses."""
 
@@ -394,22 +493,7 @@ class _ProfileFieldExtractionLlmResponse(BaseModel):
     clarification_question: str | None = None
 
 _BANK_ACCOUNTS_REQUEST_HINTS = ("liste", "catégor", "depens", "dépens", "recett", "transaction", "relev")
-_YES_VALUES = {
-    "oui",
-    "ouais",
-    "yep",
-    "yes",
-    "y",
-    "ok",
-    "daccord",
-    "confirm",
-    "je confirme",
-    "pret",
-    "go",
-    "cest pret",
-    "c'est pret",
-}
-_NO_VALUES = {"non", "nope", "no", "n"}
+_CHAT_STREAM_RELEASE_TIMEOUT_SECONDS = 30.0
 _IMPORT_FILE_PROMPT = "Parfait. Envoie le fichier CSV du compte sélectionné."
 _IMPORT_WAIT_READY_REPLY = (
     "Parfait ! Maintenant que j'ai récupéré tes données personnelles, la prochaine étape consiste à importer un relevé bancaire.\n\n"
@@ -1210,9 +1294,7 @@ def _normalize_user_text_for_matching(value: str) -> str:
 def _normalize_text_basic(s: str) -> str:
     """Normalize user text for deterministic command parsing."""
 
-    normalized = unicodedata.normalize("NFKD", s.replace("’", "'").replace("`", "'"))
-    ascii_only = "".join(char for char in normalized if not unicodedata.combining(char))
-    return re.sub(r"\s+", " ", ascii_only.lower()).strip()
+    return basic_text(s)
 
 
 def _parse_category_norm_from_text(fragment: str) -> str | None:
@@ -1644,6 +1726,18 @@ def parse_shared_expense_confirmation(user_message: str, suggestions_snapshot: l
     return {"kind": "invalid"}
 
 
+def _bump_shared_expense_data_versions(*, profile_id: UUID, other_profile_id: UUID | str | None) -> None:
+    """Invalidate cached reads and reports of both sides of a new shared expense.
+
+    Spending reports include the effective spending computed from the shared
+    expenses a profile pays or receives, so the beneficiary's reports change too.
+    """
+
+    bump_profile_data_version(profile_id)
+    if other_profile_id:
+        bump_profile_data_version(other_profile_id)
+
+
 def _execute_shared_expense_confirmation_actions(
     *,
     profile_id: UUID,
@@ -1688,11 +1782,17 @@ def _execute_shared_expense_confirmation_actions(
                 amount = Decimal(str(row.get("amount") or "0"))
                 effective_ratio_other = Decimal(str(ratio_other or row.get("suggested_split_ratio_other") or "0.5"))
                 amount_to_apply = (abs(amount) * effective_ratio_other).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                repository.create_shared_expense_from_suggestion(
-                    profile_id=profile_id,
-                    suggestion_id=suggestion_id,
-                    amount=amount_to_apply,
-                )
+                try:
+                    repository.create_shared_expense_from_suggestion(
+                        profile_id=profile_id,
+                        suggestion_id=suggestion_id,
+                        amount=amount_to_apply,
+                    )
+                finally:
+                    _bump_shared_expense_data_versions(
+                        profile_id=profile_id,
+                        other_profile_id=row.get("suggested_to_profile_id"),
+                    )
                 applied.append(index)
             except Exception:
                 logger.exception("shared_expense_apply_from_chat_failed profile_id=%s suggestion_id=%s", profile_id, suggestion_id)
@@ -2217,8 +2317,7 @@ def _normalize_onboarding_step_substep(global_state: dict[str, Any]) -> dict[str
 
 
 def _normalize_text(value: str) -> str:
-    normalized = unicodedata.normalize("NFKD", value.strip().lower()).encode("ascii", "ignore").decode("ascii")
-    return " ".join(normalized.split())
+    return ascii_text(value)
 
 
 _MERCHANT_NOISE_PATTERNS: tuple[re.Pattern[str], ...] = (
@@ -2418,13 +2517,11 @@ def _canonicalize_merchant(candidate: str) -> tuple[str, str, str] | None:
 
 
 def _is_yes(message: str) -> bool:
-    normalized = _normalize_text(message)
-    return normalized in _YES_VALUES or "✅" in message
+    return analyze_message(message).answer == "yes"
 
 
 def _is_no(message: str) -> bool:
-    normalized = _normalize_text(message)
-    return normalized in _NO_VALUES or "❌" in message
+    return analyze_message(message).answer == "no"
 
 
 def _is_allons_y(message: str) -> bool:
@@ -2502,6 +2599,8 @@ def _persist_last_spending_report_payload(
 
     if not hasattr(profiles_repository, "update_chat_state"):
         return
+    if isinstance(state_dict, dict) and state_dict.get("last_spending_report_payload") == next_state["last_spending_report_payload"]:
+        return
 
     profiles_repository.update_chat_state(
         profile_id=profile_id,
@@ -2678,12 +2777,15 @@ def _match_bank_account_name(message: str, accounts: list[dict[str, Any]]) -> di
     cleaned_message = normalized_message.replace("compte bancaire", "").replace("compte", "")
     cleaned_message = " ".join(cleaned_message.split())
 
-    for account in accounts:
-        account_name = str(account.get("name", ""))
-        normalized_name = _normalize_text(account_name)
-        if cleaned_message == normalized_name or normalized_message == normalized_name:
-            return account
-    return None
+    index = NameIndex(
+        enumerate(accounts),
+        name=lambda entry: str(entry[1].get("name", "")),
+        normalize=_normalize_text,
+    )
+    matches = index.items_with_norm(cleaned_message) + index.items_with_norm(normalized_message)
+    if not matches:
+        return None
+    return min(matches, key=lambda entry: entry[0])[1]
 
 
 def _detect_bank_account_for_import(
@@ -3111,15 +3213,18 @@ def _extract_profile_fields_with_llm(message: str) -> dict[str, Any] | None:
         f"Message utilisateur: {message}"
     )
     client = OpenAI(api_key=api_key, timeout=10.0)
-    response = client.chat.completions.create(
-        model=_config.llm_model(),
-        temperature=0.1,
-        messages=[
-            {"role": "system", "content": "Tu réponds uniquement avec un JSON strict valide."},
-            {"role": "user", "content": prompt},
-        ],
-        response_format={"type": "json_object"},
-    )
+    model = _config.llm_model()
+    with trace_span(LLM_SPAN, model=model, purpose="profile_extraction") as span:
+        response = client.chat.completions.create(
+            model=model,
+            temperature=0.1,
+            messages=[
+                {"role": "system", "content": "Tu réponds uniquement avec un JSON strict valide."},
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+        )
+        set_llm_usage(span, response)
     content = response.choices[0].message.content if response.choices else None
     if not content:
         return None
@@ -3508,7 +3613,7 @@ def get_tool_router() -> ToolRouter:
 
     backend_tool_service = build_backend_tool_service()
     backend_client = BackendClient(tool_service=backend_tool_service)
-    return ToolRouter(backend_client=backend_client)
+    return ToolRouter(backend_client=backend_client, result_cache=shared_tool_result_cache())
 
 
 @lru_cache(maxsize=1)
@@ -3516,11 +3621,12 @@ def get_agent_loop() -> AgentLoop:
     """Create and cache the agent loop once per process."""
     backend_tool_service = build_backend_tool_service()
     backend_client = BackendClient(tool_service=backend_tool_service)
-    tool_router = ToolRouter(backend_client=backend_client)
+    tool_router = ToolRouter(backend_client=backend_client, result_cache=shared_tool_result_cache())
     llm_planner: LLMPlanner | None = None
 
     if _config.llm_enabled():
         llm_planner = LLMPlanner(strict=_config.llm_strict())
+        warm_tool_definitions()
 
     loop = AgentLoop(
         tool_router=tool_router,
@@ -3537,6 +3643,40 @@ def get_loop_registry():
     return build_default_registry()
 
 
+@lru_cache(maxsize=1)
+def get_report_store() -> ReportArtifactStore:
+    """Create and cache the report artifact store shared by workers."""
+
+    return build_report_store(_config.report_store_url(), max_bytes=_config.report_store_max_bytes())
+
+
+@lru_cache(maxsize=1)
+def get_report_render_pool() -> ReportRenderPool | None:
+    """Create and cache the PDF render process pool (``None`` when disabled)."""
+
+    workers = _config.report_render_workers()
+    if workers <= 0:
+        return None
+    return ReportRenderPool(workers=workers, timeout_seconds=_config.report_render_timeout_seconds())
+
+
+@lru_cache(maxsize=1)
+def get_report_precomputer() -> ReportPrecomputer | None:
+    """Create and cache the post-import report pre-computation pool (``None`` when disabled)."""
+
+    if not _config.report_precompute_enabled():
+        return None
+    return ReportPrecomputer()
+
+
+def _warm_report_rendering() -> None:
+    render_pool = get_report_render_pool()
+    if render_pool is None:
+        preload_renderers()
+    else:
+        render_pool.warm()
+
+
 @lru_cache(maxsize=1)
 def get_profiles_repository() -> SupabaseProfilesRepository:
     """Create and cache profiles repository."""
@@ -3707,7 +3847,43 @@ def _resolve_authenticated_profile(request: Request, authorization: str | None)
     return auth_user_id, profile_id
 
 
-app = FastAPI(title="IA Financial Assistant Agent API")
+def _startup_warmup_steps() -> dict[str, Any]:
+    """Caches worth building before the first chat turn of a worker."""
+
+    return {
+        "loop_registry": get_loop_registry,
+        "agent_loop": get_agent_loop,
+        "tool_definitions": warm_tool_definitions,
+        "message_analysis": lambda: analyze_message("Combien j'ai dépensé en janvier 2026 ?"),
+        "merchant_categorizer": load_default_merchant_categorizer,
+        "report_renderers": _warm_report_rendering,
+    }
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    """Start the optional background warm-up; stop the background report pools on shutdown."""
+
+    if _config.startup_warmup_enabled():
+        start_warmup(_startup_warmup_steps())
+    yield
+    if get_report_precomputer.cache_info().currsize:
+        precomputer = get_report_precomputer()
+        if precomputer is not None:
+            precomputer.shutdown()
+        get_report_precomputer.cache_clear()
+    if get_report_render_pool.cache_info().currsize:
+        render_pool = get_report_render_pool()
+        if render_pool is not None:
+            render_pool.shutdown()
+        get_report_render_pool.cache_clear()
+
+
+app = FastAPI(
+    title="IA Financial Assistant Agent API",
+    lifespan=_lifespan,
+    default_response_class=CodecJSONResponse,
+)
 
 ALLOW_ORIGINS = _config.cors_allow_origins()
 
@@ -3717,15 +3893,17 @@ async def log_http_requests(request: Request, call_next):
     """Log incoming requests, HTTP status codes and unexpected errors."""
 
     logger.info("http_request_received method=%s path=%s", request.method, request.url.path)
-    try:
-        response = await call_next(request)
-    except Exception:
-        logger.exception(
-            "http_request_failed method=%s path=%s",
-            request.method,
-            request.url.path,
-        )
-        raise
+    with start_trace(f"{request.method} {request.url.path}", method=request.method, path=request.url.path) as trace:
+        try:
+            response = await call_next(request)
+        except Exception:
+            logger.exception(
+                "http_request_failed method=%s path=%s",
+                request.method,
+                request.url.path,
+            )
+            raise
+        trace.attributes["status_code"] = response.status_code
 
     logger.info(
         "http_response_sent method=%s path=%s status_code=%s",
@@ -3763,7 +3941,7 @@ async def handle_unexpected_exception(request: Request, exc: Exception) -> JSONR
         content["exception_type"] = type(exc).__name__
         content["exception_message"] = str(exc)
 
-    return JSONResponse(status_code=500, content=content, headers={"X-Error-Id": error_id})
+    return CodecJSONResponse(status_code=500, content=content, headers={"X-Error-Id": error_id})
 
 
 @app.get("/health")
@@ -3782,6 +3960,21 @@ def agent_chat(
 ) -> JSONResponse:
     """Handle a user chat message through the agent loop."""
 
+    with request_read_memo() as read_memo:
+        response = _handle_chat_turn(request, payload, authorization=authorization, x_debug=x_debug)
+    trace = current_trace()
+    if trace is not None and read_memo is not None:
+        trace.attributes["supabase_reads_deduplicated"] = read_memo.deduplicated
+    return response
+
+
+def _handle_chat_turn(
+    request: Request,
+    payload: ChatRequest,
+    *,
+    authorization: str | None,
+    x_debug: str | None,
+) -> JSONResponse:
     logger.info("agent_chat_received message_length=%s", len(payload.message))
     debug_enabled = _is_debug_request(request, x_debug)
     registry = get_loop_registry()
@@ -3796,17 +3989,28 @@ def agent_chat(
         }
         if debug_enabled:
             debug_loop = _compute_debug_loop(state_dict, global_state, registry)
-            payload_dict["debug"] = {"loop": debug_loop}
-        return JSONResponse(content=payload_dict)
+            read_memo = current_read_memo()
+            payload_dict["debug"] = {
+                "loop": debug_loop,
+                "tool_cache": shared_tool_result_cache().stats(profile_id),
+                "read_memo": read_memo.stats() if read_memo is not None else None,
+            }
+            trace = current_trace()
+            if trace is not None:
+                payload_dict["debug"]["trace"] = trace.summary()
+        return CodecJSONResponse(content=payload_dict)
 
     profile_id: UUID | None = None
     try:
-        auth_user_id, profile_id = _resolve_authenticated_profile(request, authorization)
-        profiles_repository = get_profiles_repository()
+        with trace_span("chat.auth"):
+            auth_user_id, profile_id = _resolve_authenticated_profile(request, authorization)
+        emit_chat_event("ack")
+        profiles_repository = with_chat_state_buffer(get_profiles_repository())
 
-        chat_state = _normalize_chat_state(
-            profiles_repository.get_chat_state(profile_id=profile_id, user_id=auth_user_id)
-        )
+        with trace_span("chat.state_load"):
+            chat_state = _normalize_chat_state(
+                profiles_repository.get_chat_state(profile_id=profile_id, user_id=auth_user_id)
+            )
 
         active_task = chat_state.get("active_task")
         state = chat_state.get("state")
@@ -3864,10 +4068,11 @@ def agent_chat(
 
         if global_state is None and hasattr(profiles_repository, "get_profile_fields"):
             try:
-                profile_fields = profiles_repository.get_profile_fields(
-                    profile_id=profile_id,
-                    fields=list(_PROFILE_COMPLETION_FIELDS),
-                )
+                with trace_span("chat.global_state_bootstrap"):
+                    profile_fields = profiles_repository.get_profile_fields(
+                        profile_id=profile_id,
+                        fields=list(_PROFILE_COMPLETION_FIELDS),
+                    )
             except Exception:
                 logger.exception("global_state_bootstrap_profile_lookup_failed profile_id=%s", profile_id)
                 profile_fields = {}
@@ -4171,12 +4376,15 @@ def agent_chat(
                 ]
 
                 desired_names = list(desired_names_by_norm.values())
-                if hasattr(profiles_repository, "sync_bank_accounts"):
-                    profiles_repository.sync_bank_accounts(profile_id=profile_id, names=desired_names)
-                else:
-                    if accounts_to_remove and hasattr(profiles_repository, "remove_bank_accounts"):
-                        profiles_repository.remove_bank_accounts(profile_id=profile_id, names=accounts_to_remove)
-                    profiles_repository.ensure_bank_accounts(profile_id=profile_id, names=desired_names)
+                try:
+                    if hasattr(profiles_repository, "sync_bank_accounts"):
+                        profiles_repository.sync_bank_accounts(profile_id=profile_id, names=desired_names)
+                    else:
+                        if accounts_to_remove and hasattr(profiles_repository, "remove_bank_accounts"):
+                            profiles_repository.remove_bank_accounts(profile_id=profile_id, names=accounts_to_remove)
+                        profiles_repository.ensure_bank_accounts(profile_id=profile_id, names=desired_names)
+                finally:
+                    bump_profile_data_version(profile_id)
                 refreshed_accounts = profiles_repository.list_bank_accounts(profile_id=profile_id)
                 updated_global_state = _build_bank_accounts_onboarding_global_state(
                     global_state,
@@ -4228,16 +4436,17 @@ def agent_chat(
                 "global_state": global_state or {},
                 "state": state_dict,
             }
-            loop_reply = route_message(
-                message=payload.message,
-                current_loop=current_loop,
-                global_state=global_state or {},
-                services=loop_services,
-                profile_id=profile_id,
-                user_id=auth_user_id,
-                llm_judge=None,
-                registry=registry,
-            )
+            with trace_span("chat.route_message"):
+                loop_reply = route_message(
+                    message=payload.message,
+                    current_loop=current_loop,
+                    global_state=global_state or {},
+                    services=loop_services,
+                    profile_id=profile_id,
+                    user_id=auth_user_id,
+                    llm_judge=None,
+                    registry=registry,
+                )
 
             resolved_loop = loop_reply.next_loop if loop_reply.handled else current_loop
             if used_implicit_loop and not loop_reply.handled:
@@ -5015,7 +5224,10 @@ def agent_chat(
                             plan=None,
                         )
 
-                    profiles_repository.ensure_bank_accounts(profile_id=profile_id, names=matched_banks)
+                    try:
+                        profiles_repository.ensure_bank_accounts(profile_id=profile_id, names=matched_banks)
+                    finally:
+                        bump_profile_data_version(profile_id)
                     refreshed_accounts = profiles_repository.list_bank_accounts(profile_id=profile_id)
                     accounts_display = _format_accounts_for_reply(refreshed_accounts)
 
@@ -5175,15 +5387,19 @@ def agent_chat(
             if mode == "onboarding" and onboarding_step == "categories":
                 substep = global_state.get("onboarding_substep")
                 if substep in {"categories_intro", "categories_bootstrap"}:
-                    profiles_repository.ensure_system_categories(
-                        profile_id=profile_id,
-                        categories=_build_system_categories_payload(),
-                    )
-                    _ = profiles_repository.list_merchants_without_category(profile_id=profile_id)
-                    _classify_merchants_without_category(
-                        profiles_repository=profiles_repository,
-                        profile_id=profile_id,
-                    )
+                    try:
+                        profiles_repository.ensure_system_categories(
+                            profile_id=profile_id,
+                            categories=_build_system_categories_payload(),
+                        )
+                        _ = profiles_repository.list_merchants_without_category(profile_id=profile_id)
+                        _classify_merchants_without_category(
+                            profiles_repository=profiles_repository,
+                            profile_id=profile_id,
+                        )
+                    finally:
+                        # Categories and merchant categories feed the cached lists and reports.
+                        bump_profile_data_version(profile_id)
 
                     month_value: str | None = None
                     start_date_value: str | None = None
@@ -5700,7 +5916,8 @@ def agent_chat(
         if _handler_accepts_global_state_kwarg(handler):
             handler_kwargs["global_state"] = global_state
 
-        agent_reply = handler(payload.message, **handler_kwargs)
+        with trace_span("agent.handle_user_message"):
+            agent_reply = handler(payload.message, **handler_kwargs)
 
         response_plan = dict(agent_reply.plan) if isinstance(agent_reply.plan, dict) else agent_reply.plan
 
@@ -5744,11 +5961,12 @@ def agent_chat(
             )
 
             try:
-                profiles_repository.update_chat_state(
-                    profile_id=profile_id,
-                    user_id=auth_user_id,
-                    chat_state=updated_chat_state,
-                )
+                with trace_span("chat.state_write"):
+                    profiles_repository.update_chat_state(
+                        profile_id=profile_id,
+                        user_id=auth_user_id,
+                        chat_state=updated_chat_state,
+                    )
             except Exception:
                 logger.exception("chat_state_update_failed profile_id=%s", profile_id)
                 if not isinstance(response_plan, dict):
@@ -5814,6 +6032,93 @@ def agent_chat(
         )
 
 
+@app.post("/agent/chat/stream")
+async def agent_chat_stream(
+    request: Request,
+    payload: ChatRequest,
+    authorization: str | None = Header(default=None),
+    x_debug: str | None = Header(default=None),
+) -> StreamingResponse:
+    """Handle a chat message like ``/agent/chat`` and stream its progress via SSE.
+
+    The response starts once the caller is authenticated (``ack``); auth
+    failures are plain HTTP errors. Chat state writes of the turn are persisted
+    after the final ``done`` or ``error`` event.
+    """
+
+    event_loop = asyncio.get_running_loop()
+    events: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+    state_buffer = ChatStateWriteBuffer()
+    released = threading.Event()
+
+    def _sink(event: str, data: Any) -> None:
+        event_loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    def _run_turn() -> None:
+        with chat_event_sink(_sink), buffered_chat_state(state_buffer):
+            try:
+                outcome: tuple[str, Any] = (
+                    "response",
+                    agent_chat(request, payload, authorization=authorization, x_debug=x_debug),
+                )
+            except Exception as exc:
+                outcome = ("exception", exc)
+        _sink(*outcome)
+        released.wait(timeout=_CHAT_STREAM_RELEASE_TIMEOUT_SECONDS)
+        try:
+            with trace_span("chat.state_flush"):
+                state_buffer.flush()
+        except Exception:
+            logger.exception("chat_stream_state_flush_failed")
+
+    turn = asyncio.ensure_future(asyncio.to_thread(_run_turn))
+    first_event = await events.get()
+    if first_event[0] == "exception":
+        released.set()
+        await turn
+        raise first_event[1]
+
+    async def _event_stream():
+        event_id = 0
+        event, data = first_event
+        try:
+            while True:
+                event_id += 1
+                if event == "response":
+                    content = json.loads(bytes(data.body))
+                    for chunk in reply_chunks(str(content.get("reply") or "")):
+                        yield format_sse("reply_delta", {"text": chunk}, event_id=event_id)
+                        event_id += 1
+                    tool_result = content.get("tool_result")
+                    if isinstance(tool_result, dict) and tool_result.get("type") == "ui_action":
+                        yield format_sse("ui_action", tool_result, event_id=event_id)
+                        event_id += 1
+                    yield format_sse("done", content, event_id=event_id)
+                    break
+                if event == "exception":
+                    is_http_error = isinstance(data, HTTPException)
+                    yield format_sse(
+                        "error",
+                        {
+                            "status_code": data.status_code if is_http_error else 500,
+                            "detail": data.detail if is_http_error else "Internal Server Error",
+                        },
+                        event_id=event_id,
+                    )
+                    break
+                yield format_sse(event, data, event_id=event_id)
+                event, data = await events.get()
+        finally:
+            released.set()
+        await turn
+
+    return StreamingResponse(
+        _event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/agent/reset-session")
 def reset_session(request: Request, authorization: str | None = Header(default=None)) -> dict[str, bool]:
     """Reset persisted chat session state for the authenticated profile."""
@@ -5859,6 +6164,7 @@ def debug_hard_reset(
     auth_user_id, profile_id = _resolve_authenticated_profile(request, authorization)
     repo = get_profiles_repository()
     repo.hard_reset_profile(profile_id=profile_id, user_id=auth_user_id)
+    bump_profile_data_version(profile_id)
     return {"ok": True}
 
 
@@ -5924,6 +6230,7 @@ def apply_cluster(
         if str(exc) == "cluster_not_found_or_forbidden":
             raise HTTPException(status_code=404, detail="cluster not found") from exc
         raise
+    bump_profile_data_version(profile_id)
     return {
         "type": "cluster_applied",
         "cluster_id": str(cluster_id),
@@ -6019,8 +6326,8 @@ def apply_shared_expense_suggestion(
         except (InvalidOperation, ValueError) as exc:
             raise HTTPException(status_code=400, detail="invalid amount format") from exc
 
+    suggestion = repository.get_suggestion_by_id(profile_id=profile_id, suggestion_id=suggestion_id)
     if amount is None:
-        suggestion = repository.get_suggestion_by_id(profile_id=profile_id, suggestion_id=suggestion_id)
         if suggestion is None:
             raise HTTPException(status_code=404, detail="suggestion not found")
 
@@ -6057,11 +6364,17 @@ def apply_shared_expense_suggestion(
     if amount is None:
         raise HTTPException(status_code=400, detail="amount required")
 
-    shared_expense_id = repository.create_shared_expense_from_suggestion(
-        profile_id=profile_id,
-        suggestion_id=suggestion_id,
-        amount=amount,
-    )
+    try:
+        shared_expense_id = repository.create_shared_expense_from_suggestion(
+            profile_id=profile_id,
+            suggestion_id=suggestion_id,
+            amount=amount,
+        )
+    finally:
+        _bump_shared_expense_data_versions(
+            profile_id=profile_id,
+            other_profile_id=suggestion.suggested_to_profile_id if suggestion is not None else None,
+        )
     return {
         "ok": True,
         "shared_expense_id": str(shared_expense_id) if shared_expense_id is not None else None,
@@ -6736,7 +7049,8 @@ def get_spending_report_json(
     end_date: str | None = None,
     month: str | None = None,
     bank_account_id: str | None = None,
-) -> dict[str, Any]:
+    if_none_match: str | None = Header(default=None),
+) -> Response:
     try:
         auth_user_id, profile_id = _resolve_authenticated_profile(request, authorization)
         profiles_repository = get_profiles_repository()
@@ -6759,7 +7073,7 @@ def get_spending_report_json(
                 "format": "json",
             },
         )
-        report_payload = _build_spending_report_payload(
+        _cache_key, report = _get_or_build_spending_report(
             profile_id=profile_id,
             period_start=period_start,
             period_end=period_end,
@@ -6770,15 +7084,81 @@ def get_spending_report_json(
             profile_id=profile_id,
             user_id=auth_user_id,
             state_dict=state_dict if isinstance(state_dict, dict) else None,
-            report_payload=report_payload,
+            report_payload=report.payload,
             fallback_date_range={"start_date": period_start.isoformat(), "end_date": period_end.isoformat()},
         )
-        return report_payload
+        headers = _report_validator_headers(report.etag)
+        if etag_matches(if_none_match, report.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=report.body, media_type="application/json", headers=headers)
     except Exception:
         logger.exception("spending_report_failed", extra={"format": "json"})
         raise
 
 
+def _resolve_trend_date_range(*, start_date: str | None, end_date: str | None, months: int) -> tuple[date, date]:
+    """Return the explicit range, else the last ``months`` calendar months up to today."""
+
+    if start_date or end_date:
+        if not start_date or not end_date:
+            raise HTTPException(status_code=400, detail="start_date and end_date must be provided together")
+        parsed_start = _parse_iso_date(start_date, "start_date")
+        parsed_end = _parse_iso_date(end_date, "end_date")
+        if parsed_start > parsed_end:
+            raise HTTPException(status_code=400, detail="start_date must be before or equal to end_date")
+        return parsed_start, parsed_end
+
+    today = date.today()
+    month_index = today.year * 12 + today.month - 1 - (months - 1)
+    return date(month_index // 12, month_index % 12 + 1, 1), today
+
+
+@app.get("/finance/reports/spending/trend")
+def get_spending_trend_report(
+    request: Request,
+    authorization: str | None = Header(default=None),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    months: int = Query(default=12, ge=1, le=60),
+    granularity: RelevesTrendGranularity = RelevesTrendGranularity.MONTH,
+    bank_account_id: str | None = None,
+    top_merchants: int = Query(default=5, ge=0, le=20),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    """Per-period spending, cashflow, categories and top merchants over a range, as parallel arrays."""
+
+    _auth_user_id, profile_id = _resolve_authenticated_profile(request, authorization)
+    period_start, period_end = _resolve_trend_date_range(start_date=start_date, end_date=end_date, months=months)
+    logger.info(
+        "finance_spending_trend_requested",
+        extra={
+            "profile_id": str(profile_id),
+            "start_date": period_start.isoformat(),
+            "end_date": period_end.isoformat(),
+            "granularity": granularity.value,
+        },
+    )
+    trend_result = get_tool_router().call(
+        "finance_releves_trend",
+        {
+            "date_range": {"start_date": period_start.isoformat(), "end_date": period_end.isoformat()},
+            "granularity": granularity.value,
+            "bank_account_id": bank_account_id,
+            "top_merchants": top_merchants,
+        },
+        profile_id=profile_id,
+    )
+    if isinstance(trend_result, ToolError):
+        raise HTTPException(status_code=400, detail=trend_result.message)
+
+    body = json_dumps(jsonable_encoder(trend_result, exclude={"filters"}))
+    etag = content_etag(body)
+    headers = _report_validator_headers(etag)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/finance/reports/spending.pdf")
 def get_spending_report_pdf(
     request: Request,
@@ -6787,6 +7167,7 @@ def get_spending_report_pdf(
     end_date: str | None = None,
     month: str | None = None,
     bank_account_id: str | None = None,
+    if_none_match: str | None = Header(default=None),
 ) -> Response:
     try:
         auth_user_id, profile_id = _resolve_authenticated_profile(request, authorization)
@@ -6811,7 +7192,7 @@ def get_spending_report_pdf(
             },
         )
 
-        report_payload = _build_spending_report_payload(
+        cache_key, report = _get_or_build_spending_report(
             profile_id=profile_id,
             period_start=period_start,
             period_end=period_end,
@@ -6822,24 +7203,22 @@ def get_spending_report_pdf(
             profile_id=profile_id,
             user_id=auth_user_id,
             state_dict=state_dict if isinstance(state_dict, dict) else None,
-            report_payload=report_payload,
+            report_payload=report.payload,
             fallback_date_range={"start_date": period_start.isoformat(), "end_date": period_end.isoformat()},
         )
 
+        report = _get_or_render_spending_pdf(cache_key, report)
+        headers = _report_validator_headers(report.pdf_etag)
+        if etag_matches(if_none_match, report.pdf_etag):
+            return Response(status_code=304, headers=headers)
+
         filename_period = (
             period_start.strftime("%Y-%m") if period_start.day == 1 else f"{period_start.isoformat()}_{period_end.isoformat()}"
         )
-        pdf_bytes = _get_or_create_spending_pdf_bytes(
-            profile_id=profile_id,
-            period_start=period_start,
-            period_end=period_end,
-            bank_account_id=bank_account_id,
-            report_payload=report_payload,
-        )
         return Response(
-            content=pdf_bytes,
+            content=report.pdf,
             media_type="application/pdf",
-            headers={"Content-Disposition": f'inline; filename="rapport-depenses-{filename_period}.pdf"'},
+            headers={**headers, "Content-Disposition": f'inline; filename="rapport-depenses-{filename_period}.pdf"'},
         )
     except Exception:
         logger.exception("spending_report_failed", extra={"format": "pdf"})
@@ -6926,6 +7305,9 @@ def _build_throttled_import_progress_emitter(
 def _run_import_job_pipeline(*, repository: SupabaseImportJobsRepository, profile_id: UUID, payload: ImportRequestPayload, job_id: UUID) -> None:
     """Execute CSV import in background and persist progress events."""
 
+    precomputer = get_report_precomputer()
+    if precomputer is not None:
+        precomputer.cancel(profile_id)
     try:
         total_transactions_hint = 1
         parsed_total_received = False
@@ -7155,7 +7537,12 @@ def _run_import_job_pipeline(*, repository: SupabaseImportJobsRepository, profil
 
         backend_client = getattr(tool_router, "backend_client", None)
         if backend_client is not None and hasattr(backend_client, "finance_releves_import_files"):
-            result_obj = backend_client.finance_releves_import_files(request=request_model, on_progress=_on_import_progress)
+            try:
+                result_obj = backend_client.finance_releves_import_files(request=request_model, on_progress=_on_import_progress)
+            finally:
+                # The backend client bypasses the tool router, which bumps on writes;
+                # a failed import may already have inserted rows.
+                bump_profile_data_version(profile_id)
             result = jsonable_encoder(result_obj)
         else:
             result_obj = tool_router.call(
@@ -7246,21 +7633,25 @@ def _run_import_job_pipeline(*, repository: SupabaseImportJobsRepository, profil
                 },
             )
             try:
-                resolution_result = _resolve_pending_map_alias_batches(
-                    profile_id=profile_id,
-                    profiles_repository=profiles_repository,
-                    limit_per_batch=limit_per_batch,
-                    max_per_run=max_per_run,
-                    on_progress=lambda processed, target: _emit_import_job_event(
-                        repository=repository,
+                try:
+                    resolution_result = _resolve_pending_map_alias_batches(
                         profile_id=profile_id,
-                        job_id=job_id,
-                        kind="categorization_progress",
-                        message=f"Catégorisation... ({processed}/{max(target, 1)})",
-                        progress=min(0.99, 0.93 + (0.06 * (processed / max(target, 1)))),
-                        payload={"processed": processed, "target": target},
-                    ),
-                )
+                        profiles_repository=profiles_repository,
+                        limit_per_batch=limit_per_batch,
+                        max_per_run=max_per_run,
+                        on_progress=lambda processed, target: _emit_import_job_event(
+                            repository=repository,
+                            profile_id=profile_id,
+                            job_id=job_id,
+                            kind="categorization_progress",
+                            message=f"Catégorisation... ({processed}/{max(target, 1)})",
+                            progress=min(0.99, 0.93 + (0.06 * (processed / max(target, 1)))),
+                            payload={"processed": processed, "target": target},
+                        ),
+                    )
+                finally:
+                    # Alias resolution recategorizes transactions outside the tool router.
+                    bump_profile_data_version(profile_id)
                 stats = resolution_result.get("stats") if isinstance(resolution_result, dict) else {}
                 pending_after = resolution_result.get("remaining_pending_count") if isinstance(resolution_result, dict) else None
                 usage_payload = stats.get("usage") if isinstance(stats, dict) else None
@@ -7350,6 +7741,22 @@ def _run_import_job_pipeline(*, repository: SupabaseImportJobsRepository, profil
             payload={"result": result if isinstance(result, dict) else None},
             job_patch={"status": "done", "processed_transactions": processed_transactions, "result": result if isinstance(result, dict) else None},
         )
+
+        import_range = _extract_import_date_range(result) if isinstance(result, dict) else None
+        if import_range is not None:
+            try:
+                _schedule_import_report_precompute(
+                    profile_id=profile_id,
+                    import_start=date.fromisoformat(import_range["start"]),
+                    import_end=date.fromisoformat(import_range["end"]),
+                )
+            except Exception:
+                logger.warning(
+                    "import_job_report_precompute_schedule_failed job_id=%s profile_id=%s",
+                    job_id,
+                    profile_id,
+                    exc_info=True,
+                )
     except Exception as exc:
         logger.exception("import_job_pipeline_failed job_id=%s profile_id=%s", job_id, profile_id)
         current_job = repository.get_job(profile_id=profile_id, job_id=job_id)
@@ -7833,6 +8240,74 @@ def _resolve_pending_map_alias_batches(
     }
 
 
+@app.get("/finance/releves/export")
+def export_releves(
+    request: Request,
+    authorization: str | None = Header(default=None),
+    export_format: RelevesExportFormat = Query(default=RelevesExportFormat.CSV, alias="format"),
+    start_date: str | None = None,
+    end_date: str | None = None,
+    bank_account_id: UUID | None = None,
+    category_id: UUID | None = None,
+) -> StreamingResponse:
+    """Stream the profile's releves, oldest first, as CSV or NDJSON with category and merchant names."""
+
+    _auth_user_id, profile_id = _resolve_authenticated_profile(request, authorization)
+    date_range: DateRange | None = None
+    if start_date or end_date:
+        if not start_date or not end_date:
+            raise HTTPException(status_code=400, detail="start_date and end_date must be provided together")
+        parsed_start = _parse_iso_date(start_date, "start_date")
+        parsed_end = _parse_iso_date(end_date, "end_date")
+        if parsed_start > parsed_end:
+            raise HTTPException(status_code=400, detail="start_date must be before or equal to end_date")
+        date_range = DateRange(start_date=parsed_start, end_date=parsed_end)
+
+    backend_client = getattr(get_tool_router(), "backend_client", None)
+    tool_service = getattr(backend_client, "tool_service", None)
+    releves_repository = getattr(tool_service, "releves_repository", None)
+    if releves_repository is None:
+        raise HTTPException(status_code=503, detail="releves export unavailable")
+
+    logger.info(
+        "finance_releves_export_requested",
+        extra={
+            "profile_id": str(profile_id),
+            "format": export_format.value,
+            "start_date": date_range.start_date.isoformat() if date_range else None,
+            "end_date": date_range.end_date.isoformat() if date_range else None,
+        },
+    )
+    chunks = encode_releves_export(
+        releves_repository.iter_releves_for_export(
+            profile_id=profile_id,
+            date_range=date_range,
+            bank_account_id=bank_account_id,
+            category_id=category_id,
+        ),
+        export_format,
+    )
+    # Read the first page before answering so that a failing backend is an
+    # HTTP error rather than an empty download. An empty NDJSON export has no chunk.
+    first_chunk = next(chunks, b"")
+
+    def _stream() -> Iterator[bytes]:
+        yield first_chunk
+        try:
+            yield from chunks
+        except Exception:
+            # Headers are sent: aborting the response is the only way to tell the client.
+            logger.exception("finance_releves_export_failed", extra={"profile_id": str(profile_id)})
+            raise
+
+    filename = f"releves-{date.today().isoformat()}.{export_format.value}"
+    return StreamingResponse(
+        _stream(),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+    )
+
+
 @app.post("/finance/releves/import")
 def import_releves(request: Request, payload: ImportRequestPayload, authorization: str | None = Header(default=None)) -> Any:
     """Import bank statements using backend tool router."""
@@ -8154,10 +8629,45 @@ def import_releves(request: Request, payload: ImportRequestPayload, authorizatio
                 for row in merchants
                 if row.get("id")
             }
+            streamed_suggestion_ids: set[int] = set()
+
+            def _store_cleanup_suggestions(chunk_suggestions: list[MerchantSuggestion], chunk_llm_run_id: str | None) -> None:
+                suggestion_rows: list[dict[str, Any]] = []
+                for suggestion in chunk_suggestions:
+                    streamed_suggestion_ids.add(id(suggestion))
+                    auto_applied, error_message = _maybe_auto_apply_suggestion(
+                        profiles_repository=profiles_repository,
+                        profile_id=profile_id,
+                        suggestion=suggestion,
+                        merchants_by_id=merchants_by_id,
+                    )
+                    if error_message:
+                        response_payload["merchant_suggestions_failed_count"] += 1
+                        suggestion_rows.append({
+                            **_build_suggestion_row(suggestion, status="failed"),
+                            "llm_run_id": chunk_llm_run_id,
+                            "error": error_message,
+                        })
+                        continue
+                    if auto_applied:
+                        response_payload["merchant_suggestions_applied_count"] += 1
+                        suggestion_rows.append({**_build_suggestion_row(suggestion, status="applied"), "llm_run_id": chunk_llm_run_id})
+                    else:
+                        response_payload["merchant_suggestions_pending_count"] += 1
+                        suggestion_rows.append({**_build_suggestion_row(suggestion, status="pending"), "llm_run_id": chunk_llm_run_id})
+
+                profiles_repository.create_merchant_suggestions(
+                    profile_id=profile_id,
+                    suggestions=suggestion_rows,
+                )
+
+            # Chunks are applied and persisted as they complete, so a slow or failing
+            # chunk does not hold back or discard the suggestions of the others.
             suggestions, llm_run_id, usage, cleanup_stats = run_merchant_cleanup(
                 profile_id=profile_id,
                 profiles_repository=profiles_repository,
                 merchants=merchants,
+                on_suggestions=_store_cleanup_suggestions,
             )
             response_payload["merchant_cleanup_llm_run_id"] = llm_run_id
             response_payload["merchant_cleanup_usage"] = usage
@@ -8177,33 +8687,11 @@ def import_releves(request: Request, payload: ImportRequestPayload, authorizatio
                     True,
                 )
 
-            suggestion_rows: list[dict[str, Any]] = []
-            for suggestion in suggestions:
-                auto_applied, error_message = _maybe_auto_apply_suggestion(
-                    profiles_repository=profiles_repository,
-                    profile_id=profile_id,
-                    suggestion=suggestion,
-                    merchants_by_id=merchants_by_id,
-                )
-                if error_message:
-                    response_payload["merchant_suggestions_failed_count"] += 1
-                    suggestion_rows.append({
-                        **_build_suggestion_row(suggestion, status="failed"),
-                        "llm_run_id": llm_run_id,
-                        "error": error_message,
-                    })
-                    continue
-                if auto_applied:
-                    response_payload["merchant_suggestions_applied_count"] += 1
-                    suggestion_rows.append({**_build_suggestion_row(suggestion, status="applied"), "llm_run_id": llm_run_id})
-                else:
-                    response_payload["merchant_suggestions_pending_count"] += 1
-                    suggestion_rows.append({**_build_suggestion_row(suggestion, status="pending"), "llm_run_id": llm_run_id})
-
-            profiles_repository.create_merchant_suggestions(
-                profile_id=profile_id,
-                suggestions=suggestion_rows,
-            )
+            remaining_suggestions = [
+                suggestion for suggestion in suggestions if id(suggestion) not in streamed_suggestion_ids
+            ]
+            if remaining_suggestions or not streamed_suggestion_ids:
+                _store_cleanup_suggestions(remaining_suggestions, llm_run_id)
         except Exception:
             logger.exception("import_releves_merchant_cleanup_failed profile_id=%s", profile_id)
             warnings = response_payload.get("warnings")
@@ -8212,6 +8700,9 @@ def import_releves(request: Request, payload: ImportRequestPayload, authorizatio
             else:
                 response_payload["warnings"] = ["merchant_cleanup_failed"]
 
+    # The import tool already bumped the version; alias resolution and cleanup
+    # auto-apply above wrote merchants directly through the repository.
+    bump_profile_data_version(profile_id)
     return jsonable_encoder(response_payload)
 
 
@@ -8355,6 +8846,7 @@ def resolve_merchant_alias_suggestions(
         logger.exception("resolve_map_alias_suggestions_failed profile_id=%s", profile_id)
         raise HTTPException(status_code=500, detail="Failed to resolve map_alias suggestions") from exc
 
+    bump_profile_data_version(profile_id)
     return {
         "ok": True,
         "type": "merchant_alias_resolve_result",
@@ -8543,6 +9035,7 @@ def resolve_pending_merchant_aliases(
     aggregated_stats["usage"] = usage_totals
     aggregated_stats["warnings"] = sorted(warning_values)
 
+    bump_profile_data_version(profile_id)
     return {
         "ok": True,
         "type": "merchant_alias_resolve_result",
@@ -8595,7 +9088,7 @@ def rename_merchant(request: Request, payload: RenameMerchantPayload, authorizat
     _, profile_id = _resolve_authenticated_profile(request, authorization)
     profiles_repository = get_profiles_repository()
     try:
-        return profiles_repository.rename_merchant(
+        renamed = profiles_repository.rename_merchant(
             profile_id=profile_id,
             merchant_id=payload.merchant_id,
             new_name=payload.name,
@@ -8604,6 +9097,8 @@ def rename_merchant(request: Request, payload: RenameMerchantPayload, authorizat
         error_message = str(exc)
         status_code = 404 if "not found" in error_message.lower() else 400
         raise HTTPException(status_code=status_code, detail=error_message) from exc
+    bump_profile_data_version(profile_id)
+    return renamed
 
 
 @app.post("/finance/merchants/merge")
@@ -8613,7 +9108,7 @@ def merge_merchants(request: Request, payload: MergeMerchantsPayload, authorizat
     _, profile_id = _resolve_authenticated_profile(request, authorization)
     profiles_repository = get_profiles_repository()
     try:
-        return profiles_repository.merge_merchants(
+        merged = profiles_repository.merge_merchants(
             profile_id=profile_id,
             source_merchant_id=payload.source_merchant_id,
             target_merchant_id=payload.target_merchant_id,
@@ -8622,3 +9117,5 @@ def merge_merchants(request: Request, payload: MergeMerchantsPayload, authorizat
         error_message = str(exc)
         status_code = 404 if "not found" in error_message.lower() else 400
         raise HTTPException(status_code=status_code, detail=error_message) from exc
+    bump_profile_data_version(profile_id)
+    return merged
@@ -18,6 +18,8 @@ from shared.models import (
     RelevesImportResult,
     RelevesSearchResult,
     RelevesSumResult,
+    RelevesTrendRequest,
+    RelevesTrendResult,
     ProfileCategory,
     ProfileDataResult,
     ToolError,
@@ -52,6 +54,9 @@ class BackendClient:
     ) -> RelevesAggregateResult | ToolError:
         return self.tool_service.releves_aggregate(request)
 
+    def releves_trend(self, request: RelevesTrendRequest) -> RelevesTrendResult | ToolError:
+        return self.tool_service.releves_trend(request)
+
 
     def finance_releves_set_bank_account(
         self,
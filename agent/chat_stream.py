@@ -0,0 +1,186 @@
+"""Typed server-sent events for the streaming chat endpoint.
+
+``POST /agent/chat/stream`` runs the regular chat turn in a worker thread.
+Code on the turn's path reports progress with :func:`emit_chat_event`. That is
+a no-op unless a stream installed a sink with :func:`chat_event_sink`. Event
+names are:
+
+``ack``          the message was authenticated and accepted;
+``plan``         the agent chose a tool call (tool name and payload);
+``tool_result``  summary of the tool outcome (ok/error, row counts, totals);
+``reply_delta``  a chunk of the final reply text;
+``ui_action``    UI instruction attached to the reply (quick replies, forms);
+``done``         the full ``ChatResponse`` payload;
+``error``        the turn failed (``status_code``, ``detail``).
+
+Chat state writes made during a streamed turn are held by a
+:class:`ChatStateWriteBuffer` and persisted once the final event has been
+emitted, so database latency no longer delays the first useful event.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import re
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Any, Callable, Iterator
+from uuid import UUID
+
+from shared.models import ToolError
+
+
+ChatEventSink = Callable[[str, dict[str, Any]], None]
+
+REPLY_CHUNK_CHARS = 48
+
+_EVENT_SINK: contextvars.ContextVar[ChatEventSink | None] = contextvars.ContextVar("chat_event_sink", default=None)
+_STATE_BUFFER: contextvars.ContextVar[ChatStateWriteBuffer | None] = contextvars.ContextVar(
+    "chat_state_write_buffer", default=None
+)
+_REPLY_SPLIT_PATTERN = re.compile(r"(?<=\s)(?=\S)")
+
+
+def emit_chat_event(event: str, **data: Any) -> None:
+    """Send ``event`` to the active chat stream, if any."""
+
+    sink = _EVENT_SINK.get()
+    if sink is not None:
+        sink(event, data)
+
+
+@contextmanager
+def chat_event_sink(sink: ChatEventSink) -> Iterator[None]:
+    """Route :func:`emit_chat_event` calls of the current context to ``sink``."""
+
+    token = _EVENT_SINK.set(sink)
+    try:
+        yield
+    finally:
+        _EVENT_SINK.reset(token)
+
+
+def format_sse(event: str, data: dict[str, Any], *, event_id: int) -> str:
+    """Serialize one server-sent event frame."""
+
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def reply_chunks(reply: str, *, max_chars: int = REPLY_CHUNK_CHARS) -> list[str]:
+    """Split ``reply`` at word boundaries into chunks that concatenate back to it."""
+
+    chunks: list[str] = []
+    current = ""
+    for piece in _REPLY_SPLIT_PATTERN.split(reply):
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def summarize_tool_result(tool_name: str, result: Any) -> dict[str, Any]:
+    """Return a small JSON-safe digest of a tool result for the ``tool_result`` event."""
+
+    if isinstance(result, ToolError):
+        return {"tool_name": tool_name, "ok": False, "error_code": result.code.value, "message": result.message}
+
+    summary: dict[str, Any] = {"tool_name": tool_name, "ok": True}
+    items = getattr(result, "items", None)
+    if isinstance(items, list):
+        summary["items"] = len(items)
+    groups = getattr(result, "groups", None)
+    if isinstance(groups, dict):
+        summary["groups"] = len(groups)
+    for field in ("total", "count", "currency"):
+        value = getattr(result, field, None)
+        if isinstance(value, Decimal):
+            summary[field] = str(value)
+        elif isinstance(value, (int, str)) and not isinstance(value, bool):
+            summary[field] = value
+    return summary
+
+
+class ChatStateWriteBuffer:
+    """Collect ``update_chat_state`` calls of one turn and apply them later.
+
+    Writes are merged per conversation with the repository's column-level
+    upsert semantics (``active_task`` and ``state`` are replaced independently),
+    and reads made during the turn see the pending values.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[tuple[UUID, UUID], tuple[Any, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, repository: Any, *, profile_id: UUID, user_id: UUID, chat_state: dict[str, Any]) -> None:
+        key = (profile_id, user_id)
+        with self._lock:
+            _repository, pending = self._pending.get(key, (repository, {}))
+            pending.update({name: chat_state[name] for name in ("active_task", "state") if name in chat_state})
+            self._pending[key] = (repository, pending)
+
+    def overlay(self, *, profile_id: UUID, user_id: UUID, chat_state: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            pending = self._pending.get((profile_id, user_id))
+        if pending is None:
+            return chat_state
+        merged = dict(chat_state)
+        for name, value in pending[1].items():
+            if value is None:
+                merged.pop(name, None)
+            else:
+                merged[name] = value
+        return merged
+
+    def flush(self) -> int:
+        """Persist pending writes; return how many conversations were written."""
+
+        with self._lock:
+            pending = list(self._pending.items())
+            self._pending.clear()
+        for (profile_id, user_id), (repository, chat_state) in pending:
+            repository.update_chat_state(profile_id=profile_id, user_id=user_id, chat_state=chat_state)
+        return len(pending)
+
+
+class _BufferedChatStateRepository:
+    """Profiles repository proxy routing chat state writes to a buffer."""
+
+    def __init__(self, repository: Any, buffer: ChatStateWriteBuffer) -> None:
+        self._repository = repository
+        self._buffer = buffer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repository, name)
+
+    def get_chat_state(self, *, profile_id: UUID, user_id: UUID) -> dict[str, Any]:
+        chat_state = self._repository.get_chat_state(profile_id=profile_id, user_id=user_id)
+        return self._buffer.overlay(profile_id=profile_id, user_id=user_id, chat_state=chat_state)
+
+    def update_chat_state(self, *, profile_id: UUID, user_id: UUID, chat_state: dict[str, Any]) -> None:
+        self._buffer.record(self._repository, profile_id=profile_id, user_id=user_id, chat_state=chat_state)
+
+
+@contextmanager
+def buffered_chat_state(buffer: ChatStateWriteBuffer) -> Iterator[None]:
+    """Make :func:`with_chat_state_buffer` defer writes of the current context to ``buffer``."""
+
+    token = _STATE_BUFFER.set(buffer)
+    try:
+        yield
+    finally:
+        _STATE_BUFFER.reset(token)
+
+
+def with_chat_state_buffer(repository: Any) -> Any:
+    """Return ``repository``, wrapped to defer chat state writes inside a streamed turn."""
+
+    buffer = _STATE_BUFFER.get()
+    if buffer is None or not hasattr(repository, "update_chat_state"):
+        return repository
+    return _BufferedChatStateRepository(repository, buffer)
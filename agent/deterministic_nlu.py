@@ -44,6 +44,11 @@ _FRENCH_MONTHS: dict[str, int] = {
     "dec.": 12,
     "déc.": 12,
 }
+_MONTH_DATE_RANGE_PATTERN = re.compile(
+    r"\ben\s+(?P<month>"
+    + "|".join(re.escape(token) for token in sorted(_FRENCH_MONTHS, key=len, reverse=True))
+    + r")(?:\s+(?P<year>19\d{2}|20\d{2}|21\d{2}))?\b"
+)
 
 _CREATE_ACCOUNT_PATTERNS = (
     re.compile(
@@ -177,12 +182,7 @@ def _extract_date_range_from_message(
     message: str,
 ) -> tuple[dict[str, date], str] | None:
     lower = message.lower()
-    month_tokens = sorted(_FRENCH_MONTHS.keys(), key=len, reverse=True)
-    month_pattern = "|".join(re.escape(token) for token in month_tokens)
-    match = re.search(
-        rf"\ben\s+(?P<month>{month_pattern})(?:\s+(?P<year>19\d{{2}}|20\d{{2}}|21\d{{2}}))?\b",
-        lower,
-    )
+    match = _MONTH_DATE_RANGE_PATTERN.search(lower)
     if match is None:
         return None
 
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 from agent.backend_client import BackendClient
 from agent.llm_judge import LLMJudge
-from agent.llm_planner import LLMPlanner
+from agent.llm_planner import LLMPlanner, warm_tool_definitions
 from agent.loop import AgentLoop
+from agent.tool_cache import shared_tool_result_cache
 from agent.tool_router import ToolRouter
 from backend.factory import build_backend_tool_service
 from shared import config
@@ -16,13 +17,14 @@ def build_agent_loop() -> AgentLoop:
 
     backend_tool_service = build_backend_tool_service()
     backend_client = BackendClient(tool_service=backend_tool_service)
-    tool_router = ToolRouter(backend_client=backend_client)
+    tool_router = ToolRouter(backend_client=backend_client, result_cache=shared_tool_result_cache())
     llm_planner: LLMPlanner | None = None
     llm_judge: LLMJudge | None = None
 
     if config.llm_enabled():
         llm_planner = LLMPlanner(strict=config.llm_strict())
         llm_judge = LLMJudge()
+        warm_tool_definitions()
 
     return AgentLoop(
         tool_router=tool_router,
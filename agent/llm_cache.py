@@ -0,0 +1,144 @@
+"""In-process response cache for LLM planner and guardian calls."""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable
+
+from shared import config
+
+
+_RELATIVE_PERIOD_PATTERN = re.compile(
+    r"\b("
+    r"aujourd ?hui|hier|avant hier|demain|"
+    r"ce mois|cette annee|cette semaine|ce trimestre|"
+    r"mois (dernier|passe|precedent|courant|en cours)|"
+    r"annee (derniere|passee|precedente|courante|en cours)|"
+    r"semaine (derniere|passee|precedente)|"
+    r"depuis le debut|derniers? (\d+ )?(jours?|semaines?|mois|ans?|annees?)|"
+    r"today|yesterday|this (month|year|week)|last (month|year|week)"
+    r")\b"
+)
+
+
+def normalize_cache_message(message: str) -> str:
+    """Return the message folded for cache lookups (case, accents, spacing)."""
+    folded = unicodedata.normalize("NFKD", message.casefold())
+    without_accents = "".join(char for char in folded if not unicodedata.combining(char))
+    without_accents = without_accents.replace("’", "'").replace("'", " ")
+    collapsed = " ".join(without_accents.split())
+    return collapsed.strip(" .,!?:;\"“”«»")
+
+
+def has_relative_period(normalized_message: str) -> bool:
+    """Return whether a normalized message depends on the current date."""
+    return _RELATIVE_PERIOD_PATTERN.search(normalized_message) is not None
+
+
+def schema_hash(value: object) -> str:
+    """Return a stable short hash for a JSON-compatible structure."""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def build_cache_key(
+    *,
+    kind: str,
+    message: str,
+    model: str,
+    tools_hash: str,
+    extra: object = None,
+    today: date | None = None,
+) -> str:
+    """Build a cache key from the normalized message and call context.
+
+    Messages that mention relative periods ("ce mois", "mois dernier", ...)
+    embed the current date so that cached plans never outlive their period.
+    """
+
+    normalized_message = normalize_cache_message(message)
+    day_marker = ""
+    if has_relative_period(normalized_message):
+        day_marker = (today or date.today()).isoformat()
+    key_payload = {
+        "kind": kind,
+        "message": normalized_message,
+        "model": model,
+        "tools": tools_hash,
+        "day": day_marker,
+        "extra": extra,
+    }
+    return schema_hash(key_payload)
+
+
+@dataclass(slots=True)
+class LLMResponseCache:
+    """Bounded LRU cache with TTL for parsed LLM outputs.
+
+    Values are deep-copied on write and on read so callers can freely mutate
+    returned plans without corrupting cached entries.
+    """
+
+    max_entries: int = field(default_factory=config.llm_cache_max_entries)
+    ttl_seconds: float = field(default_factory=config.llm_cache_ttl_seconds)
+    clock: Callable[[], float] = time.monotonic
+    hits: int = 0
+    misses: int = 0
+    _entries: OrderedDict[str, tuple[float, Any]] = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether the cache stores anything at all."""
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: str) -> Any | None:
+        """Return a copy of the cached value or ``None`` when missing/expired."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.clock() - stored_at >= self.ttl_seconds:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a copy of ``value`` and evict least recently used entries."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (self.clock(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached entry and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import copy
 import json
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Protocol
 
+from agent.llm_cache import LLMResponseCache, build_cache_key, schema_hash
 from shared import config
+from shared.tracing import LLM_SPAN, set_llm_usage, trace_span
 
 
 class OpenAIJudgeClient(Protocol):
@@ -42,12 +46,14 @@ class OpenAIJudgeClientImpl:
         if self.timeout_s is not None:
             client_kwargs["timeout"] = self.timeout_s
         client = OpenAI(**client_kwargs)
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            tools=tools,
-            tool_choice=tool_choice,
-        )
+        with trace_span(LLM_SPAN, model=model, purpose="judge") as span:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                tools=tools,
+                tool_choice=tool_choice,
+            )
+            set_llm_usage(span, response)
         return response.model_dump(mode="json")
 
 
@@ -69,6 +75,7 @@ class LLMJudge:
 
     model: str = field(default_factory=config.llm_model)
     client: OpenAIJudgeClient | None = None
+    cache: LLMResponseCache | None = field(default_factory=LLMResponseCache)
 
     def _client(self) -> OpenAIJudgeClient | None:
         if self.client is not None:
@@ -80,6 +87,10 @@ class LLMJudge:
 
     @staticmethod
     def _tool_definitions() -> list[dict[str, Any]]:
+        return copy.deepcopy(_cached_tool_definitions()[0])
+
+    @staticmethod
+    def _build_tool_definitions() -> list[dict[str, Any]]:
         return [
             {
                 "type": "function",
@@ -153,6 +164,25 @@ class LLMJudge:
                 meta={"reason": "judge_client_unavailable"},
             )
 
+        cache = self.cache
+        cache_key: str | None = None
+        if cache is not None:
+            cache_key = build_cache_key(
+                kind="judge",
+                message=user_message,
+                model=self.model,
+                tools_hash=_cached_tool_definitions()[1],
+                extra={
+                    "deterministic_plan": deterministic_plan,
+                    "conversation_context": conversation_context,
+                    "known_categories": known_categories,
+                },
+            )
+            cached_result = cache.get(cache_key)
+            if cached_result is not None:
+                cached_result.meta["cache"] = "hit"
+                return cached_result
+
         messages = self._build_messages(
             user_message=user_message,
             deterministic_plan=deterministic_plan,
@@ -185,7 +215,7 @@ class LLMJudge:
             verdict = "approve"
 
         result_meta: dict[str, object] = {"reason": parsed.get("reason", ""), **usage_meta}
-        return LLMJudgeResult(
+        result = LLMJudgeResult(
             verdict=verdict,
             tool_name=parsed.get("tool_name") if isinstance(parsed.get("tool_name"), str) else None,
             payload=parsed.get("payload") if isinstance(parsed.get("payload"), dict) else None,
@@ -193,3 +223,13 @@ class LLMJudge:
             question=parsed.get("question") if isinstance(parsed.get("question"), str) else None,
             meta=result_meta,
         )
+        if cache is not None and cache_key is not None:
+            cache.set(cache_key, result)
+        return result
+
+
+@lru_cache(maxsize=1)
+def _cached_tool_definitions() -> tuple[list[dict[str, Any]], str]:
+    """Build guardian tool definitions and their hash once per process."""
+    definitions = LLMJudge._build_tool_definitions()
+    return definitions, schema_hash(definitions)
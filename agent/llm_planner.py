@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import copy
 import json
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Protocol
 
+from agent.llm_cache import LLMResponseCache, build_cache_key, schema_hash
 from agent.planner import ClarificationPlan, ErrorPlan, NoopPlan, Plan, ToolCallPlan
 from shared import config
+from shared.tracing import LLM_SPAN, set_llm_usage, trace_span
 from shared.models import (
     BankAccountDeleteRequest,
     CategoryCreateRequest,
@@ -18,6 +22,7 @@ from shared.models import (
     RelevesAggregateRequest,
     RelevesFilters,
     RelevesImportRequest,
+    RelevesTrendRequest,
     ToolError,
     ToolErrorCode,
 )
@@ -26,6 +31,7 @@ _ALLOWED_TOOLS = {
     "finance_releves_search",
     "finance_releves_sum",
     "finance_releves_aggregate",
+    "finance_releves_trend",
     "finance_releves_import_files",
     "finance_categories_list",
     "finance_categories_create",
@@ -40,6 +46,15 @@ _TOOL_ALIASES = {
     "finance_transactions_search": "finance_releves_search",
     "finance_transactions_sum": "finance_releves_sum",
 }
+_CACHEABLE_TOOLS = {
+    "finance_releves_search",
+    "finance_releves_sum",
+    "finance_releves_aggregate",
+    "finance_releves_trend",
+    "finance_categories_list",
+    "finance_profile_get",
+    "finance_bank_accounts_list",
+}
 _FALLBACK_CLARIFICATION = "Pouvez-vous préciser votre demande ?"
 _DELETE_BANK_ACCOUNT_FALLBACK = (
     "La suppression de compte bancaire est bien disponible via l'outil "
@@ -140,12 +155,14 @@ class OpenAIChatClientImpl:
             client_kwargs["timeout"] = self.timeout_s
 
         client = OpenAI(**client_kwargs)
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            tools=tools,
-            tool_choice=tool_choice,
-        )
+        with trace_span(LLM_SPAN, model=model, purpose="planner") as span:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                tools=tools,
+                tool_choice=tool_choice,
+            )
+            set_llm_usage(span, response)
         return response.model_dump(mode="json")
 
 
@@ -156,6 +173,7 @@ class LLMPlanner:
     model: str = field(default_factory=config.llm_model)
     strict: bool = field(default_factory=config.llm_strict)
     client: OpenAIChatClient | None = None
+    cache: LLMResponseCache | None = field(default_factory=LLMResponseCache)
 
     @staticmethod
     def _enabled() -> bool:
@@ -175,10 +193,21 @@ class LLMPlanner:
     @staticmethod
     def _tool_definition() -> list[dict[str, Any]]:
         """Return OpenAI tool definitions based on shared schemas."""
+        return copy.deepcopy(_cached_tool_definitions()[0])
+
+    @staticmethod
+    def tool_definitions_hash() -> str:
+        """Return a stable hash of the tool definitions sent to the LLM."""
+        return _cached_tool_definitions()[1]
+
+    @staticmethod
+    def _build_tool_definition() -> list[dict[str, Any]]:
+        """Build OpenAI tool definitions from shared Pydantic schemas."""
         releves_filters_schema = LLMPlanner._schema_without_profile_id(RelevesFilters.model_json_schema())
         releves_aggregate_schema = LLMPlanner._schema_without_profile_id(
             RelevesAggregateRequest.model_json_schema()
         )
+        releves_trend_schema = LLMPlanner._schema_without_profile_id(RelevesTrendRequest.model_json_schema())
         categories_create_schema = LLMPlanner._schema_without_profile_id(
             CategoryCreateRequest.model_json_schema()
         )
@@ -222,6 +251,17 @@ class LLMPlanner:
                     "parameters": releves_aggregate_schema,
                 },
             },
+            {
+                "type": "function",
+                "function": {
+                    "name": "finance_releves_trend",
+                    "description": (
+                        "Compare spending, cashflow, categories and top merchants "
+                        "month by month (or week by week) over a date range."
+                    ),
+                    "parameters": releves_trend_schema,
+                },
+            },
             {
                 "type": "function",
                 "function": {
@@ -304,6 +344,15 @@ class LLMPlanner:
             },
         ]
 
+    def _cache_key(self, message: str) -> str:
+        return build_cache_key(
+            kind="planner",
+            message=message,
+            model=self.model,
+            tools_hash=self.tool_definitions_hash(),
+            extra={"strict": self.strict, "prompt": _planner_prompt_hash()},
+        )
+
     @staticmethod
     def _messages(message: str) -> list[dict[str, str]]:
         return [
@@ -431,6 +480,13 @@ class LLMPlanner:
         if isinstance(client_or_error, ErrorPlan):
             return client_or_error
 
+        cache = self.cache
+        cache_key = self._cache_key(message) if cache is not None else None
+        if cache is not None and cache_key is not None:
+            cached_plan = cache.get(cache_key)
+            if cached_plan is not None:
+                return cached_plan
+
         try:
             response = client_or_error.create_chat_completion(
                 model=self.model,
@@ -457,4 +513,36 @@ class LLMPlanner:
                 )
             )
 
+        if cache is not None and cache_key is not None and _is_cacheable_plan(plan):
+            cache.set(cache_key, plan)
         return plan
+
+
+def _is_cacheable_plan(plan: Plan) -> bool:
+    """Return whether a plan can be replayed for an equivalent message.
+
+    Only read-only tool calls and clarifications are cached: write tools carry
+    user-provided values whose exact spelling must come from the live message.
+    """
+
+    if isinstance(plan, ClarificationPlan):
+        return True
+    return isinstance(plan, ToolCallPlan) and plan.tool_name in _CACHEABLE_TOOLS
+
+
+@lru_cache(maxsize=1)
+def _planner_prompt_hash() -> str:
+    return schema_hash([_planner_system_prompt(), _planner_few_shots()])
+
+
+@lru_cache(maxsize=1)
+def _cached_tool_definitions() -> tuple[list[dict[str, Any]], str]:
+    """Build tool definitions and their hash once per process."""
+    definitions = LLMPlanner._build_tool_definition()
+    return definitions, schema_hash(definitions)
+
+
+def warm_tool_definitions() -> None:
+    """Pre-build planner tool definitions so the first LLM turn skips schema generation."""
+    _cached_tool_definitions()
+    _planner_prompt_hash()
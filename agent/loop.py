@@ -7,13 +7,13 @@ import re
 import hashlib
 import unicodedata
 from dataclasses import dataclass
-from difflib import get_close_matches
 from datetime import datetime, timezone
 from uuid import UUID
 
 from pydantic import BaseModel
 
 from agent.answer_builder import build_final_reply
+from agent.chat_stream import emit_chat_event, summarize_tool_result
 from agent.deterministic_nlu import parse_intent
 from agent.llm_judge import LLMJudge
 from agent.llm_planner import LLMPlanner
@@ -25,6 +25,7 @@ from agent.memory import (
     is_followup_message,
     period_payload_from_message,
 )
+from agent.name_index import NameIndex
 from agent.planner import (
     ClarificationPlan,
     ErrorPlan,
@@ -35,8 +36,9 @@ from agent.planner import (
     deterministic_plan_from_message,
     plan_from_message,
 )
-from agent.tool_router import ToolRouter
+from agent.tool_router import ToolRouter, normalize_bank_account_name
 from shared import config
+from shared.tracing import trace_span
 from shared.models import (
     PROFILE_ALLOWED_FIELDS,
     RelevesFilters,
@@ -665,15 +667,16 @@ class AgentLoop:
             return plan
 
         context = query_memory.to_dict() if query_memory is not None else {}
-        verdict = self.llm_judge.judge(
-            user_message=message,
-            deterministic_plan={
-                "tool_name": plan.tool_name,
-                "payload": dict(plan.payload),
-            },
-            conversation_context=context,
-            known_categories=known_categories,
-        )
+        with trace_span("agent.judge"):
+            verdict = self.llm_judge.judge(
+                user_message=message,
+                deterministic_plan={
+                    "tool_name": plan.tool_name,
+                    "payload": dict(plan.payload),
+                },
+                conversation_context=context,
+                known_categories=known_categories,
+            )
 
         if verdict.meta.get("reason") == "judge_client_unavailable":
             if confidence == "low":
@@ -1574,28 +1577,15 @@ class AgentLoop:
         if not isinstance(items, list):
             return None
 
-        target = requested_name.lower()
-        exact_matches = [
-            account
-            for account in items
-            if isinstance(getattr(account, "name", None), str)
-            and account.name.strip().lower() == target
-        ]
+        index = NameIndex(
+            items,
+            name=lambda account: getattr(account, "name", None),
+            normalize=normalize_bank_account_name,
+        )
+        exact_matches = index.lookup(requested_name)
 
         if len(exact_matches) == 0:
-            names_by_norm: dict[str, str] = {}
-            for account in items:
-                if not isinstance(getattr(account, "name", None), str):
-                    continue
-                normalized_name = account.name.strip().lower()
-                if normalized_name and normalized_name not in names_by_norm:
-                    names_by_norm[normalized_name] = account.name
-            suggestions = [
-                names_by_norm[name_norm]
-                for name_norm in get_close_matches(
-                    target, list(names_by_norm.keys()), n=3, cutoff=0.6
-                )
-            ]
+            suggestions = [index.first_name(name_norm) for name_norm in index.close_norms(requested_name)]
             error = ToolError(
                 code=ToolErrorCode.NOT_FOUND,
                 message="Bank account not found for provided name.",
@@ -1728,29 +1718,18 @@ class AgentLoop:
             for item in items
             if isinstance(getattr(item, "name", None), str) and item.name.strip()
         ]
-        if any(_normalize_for_match(name) == requested_norm for name in category_names):
+        index = NameIndex(category_names, name=lambda name: name, normalize=_normalize_for_match)
+        if index.items_with_norm(requested_norm):
             return None
 
-        names_by_norm: dict[str, str] = {}
-        for name in category_names:
-            name_norm = _normalize_for_match(name)
-            if name_norm and name_norm not in names_by_norm:
-                names_by_norm[name_norm] = name
-
         suggestions: list[str] = []
-        for name_norm, display_name in names_by_norm.items():
+        for name_norm in index.norms():
             if requested_norm in name_norm or name_norm in requested_norm:
-                suggestions.append(display_name)
+                suggestions.append(index.first_name(name_norm))
 
         if len(suggestions) < 3:
-            close_norms = get_close_matches(
-                requested_norm,
-                list(names_by_norm.keys()),
-                n=3,
-                cutoff=0.6,
-            )
-            for close_norm in close_norms:
-                display_name = names_by_norm[close_norm]
+            for close_norm in index.close_norms(requested_name):
+                display_name = index.first_name(close_norm)
                 if display_name not in suggestions:
                     suggestions.append(display_name)
 
@@ -2367,10 +2346,12 @@ class AgentLoop:
             logger.info("tool_execution_started tool_name=%s", plan.tool_name)
             plan.payload = self._drop_none_payload_values(plan.payload)
             plan.payload = self._sanitize_payload_for_tool(plan.tool_name, plan.payload)
+            emit_chat_event("plan", tool_name=plan.tool_name, payload=plan.payload)
             raw_result = self.tool_router.call(
                 plan.tool_name, plan.payload, profile_id=profile_id
             )
             result = self._normalize_tool_result(plan.tool_name, raw_result)
+            emit_chat_event("tool_result", **summarize_tool_result(plan.tool_name, result))
             if isinstance(result, ToolError):
                 active_task_plan = self._build_bank_account_selection_active_task(
                     plan, result
@@ -2383,7 +2364,8 @@ class AgentLoop:
                         active_task=active_task_plan.active_task,
                         should_update_active_task=True,
                     )
-            final_reply = build_final_reply(plan=plan, tool_result=result)
+            with trace_span("agent.answer"):
+                final_reply = build_final_reply(plan=plan, tool_result=result)
             logger.info("tool_execution_completed tool_name=%s", plan.tool_name)
             extracted_memory = (
                 extract_memory_from_plan(
@@ -2570,7 +2552,8 @@ class AgentLoop:
         if active_task is not None:
             return self.plan_from_active_task(message, active_task)
 
-        nlu_intent = parse_intent(message)
+        with trace_span("agent.nlu"):
+            nlu_intent = parse_intent(message)
         if isinstance(nlu_intent, dict):
             intent_type = nlu_intent.get("type")
             if intent_type == "clarification":
@@ -5,9 +5,9 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 import re
-import unicodedata
 from typing import Any
 
+from agent.message_features import analyze_message, fold_text
 from agent.planner import ClarificationPlan, ToolCallPlan
 
 _READ_TOOLS = {
@@ -210,11 +210,12 @@ def is_read_tool(tool_name: str) -> bool:
 def is_followup_message(message: str) -> bool:
     """Heuristic for short follow-up messages."""
 
-    normalized = _normalize_text(message)
+    features = analyze_message(message)
+    normalized = features.folded
     if not normalized:
         return False
 
-    if any(keyword in normalized.split() for keyword in _INTENT_KEYWORDS):
+    if not _INTENT_KEYWORDS.isdisjoint(features.tokens):
         return bool(_FOLLOWUP_EXPLICIT_INTENT_PATTERN.match(normalized))
 
     tokens = normalized.replace("?", " ? ").split()
@@ -579,34 +580,19 @@ def _extract_search_term_before_chez(message: str) -> str | None:
 
 
 def _period_payload_from_message(message: str) -> dict[str, object]:
-    lowered = message.lower()
-    for month_name, month_number in _MONTH_LOOKUP.items():
-        month_match = re.search(rf"\b{re.escape(month_name)}\b", lowered)
-        if month_match is None:
-            continue
-        year_match = re.search(r"\b(19\d{2}|20\d{2}|21\d{2})\b", lowered)
-        if year_match is None:
-            continue
-        year = int(year_match.group(1))
-        return {
-            "date_range": _month_date_range_payload(year, month_number)
-        }
-
-    year_match = re.search(r"\b(19\d{2}|20\d{2}|21\d{2})\b", lowered)
-    if year_match is not None:
-        return {"year": int(year_match.group(1))}
-    return {}
+    features = analyze_message(message)
+    if not features.years:
+        return {}
+    if features.months:
+        return {"date_range": _month_date_range_payload(features.years[0], min(features.months))}
+    return {"year": features.years[0]}
 
 
 def _month_only_from_message(message: str) -> int | None:
-    lowered = message.lower()
-    has_year = re.search(r"\b(19\d{2}|20\d{2}|21\d{2})\b", lowered) is not None
-    if has_year:
+    features = analyze_message(message)
+    if features.years or not features.months:
         return None
-    for month_name, month_number in _MONTH_LOOKUP.items():
-        if re.search(rf"\b{re.escape(month_name)}\b", lowered):
-            return month_number
-    return None
+    return min(features.months)
 
 
 def _month_date_range_payload(year: int, month: int) -> dict[str, str]:
@@ -628,12 +614,7 @@ def period_payload_from_message(message: str) -> dict[str, object]:
 
 
 def _normalize_text(value: str) -> str:
-    lowered = value.strip().casefold()
-    without_accents = unicodedata.normalize("NFKD", lowered)
-    normalized = "".join(
-        char for char in without_accents if not unicodedata.combining(char)
-    )
-    return " ".join(normalized.split())
+    return fold_text(value)
 
 
 def _match_known_category(value: str, known_categories: list[str]) -> str | None:
@@ -7,7 +7,13 @@ import logging
 from typing import Any
 from uuid import UUID
 
+from backend.services.merchant_categorizer import (
+    MerchantCategorizer,
+    load_default_merchant_categorizer,
+    predict_confident_link,
+)
 from shared import config as _config
+from shared.tracing import LLM_SPAN, set_llm_usage, trace_span
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +38,7 @@ _CANONICAL_CATEGORY_LABELS: dict[str, str] = {
 }
 _ALLOWED_CATEGORY_KEYS = set(_CANONICAL_CATEGORY_LABELS)
 _MAX_LLM_BATCH_SIZE = 20
+_LOCAL_CATEGORIZER_MODEL = "local_categorizer"
 _PROMPT_COMPACT_REPLACEMENTS = (
     ("Paiement UBS TWINT", "TWINT"),
     ("Débit UBS TWINT", "TWINT"),
@@ -108,25 +115,30 @@ def _call_llm_json(prompt: str) -> tuple[dict[str, Any], str | None, dict[str, i
         {"role": "system", "content": "Tu réponds toujours avec du JSON strict."},
         {"role": "user", "content": prompt},
     ]
+    model = _config.llm_model()
     try:
-        response = client.chat.completions.create(
-            model=_config.llm_model(),
-            messages=messages,
-            response_format={"type": "json_object"},
-        )
+        with trace_span(LLM_SPAN, model=model, purpose="merchant_alias_resolver") as span:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                response_format={"type": "json_object"},
+            )
+            set_llm_usage(span, response)
     except Exception as exc:
         if not _is_response_format_unsupported(exc):
             raise
-        response = client.chat.completions.create(
-            model=_config.llm_model(),
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Tu réponds uniquement avec un objet JSON strict valide. Aucun markdown, aucun texte hors JSON.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-        )
+        with trace_span(LLM_SPAN, model=model, purpose="merchant_alias_resolver") as span:
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "Tu réponds uniquement avec un objet JSON strict valide. Aucun markdown, aucun texte hors JSON.",
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+            )
+            set_llm_usage(span, response)
     llm_run_id = str(response.id) if getattr(response, "id", None) else None
 
     usage_dict: dict[str, int] = {}
@@ -220,8 +232,18 @@ def _validate_resolution(raw: Any) -> tuple[dict[str, Any] | None, str | None]:
     }, None
 
 
-def resolve_pending_map_alias(*, profile_id: UUID, profiles_repository: Any, limit: int) -> dict[str, Any]:
-    """Resolve pending/failed map_alias suggestions in one LLM batch call."""
+def resolve_pending_map_alias(
+    *,
+    profile_id: UUID,
+    profiles_repository: Any,
+    limit: int,
+    categorizer: MerchantCategorizer | None = None,
+) -> dict[str, Any]:
+    """Resolve pending/failed map_alias suggestions in one LLM batch call.
+
+    Aliases that the local merchant categorizer links with high confidence are
+    applied first without any LLM call; only the residue is sent to the LLM.
+    """
 
     stats: dict[str, Any] = {
         "processed": 0,
@@ -230,6 +252,7 @@ def resolve_pending_map_alias(*, profile_id: UUID, profiles_repository: Any, lim
         "linked_aliases": 0,
         "updated_transactions": 0,
         "failed": 0,
+        "local_resolved": 0,
         "llm_run_id": None,
         "usage": {},
         "warnings": [],
@@ -309,6 +332,126 @@ def resolve_pending_map_alias(*, profile_id: UUID, profiles_repository: Any, lim
                 _compact_error(exc),
             )
 
+    def _apply_resolution(
+        *,
+        suggestion: dict[str, Any],
+        resolution: dict[str, Any],
+        llm_model: str,
+        llm_run_id: str | None,
+        source: str = "llm",
+    ) -> None:
+        suggestion_id = resolution["suggestion_id"]
+        stats["processed"] += 1
+        merchant_entity_id: UUID | None = resolution["merchant_entity_id"]
+        try:
+            if resolution["action"] == "create_entity":
+                entity = profiles_repository.create_merchant_entity(
+                    canonical_name=resolution["canonical_name"],
+                    canonical_name_norm=resolution["canonical_name_norm"],
+                    country=resolution["country"],
+                    suggested_category_norm=resolution["suggested_category_norm"],
+                    suggested_category_label=resolution["suggested_category_label"],
+                    suggested_confidence=resolution["confidence"],
+                    suggested_source="llm",
+                )
+                merchant_entity_id = UUID(str(entity))
+                stats["created_entities"] += 1
+
+            if merchant_entity_id is None:
+                raise ValueError("missing merchant_entity_id")
+
+            profiles_repository.upsert_merchant_alias(
+                merchant_entity_id=merchant_entity_id,
+                alias=suggestion["observed_alias"],
+                alias_norm=suggestion["observed_alias_norm"],
+                source=source,
+            )
+            stats["linked_aliases"] += 1
+
+            category_id = categories_by_key.get(resolution["suggested_category_norm"])
+            if category_id is None:
+                category_id = categories_by_key.get(_normalize_text(resolution["suggested_category_label"]))
+            if category_id is not None:
+                profiles_repository.upsert_profile_merchant_override(
+                    profile_id=profile_id,
+                    merchant_entity_id=merchant_entity_id,
+                    category_id=category_id,
+                    status="auto",
+                )
+
+            updated_transactions = profiles_repository.apply_entity_to_profile_transactions(
+                profile_id=profile_id,
+                observed_alias=suggestion["observed_alias"],
+                merchant_entity_id=merchant_entity_id,
+                category_id=category_id,
+            )
+            stats["updated_transactions"] += int(updated_transactions or 0)
+
+            _safe_update_merchant_suggestion_after_resolve(
+                profile_id=profile_id,
+                suggestion_id=suggestion_id,
+                status="applied",
+                error=None,
+                llm_model=llm_model,
+                llm_run_id=llm_run_id,
+                confidence=resolution["confidence"],
+                rationale=resolution["rationale"],
+                target_merchant_entity_id=merchant_entity_id,
+                suggested_entity_name=resolution["canonical_name"],
+                suggested_entity_name_norm=resolution["canonical_name_norm"],
+                suggested_category_norm=resolution["suggested_category_norm"],
+                suggested_category_label=resolution["suggested_category_label"],
+            )
+            stats["applied"] += 1
+        except Exception as exc:
+            stats["failed"] += 1
+            _safe_update_merchant_suggestion_after_resolve(
+                profile_id=profile_id,
+                suggestion_id=suggestion_id,
+                status="failed",
+                error=_compact_error(exc),
+                llm_model=llm_model,
+                llm_run_id=llm_run_id,
+                confidence=resolution["confidence"],
+                rationale=resolution["rationale"],
+                target_merchant_entity_id=merchant_entity_id,
+                suggested_entity_name=resolution["canonical_name"],
+                suggested_entity_name_norm=resolution["canonical_name_norm"],
+                suggested_category_norm=resolution["suggested_category_norm"],
+                suggested_category_label=resolution["suggested_category_label"],
+            )
+
+    local_categorizer = categorizer if categorizer is not None else load_default_merchant_categorizer()
+    if local_categorizer is not None:
+        residual_items: list[dict[str, str]] = []
+        for item in llm_items:
+            prediction = predict_confident_link(local_categorizer, item["observed_alias"])
+            if prediction is None:
+                residual_items.append(item)
+                continue
+            suggestion = suggestions_by_id[UUID(item["suggestion_id"])]
+            category_norm = prediction.category_norm if prediction.category_norm in _ALLOWED_CATEGORY_KEYS else "other"
+            _apply_resolution(
+                suggestion=suggestion,
+                resolution={
+                    "suggestion_id": suggestion["id"],
+                    "action": "link_existing",
+                    "merchant_entity_id": UUID(prediction.merchant_entity_id),
+                    "canonical_name": prediction.canonical_name,
+                    "canonical_name_norm": _normalize_text(prediction.canonical_name),
+                    "country": "CH",
+                    "suggested_category_norm": category_norm,
+                    "suggested_category_label": _CANONICAL_CATEGORY_LABELS[category_norm],
+                    "confidence": prediction.confidence,
+                    "rationale": "local_categorizer_nearest_neighbour",
+                },
+                llm_model=_LOCAL_CATEGORIZER_MODEL,
+                llm_run_id=None,
+                source=_LOCAL_CATEGORIZER_MODEL,
+            )
+            stats["local_resolved"] += 1
+        llm_items = residual_items
+
     for start in range(0, len(llm_items), _MAX_LLM_BATCH_SIZE):
         llm_batch_items = llm_items[start : start + _MAX_LLM_BATCH_SIZE]
         batch_ids: set[UUID] = {UUID(item["suggestion_id"]) for item in llm_batch_items}
@@ -366,85 +509,12 @@ def resolve_pending_map_alias(*, profile_id: UUID, profiles_repository: Any, lim
                 continue
 
             seen_ids.add(suggestion_id)
-            stats["processed"] += 1
-            merchant_entity_id: UUID | None = resolution["merchant_entity_id"]
-            try:
-                if resolution["action"] == "create_entity":
-                    entity = profiles_repository.create_merchant_entity(
-                        canonical_name=resolution["canonical_name"],
-                        canonical_name_norm=resolution["canonical_name_norm"],
-                        country=resolution["country"],
-                        suggested_category_norm=resolution["suggested_category_norm"],
-                        suggested_category_label=resolution["suggested_category_label"],
-                        suggested_confidence=resolution["confidence"],
-                        suggested_source="llm",
-                    )
-                    merchant_entity_id = UUID(str(entity))
-                    stats["created_entities"] += 1
-
-                if merchant_entity_id is None:
-                    raise ValueError("missing merchant_entity_id")
-
-                profiles_repository.upsert_merchant_alias(
-                    merchant_entity_id=merchant_entity_id,
-                    alias=suggestion["observed_alias"],
-                    alias_norm=suggestion["observed_alias_norm"],
-                    source="llm",
-                )
-                stats["linked_aliases"] += 1
-
-                category_id = categories_by_key.get(resolution["suggested_category_norm"])
-                if category_id is None:
-                    category_id = categories_by_key.get(_normalize_text(resolution["suggested_category_label"]))
-                if category_id is not None:
-                    profiles_repository.upsert_profile_merchant_override(
-                        profile_id=profile_id,
-                        merchant_entity_id=merchant_entity_id,
-                        category_id=category_id,
-                        status="auto",
-                    )
-
-                updated_transactions = profiles_repository.apply_entity_to_profile_transactions(
-                    profile_id=profile_id,
-                    observed_alias=suggestion["observed_alias"],
-                    merchant_entity_id=merchant_entity_id,
-                    category_id=category_id,
-                )
-                stats["updated_transactions"] += int(updated_transactions or 0)
-
-                _safe_update_merchant_suggestion_after_resolve(
-                    profile_id=profile_id,
-                    suggestion_id=suggestion_id,
-                    status="applied",
-                    error=None,
-                    llm_model=_config.llm_model(),
-                    llm_run_id=llm_run_id,
-                    confidence=resolution["confidence"],
-                    rationale=resolution["rationale"],
-                    target_merchant_entity_id=merchant_entity_id,
-                    suggested_entity_name=resolution["canonical_name"],
-                    suggested_entity_name_norm=resolution["canonical_name_norm"],
-                    suggested_category_norm=resolution["suggested_category_norm"],
-                    suggested_category_label=resolution["suggested_category_label"],
-                )
-                stats["applied"] += 1
-            except Exception as exc:
-                stats["failed"] += 1
-                _safe_update_merchant_suggestion_after_resolve(
-                    profile_id=profile_id,
-                    suggestion_id=suggestion_id,
-                    status="failed",
-                    error=_compact_error(exc),
-                    llm_model=_config.llm_model(),
-                    llm_run_id=llm_run_id,
-                    confidence=resolution["confidence"],
-                    rationale=resolution["rationale"],
-                    target_merchant_entity_id=merchant_entity_id,
-                    suggested_entity_name=resolution["canonical_name"],
-                    suggested_entity_name_norm=resolution["canonical_name_norm"],
-                    suggested_category_norm=resolution["suggested_category_norm"],
-                    suggested_category_label=resolution["suggested_category_label"],
-                )
+            _apply_resolution(
+                suggestion=suggestion,
+                resolution=resolution,
+                llm_model=_config.llm_model(),
+                llm_run_id=llm_run_id,
+            )
 
         for suggestion_id in batch_ids:
             if suggestion_id in seen_ids:
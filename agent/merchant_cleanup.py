@@ -2,18 +2,24 @@
 
 from __future__ import annotations
 
+import contextvars
 import json
 import logging
-from dataclasses import dataclass
-from typing import Any
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
 from uuid import UUID
 
+from backend.services.classification.recurrence import normalize_label_key
 from shared import config as _config
+from shared.tracing import LLM_SPAN, set_llm_usage, trace_span
 
 logger = logging.getLogger(__name__)
 
 _MAX_SUGGESTIONS = 50
 _ALLOWED_ACTIONS = {"rename", "merge", "categorize", "keep"}
+_BLOCK_KEY_LENGTH = 4
 
 
 @dataclass(slots=True)
@@ -236,14 +242,17 @@ def _call_llm_json(prompt: str) -> tuple[dict[str, Any], str | None, dict[str, i
         raise RuntimeError("OpenAI SDK unavailable") from exc
 
     client = OpenAI(api_key=api_key, timeout=20.0)
-    response = client.chat.completions.create(
-        model=_config.llm_model(),
-        messages=[
-            {"role": "system", "content": "Tu réponds toujours avec du JSON strict."},
-            {"role": "user", "content": prompt},
-        ],
-        response_format={"type": "json_object"},
-    )
+    model = _config.llm_model()
+    with trace_span(LLM_SPAN, model=model, purpose="merchant_cleanup") as span:
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": "Tu réponds toujours avec du JSON strict."},
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+        )
+        set_llm_usage(span, response)
 
     llm_run_id = str(response.id) if getattr(response, "id", None) else None
     usage_dict: dict[str, int] = {}
@@ -265,54 +274,245 @@ def _call_llm_json(prompt: str) -> tuple[dict[str, Any], str | None, dict[str, i
     return json.loads(content), llm_run_id, usage_dict
 
 
-def run_merchant_cleanup(
-    *,
-    profile_id: UUID,
-    profiles_repository: Any,
-    merchants: list[dict[str, Any]] | None = None,
-) -> tuple[list[MerchantSuggestion], str | None, dict[str, int], dict[str, Any]]:
-    """Run merchant cleanup suggestions through LLM and parse robustly."""
+def _empty_cleanup_stats() -> dict[str, Any]:
+    return {"raw_count": 0, "parsed_count": 0, "rejected_count": 0, "rejected_reasons": {}}
 
-    if merchants is None:
-        try:
-            merchants = profiles_repository.list_merchants(profile_id=profile_id, limit=5000)
-        except Exception:
-            logger.exception("merchant_cleanup_list_merchants_failed profile_id=%s", profile_id)
-            return [], None, {}, {"raw_count": 0, "parsed_count": 0, "rejected_count": 0, "rejected_reasons": {}}
 
-    if not merchants:
-        return [], None, {}, {"raw_count": 0, "parsed_count": 0, "rejected_count": 0, "rejected_reasons": {}}
+def _merchant_block_key(merchant: dict[str, Any]) -> str:
+    """Return the blocking key grouping merchants that could be merged together."""
+
+    aliases = merchant.get("aliases") if isinstance(merchant.get("aliases"), list) else []
+    for candidate in (merchant.get("name_norm"), merchant.get("name"), *aliases):
+        normalized = normalize_label_key(str(candidate or ""), None)
+        if normalized:
+            return normalized.split()[0][:_BLOCK_KEY_LENGTH]
+    return ""
+
+
+def partition_merchants(merchants: list[dict[str, Any]], *, chunk_size: int) -> list[list[dict[str, Any]]]:
+    """Split merchants into prompt-sized chunks keeping similar names together.
+
+    Merchants are blocked by the first letters of their first normalized token
+    (``COOP CITY`` and ``Coop-1234`` share ``coop``); blocks are packed in key
+    order so neighbouring spellings also tend to share a chunk. Only blocks
+    larger than ``chunk_size`` are split.
+    """
+
+    chunk_size = max(1, chunk_size)
+    blocks: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for merchant in merchants:
+        blocks[_merchant_block_key(merchant)].append(merchant)
+
+    chunks: list[list[dict[str, Any]]] = []
+    current: list[dict[str, Any]] = []
+    for block_key in sorted(blocks):
+        block = blocks[block_key]
+        if current and len(current) + len(block) > chunk_size:
+            chunks.append(current)
+            current = []
+        for start in range(0, len(block), chunk_size):
+            piece = block[start:start + chunk_size]
+            if len(piece) == chunk_size:
+                chunks.append(piece)
+            else:
+                current.extend(piece)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+@dataclass(slots=True)
+class MerchantCleanupChunkResult:
+    """Suggestions parsed from one merchant chunk."""
+
+    chunk_index: int
+    merchants_count: int
+    suggestions: list[MerchantSuggestion]
+    llm_run_id: str | None
+    usage: dict[str, int]
+    stats: dict[str, Any]
+    failed: bool = False
+
+
+def _suggestion_key(suggestion: MerchantSuggestion) -> tuple[Any, ...]:
+    if suggestion.action == "merge":
+        return ("merge", frozenset({suggestion.source_merchant_id, suggestion.target_merchant_id}))
+    return (suggestion.action, suggestion.source_merchant_id)
+
 
+@dataclass(slots=True)
+class CleanupSuggestionMerger:
+    """Deduplicate suggestions across chunks as they arrive.
+
+    A merge is identified by its unordered merchant pair, other actions by
+    ``(action, source_merchant_id)``; the first suggestion for a key wins so
+    suggestions already streamed to the caller are never retracted.
+    """
+
+    suggestions: list[MerchantSuggestion] = field(default_factory=list)
+    duplicates_count: int = 0
+    _seen: set[tuple[Any, ...]] = field(default_factory=set)
+
+    def add(self, suggestions: list[MerchantSuggestion]) -> list[MerchantSuggestion]:
+        """Record ``suggestions`` and return the ones not seen before."""
+
+        accepted: list[MerchantSuggestion] = []
+        for suggestion in suggestions:
+            key = _suggestion_key(suggestion)
+            if key in self._seen:
+                self.duplicates_count += 1
+                continue
+            self._seen.add(key)
+            accepted.append(suggestion)
+        self.suggestions.extend(accepted)
+        return accepted
+
+
+def _run_cleanup_chunk(
+    *,
+    profile_id: UUID,
+    chunk_index: int,
+    merchants: list[dict[str, Any]],
+) -> MerchantCleanupChunkResult:
     prompt = _build_cleanup_prompt(merchants=merchants)
     try:
         llm_payload, llm_run_id, usage = _call_llm_json(prompt)
     except Exception:
-        logger.exception("merchant_cleanup_llm_failed profile_id=%s", profile_id)
-        return [], None, {}, {"raw_count": 0, "parsed_count": 0, "rejected_count": 0, "rejected_reasons": {}}
+        logger.exception("merchant_cleanup_llm_failed profile_id=%s chunk_index=%s", profile_id, chunk_index)
+        return MerchantCleanupChunkResult(chunk_index, len(merchants), [], None, {}, _empty_cleanup_stats(), failed=True)
 
     raw_suggestions = llm_payload.get("suggestions") if isinstance(llm_payload, dict) else None
     suggestions_count = len(raw_suggestions) if isinstance(raw_suggestions, list) else 0
     logger.info(
-        "merchant_cleanup_llm_ok profile_id=%s llm_run_id=%s usage=%s merchants_count=%s prompt_chars=%s",
+        "merchant_cleanup_llm_ok profile_id=%s chunk_index=%s llm_run_id=%s usage=%s merchants_count=%s suggestions_count=%s prompt_chars=%s",
         profile_id,
+        chunk_index,
         llm_run_id,
         usage,
+        len(merchants),
         suggestions_count,
         len(prompt),
     )
     if not isinstance(raw_suggestions, list):
         excerpt = json.dumps(llm_payload, ensure_ascii=False)[:500]
         logger.warning(
-            'merchant_cleanup_llm_invalid_shape profile_id=%s llm_run_id=%s excerpt="%s"',
+            'merchant_cleanup_llm_invalid_shape profile_id=%s chunk_index=%s llm_run_id=%s excerpt="%s"',
             profile_id,
+            chunk_index,
             llm_run_id,
             excerpt,
         )
 
     try:
         suggestions, stats = parse_cleanup_suggestions_with_stats(llm_payload)
-        logger.info("merchant_cleanup_parse_stats profile_id=%s llm_run_id=%s stats=%s", profile_id, llm_run_id, stats)
-        return suggestions, llm_run_id, usage, stats
     except Exception:
-        logger.exception("merchant_cleanup_parse_failed profile_id=%s", profile_id)
-        return [], llm_run_id, usage, {"raw_count": 0, "parsed_count": 0, "rejected_count": 0, "rejected_reasons": {}}
+        logger.exception("merchant_cleanup_parse_failed profile_id=%s chunk_index=%s", profile_id, chunk_index)
+        return MerchantCleanupChunkResult(
+            chunk_index, len(merchants), [], llm_run_id, usage, _empty_cleanup_stats(), failed=True
+        )
+    return MerchantCleanupChunkResult(chunk_index, len(merchants), suggestions, llm_run_id, usage, stats)
+
+
+def iter_merchant_cleanup_chunks(
+    *,
+    profile_id: UUID,
+    merchants: list[dict[str, Any]],
+    chunk_size: int | None = None,
+    max_workers: int | None = None,
+) -> Iterator[MerchantCleanupChunkResult]:
+    """Run cleanup over similarity-grouped chunks concurrently, yielding results as they complete.
+
+    A failing chunk yields an empty ``failed`` result instead of aborting the run.
+    """
+
+    chunks = partition_merchants(
+        merchants,
+        chunk_size=_config.merchant_cleanup_chunk_size() if chunk_size is None else chunk_size,
+    )
+    if not chunks:
+        return
+    workers = max(1, min(len(chunks), _config.merchant_cleanup_max_workers() if max_workers is None else max_workers))
+    if workers == 1:
+        for chunk_index, chunk in enumerate(chunks):
+            yield _run_cleanup_chunk(profile_id=profile_id, chunk_index=chunk_index, merchants=chunk)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="merchant-cleanup") as executor:
+        futures = [
+            # Each chunk runs in a copy of the caller's context so its LLM span joins the request trace.
+            executor.submit(
+                contextvars.copy_context().run,
+                _run_cleanup_chunk,
+                profile_id=profile_id,
+                chunk_index=chunk_index,
+                merchants=chunk,
+            )
+            for chunk_index, chunk in enumerate(chunks)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _accumulate_cleanup_stats(total: dict[str, Any], chunk_stats: dict[str, Any]) -> None:
+    for key in ("raw_count", "parsed_count", "rejected_count"):
+        total[key] += int(chunk_stats.get(key) or 0)
+    for reason, count in dict(chunk_stats.get("rejected_reasons") or {}).items():
+        total["rejected_reasons"][reason] = total["rejected_reasons"].get(reason, 0) + int(count)
+
+
+def run_merchant_cleanup(
+    *,
+    profile_id: UUID,
+    profiles_repository: Any,
+    merchants: list[dict[str, Any]] | None = None,
+    on_suggestions: Callable[[list[MerchantSuggestion], str | None], None] | None = None,
+    chunk_size: int | None = None,
+    max_workers: int | None = None,
+) -> tuple[list[MerchantSuggestion], str | None, dict[str, int], dict[str, Any]]:
+    """Run merchant cleanup suggestions through LLM and parse robustly.
+
+    Merchants are processed in concurrent chunks; ``on_suggestions`` receives
+    each chunk's deduplicated suggestions (with its ``llm_run_id``) as soon as
+    the chunk completes. The returned ``llm_run_id`` is the first chunk's one.
+    """
+
+    if merchants is None:
+        try:
+            merchants = profiles_repository.list_merchants(profile_id=profile_id, limit=5000)
+        except Exception:
+            logger.exception("merchant_cleanup_list_merchants_failed profile_id=%s", profile_id)
+            return [], None, {}, _empty_cleanup_stats()
+
+    if not merchants:
+        return [], None, {}, _empty_cleanup_stats()
+
+    merger = CleanupSuggestionMerger()
+    stats = _empty_cleanup_stats()
+    usage: dict[str, int] = {}
+    run_ids: dict[int, str] = {}
+    chunks_count = 0
+    chunks_failed = 0
+    for chunk_result in iter_merchant_cleanup_chunks(
+        profile_id=profile_id,
+        merchants=merchants,
+        chunk_size=chunk_size,
+        max_workers=max_workers,
+    ):
+        chunks_count += 1
+        chunks_failed += int(chunk_result.failed)
+        if chunk_result.llm_run_id:
+            run_ids[chunk_result.chunk_index] = chunk_result.llm_run_id
+        for usage_key, usage_value in chunk_result.usage.items():
+            usage[usage_key] = usage.get(usage_key, 0) + usage_value
+        _accumulate_cleanup_stats(stats, chunk_result.stats)
+
+        accepted = merger.add(chunk_result.suggestions)
+        if accepted and on_suggestions is not None:
+            on_suggestions(accepted, chunk_result.llm_run_id)
+
+    stats["chunks_count"] = chunks_count
+    stats["chunks_failed"] = chunks_failed
+    stats["duplicates_dropped"] = merger.duplicates_count
+    llm_run_id = run_ids[min(run_ids)] if run_ids else None
+    logger.info("merchant_cleanup_parse_stats profile_id=%s llm_run_id=%s stats=%s", profile_id, llm_run_id, stats)
+    return merger.suggestions, llm_run_id, usage, stats
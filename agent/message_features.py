@@ -0,0 +1,257 @@
+"""Single-pass analysis of chat messages shared by the deterministic routers.
+
+The intent parser, the deterministic planner, follow-up detection and the API
+onboarding helpers all look at the same user message within one turn. Instead
+of each re-normalizing it and scanning it with its own regexes,
+:func:`analyze_message` normalizes the message once and runs one compiled
+grammar over it, returning an immutable :class:`MessageFeatures` (months and
+years in message order, amounts, quoted strings, intent keyword tags, yes/no
+answer). Results are memoized per message text, so every router consulted
+during a turn reuses the same analysis.
+
+The text folding helpers (:func:`fold_text`, :func:`ascii_text`,
+:func:`basic_text`) are memoized as well; they keep the exact semantics of the
+module-local normalizers they replace.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Literal
+
+_CACHE_SIZE = 1024
+
+MONTHS: dict[str, int] = {
+    "janvier": 1,
+    "janv": 1,
+    "fevrier": 2,
+    "février": 2,
+    "fevr": 2,
+    "févr": 2,
+    "mars": 3,
+    "avril": 4,
+    "avr": 4,
+    "mai": 5,
+    "juin": 6,
+    "juillet": 7,
+    "juil": 7,
+    "aout": 8,
+    "août": 8,
+    "septembre": 9,
+    "sept": 9,
+    "octobre": 10,
+    "oct": 10,
+    "novembre": 11,
+    "nov": 11,
+    "decembre": 12,
+    "décembre": 12,
+    "dec": 12,
+    "déc": 12,
+}
+"""Every month spelling (full names and abbreviations, with and without accents)."""
+
+MONTH_PATTERN = "|".join(re.escape(token) for token in sorted(MONTHS, key=len, reverse=True))
+"""Regex alternation of :data:`MONTHS`, longest spelling first."""
+
+YEAR_PATTERN = r"(?:19\d{2}|20\d{2}|21\d{2})"
+
+# Tokens allowed between a month and its year ("janvier et mars 2026").
+_MONTH_YEAR_LINK_TOKENS = {"en", "et", "puis", "ainsi", "que"}
+
+# Keyword phrases matched (case-insensitively, at word starts) by the grammar,
+# grouped under the tag routers test with ``MessageFeatures.has``.
+_KEYWORD_PHRASES: dict[str, tuple[str, ...]] = {
+    "category_list": (
+        "liste mes catégories",
+        "liste mes categories",
+        "quelles sont mes catégories",
+        "quelles sont mes categories",
+    ),
+    "category_delete": (
+        "supprime la catégorie",
+        "supprimer la catégorie",
+        "delete la catégorie",
+        "remove la catégorie",
+        "efface la catégorie",
+    ),
+    "category_rename": (
+        "renomme la catégorie",
+        "renommer la catégorie",
+        "change le nom de la catégorie",
+        "modifie le nom de la catégorie",
+        "modifie la catégorie",
+        "modifier la catégorie",
+        "change la catégorie",
+        "changer la catégorie",
+        "appelle la catégorie",
+    ),
+    "releves_assign": (
+        "rattache les transactions au compte",
+        "assigne les transactions au compte",
+        "mets les transactions sur le compte",
+    ),
+    "bank_account_list": (
+        "liste mes comptes bancaires",
+        "affiche mes comptes bancaires",
+        "montre moi mes comptes bancaires",
+        "j'ai combien de comptes bancaires",
+        "liste mes comptes",
+        "affiche mes comptes",
+        "quels sont mes comptes",
+    ),
+    "expense": ("depense", "dépense", "depenses", "dépenses"),
+    "group_by_categorie": ("par catégorie", "par categorie"),
+    "group_by_payee": ("par marchand", "par commerçant", "par commercant"),
+    "group_by_month": ("par mois",),
+}
+_TAG_BY_PHRASE = {phrase: tag for tag, phrases in _KEYWORD_PHRASES.items() for phrase in phrases}
+
+_YES_VALUES = frozenset(
+    {
+        "oui",
+        "ouais",
+        "yep",
+        "yes",
+        "y",
+        "ok",
+        "daccord",
+        "confirm",
+        "je confirme",
+        "pret",
+        "go",
+        "cest pret",
+        "c'est pret",
+    }
+)
+_NO_VALUES = frozenset({"non", "nope", "no", "n"})
+
+_GRAMMAR = re.compile(
+    "(?P<keyword>"
+    + "|".join(re.escape(phrase) for phrase in sorted(_TAG_BY_PHRASE, key=len, reverse=True))
+    + r")|(?P<number>\d+(?:[.,]\d+)?)(?![\w.])"
+    r"|(?P<word>[\wéèêëàâäùûüôöîïç.]+)",
+    re.IGNORECASE,
+)
+_QUOTED_PATTERN = re.compile(r"[\"'«](?P<value>[^\"'»]+)[\"'»]")
+_YEAR_TOKEN = re.compile(YEAR_PATTERN)
+_YEAR_IN_TEXT = re.compile(rf"\b({YEAR_PATTERN})\b")
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def fold_text(value: str) -> str:
+    """Casefold, strip accents and collapse whitespace."""
+
+    without_accents = unicodedata.normalize("NFKD", value.strip().casefold())
+    return " ".join("".join(char for char in without_accents if not unicodedata.combining(char)).split())
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def ascii_text(value: str) -> str:
+    """Lowercase, drop every non-ASCII character after NFKD and collapse whitespace."""
+
+    normalized = unicodedata.normalize("NFKD", value.strip().lower()).encode("ascii", "ignore").decode("ascii")
+    return " ".join(normalized.split())
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def basic_text(value: str) -> str:
+    """Unify apostrophes, strip accents, lowercase and collapse whitespace."""
+
+    normalized = unicodedata.normalize("NFKD", value.replace("’", "'").replace("`", "'"))
+    ascii_only = "".join(char for char in normalized if not unicodedata.combining(char))
+    return " ".join(ascii_only.lower().split())
+
+
+@dataclass(frozen=True, slots=True)
+class MessageFeatures:
+    """Normalized forms and grammar features of one message."""
+
+    text: str
+    lower: str
+    folded: str
+    tokens: tuple[str, ...]
+    month_years: tuple[tuple[int, int | None], ...]
+    years: tuple[int, ...]
+    amounts: tuple[Decimal, ...]
+    quoted: tuple[str, ...]
+    keywords: frozenset[str]
+    answer: Literal["yes", "no"] | None
+
+    def has(self, tag: str) -> bool:
+        """Return whether a keyword phrase of ``tag`` occurs in the message."""
+        return tag in self.keywords
+
+    @property
+    def months(self) -> tuple[int, ...]:
+        """Months mentioned, in message order."""
+        return tuple(month for month, _year in self.month_years)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def analyze_message(message: str) -> MessageFeatures:
+    """Normalize ``message`` once and extract its grammar features."""
+
+    text = message.strip()
+    words: list[str] = []
+    amounts: list[Decimal] = []
+    keywords: set[str] = set()
+    for match in _GRAMMAR.finditer(text):
+        kind = match.lastgroup
+        token = match.group(0).lower()
+        if kind == "keyword":
+            keywords.add(_TAG_BY_PHRASE[token])
+            words.extend(token.split())
+            continue
+        if kind == "number":
+            try:
+                amounts.append(Decimal(token.replace(",", ".")))
+            except InvalidOperation:
+                pass
+        words.append(token)
+
+    month_years: list[tuple[int, int | None]] = []
+    stripped_words = [word.strip(".") for word in words]
+    for index, word in enumerate(stripped_words):
+        month = MONTHS.get(word)
+        if month is None:
+            continue
+        year: int | None = None
+        for next_word in stripped_words[index + 1 :]:
+            if next_word in _MONTH_YEAR_LINK_TOKENS:
+                continue
+            if _YEAR_TOKEN.fullmatch(next_word):
+                year = int(next_word)
+            break
+        month_years.append((month, year))
+
+    folded = fold_text(text)
+    answer_text = ascii_text(text)
+    answer: Literal["yes", "no"] | None = None
+    if answer_text in _YES_VALUES or "✅" in text:
+        answer = "yes"
+    elif answer_text in _NO_VALUES or "❌" in text:
+        answer = "no"
+
+    return MessageFeatures(
+        text=text,
+        lower=text.lower(),
+        folded=folded,
+        tokens=tuple(folded.split()),
+        month_years=tuple(month_years),
+        years=tuple(int(year) for year in _YEAR_IN_TEXT.findall(text)),
+        amounts=tuple(amounts),
+        quoted=tuple(match.group("value").strip() for match in _QUOTED_PATTERN.finditer(text)),
+        keywords=frozenset(keywords),
+        answer=answer,
+    )
+
+
+def clear_message_caches() -> None:
+    """Drop memoized analyses (benchmarks and tests)."""
+
+    for cached in (analyze_message, fold_text, ascii_text, basic_text):
+        cached.cache_clear()
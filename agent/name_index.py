@@ -0,0 +1,99 @@
+"""Name resolution indexes over a profile's categories and bank accounts.
+
+A :class:`NameIndex` is built once from a list result (``finance_categories_list``,
+``finance_bank_accounts_list``) with the normalizer of its caller. It answers:
+
+- exact lookups through a ``norm -> items`` map, in O(1);
+- "did you mean" suggestions with :func:`difflib.get_close_matches`
+  semantics. Candidates whose length alone rules out the cutoff are skipped,
+  and answers are memoized per query.
+
+Indexes are immutable. The tool router keeps one per profile and list tool,
+rebuilt when the profile data version of the read-tool result cache changes.
+"""
+
+from __future__ import annotations
+
+from difflib import get_close_matches
+from typing import Callable, Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+
+_CLOSE_MATCH_MEMO_SIZE = 256
+
+
+class NameIndex(Generic[T]):
+    """Exact and fuzzy lookup of items by normalized name."""
+
+    __slots__ = ("_normalize", "_items_by_norm", "_first_name_by_norm", "_norm_lengths", "_close_memo")
+
+    def __init__(
+        self,
+        items: Iterable[T],
+        *,
+        name: Callable[[T], object],
+        normalize: Callable[[str], str],
+        norm: Callable[[T], object] | None = None,
+    ) -> None:
+        """Index ``items`` by ``normalize(name(item))``, or by ``norm(item)`` when given."""
+
+        self._normalize = normalize
+        self._items_by_norm: dict[str, tuple[T, ...]] = {}
+        self._first_name_by_norm: dict[str, str] = {}
+        for item in items:
+            raw_name = name(item)
+            if not isinstance(raw_name, str):
+                continue
+            raw_norm = norm(item) if norm is not None else normalize(raw_name)
+            if not isinstance(raw_norm, str):
+                continue
+            self._items_by_norm[raw_norm] = (*self._items_by_norm.get(raw_norm, ()), item)
+            self._first_name_by_norm.setdefault(raw_norm, raw_name)
+        self._norm_lengths = tuple((candidate, len(candidate)) for candidate in self._items_by_norm if candidate)
+        self._close_memo: dict[tuple[str, int, float], tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._items_by_norm.values())
+
+    def normalize(self, name: str) -> str:
+        return self._normalize(name)
+
+    def lookup(self, name: str) -> tuple[T, ...]:
+        """Return every item whose normalized name equals ``normalize(name)``."""
+
+        return self._items_by_norm.get(self._normalize(name), ())
+
+    def norms(self) -> tuple[str, ...]:
+        """Return the non-empty indexed norms in first-seen order."""
+
+        return tuple(candidate for candidate, _length in self._norm_lengths)
+
+    def items_with_norm(self, norm: str) -> tuple[T, ...]:
+        return self._items_by_norm.get(norm, ())
+
+    def first_name(self, norm: str) -> str:
+        """Return the display name of the first item indexed under ``norm``."""
+
+        return self._first_name_by_norm[norm]
+
+    def close_norms(self, name: str, *, n: int = 3, cutoff: float = 0.6) -> tuple[str, ...]:
+        """Return up to ``n`` indexed norms similar to ``normalize(name)``, best first."""
+
+        target = self._normalize(name)
+        memo_key = (target, n, cutoff)
+        memoized = self._close_memo.get(memo_key)
+        if memoized is not None:
+            return memoized
+
+        target_length = len(target)
+        # SequenceMatcher.ratio() is at most 2 * min(len) / (sum of lens).
+        candidates = [
+            candidate
+            for candidate, length in self._norm_lengths
+            if 2 * min(length, target_length) >= cutoff * (length + target_length)
+        ]
+        matches = tuple(get_close_matches(target, candidates, n=n, cutoff=cutoff)) if candidates else ()
+        if len(self._close_memo) >= _CLOSE_MATCH_MEMO_SIZE:
+            self._close_memo.clear()
+        self._close_memo[memo_key] = matches
+        return matches
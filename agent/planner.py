@@ -6,8 +6,9 @@ import calendar
 import re
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
+from agent.message_features import MONTH_PATTERN, MONTHS, YEAR_PATTERN, analyze_message
 from shared.models import ToolError, ToolErrorCode
 from shared.profile_fields import normalize_profile_field
 
@@ -61,99 +62,7 @@ Plan = ToolCallPlan | ClarificationPlan | NoopPlan | ErrorPlan | SetActiveTaskPl
 
 
 _SEARCH_TOKENS = {"from", "to", "category", "limit", "offset"}
-_FRENCH_MONTHS = {
-    "janvier": 1,
-    "fevrier": 2,
-    "février": 2,
-    "mars": 3,
-    "avril": 4,
-    "mai": 5,
-    "juin": 6,
-    "juillet": 7,
-    "aout": 8,
-    "août": 8,
-    "septembre": 9,
-    "octobre": 10,
-    "novembre": 11,
-    "decembre": 12,
-    "décembre": 12,
-}
-_FRENCH_MONTH_ALIASES = {
-    "janv": 1,
-    "janv.": 1,
-    "fevr": 2,
-    "fevr.": 2,
-    "févr": 2,
-    "févr.": 2,
-    "avr": 4,
-    "avr.": 4,
-    "juil": 7,
-    "juil.": 7,
-    "sept": 9,
-    "sept.": 9,
-    "oct": 10,
-    "oct.": 10,
-    "nov": 11,
-    "nov.": 11,
-    "dec": 12,
-    "dec.": 12,
-    "déc": 12,
-    "déc.": 12,
-}
-_EXPENSE_KEYWORDS = {"depense", "dépense", "depenses", "dépenses"}
 _EXPENSE_CATEGORY_ALIASES = {"alimentation": "Alimentation"}
-_MONTH_YEAR_LINK_TOKENS = {"en", "et", "puis", "ainsi", "que"}
-
-_AGGREGATE_RULES: tuple[tuple[tuple[str, ...], str], ...] = (
-    (("par catégorie", "par categorie"), "categorie"),
-    (("par marchand", "par commerçant", "par commercant"), "payee"),
-    (("par mois",), "month"),
-)
-
-
-_CATEGORY_LIST_PATTERNS = (
-    "liste mes catégories",
-    "liste mes categories",
-    "quelles sont mes catégories",
-    "quelles sont mes categories",
-)
-
-_CATEGORY_DELETE_PATTERNS = (
-    "supprime la catégorie",
-    "supprimer la catégorie",
-    "delete la catégorie",
-    "remove la catégorie",
-    "efface la catégorie",
-)
-
-_CATEGORY_RENAME_PATTERNS = (
-    "renomme la catégorie",
-    "renommer la catégorie",
-    "change le nom de la catégorie",
-    "modifie le nom de la catégorie",
-    "modifie la catégorie",
-    "modifier la catégorie",
-    "change la catégorie",
-    "changer la catégorie",
-    "appelle la catégorie",
-)
-
-_RELEVES_ASSIGN_PATTERNS = (
-    "rattache les transactions au compte",
-    "assigne les transactions au compte",
-    "mets les transactions sur le compte",
-)
-
-_BANK_ACCOUNT_LIST_PATTERNS = (
-    "liste mes comptes bancaires",
-    "affiche mes comptes bancaires",
-    "montre moi mes comptes bancaires",
-    "j'ai combien de comptes bancaires",
-    "liste mes comptes",
-    "affiche mes comptes",
-    "quels sont mes comptes",
-)
-
 _BANK_ACCOUNT_DELETE_PATTERNS = (
     r"supprime\s+le\s+compte",
     r"supprimer\s+le\s+compte",
@@ -162,7 +71,6 @@ _BANK_ACCOUNT_DELETE_PATTERNS = (
     r"delete\s+account",
 )
 
-_QUOTED_VALUE_PATTERN = r"[\"'«](?P<value>[^\"'»]+)[\"'»]"
 _PROFILE_FIELD_WHITELIST = {
     "first_name",
     "last_name",
@@ -197,9 +105,34 @@ _PROFILE_FULL_FIELDS = [
 _PROFILE_ADDRESS_FIELDS = ["address_line1", "address_line2", "postal_code", "city", "canton", "country"]
 
 
-def _aggregate_group_by_for_message(lower_message: str) -> str | None:
-    for keywords, group_by in _AGGREGATE_RULES:
-        if any(keyword in lower_message for keyword in keywords):
+_AGGREGATE_GROUP_BY_TAGS = (
+    ("group_by_categorie", "categorie"),
+    ("group_by_payee", "payee"),
+    ("group_by_month", "month"),
+)
+_TEMPORAL_SUFFIX_PATTERN = re.compile(
+    r"\s+(?:"
+    rf"en\s+(?:{MONTH_PATTERN})(?:\s+{YEAR_PATTERN})?"
+    rf"(?:\s*,\s*(?:{MONTH_PATTERN})(?:\s+{YEAR_PATTERN})?)*"
+    rf"(?:\s+et\s+(?:en\s+)?(?:{MONTH_PATTERN})(?:\s+{YEAR_PATTERN})?)?|"
+    rf"(?:{MONTH_PATTERN})(?:\s+{YEAR_PATTERN})?|"
+    r"(?:ces|les)\s+\d+\s+derniers?\s+mois|"
+    r"ce\s+mois-ci|"
+    r"le\s+mois\s+dernier"
+    r")\s*$",
+    re.IGNORECASE,
+)
+_CATEGORY_MONTH_SUFFIX_PATTERN = re.compile(
+    rf"\s+(?:en\s+)?(?:{MONTH_PATTERN})(?:\s+{YEAR_PATTERN})?.*$",
+    re.IGNORECASE,
+)
+_CATEGORY_FIRST_TOKEN_PATTERN = re.compile(r"([\wéèêëàâäùûüôöîïç\.]+)")
+
+
+def _aggregate_group_by_for_message(message: str) -> str | None:
+    features = analyze_message(message)
+    for tag, group_by in _AGGREGATE_GROUP_BY_TAGS:
+        if features.has(tag):
             return group_by
     return None
 
@@ -208,56 +141,20 @@ def _today() -> date:
     return date.today()
 
 
-def _extract_month(lower_message: str) -> int | None:
-    tokenized_message = re.findall(r"[\wéèêëàâäùûüôöîïç\.]+", lower_message)
-    month_lookup = {**_FRENCH_MONTHS, **_FRENCH_MONTH_ALIASES}
-    return next((month_lookup[token] for token in tokenized_message if token in month_lookup), None)
+def _extract_month(message: str) -> int | None:
+    months = analyze_message(message).months
+    return months[0] if months else None
 
 
 def _extract_month_year_pairs(message: str) -> list[tuple[int, int | None]]:
     """Extract ordered `(month, year)` pairs from a natural-language message."""
 
-    lower_message = message.lower()
-    tokenized_matches = list(re.finditer(r"[\wéèêëàâäùûüôöîïç\.]+", lower_message))
-    month_lookup = {
-        **_FRENCH_MONTHS,
-        **{alias.strip("."): value for alias, value in _FRENCH_MONTH_ALIASES.items()},
-    }
-    month_year_pairs: list[tuple[int, int | None]] = []
-    year_pattern = re.compile(r"(19\d{2}|20\d{2}|21\d{2})")
-
-    for index, match in enumerate(tokenized_matches):
-        normalized_token = match.group(0).strip(".")
-        if normalized_token in _MONTH_YEAR_LINK_TOKENS:
-            continue
-
-        month = month_lookup.get(normalized_token)
-        if month is None:
-            continue
-
-        year: int | None = None
-        lookahead_index = index + 1
-        while lookahead_index < len(tokenized_matches):
-            next_token = tokenized_matches[lookahead_index].group(0).strip(".")
-            if next_token in _MONTH_YEAR_LINK_TOKENS:
-                lookahead_index += 1
-                continue
-            if year_pattern.fullmatch(next_token):
-                year = int(next_token)
-            break
-
-        month_year_pairs.append((month, year))
-
-    return month_year_pairs
+    return list(analyze_message(message).month_years)
 
 
 def _extract_year(message: str) -> int | None:
-    years = re.findall(r"\b(19\d{2}|20\d{2}|21\d{2})\b", message)
-    if not years:
-        return None
-    return int(years[0])
-
-
+    years = analyze_message(message).years
+    return years[0] if years else None
 
 
 def _extract_bank_account_name_for_assignment(message: str) -> str | None:
@@ -290,24 +187,7 @@ def _extract_merchant_name(message: str) -> str | None:
     if not merchant_value:
         return None
 
-    month_tokens = sorted(
-        {**_FRENCH_MONTHS, **{alias.strip("."): value for alias, value in _FRENCH_MONTH_ALIASES.items()}},
-        key=len,
-        reverse=True,
-    )
-    month_pattern = "|".join(re.escape(token) for token in month_tokens)
-    temporal_pattern = (
-        r"\s+(?:"
-        rf"en\s+(?:{month_pattern})(?:\s+(?:19\d{{2}}|20\d{{2}}|21\d{{2}}))?"
-        rf"(?:\s*,\s*(?:{month_pattern})(?:\s+(?:19\d{{2}}|20\d{{2}}|21\d{{2}}))?)*"
-        rf"(?:\s+et\s+(?:en\s+)?(?:{month_pattern})(?:\s+(?:19\d{{2}}|20\d{{2}}|21\d{{2}}))?)?|"
-        rf"(?:{month_pattern})(?:\s+(?:19\d{{2}}|20\d{{2}}|21\d{{2}}))?|"
-        r"(?:ces|les)\s+\d+\s+derniers?\s+mois|"
-        r"ce\s+mois-ci|"
-        r"le\s+mois\s+dernier"
-        r")\s*$"
-    )
-    merchant_without_temporal = re.sub(temporal_pattern, "", merchant_value, flags=re.IGNORECASE)
+    merchant_without_temporal = _TEMPORAL_SUFFIX_PATTERN.sub("", merchant_value)
     merchant_name = merchant_without_temporal.strip(" .,!?:;\"'")
     return merchant_name or None
 
@@ -326,9 +206,9 @@ def _extract_expense_category(message: str) -> str | None:
     if re.match(r"^(?:chez|au|aux|a|à)\b", raw_category, flags=re.IGNORECASE):
         return None
 
-    first_token_match = re.match(r"([\wéèêëàâäùûüôöîïç\.]+)", raw_category.casefold())
+    first_token_match = _CATEGORY_FIRST_TOKEN_PATTERN.match(raw_category.casefold())
     first_token = first_token_match.group(1).strip(".") if first_token_match is not None else ""
-    if first_token in _FRENCH_MONTHS or first_token in {alias.strip(".") for alias in _FRENCH_MONTH_ALIASES}:
+    if first_token in MONTHS:
         return None
 
     raw_category = re.split(r"\s*(?:;|,)\s*", raw_category, maxsplit=1)[0].strip(" .,!?:;\"'")
@@ -338,18 +218,7 @@ def _extract_expense_category(message: str) -> str | None:
     if not raw_category:
         return None
 
-    month_tokens = sorted(
-        {**_FRENCH_MONTHS, **{alias.strip('.'): value for alias, value in _FRENCH_MONTH_ALIASES.items()}},
-        key=len,
-        reverse=True,
-    )
-    month_pattern = "|".join(re.escape(token) for token in month_tokens)
-    raw_category = re.sub(
-        rf"\s+(?:en\s+)?(?:{month_pattern})(?:\s+(?:19\d{{2}}|20\d{{2}}|21\d{{2}}))?.*$",
-        "",
-        raw_category,
-        flags=re.IGNORECASE,
-    ).strip(" .,!?:;\"'")
+    raw_category = _CATEGORY_MONTH_SUFFIX_PATTERN.sub("", raw_category).strip(" .,!?:;\"'")
     if not raw_category:
         return None
 
@@ -447,7 +316,7 @@ def _extract_category_name(message: str, pattern: str) -> str | None:
 
 
 def _extract_quoted_values(message: str) -> list[str]:
-    return [match.group("value").strip() for match in re.finditer(_QUOTED_VALUE_PATTERN, message)]
+    return list(analyze_message(message).quoted)
 
 
 def _extract_category_name_after_keyword(message: str) -> str | None:
@@ -512,32 +381,34 @@ def _build_profile_update_request(fields_to_update: dict[str, object]) -> ToolCa
     )
 
 
-def _try_build_profile_plan(message: str) -> ToolCallPlan | ErrorPlan | None:
-    lower_message = message.lower()
-
-    if re.search(
-        r"\b(?:affiche\s+mon\s+profil|quelles?\s+sont\s+mes\s+informations\s+personnelles|montre\s+mes\s+infos\s+personnelles?)\b",
-        lower_message,
-    ):
-        return _build_profile_fields_request(_PROFILE_FULL_FIELDS)
-
-    if re.search(r"\bquel\s+est\s+mon\s+pr[ée]nom\b", lower_message):
-        return _build_profile_fields_request(["first_name"])
-
-    if re.search(r"\bquel\s+est\s+mon\s+nom\b", lower_message):
-        return _build_profile_fields_request(["last_name"])
-
-    if re.search(r"\bquelle\s+est\s+ma\s+date\s+de\s+naissance\b", lower_message):
-        return _build_profile_fields_request(["birth_date"])
+_PROFILE_QUERY_RULES: tuple[tuple[re.Pattern[str], Callable[[], ToolCallPlan]], ...] = (
+    (
+        re.compile(
+            r"\b(?:affiche\s+mon\s+profil|quelles?\s+sont\s+mes\s+informations\s+personnelles|montre\s+mes\s+infos\s+personnelles?)\b"
+        ),
+        lambda: _build_profile_fields_request(_PROFILE_FULL_FIELDS),
+    ),
+    (re.compile(r"\bquel\s+est\s+mon\s+pr[ée]nom\b"), lambda: _build_profile_fields_request(["first_name"])),
+    (re.compile(r"\bquel\s+est\s+mon\s+nom\b"), lambda: _build_profile_fields_request(["last_name"])),
+    (
+        re.compile(r"\bquelle\s+est\s+ma\s+date\s+de\s+naissance\b"),
+        lambda: _build_profile_fields_request(["birth_date"]),
+    ),
+    (re.compile(r"\bquelle\s+est\s+mon\s+adresse\b"), lambda: _build_profile_fields_request(_PROFILE_ADDRESS_FIELDS)),
+    (re.compile(r"\bmontre\s+mes\s+infos\s+perso\b"), lambda: _build_profile_fields_request(_PROFILE_FULL_FIELDS)),
+    (
+        re.compile(r"\b(?:supprime|efface)\s+mon\s+pr[ée]nom\b"),
+        lambda: _build_profile_update_request({"first_name": None}),
+    ),
+)
 
-    if re.search(r"\bquelle\s+est\s+mon\s+adresse\b", lower_message):
-        return _build_profile_fields_request(_PROFILE_ADDRESS_FIELDS)
 
-    if re.search(r"\bmontre\s+mes\s+infos\s+perso\b", lower_message):
-        return _build_profile_fields_request(_PROFILE_FULL_FIELDS)
+def _try_build_profile_plan(message: str) -> ToolCallPlan | ErrorPlan | None:
+    lower_message = message.lower()
 
-    if re.search(r"\b(?:supprime|efface)\s+mon\s+pr[ée]nom\b", lower_message):
-        return _build_profile_update_request({"first_name": None})
+    for pattern, build_plan in _PROFILE_QUERY_RULES:
+        if pattern.search(lower_message):
+            return build_plan()
 
     first_name_match = re.search(
         r"\b(?:mon\s+pr[ée]nom\s+est|mets?\s+mon\s+pr[ée]nom\s+[àa])\s+(?P<first_name>.+)$",
@@ -791,26 +662,26 @@ def deterministic_plan_from_message(message: str) -> Plan:
             user_reply="Voici le résultat de la recherche de relevés.",
         )
 
-    lower_message = normalized_message.lower()
+    features = analyze_message(normalized_message)
 
     profile_plan = _try_build_profile_plan(normalized_message)
     if profile_plan is not None:
         return profile_plan
 
-    if any(pattern in lower_message for pattern in _CATEGORY_LIST_PATTERNS):
+    if features.has("category_list"):
         return ToolCallPlan(
             tool_name="finance_categories_list",
             payload={},
             user_reply="Voici vos catégories.",
         )
 
-    if any(pattern in lower_message for pattern in _CATEGORY_DELETE_PATTERNS):
+    if features.has("category_delete"):
         return _build_delete_plan(normalized_message)
 
-    if any(pattern in lower_message for pattern in _CATEGORY_RENAME_PATTERNS):
+    if features.has("category_rename"):
         return _build_rename_plan(normalized_message)
 
-    if any(pattern in lower_message for pattern in _RELEVES_ASSIGN_PATTERNS):
+    if features.has("releves_assign"):
         account_name = _extract_bank_account_name_for_assignment(normalized_message)
         if account_name:
             today = _today()
@@ -828,7 +699,7 @@ def deterministic_plan_from_message(message: str) -> Plan:
                 user_reply="OK",
             )
 
-    if any(pattern in lower_message for pattern in _BANK_ACCOUNT_LIST_PATTERNS):
+    if features.has("bank_account_list"):
         return ToolCallPlan(
             tool_name="finance_bank_accounts_list",
             payload={},
@@ -914,7 +785,7 @@ def deterministic_plan_from_message(message: str) -> Plan:
             user_reply="Catégorie réintégrée dans les totaux.",
         )
 
-    aggregate_group_by = _aggregate_group_by_for_message(lower_message)
+    aggregate_group_by = _aggregate_group_by_for_message(normalized_message)
     if aggregate_group_by is not None:
         return ToolCallPlan(
             tool_name="finance_releves_aggregate",
@@ -925,7 +796,7 @@ def deterministic_plan_from_message(message: str) -> Plan:
             user_reply="OK, je prépare une vue agrégée de vos dépenses.",
         )
 
-    if any(keyword in lower_message for keyword in _EXPENSE_KEYWORDS):
+    if features.has("expense"):
         merchant_name = _extract_merchant_name(normalized_message)
         category_name = _extract_expense_category(normalized_message)
         today = _today()
@@ -971,7 +842,7 @@ def deterministic_plan_from_message(message: str) -> Plan:
                 user_reply="OK, je calcule le total de vos dépenses.",
             )
 
-        month = _extract_month(lower_message)
+        month = _extract_month(normalized_message)
         if month is not None:
             explicit_year = _extract_year(normalized_message)
             year = explicit_year or today.year
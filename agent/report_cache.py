@@ -0,0 +1,144 @@
+"""Content-addressed cache of rendered finance reports.
+
+A report is keyed by profile, period, bank-account filter and the profile's
+data version (see :mod:`agent.tool_cache`). The report endpoints look it up
+before fetching any data, and any write that bumps the version makes older
+reports unreachable. Each entry holds the JSON body and, once requested, the
+PDF. Both carry an ETag derived from their bytes, so clients revalidate with
+``If-None-Match`` and get a 304 without a body.
+
+Eviction is least-recently-used by total stored bytes: one large PDF weighs
+more than many small JSON reports. Data versions are process-local, so the
+TTL bounds staleness when another worker performs the write.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable
+
+from shared import config
+
+
+@dataclass(frozen=True, slots=True)
+class ReportCacheKey:
+    """Identity of one report: who, which period, which account, which data."""
+
+    profile_id: str
+    start_date: str
+    end_date: str
+    bank_account_id: str
+    data_version: int
+
+
+@dataclass(frozen=True, slots=True)
+class CachedReport:
+    """Report payload with its serialized forms; ``payload`` must be treated as read-only."""
+
+    payload: dict[str, Any]
+    body: bytes
+    etag: str
+    pdf: bytes | None = None
+    pdf_etag: str | None = None
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.body) + len(self.pdf or b"")
+
+
+def content_etag(content: bytes) -> str:
+    """Return a strong ETag for ``content``."""
+
+    return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """Return whether an ``If-None-Match`` header value matches ``etag`` (weak comparison)."""
+
+    if not if_none_match or not etag:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@dataclass(slots=True)
+class ReportCache:
+    """Byte-bounded LRU cache of :class:`CachedReport` entries."""
+
+    max_bytes: int = field(default_factory=config.report_cache_max_bytes)
+    ttl_seconds: float = 10 * 60
+    clock: Callable[[], float] = time.monotonic
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    _entries: OrderedDict[ReportCacheKey, tuple[float, CachedReport]] = field(default_factory=OrderedDict)
+    _total_bytes: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def get(self, key: ReportCacheKey) -> CachedReport | None:
+        """Return the cached report or ``None`` when missing/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self.clock() - entry[0] >= self.ttl_seconds:
+                if entry is not None:
+                    self._pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put_payload(self, key: ReportCacheKey, payload: dict[str, Any], body: bytes) -> CachedReport:
+        """Store a freshly computed report payload and its JSON ``body``."""
+        report = CachedReport(payload=payload, body=body, etag=content_etag(body))
+        self._store(key, report)
+        return report
+
+    def put_pdf(self, key: ReportCacheKey, report: CachedReport, pdf: bytes) -> CachedReport:
+        """Attach the rendered PDF to ``report`` and store the result."""
+        report = replace(report, pdf=pdf, pdf_etag=content_etag(pdf))
+        self._store(key, report)
+        return report
+
+    def _store(self, key: ReportCacheKey, report: CachedReport) -> None:
+        if report.nbytes > self.max_bytes or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (self.clock(), report)
+            self._total_bytes += report.nbytes
+            while self._total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._pop(oldest_key)
+                self.evictions += 1
+
+    def _pop(self, key: ReportCacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1].nbytes
+
+    def clear(self) -> None:
+        """Drop every cached report and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction counters, entry count and stored bytes."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "bytes": self._total_bytes,
+        }
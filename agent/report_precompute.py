@@ -0,0 +1,142 @@
+"""Background pre-computation of finance reports after an import.
+
+Right after an import, users open the report of the imported month, and
+that request pays for the whole aggregation (and the PDF render). Once an
+import finishes, :class:`ReportPrecomputer` runs the report steps for the
+imported months in a small thread pool. Those threads run at a lower OS
+scheduling priority (on Linux) and process one step at a time. The results
+land in the regular report caches, so a request that races the
+pre-computation simply computes the report itself.
+
+A run belongs to a profile. Scheduling a new run for the same profile, for
+example because another import started, cancels the previous one: steps
+not yet started are skipped.
+"""
+
+from __future__ import annotations
+
+import calendar
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Sequence
+from uuid import UUID
+
+
+logger = logging.getLogger(__name__)
+
+PrecomputeStep = Callable[[], object]
+
+
+def months_in_range(start: date, end: date, *, max_months: int) -> list[tuple[date, date]]:
+    """Return the ``(first day, last day)`` of each month overlapping ``start``..``end``.
+
+    The most recent months come first, and at most ``max_months`` are returned.
+    """
+
+    if end < start:
+        start, end = end, start
+    months: list[tuple[date, date]] = []
+    year, month = end.year, end.month
+    while len(months) < max_months and (year, month) >= (start.year, start.month):
+        last_day = calendar.monthrange(year, month)[1]
+        months.append((date(year, month, 1), date(year, month, last_day)))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months
+
+
+def _lower_thread_priority(niceness: int) -> None:
+    # Linux applies PRIO_PROCESS to a single thread when given its native id;
+    # elsewhere it would renice the whole server, so leave priority alone.
+    if niceness <= 0 or not sys.platform.startswith("linux"):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), niceness)
+    except OSError:
+        logger.debug("report_precompute_renice_failed niceness=%s", niceness, exc_info=True)
+
+
+@dataclass(slots=True)
+class _PrecomputeRun:
+    cancelled: threading.Event
+    future: Future[int] | None = None
+
+
+class ReportPrecomputer:
+    """Run per-profile report pre-computation steps in low-priority threads."""
+
+    def __init__(self, *, workers: int = 1, niceness: int = 10) -> None:
+        self.workers = max(1, workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="report-precompute",
+            initializer=_lower_thread_priority,
+            initargs=(niceness,),
+        )
+        self._runs: dict[str, _PrecomputeRun] = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, profile_id: UUID | str, steps: Sequence[PrecomputeStep]) -> Future[int]:
+        """Cancel the profile's pending run and queue ``steps``; the future yields how many steps ran."""
+
+        run_key = str(profile_id)
+        run = _PrecomputeRun(cancelled=threading.Event())
+        with self._lock:
+            previous = self._runs.get(run_key)
+            if previous is not None:
+                previous.cancelled.set()
+            self._runs[run_key] = run
+            run.future = self._executor.submit(self._run, run_key, run, list(steps))
+        return run.future
+
+    def cancel(self, profile_id: UUID | str) -> bool:
+        """Stop the profile's pending run before its next step; return whether one was pending."""
+
+        with self._lock:
+            run = self._runs.pop(str(profile_id), None)
+        if run is None:
+            return False
+        run.cancelled.set()
+        return True
+
+    def _run(self, run_key: str, run: _PrecomputeRun, steps: list[PrecomputeStep]) -> int:
+        completed = 0
+        try:
+            for step in steps:
+                if run.cancelled.is_set():
+                    logger.info(
+                        "report_precompute_cancelled profile_id=%s completed=%s remaining=%s",
+                        run_key,
+                        completed,
+                        len(steps) - completed,
+                    )
+                    return completed
+                try:
+                    step()
+                except Exception:
+                    logger.warning("report_precompute_step_failed profile_id=%s", run_key, exc_info=True)
+                completed += 1
+            logger.info("report_precompute_done profile_id=%s steps=%s", run_key, completed)
+            return completed
+        finally:
+            with self._lock:
+                if self._runs.get(run_key) is run:
+                    del self._runs[run_key]
+
+    def pending(self) -> int:
+        """Return how many profiles have a run queued or in progress."""
+
+        with self._lock:
+            return len(self._runs)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            runs = list(self._runs.values())
+            self._runs.clear()
+        for run in runs:
+            run.cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,309 @@
+"""Report artifact stores shared by every API worker.
+
+The in-process :mod:`agent.report_cache` is lost on restart and is not shared
+between uvicorn workers. Rendered PDFs are therefore also kept in an artifact
+store addressed by the content hash of the report payload. A report rendered
+by one worker, or warmed after an import, is then reused by the others.
+
+Two backends implement :class:`ReportArtifactStore`:
+
+- :class:`DiskReportStore` (default): one file per artifact, written
+  atomically, evicted least-recently-used once the directory exceeds its
+  byte budget; cross-process locking uses ``flock`` on striped lock files;
+- :class:`RedisReportStore`: any Redis-compatible client (``get``/``set``/
+  ``delete``). Expiry is the key TTL, locking uses ``SET NX PX``.
+
+:meth:`get_or_create` is single-flight: concurrent requests for the same
+missing artifact, from threads or from other workers, wait for one render.
+When the backend itself fails (disk errors, Redis outage), it logs and renders
+without the store.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterator, Protocol
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: in-process locking only
+    fcntl = None
+
+try:
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover - redis is optional
+    RedisError = None
+
+
+logger = logging.getLogger(__name__)
+
+_LOCK_STRIPES = 64
+_TMP_SUFFIX = ".tmp"
+
+
+class ReportArtifactStore(Protocol):
+    """Byte artifacts keyed by string, with single-flight creation."""
+
+    def get(self, key: str) -> bytes | None:
+        ...
+
+    def put(self, key: str, data: bytes) -> None:
+        ...
+
+    def get_or_create(self, key: str, create: Callable[[], bytes]) -> bytes:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class _SingleFlightStore(ABC):
+    """``get_or_create`` on top of ``get``/``put`` and a cross-process lock."""
+
+    backend_errors: tuple[type[Exception], ...] = (OSError,)
+
+    def __init__(self) -> None:
+        self._flights: dict[str, tuple[threading.Lock, int]] = {}
+        self._flights_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        ...
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def _shared_lock(self, key: str) -> ContextManager[None]:
+        return nullcontext()
+
+    @contextmanager
+    def _flight(self, key: str) -> Iterator[None]:
+        with self._flights_lock:
+            lock, waiters = self._flights.get(key, (threading.Lock(), 0))
+            self._flights[key] = (lock, waiters + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._flights_lock:
+                lock, waiters = self._flights[key]
+                if waiters == 1:
+                    del self._flights[key]
+                else:
+                    self._flights[key] = (lock, waiters - 1)
+
+    def _get_or_none(self, key: str) -> bytes | None:
+        try:
+            return self.get(key)
+        except self.backend_errors:
+            logger.warning("report_store_get_failed key=%s", key, exc_info=True)
+            return None
+
+    @contextmanager
+    def _guarded_shared_lock(self, key: str) -> Iterator[None]:
+        lock = self._shared_lock(key)
+        try:
+            lock.__enter__()
+        except self.backend_errors:
+            logger.warning("report_store_lock_failed key=%s", key, exc_info=True)
+            yield
+            return
+        try:
+            yield
+        finally:
+            try:
+                lock.__exit__(None, None, None)
+            except self.backend_errors:
+                logger.warning("report_store_unlock_failed key=%s", key, exc_info=True)
+
+    def get_or_create(self, key: str, create: Callable[[], bytes]) -> bytes:
+        """Return the artifact for ``key``, calling ``create`` at most once across waiters."""
+
+        data = self._get_or_none(key)
+        if data is not None:
+            self.hits += 1
+            return data
+        with self._flight(key), self._guarded_shared_lock(key):
+            data = self._get_or_none(key)
+            if data is not None:
+                self.hits += 1
+                return data
+            self.misses += 1
+            data = create()
+            try:
+                self.put(key, data)
+            except self.backend_errors:
+                logger.warning("report_store_put_failed key=%s", key, exc_info=True)
+            return data
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class DiskReportStore(_SingleFlightStore):
+    """Artifacts as files under ``directory``, bounded to ``max_bytes`` in total."""
+
+    def __init__(self, directory: str | os.PathLike[str], *, max_bytes: int) -> None:
+        super().__init__()
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        (self.directory / "locks").mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.bin"
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        file_descriptor, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=_TMP_SUFFIX)
+        try:
+            with os.fdopen(file_descriptor, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_name, self._path(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _artifacts(self) -> list[os.DirEntry[str]]:
+        with os.scandir(self.directory) as entries:
+            return [entry for entry in entries if entry.is_file() and entry.name.endswith(".bin")]
+
+    def _evict(self) -> None:
+        artifacts = []
+        for entry in self._artifacts():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            artifacts.append((stat.st_mtime, stat.st_size, entry.path))
+        total_bytes = sum(size for _mtime, size, _path in artifacts)
+        for _mtime, size, path in sorted(artifacts):
+            if total_bytes <= self.max_bytes:
+                break
+            Path(path).unlink(missing_ok=True)
+            total_bytes -= size
+
+    @contextmanager
+    def _shared_lock(self, key: str) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        stripe = int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16) % _LOCK_STRIPES
+        with open(self.directory / "locks" / f"{stripe:02d}.lock", "a+b") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def clear(self) -> None:
+        for entry in self._artifacts():
+            Path(entry.path).unlink(missing_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+
+class RedisReportStore(_SingleFlightStore):
+    """Artifacts in a Redis-compatible server, expiring after ``ttl_seconds``."""
+
+    backend_errors = (OSError,) if RedisError is None else (RedisError, OSError)
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        prefix: str = "reports:",
+        ttl_seconds: int = 24 * 60 * 60,
+        lock_timeout_seconds: float = 60.0,
+        poll_seconds: float = 0.05,
+    ) -> None:
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.poll_seconds = poll_seconds
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> RedisReportStore:
+        """Connect with the optional ``redis`` package."""
+
+        import redis
+
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def put(self, key: str, data: bytes) -> None:
+        self.client.set(self.prefix + key, data, ex=self.ttl_seconds)
+
+    @contextmanager
+    def _shared_lock(self, key: str) -> Iterator[None]:
+        lock_key = f"{self.prefix}lock:{key}"
+        token = uuid.uuid4().hex.encode("ascii")
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        acquired = False
+        while not acquired:
+            acquired = bool(self.client.set(lock_key, token, nx=True, px=int(self.lock_timeout_seconds * 1000)))
+            if acquired or time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll_seconds)
+            if self.client.get(self.prefix + key) is not None:
+                break
+        try:
+            yield
+        finally:
+            # Compare-then-delete is not atomic; the PX expiry covers a lock
+            # that changed hands in between.
+            if acquired and self.client.get(lock_key) == token:
+                self.client.delete(lock_key)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+        self.hits = 0
+        self.misses = 0
+
+
+def build_report_store(url: str | None, *, max_bytes: int) -> ReportArtifactStore:
+    """Return the store configured by ``url`` (``redis://``/``rediss://`` or a directory path)."""
+
+    location = (url or "").strip()
+    if location.startswith(("redis://", "rediss://", "unix://")):
+        return RedisReportStore.from_url(location)
+    if location.startswith("file://"):
+        location = location.removeprefix("file://")
+    if not location:
+        location = os.path.join(tempfile.gettempdir(), "ia-financial-assistant-reports")
+    return DiskReportStore(location, max_bytes=max_bytes)
@@ -0,0 +1,20 @@
+"""Response classes of the agent API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from shared.json_codec import json_dumps
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSON response encoded with the shared codec (``orjson`` when installed).
+
+    It is the app's default response class, so every route that returns a
+    model or a dict renders through :func:`shared.json_codec.json_dumps`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
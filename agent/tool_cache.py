@@ -0,0 +1,200 @@
+"""Per-profile result cache for read-only finance tools.
+
+Entries are keyed by profile, tool and canonicalized payload, and scoped to the
+profile's current data version. Every write that can change what read tools
+return (imports, category/bank-account writes, merchant renames/merges,
+cluster applies) bumps the version, which makes older entries unreachable;
+they then age out through LRU eviction and the TTL.
+
+Data versions are process-local, so the TTL also bounds staleness when
+another worker process performs the write.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from shared import config
+
+
+CACHEABLE_READ_TOOLS: dict[str, str] = {
+    "finance_releves_search": "finance_releves_search",
+    "finance_transactions_search": "finance_releves_search",
+    "finance_releves_sum": "finance_releves_sum",
+    "finance_transactions_sum": "finance_releves_sum",
+    "finance_releves_aggregate": "finance_releves_aggregate",
+    "finance_releves_trend": "finance_releves_trend",
+    "finance_categories_list": "finance_categories_list",
+    "finance_bank_accounts_list": "finance_bank_accounts_list",
+}
+
+DATA_WRITE_TOOLS = frozenset(
+    {
+        "finance_releves_set_bank_account",
+        "finance_releves_import_files",
+        "finance_categories_create",
+        "finance_categories_update",
+        "finance_categories_delete",
+        "finance_bank_accounts_create",
+        "finance_bank_accounts_update",
+        "finance_bank_accounts_delete",
+        "finance_bank_accounts_set_default",
+        "finance_merchants_rename",
+        "finance_merchants_merge",
+        "finance_merchants_apply_suggestion",
+    }
+)
+
+
+def canonical_tool_payload(payload: dict[str, Any]) -> str:
+    """Return a stable JSON form of a tool payload (key order, ``None`` values)."""
+
+    cleaned = {key: value for key, value in payload.items() if value is not None}
+    return json.dumps(cleaned, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _copy_result(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_copy(deep=True)
+    return value
+
+
+@dataclass(slots=True)
+class ToolResultCache:
+    """Bounded LRU cache of read-tool results scoped by profile data version."""
+
+    max_entries: int = field(default_factory=config.tool_cache_max_entries)
+    ttl_seconds: float = field(default_factory=config.tool_cache_ttl_seconds)
+    clock: Callable[[], float] = time.monotonic
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    _entries: OrderedDict[tuple[str, int, str, str], tuple[float, Any]] = field(default_factory=OrderedDict)
+    _data_versions: dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether the cache stores anything at all."""
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def data_version(self, profile_id: UUID | str) -> int:
+        """Return the current data version of ``profile_id``."""
+        return self._data_versions.get(str(profile_id), 0)
+
+    def bump_data_version(self, profile_id: UUID | str) -> int:
+        """Invalidate every cached read of ``profile_id`` and return the new version."""
+        with self._lock:
+            profile_key = str(profile_id)
+            version = self._data_versions.get(profile_key, 0) + 1
+            self._data_versions[profile_key] = version
+            self.invalidations += 1
+            return version
+
+    def _key(
+        self,
+        profile_id: UUID | str,
+        tool_name: str,
+        payload: dict[str, Any],
+        data_version: int | None = None,
+    ) -> tuple[str, int, str, str]:
+        profile_key = str(profile_id)
+        return (
+            profile_key,
+            self._data_versions.get(profile_key, 0) if data_version is None else data_version,
+            CACHEABLE_READ_TOOLS.get(tool_name, tool_name),
+            canonical_tool_payload(payload),
+        )
+
+    def get(self, profile_id: UUID | str, tool_name: str, payload: dict[str, Any]) -> Any | None:
+        """Return a copy of the cached result or ``None`` when missing/expired."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            key = self._key(profile_id, tool_name, payload)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.clock() - stored_at >= self.ttl_seconds:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy_result(value)
+
+    def set(
+        self,
+        profile_id: UUID | str,
+        tool_name: str,
+        payload: dict[str, Any],
+        value: Any,
+        *,
+        data_version: int | None = None,
+    ) -> None:
+        """Store a copy of ``value`` and evict least recently used entries.
+
+        Pass the ``data_version`` read before computing ``value`` so a write that
+        lands meanwhile leaves the entry unreachable instead of stale.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            key = self._key(profile_id, tool_name, payload, data_version)
+            self._entries[key] = (self.clock(), _copy_result(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached entry and reset counters (data versions are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self, profile_id: UUID | str | None = None) -> dict[str, int]:
+        """Return hit/miss/invalidation counters, size and optionally a profile version."""
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+        }
+        if profile_id is not None:
+            stats["data_version"] = self.data_version(profile_id)
+        return stats
+
+
+_SHARED_CACHE: ToolResultCache | None = None
+_SHARED_CACHE_LOCK = threading.Lock()
+
+
+def shared_tool_result_cache() -> ToolResultCache:
+    """Return the process-wide read-tool cache shared by every router."""
+
+    global _SHARED_CACHE
+    with _SHARED_CACHE_LOCK:
+        if _SHARED_CACHE is None:
+            _SHARED_CACHE = ToolResultCache()
+        return _SHARED_CACHE
+
+
+def bump_profile_data_version(profile_id: UUID | str) -> int:
+    """Invalidate cached read-tool results of ``profile_id`` after a data write."""
+
+    return shared_tool_result_cache().bump_data_version(profile_id)
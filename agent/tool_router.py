@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from difflib import get_close_matches
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
 from uuid import UUID
 
 from shared.text_utils import normalize_category_name
@@ -11,6 +13,9 @@ from shared.profile_fields import normalize_profile_field
 from pydantic import BaseModel, ConfigDict, ValidationError, model_validator
 
 from agent.backend_client import BackendClient
+from agent.name_index import NameIndex
+from agent.tool_cache import CACHEABLE_READ_TOOLS, DATA_WRITE_TOOLS, ToolResultCache
+from shared.tracing import trace_span
 from shared.models import (
     BankAccount,
     BankAccountCreateRequest,
@@ -33,11 +38,19 @@ from shared.models import (
     RelevesImportResult,
     RelevesSearchResult,
     RelevesSumResult,
+    RelevesTrendRequest,
+    RelevesTrendResult,
     ToolError,
     ToolErrorCode,
 )
 
 
+def normalize_bank_account_name(name: str) -> str:
+    """Bank account names match case-insensitively, ignoring surrounding spaces."""
+
+    return name.strip().lower()
+
+
 class _CategoryUpdateByNamePayload(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -172,6 +185,50 @@ class _MerchantsApplySuggestionPayload(BaseModel):
 @dataclass(slots=True)
 class ToolRouter:
     backend_client: BackendClient
+    result_cache: ToolResultCache | None = None
+    _name_indexes: OrderedDict[tuple[str, str], tuple[int, float, NameIndex]] = field(
+        default_factory=OrderedDict, repr=False
+    )
+    _name_indexes_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _name_index(
+        self,
+        *,
+        profile_id: UUID,
+        list_tool_name: str,
+        build: Callable[[list], NameIndex],
+    ) -> NameIndex | ToolError:
+        """Return the name index of ``list_tool_name`` items, cached per data version.
+
+        Indexes live next to the result cache rather than in it, so index reuse
+        does not show up in its hit/miss counters. They follow its profile data
+        version, TTL and size bound.
+        """
+
+        cache = self.result_cache
+        slot = (str(profile_id), list_tool_name)
+        if cache is not None and cache.enabled:
+            data_version = cache.data_version(profile_id)
+            with self._name_indexes_lock:
+                entry = self._name_indexes.get(slot)
+                if entry is not None:
+                    index_version, stored_at, cached_index = entry
+                    if index_version == data_version and cache.clock() - stored_at < cache.ttl_seconds:
+                        self._name_indexes.move_to_end(slot)
+                        return cached_index
+                    self._name_indexes.pop(slot, None)
+
+        list_result = self.call(list_tool_name, {}, profile_id=profile_id)
+        if isinstance(list_result, ToolError):
+            return list_result
+        index = build(list_result.items)
+        if cache is not None and cache.enabled:
+            with self._name_indexes_lock:
+                self._name_indexes[slot] = (data_version, cache.clock(), index)
+                self._name_indexes.move_to_end(slot)
+                while len(self._name_indexes) > cache.max_entries:
+                    self._name_indexes.popitem(last=False)
+        return index
 
     def _find_category_by_name(
         self,
@@ -179,12 +236,21 @@ class ToolRouter:
         profile_id: UUID,
         category_name: str,
     ) -> ProfileCategory | ToolError:
-        categories_result = self.backend_client.finance_categories_list(profile_id=profile_id)
-        if isinstance(categories_result, ToolError):
-            return categories_result
+        index = self._name_index(
+            profile_id=profile_id,
+            list_tool_name="finance_categories_list",
+            build=lambda items: NameIndex(
+                items,
+                name=lambda item: item.name,
+                norm=lambda item: item.name_norm,
+                normalize=normalize_category_name,
+            ),
+        )
+        if isinstance(index, ToolError):
+            return index
 
-        target_name = normalize_category_name(category_name)
-        exact_matches = [item for item in categories_result.items if item.name_norm == target_name]
+        target_name = index.normalize(category_name)
+        exact_matches = index.items_with_norm(target_name)
 
         if len(exact_matches) == 1:
             return exact_matches[0]
@@ -200,15 +266,12 @@ class ToolRouter:
                 },
             )
 
-        close_name_norms = get_close_matches(
-            target_name,
-            [item.name_norm for item in categories_result.items],
-            n=3,
-            cutoff=0.6,
-        )
-        close_name_norms_set = set(close_name_norms)
+        close_name_norms = set(index.close_norms(category_name))
         close_category_names = [
-            item.name for item in categories_result.items if item.name_norm in close_name_norms_set
+            item.name
+            for name_norm in index.norms()
+            if name_norm in close_name_norms
+            for item in index.items_with_norm(name_norm)
         ]
         return ToolError(
             code=ToolErrorCode.NOT_FOUND,
@@ -226,12 +289,15 @@ class ToolRouter:
         profile_id: UUID,
         name: str,
     ) -> BankAccount | ToolError:
-        accounts_result = self.backend_client.finance_bank_accounts_list(profile_id=profile_id)
-        if isinstance(accounts_result, ToolError):
-            return accounts_result
+        index = self._name_index(
+            profile_id=profile_id,
+            list_tool_name="finance_bank_accounts_list",
+            build=lambda items: NameIndex(items, name=lambda item: item.name, normalize=normalize_bank_account_name),
+        )
+        if isinstance(index, ToolError):
+            return index
 
-        target_name = name.strip().lower()
-        exact_matches = [item for item in accounts_result.items if item.name.strip().lower() == target_name]
+        exact_matches = index.lookup(name)
         if len(exact_matches) == 1:
             return exact_matches[0]
         if len(exact_matches) > 1:
@@ -247,29 +313,15 @@ class ToolRouter:
                 },
             )
 
-        candidate_names_by_norm: dict[str, str] = {}
-        for account in accounts_result.items:
-            normalized_account_name = account.name.strip().lower()
-            if normalized_account_name and normalized_account_name not in candidate_names_by_norm:
-                candidate_names_by_norm[normalized_account_name] = account.name
-
-        close_name_norms = get_close_matches(
-            target_name,
-            list(candidate_names_by_norm.keys()),
-            n=3,
-            cutoff=0.6,
-        )
         return ToolError(
             code=ToolErrorCode.NOT_FOUND,
             message="Bank account not found for provided name.",
             details={
                 "name": name,
-                "close_names": [candidate_names_by_norm[normalized_name] for normalized_name in close_name_norms],
+                "close_names": [index.first_name(name_norm) for name_norm in index.close_norms(name)],
             },
         )
 
-
-
     @staticmethod
     def _normalize_profile_get_payload(payload: dict) -> dict | ToolError:
         raw_fields = payload.get("fields")
@@ -330,6 +382,52 @@ class ToolRouter:
         RelevesSearchResult
         | RelevesSumResult
         | RelevesAggregateResult
+        | RelevesTrendResult
+        | RelevesImportResult
+        | CategoriesListResult
+        | BankAccountsListResult
+        | ProfileCategory
+        | BankAccount
+        | dict[str, bool]
+        | dict[str, object]
+        | ProfileDataResult
+        | ToolError
+    ):
+        with trace_span("agent.tool_call", tool=tool_name) as span:
+            cache = self.result_cache
+            if cache is None or profile_id is None or not isinstance(payload, dict):
+                return self._dispatch(tool_name, payload, profile_id=profile_id)
+
+            if tool_name in CACHEABLE_READ_TOOLS:
+                cached_result = cache.get(profile_id, tool_name, payload)
+                if cached_result is not None:
+                    span.set(cache_hit=True)
+                    return cached_result
+                data_version = cache.data_version(profile_id)
+                result = self._dispatch(tool_name, payload, profile_id=profile_id)
+                if not isinstance(result, ToolError):
+                    cache.set(profile_id, tool_name, payload, result, data_version=data_version)
+                return result
+
+            if tool_name in DATA_WRITE_TOOLS:
+                try:
+                    return self._dispatch(tool_name, payload, profile_id=profile_id)
+                finally:
+                    cache.bump_data_version(profile_id)
+
+            return self._dispatch(tool_name, payload, profile_id=profile_id)
+
+    def _dispatch(
+        self,
+        tool_name: str,
+        payload: dict,
+        *,
+        profile_id: UUID | None = None,
+    ) -> (
+        RelevesSearchResult
+        | RelevesSumResult
+        | RelevesAggregateResult
+        | RelevesTrendResult
         | RelevesImportResult
         | CategoriesListResult
         | BankAccountsListResult
@@ -346,6 +444,7 @@ class ToolRouter:
             "finance_transactions_sum",
             "finance_releves_sum",
             "finance_releves_aggregate",
+            "finance_releves_trend",
             "finance_releves_set_bank_account",
             "finance_releves_import_files",
             "finance_categories_list",
@@ -414,6 +513,17 @@ class ToolRouter:
                 )
             return self.backend_client.releves_aggregate(request)
 
+        if tool_name == "finance_releves_trend":
+            try:
+                request = RelevesTrendRequest.model_validate({**payload, "profile_id": str(profile_id)})
+            except ValidationError as exc:
+                return ToolError(
+                    code=ToolErrorCode.VALIDATION_ERROR,
+                    message=f"Invalid payload for tool {tool_name}",
+                    details={"validation_errors": exc.errors(), "payload": payload},
+                )
+            return self.backend_client.releves_trend(request)
+
         if tool_name == "finance_releves_set_bank_account":
             try:
                 request_payload = _RelevesSetBankAccountPayload.model_validate(payload)
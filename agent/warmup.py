@@ -0,0 +1,46 @@
+"""Background warm-up of process-wide caches after the API starts.
+
+The first chat turn of a fresh worker otherwise pays for building the loop
+registry, the planner tool schemas, the merchant categorizer model and the
+PDF renderer imports. :func:`start_warmup` runs named steps in a daemon
+thread, so the server accepts traffic immediately and requests racing the
+warm-up simply build whatever is not ready yet (every step is idempotent).
+A failing step is logged and skipped.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Mapping
+
+
+logger = logging.getLogger(__name__)
+
+WarmupSteps = Mapping[str, Callable[[], object]]
+
+
+def run_warmup(steps: WarmupSteps) -> dict[str, float | None]:
+    """Run ``steps`` in order; return each step's duration in ms (``None`` when it failed)."""
+
+    durations: dict[str, float | None] = {}
+    for name, step in steps.items():
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.warning("startup_warmup_step_failed step=%s", name, exc_info=True)
+            durations[name] = None
+            continue
+        durations[name] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("startup_warmup_done durations_ms=%s", durations)
+    return durations
+
+
+def start_warmup(steps: WarmupSteps) -> threading.Thread:
+    """Run :func:`run_warmup` in a daemon thread and return the thread."""
+
+    thread = threading.Thread(target=run_warmup, args=(steps,), name="startup-warmup", daemon=True)
+    thread.start()
+    return thread
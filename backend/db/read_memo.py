@@ -0,0 +1,101 @@
+"""Request-scoped memoization of PostgREST reads.
+
+Within one chat turn several branches fetch the same rows (profile fields,
+bank accounts, categories...). :func:`request_read_memo` binds a
+:class:`RequestReadMemo` to the current context; while it is active,
+:meth:`SupabaseClient.get_rows` answers repeated identical GETs from the memo
+instead of issuing another round-trip.
+
+Any write through the client (insert, upsert, patch, delete) clears the whole
+memo: triggers and views can make one table's write visible in another, so a
+per-table invalidation would not be safe. Cached rows are deep-copied on the
+way in and out so callers can keep mutating what they receive.
+
+The memo lives only as long as the ``with`` block. Long-lived requests that poll
+for changes made elsewhere (SSE progress streams) must not run inside one.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import copy
+import threading
+from contextlib import contextmanager
+from typing import Any, Hashable, Iterator
+
+from shared import config
+
+
+_ACTIVE_MEMO: contextvars.ContextVar[RequestReadMemo | None] = contextvars.ContextVar(
+    "request_read_memo", default=None
+)
+
+
+class RequestReadMemo:
+    """Identical-read cache for one request, shared by its worker threads."""
+
+    def __init__(self) -> None:
+        self._entries: dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.deduplicated = 0
+        self.invalidations = 0
+        self.deduplicated_by_table: dict[str, int] = {}
+
+    def lookup(self, key: Hashable, *, table: str) -> tuple[bool, Any]:
+        """Return ``(True, value)`` for a memoized read, ``(False, None)`` otherwise."""
+
+        with self._lock:
+            self.reads += 1
+            if key not in self._entries:
+                return False, None
+            self.deduplicated += 1
+            self.deduplicated_by_table[table] = self.deduplicated_by_table.get(table, 0) + 1
+            value = self._entries[key]
+        return True, copy.deepcopy(value)
+
+    def store(self, key: Hashable, value: Any) -> None:
+        snapshot = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "reads": self.reads,
+                "deduplicated": self.deduplicated,
+                "invalidations": self.invalidations,
+                "deduplicated_by_table": dict(sorted(self.deduplicated_by_table.items())),
+            }
+
+
+def current_read_memo() -> RequestReadMemo | None:
+    """Return the memo bound to the current request, if any."""
+
+    return _ACTIVE_MEMO.get()
+
+
+@contextmanager
+def request_read_memo() -> Iterator[RequestReadMemo | None]:
+    """Memoize PostgREST reads made in this context until the block exits.
+
+    Yields ``None`` (and memoizes nothing) when disabled by configuration.
+    Nested blocks reuse the outer memo.
+    """
+
+    active = _ACTIVE_MEMO.get()
+    if active is not None or not config.request_read_memo_enabled():
+        yield active
+        return
+    memo = RequestReadMemo()
+    token = _ACTIVE_MEMO.set(memo)
+    try:
+        yield memo
+    finally:
+        _ACTIVE_MEMO.reset(token)
@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from typing import Any
 from urllib.error import HTTPError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
+from backend.db.read_memo import current_read_memo
+from shared.json_codec import json_dumps, json_loads
+from shared.tracing import SUPABASE_SPAN, trace_span
+
 
 @dataclass(slots=True)
 class SupabaseSettings:
@@ -49,8 +52,8 @@ class SupabaseClient:
         raw_text = body[:3000] if body else None
         if body:
             try:
-                parsed = json.loads(body)
-            except json.JSONDecodeError:
+                parsed = json_loads(body)
+            except ValueError:
                 parsed = None
             if isinstance(parsed, dict):
                 error_json = parsed
@@ -61,6 +64,25 @@ class SupabaseClient:
         ) from exc
 
 
+    def _send(self, request: Request, *, table: str) -> tuple[Any, Any]:
+        """Run one PostgREST round-trip and return the decoded body and headers."""
+
+        if request.get_method() != "GET":
+            memo = current_read_memo()
+            if memo is not None:
+                memo.invalidate()
+        with trace_span(SUPABASE_SPAN, table=table, method=request.get_method()) as span:
+            try:
+                with urlopen(request) as response:  # noqa: S310 - URL comes from trusted env config
+                    body = response.read()
+                    headers = response.headers
+            except HTTPError as exc:
+                span.set(status_code=exc.code)
+                self._raise_http_error(exc)
+            decoded = json_loads(body) if body else []
+            span.set(bytes=len(body), rows=len(decoded) if isinstance(decoded, list) else 1)
+            return decoded, headers
+
     def patch_rows(
         self,
         *,
@@ -84,14 +106,11 @@ class SupabaseClient:
                 "Content-Type": "application/json",
                 "Prefer": "return=representation",
             },
-            data=json.dumps(payload).encode("utf-8"),
+            data=json_dumps(payload),
             method="PATCH",
         )
-        try:
-            with urlopen(request) as response:  # noqa: S310 - URL comes from trusted env config
-                return json.loads(response.read().decode("utf-8"))
-        except HTTPError as exc:
-            self._raise_http_error(exc)
+        rows, _ = self._send(request, table=table)
+        return rows
 
     def post_rows(
         self,
@@ -115,14 +134,11 @@ class SupabaseClient:
                 "Content-Type": "application/json",
                 "Prefer": prefer,
             },
-            data=json.dumps(payload).encode("utf-8"),
+            data=json_dumps(payload),
             method="POST",
         )
-        try:
-            with urlopen(request) as response:  # noqa: S310 - URL comes from trusted env config
-                return json.loads(response.read().decode("utf-8"))
-        except HTTPError as exc:
-            self._raise_http_error(exc)
+        rows, _ = self._send(request, table=table)
+        return rows
 
     def delete_rows(
         self,
@@ -147,22 +163,18 @@ class SupabaseClient:
             },
             method="DELETE",
         )
-        try:
-            with urlopen(request) as response:  # noqa: S310 - URL comes from trusted env config
-                content = response.read().decode("utf-8")
-                return json.loads(content) if content else []
-        except HTTPError as exc:
-            self._raise_http_error(exc)
+        rows, _ = self._send(request, table=table)
+        return rows
 
     def upsert_row(
         self,
         *,
         table: str,
-        payload: dict[str, Any],
+        payload: dict[str, Any] | list[dict[str, Any]],
         on_conflict: str,
         use_anon_key: bool = False,
     ) -> list[dict[str, Any]]:
-        """Upsert one row in PostgREST and return representation."""
+        """Upsert one row (or a list of rows) in PostgREST and return representation."""
 
         api_key = self.settings.anon_key if use_anon_key else self.settings.service_role_key
         if not api_key:
@@ -178,14 +190,11 @@ class SupabaseClient:
                 "Content-Type": "application/json",
                 "Prefer": "resolution=merge-duplicates,return=representation",
             },
-            data=json.dumps(payload).encode("utf-8"),
+            data=json_dumps(payload),
             method="POST",
         )
-        try:
-            with urlopen(request) as response:  # noqa: S310 - URL comes from trusted env config
-                return json.loads(response.read().decode("utf-8"))
-        except HTTPError as exc:
-            self._raise_http_error(exc)
+        rows, _ = self._send(request, table=table)
+        return rows
 
     def get_rows(
         self,
@@ -211,15 +220,19 @@ class SupabaseClient:
             },
             method="GET",
         )
-        try:
-            with urlopen(request) as response:  # noqa: S310 - URL comes from trusted env config
-                rows = json.loads(response.read().decode("utf-8"))
-                total: int | None = None
-                if with_count:
-                    content_range = response.headers.get("content-range")
-                    if content_range and "/" in content_range:
-                        _, total_str = content_range.split("/", maxsplit=1)
-                        total = int(total_str)
-                return rows, total
-        except HTTPError as exc:
-            self._raise_http_error(exc)
+        memo = current_read_memo()
+        memo_key = (request.full_url, with_count, use_anon_key)
+        if memo is not None:
+            found, memoized = memo.lookup(memo_key, table=table)
+            if found:
+                return memoized
+        rows, headers = self._send(request, table=table)
+        total: int | None = None
+        if with_count:
+            content_range = headers.get("content-range")
+            if content_range and "/" in content_range:
+                _, total_str = content_range.split("/", maxsplit=1)
+                total = int(total_str)
+        if memo is not None:
+            memo.store(memo_key, (rows, total))
+        return rows, total
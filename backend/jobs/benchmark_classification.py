@@ -0,0 +1,97 @@
+"""Benchmark deterministic import classification over synthetic labels.
+
+Usage:
+    python -m backend.jobs.benchmark_classification
+    python -m backend.jobs.benchmark_classification --rows 100000 --distinct-labels 0
+
+Labels are generated from merchant, bank, fee, tax and TWINT fragments mixed
+with references and free words, so every rule of
+``classify_and_categorize_transaction`` is exercised. Rows draw their label
+from a pool of ``--distinct-labels`` labels, like statements where the same
+merchants come back every month; ``0`` makes every label unique.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections import Counter
+from decimal import Decimal
+from typing import Any
+
+from backend.services.releves_import.classification import (
+    _classify_normalized_text,
+    classify_and_categorize_transaction,
+)
+
+_FRAGMENTS = (
+    "Migros", "COOP-1234", "Lidl", "Denner", "Galaxus", "IKEA", "Manor", "McDonald's", "Starbucks",
+    "SBB CFF FFS", "TPG", "Uber", "Bolt", "Spotify", "Netflix", "YouTube", "Apple", "Google",
+    "UBS", "Raiffeisen", "Revolut", "PostFinance", "BCV", "Crédit Suisse",
+    "Virement interne", "Transfert entre comptes", "Top up", "Recharge",
+    "TWINT", "Envoi à", "Martin Dupont", "à la poste", "Paiement", "Ordre permanent", "eBill", "LSV",
+    "Salaire", "Lohn", "Payroll", "Remboursement", "Storno",
+    "Frais de tenue de compte", "Kontoführungsgebühr", "Spesen", "Frais carte", "ATM Bargeld", "Fee",
+    "Impôts", "ESTV", "AFC", "VAT", "Assurance", "AXA", "Helvetia", "Mobiliar",
+    "Abonnement mensuel", "Subscription", "Boulangerie", "Pharmacie", "Garage", "Cinéma",
+)
+
+
+def _synthetic_label(generator: random.Random) -> tuple[str, str]:
+    parts = generator.sample(_FRAGMENTS, generator.randint(1, 4))
+    if generator.random() < 0.5:
+        parts.append(str(generator.randint(1000, 99_999_999)))
+    return " ".join(parts), generator.choice(("", "", "Lausanne", "Genève", "Zürich"))
+
+
+def synthetic_rows(count: int, *, seed: int = 13, distinct_labels: int = 0) -> list[dict[str, Any]]:
+    """Return ``count`` reproducible synthetic import rows.
+
+    ``distinct_labels`` bounds the number of different labels (``0`` = unbounded).
+    """
+
+    generator = random.Random(seed)
+    pool = [_synthetic_label(generator) for _ in range(distinct_labels)]
+    rows: list[dict[str, Any]] = []
+    for _ in range(count):
+        libelle, payee = generator.choice(pool) if pool else _synthetic_label(generator)
+        cents = generator.randint(-250_000, 400_000)
+        rows.append({"montant": Decimal(cents) / 100, "libelle": libelle, "payee": payee})
+    return rows
+
+
+def run(*, rows: int = 100_000, seed: int = 13, distinct_labels: int = 5_000) -> dict[str, Any]:
+    dataset = synthetic_rows(rows, seed=seed, distinct_labels=distinct_labels)
+    _classify_normalized_text.cache_clear()
+    started = time.perf_counter()
+    categories = Counter(classify_and_categorize_transaction(row).category_key for row in dataset)
+    elapsed_s = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "distinct_labels": distinct_labels,
+        "elapsed_ms": round(elapsed_s * 1000, 1),
+        "rows_per_s": round(rows / elapsed_s) if elapsed_s > 0 else None,
+        "us_per_row": round(elapsed_s * 1_000_000 / rows, 2) if rows else None,
+        "categories": dict(sorted(categories.items())),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of synthetic labels.")
+    parser.add_argument("--seed", type=int, default=13, help="Random seed of the generator.")
+    parser.add_argument(
+        "--distinct-labels",
+        type=int,
+        default=5_000,
+        help="Size of the label pool rows are drawn from (0 = every label unique).",
+    )
+    args = parser.parse_args()
+    report = run(rows=args.rows, seed=args.seed, distinct_labels=args.distinct_labels)
+    print(f"benchmark_classification: {json.dumps(report, sort_keys=True)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare a profile's monthly releves rollups with its raw releves and optionally rebuild them."""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date
+from uuid import UUID
+
+from backend.db.supabase_client import SupabaseClient, SupabaseSettings
+from backend.repositories.releves_repository import SupabaseRelevesRepository
+from shared import config
+from shared.models import DateRange
+
+
+def _build_repository() -> SupabaseRelevesRepository:
+    supabase_url = config.supabase_url()
+    service_role_key = config.supabase_service_role_key()
+    if not supabase_url or not service_role_key:
+        raise RuntimeError("Supabase backend is not configured")
+    client = SupabaseClient(
+        settings=SupabaseSettings(
+            url=supabase_url,
+            service_role_key=service_role_key,
+            anon_key=config.supabase_anon_key(),
+        )
+    )
+    return SupabaseRelevesRepository(client=client)
+
+
+def run(*, profile_id: UUID, start_date: date, end_date: date, repair: bool = False) -> list[date]:
+    repository = _build_repository()
+
+    drifted = repository.check_monthly_rollups(
+        profile_id=profile_id,
+        date_range=DateRange(start_date=start_date, end_date=end_date),
+        repair=repair,
+    )
+    months = ",".join(month.strftime("%Y-%m") for month in drifted) or "-"
+    print(f"check_releves_rollups: profile_id={profile_id} drifted={len(drifted)} months={months} repaired={repair}")
+    return drifted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile-id", type=UUID, required=True, help="Profile whose rollups are checked.")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="First day checked (YYYY-MM-DD).")
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="Last day checked.")
+    parser.add_argument("--repair", action="store_true", help="Rebuild the months that differ from raw releves.")
+    args = parser.parse_args()
+    run(profile_id=args.profile_id, start_date=args.start, end_date=args.end, repair=args.repair)
+
+
+if __name__ == "__main__":
+    main()
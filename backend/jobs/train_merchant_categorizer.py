@@ -0,0 +1,80 @@
+"""Train the local merchant categorizer from merchant entities and aliases.
+
+Usage:
+    python -m backend.jobs.train_merchant_categorizer --output models/merchant_categorizer.json
+    python -m backend.jobs.train_merchant_categorizer --output /tmp/model.json --benchmark
+
+``--benchmark`` holds out part of the known aliases, trains on the rest and
+prints entity/category accuracy, auto-link precision and per-query latency
+before writing the model trained on the full dataset.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from backend.db.supabase_client import SupabaseClient, SupabaseSettings
+from backend.repositories.profiles_repository import SupabaseProfilesRepository
+from backend.services.merchant_categorizer import (
+    MerchantCategorizer,
+    evaluate_categorizer,
+    split_examples,
+    training_examples_from_rows,
+)
+from shared import config
+
+
+def _build_repository() -> SupabaseProfilesRepository:
+    supabase_url = config.supabase_url()
+    service_role_key = config.supabase_service_role_key()
+    if not supabase_url or not service_role_key:
+        raise RuntimeError("Supabase backend is not configured")
+    client = SupabaseClient(
+        settings=SupabaseSettings(
+            url=supabase_url,
+            service_role_key=service_role_key,
+            anon_key=config.supabase_anon_key(),
+        )
+    )
+    return SupabaseProfilesRepository(client)
+
+
+def run(*, output: str, limit: int = 50_000, benchmark: bool = False, holdout: float = 0.2) -> MerchantCategorizer:
+    repository = _build_repository()
+    examples = training_examples_from_rows(repository.list_merchant_categorizer_training_rows(limit=limit))
+
+    if benchmark:
+        train_examples, holdout_examples = split_examples(examples, holdout_ratio=holdout)
+        benchmark_model = MerchantCategorizer.train(train_examples)
+        report = evaluate_categorizer(
+            benchmark_model,
+            holdout_examples,
+            link_threshold=config.merchant_categorizer_link_threshold(),
+        )
+        print(f"train_merchant_categorizer benchmark: {json.dumps(report, sort_keys=True)}")
+
+    started = time.perf_counter()
+    categorizer = MerchantCategorizer.train(examples)
+    train_ms = (time.perf_counter() - started) * 1000
+    categorizer.save(output)
+    print(
+        f"train_merchant_categorizer: examples={len(examples)} documents={len(categorizer)} "
+        f"train_ms={train_ms:.1f} output={output}"
+    )
+    return categorizer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", required=True, help="Path of the JSON model to write.")
+    parser.add_argument("--limit", type=int, default=50_000, help="Max training rows fetched.")
+    parser.add_argument("--benchmark", action="store_true", help="Print a holdout accuracy/latency report.")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Alias ratio held out for --benchmark.")
+    args = parser.parse_args()
+    run(output=args.output, limit=args.limit, benchmark=args.benchmark, holdout=args.holdout)
+
+
+if __name__ == "__main__":
+    main()
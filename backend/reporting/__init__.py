@@ -1,10 +1,39 @@
-"""Reporting utilities for backend-generated documents."""
+"""Reporting utilities for backend-generated documents.
 
-from backend.reporting.spending_report import (
-    SpendingCategoryRow,
-    SpendingReportData,
-    SpendingTransactionRow,
-    generate_spending_report_pdf,
-)
+Renderers depend on ReportLab and matplotlib, which are slow to import; they
+are loaded on the first rendered document rather than with this package.
+"""
 
-__all__ = ["SpendingCategoryRow", "SpendingReportData", "SpendingTransactionRow", "generate_spending_report_pdf"]
+from __future__ import annotations
+
+from backend.reporting.models import SpendingCategoryRow, SpendingReportData, SpendingTransactionRow
+
+
+def generate_spending_report_pdf(data: SpendingReportData) -> bytes:
+    """Render the spending report PDF (see :mod:`backend.reporting.spending_report`)."""
+
+    from backend.reporting.spending_report import generate_spending_report_pdf as render
+
+    return render(data)
+
+
+def preload_renderers() -> None:
+    """Import the PDF renderers and their dependencies ahead of the first report."""
+
+    from shared import config
+
+    if config.report_chart_renderer() == "matplotlib":
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot  # noqa: F401
+    import backend.reporting.spending_report  # noqa: F401
+
+
+__all__ = [
+    "SpendingCategoryRow",
+    "SpendingReportData",
+    "SpendingTransactionRow",
+    "generate_spending_report_pdf",
+    "preload_renderers",
+]
@@ -0,0 +1,58 @@
+"""Input rows of generated reports.
+
+Kept apart from the renderers so that API modules can build report payloads
+without importing ReportLab or matplotlib.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+
+
+@dataclass(slots=True)
+class SpendingCategoryRow:
+    """Aggregated spending by category."""
+
+    name: str
+    amount: Decimal
+
+
+@dataclass(slots=True)
+class SpendingReportData:
+    """Input payload for spending report rendering."""
+
+    period_label: str
+    start_date: str
+    end_date: str
+    total: Decimal
+    count: int
+    currency: str | None
+    categories: list[SpendingCategoryRow]
+    transactions: list["SpendingTransactionRow"]
+    transactions_truncated: bool = False
+    transactions_unavailable: bool = False
+    cashflow_income: Decimal = Decimal("0")
+    cashflow_expense: Decimal = Decimal("0")
+    cashflow_net: Decimal = Decimal("0")
+    cashflow_internal_transfers: Decimal = Decimal("0")
+    cashflow_net_including_transfers: Decimal = Decimal("0")
+    cashflow_transaction_count: int = 0
+    cashflow_currency: str | None = None
+    effective_total: Decimal = Decimal("0")
+    shared_outgoing: Decimal = Decimal("0")
+    shared_incoming: Decimal = Decimal("0")
+    shared_net_balance: Decimal = Decimal("0")
+    categorization_confidence_score_percent: int | None = None
+    categorization_confidence_coverage_percent: int | None = None
+
+
+@dataclass(slots=True)
+class SpendingTransactionRow:
+    """Spending transaction details row for detail pages."""
+
+    date: str
+    merchant: str
+    category: str
+    amount: Decimal
+    flow_type: str
@@ -0,0 +1,156 @@
+"""Render report PDFs in a pool of worker processes.
+
+Building the chart and the ReportLab document holds the GIL for hundreds of
+milliseconds. Running that on a request thread stalls every other request of
+the same API worker. :class:`ReportRenderPool` sends renders to a few
+long-lived processes instead. Processes are started with ``spawn``, which is
+safe in a threaded server, and import ReportLab and matplotlib once when they
+start. Report data crosses the process boundary by pickling:
+:class:`SpendingReportData` is a plain dataclass of strings, Decimals and
+lists.
+
+At most ``max_pending`` renders may be queued or running. Beyond that, and
+when a render exceeds its timeout, callers get
+:class:`ReportRenderUnavailable` rather than an ever-growing backlog.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+from backend.reporting.models import SpendingReportData
+
+
+logger = logging.getLogger(__name__)
+
+Renderer = Callable[[SpendingReportData], bytes]
+
+
+class ReportRenderUnavailable(RuntimeError):
+    """The render could not be queued or did not finish in time."""
+
+
+def render_spending_report(data: SpendingReportData) -> bytes:
+    """Default renderer, importable by reference from worker processes."""
+
+    from backend.reporting.spending_report import generate_spending_report_pdf
+
+    return generate_spending_report_pdf(data)
+
+
+def _initialize_worker() -> None:
+    from backend.reporting import preload_renderers
+
+    preload_renderers()
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+class ReportRenderPool:
+    """Bounded process pool rendering :class:`SpendingReportData` to PDF bytes."""
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        max_pending: int | None = None,
+        timeout_seconds: float = 30.0,
+        renderer: Renderer = render_spending_report,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max_pending if max_pending is not None else self.workers * 4
+        self.timeout_seconds = timeout_seconds
+        self.renderer = renderer
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor_lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+        )
+
+    def warm(self) -> set[int]:
+        """Start every worker process now; return their pids."""
+
+        with self._executor_lock:
+            executor = self._executor
+        futures = [executor.submit(_worker_pid) for _ in range(self.workers)]
+        return {future.result(timeout=self.timeout_seconds * 2) for future in futures}
+
+    def submit(self, data: SpendingReportData) -> Future[bytes]:
+        """Queue a render, or raise :class:`ReportRenderUnavailable` when the queue is full."""
+
+        future, _executor = self._submit(data)
+        return future
+
+    def _submit(self, data: SpendingReportData) -> tuple[Future[bytes], ProcessPoolExecutor]:
+        if not self._slots.acquire(blocking=False):
+            raise ReportRenderUnavailable(f"report render queue is full ({self.max_pending} pending)")
+        with self._executor_lock:
+            executor = self._executor
+        try:
+            future = executor.submit(self.renderer, data)
+        except BrokenProcessPool as exc:
+            self._slots.release()
+            self._replace_broken_executor(executor)
+            raise ReportRenderUnavailable("report render pool restarted") from exc
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future, executor
+
+    def _replace_broken_executor(self, failed: ProcessPoolExecutor) -> None:
+        """Replace ``failed`` unless another caller already did."""
+
+        with self._executor_lock:
+            if self._executor is not failed:
+                return
+            logger.warning("report_render_pool_broken workers=%s", self.workers)
+            self._executor = self._new_executor()
+        failed.shutdown(wait=False, cancel_futures=True)
+
+    def render(self, data: SpendingReportData, *, timeout: float | None = None) -> bytes:
+        """Render ``data`` in the pool and wait for the PDF bytes."""
+
+        future, executor = self._submit(data)
+        try:
+            return future.result(timeout=self.timeout_seconds if timeout is None else timeout)
+        except FutureTimeoutError as exc:
+            future.cancel()
+            raise ReportRenderUnavailable("report render timed out") from exc
+        except BrokenProcessPool as exc:
+            self._replace_broken_executor(executor)
+            raise ReportRenderUnavailable("report render pool restarted") from exc
+
+    async def render_async(self, data: SpendingReportData, *, timeout: float | None = None) -> bytes:
+        """Awaitable :meth:`render` that leaves the event loop free meanwhile."""
+
+        future, executor = self._submit(data)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=self.timeout_seconds if timeout is None else timeout,
+            )
+        except asyncio.TimeoutError as exc:
+            raise ReportRenderUnavailable("report render timed out") from exc
+        except BrokenProcessPool as exc:
+            self._replace_broken_executor(executor)
+            raise ReportRenderUnavailable("report render pool restarted") from exc
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -2,15 +2,13 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP
 from io import BytesIO
 from datetime import date
 
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing, String
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
@@ -27,53 +25,8 @@ from reportlab.platypus import (
     TableStyle,
 )
 
-
-@dataclass(slots=True)
-class SpendingCategoryRow:
-    """Aggregated spending by category."""
-
-    name: str
-    amount: Decimal
-
-
-@dataclass(slots=True)
-class SpendingReportData:
-    """Input payload for spending report rendering."""
-
-    period_label: str
-    start_date: str
-    end_date: str
-    total: Decimal
-    count: int
-    currency: str | None
-    categories: list[SpendingCategoryRow]
-    transactions: list["SpendingTransactionRow"]
-    transactions_truncated: bool = False
-    transactions_unavailable: bool = False
-    cashflow_income: Decimal = Decimal("0")
-    cashflow_expense: Decimal = Decimal("0")
-    cashflow_net: Decimal = Decimal("0")
-    cashflow_internal_transfers: Decimal = Decimal("0")
-    cashflow_net_including_transfers: Decimal = Decimal("0")
-    cashflow_transaction_count: int = 0
-    cashflow_currency: str | None = None
-    effective_total: Decimal = Decimal("0")
-    shared_outgoing: Decimal = Decimal("0")
-    shared_incoming: Decimal = Decimal("0")
-    shared_net_balance: Decimal = Decimal("0")
-    categorization_confidence_score_percent: int | None = None
-    categorization_confidence_coverage_percent: int | None = None
-
-
-@dataclass(slots=True)
-class SpendingTransactionRow:
-    """Spending transaction details row for detail pages."""
-
-    date: str
-    merchant: str
-    category: str
-    amount: Decimal
-    flow_type: str
+from backend.reporting.models import SpendingCategoryRow, SpendingReportData, SpendingTransactionRow
+from shared import config
 
 
 def _format_amount(value: Decimal, currency: str | None) -> str:
@@ -126,11 +79,97 @@ def _dedupe_category_rows(
     ]
 
 
+# matplotlib's default color cycle, so both chart renderers look alike.
+_CHART_COLORS = (
+    "#1F77B4",
+    "#FF7F0E",
+    "#2CA02C",
+    "#D62728",
+    "#9467BD",
+    "#8C564B",
+    "#E377C2",
+    "#7F7F7F",
+    "#BCBD22",
+    "#17BECF",
+)
+_CHART_WIDTH = 166 * mm
+_CHART_HEIGHT = 92 * mm
+
+
+def _build_vector_pie_chart(categories: list[SpendingCategoryRow]) -> Drawing:
+    """Draw the category donut and its legend with ReportLab vector graphics."""
+
+    rows = _summarize_categories(_dedupe_category_rows(categories))
+    values = [float(row.amount) for row in rows]
+    total = sum(values)
+    palette = [colors.HexColor(_CHART_COLORS[index % len(_CHART_COLORS)]) for index in range(len(rows))]
+
+    drawing = Drawing(_CHART_WIDTH, _CHART_HEIGHT)
+    drawing.add(
+        String(
+            _CHART_WIDTH / 2,
+            _CHART_HEIGHT - 6 * mm,
+            "Répartition par catégorie",
+            fontName="Helvetica",
+            fontSize=12,
+            textAnchor="middle",
+        )
+    )
+
+    diameter = 78 * mm
+    pie = Pie()
+    pie.x = 24 * mm
+    pie.y = 2 * mm
+    pie.width = pie.height = diameter
+    pie.data = values
+    pie.labels = [_autopct_threshold(value * 100 / total) if total else "" for value in values]
+    pie.startAngle = 90
+    pie.direction = "anticlockwise"
+    pie.innerRadiusFraction = 0.55
+    pie.simpleLabels = 1
+    pie.slices.strokeColor = colors.white
+    pie.slices.strokeWidth = 1
+    pie.slices.labelRadius = 0.78
+    pie.slices.fontName = "Helvetica"
+    pie.slices.fontSize = 9
+    for index, color in enumerate(palette):
+        pie.slices[index].fillColor = color
+    drawing.add(pie)
+
+    legend = Legend()
+    legend.x = pie.x + diameter + 14 * mm
+    legend.y = pie.y + diameter / 2 + len(rows) * 2.5 * mm
+    legend.alignment = "right"
+    legend.boxAnchor = "nw"
+    legend.fontName = "Helvetica"
+    legend.fontSize = 8
+    legend.columnMaximum = len(rows) or 1
+    legend.dx = legend.dy = 3 * mm
+    legend.deltay = 5 * mm
+    legend.strokeColor = None
+    legend.colorNamePairs = list(zip(palette, [row.name for row in rows]))
+    drawing.add(String(legend.x, legend.y + 3 * mm, "Catégories", fontName="Helvetica", fontSize=9))
+    drawing.add(legend)
+    return drawing
+
+
+def _build_chart_flowable(categories: list[SpendingCategoryRow], renderer: str) -> Flowable:
+    if renderer == "vector":
+        return _build_vector_pie_chart(categories)
+    return Image(BytesIO(_build_pie_chart(categories)), width=_CHART_WIDTH, height=_CHART_HEIGHT)
+
+
 def _build_pie_chart(categories: list[SpendingCategoryRow]) -> bytes:
     rows = _summarize_categories(_dedupe_category_rows(categories))
     labels = [row.name for row in rows]
     values = [float(row.amount) for row in rows]
 
+    # pyplot costs ~0.4 s to import; only reports with a chart need it.
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(6.2, 3.6), dpi=140)
     wedges, _, _ = ax.pie(
         values,
@@ -362,8 +401,12 @@ def _build_shared_expenses_summary_table(data: SpendingReportData) -> Table:
     return table
 
 
-def generate_spending_report_pdf(data: SpendingReportData) -> bytes:
-    """Render a 2-page spending report with summary and transaction detail table."""
+def generate_spending_report_pdf(data: SpendingReportData, *, chart_renderer: str | None = None) -> bytes:
+    """Render a 2-page spending report with summary and transaction detail table.
+
+    ``chart_renderer`` (``"matplotlib"`` or ``"vector"``) defaults to
+    :func:`shared.config.report_chart_renderer`.
+    """
 
     buffer = BytesIO()
     doc = SimpleDocTemplate(
@@ -430,8 +473,7 @@ def generate_spending_report_pdf(data: SpendingReportData) -> bytes:
             Paragraph("Aucune transaction sur la période.", styles["BodyText"])
         )
     else:
-        pie_bytes = _build_pie_chart(data.categories)
-        story.append(Image(BytesIO(pie_bytes), width=166 * mm, height=92 * mm))
+        story.append(_build_chart_flowable(data.categories, chart_renderer or config.report_chart_renderer()))
         story.append(Spacer(1, 3 * mm))
 
         deduped_categories = _dedupe_category_rows(data.categories)
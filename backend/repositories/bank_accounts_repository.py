@@ -9,6 +9,7 @@ from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 from uuid import UUID, uuid4
 
+from backend.db.read_memo import current_read_memo
 from backend.db.supabase_client import SupabaseClient
 from shared.models import (
     BankAccount,
@@ -124,6 +125,10 @@ class SupabaseBankAccountsRepository:
         query: list[tuple[str, str | int]] | dict[str, str | int],
         body: dict[str, object] | None = None,
     ) -> list[dict[str, Any]]:
+        # These writes bypass SupabaseClient._send, so clear the request read memo here as it does.
+        memo = current_read_memo()
+        if memo is not None:
+            memo.invalidate()
         encoded_query = urlencode(query, doseq=True)
         payload = json.dumps(body).encode("utf-8") if body is not None else None
         api_key = self._client.settings.service_role_key
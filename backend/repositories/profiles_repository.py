@@ -11,6 +11,7 @@ import unicodedata
 from uuid import NAMESPACE_URL, UUID, uuid5
 
 from backend.db.supabase_client import SupabaseClient
+from backend.repositories.releves_rollups_repository import drop_profile_rollups, invalidate_rollup_months
 from shared.models import PROFILE_DEFAULT_CORE_FIELDS
 
 
@@ -112,6 +113,14 @@ class ProfilesRepository(Protocol):
     def find_merchant_entity_by_alias_norm(self, *, alias_norm: str) -> dict[str, Any] | None:
         """Return one global merchant entity for an alias_norm when available."""
 
+    def list_merchant_aliases_for_index(
+        self,
+        *,
+        seen_after: str | None = None,
+        limit: int = 100_000,
+    ) -> list[dict[str, Any]]:
+        """List merchant aliases (optionally only those seen since a timestamp) for in-process indexing."""
+
     def upsert_merchant_alias(
         self,
         *,
@@ -159,6 +168,9 @@ class ProfilesRepository(Protocol):
     def get_profile_category_name_by_id(self, *, profile_id: UUID, category_id: UUID) -> str | None:
         """Resolve one profile category label by id."""
 
+    def get_profile_category_names_by_ids(self, *, profile_id: UUID, category_ids: list[UUID]) -> dict[UUID, str]:
+        """Return profile category labels keyed by category id."""
+
     def get_merchant_entity_suggested_category_norm(self, *, merchant_entity_id: UUID) -> str | None:
         """Return suggested_category_norm for one merchant entity."""
 
@@ -172,6 +184,9 @@ class ProfilesRepository(Protocol):
     def list_merchant_entities_missing_suggested_category(self, *, limit: int = 200) -> list[dict[str, Any]]:
         """List merchant entities that still need suggested category enrichment."""
 
+    def list_merchant_categorizer_training_rows(self, *, limit: int = 50_000) -> list[dict[str, Any]]:
+        """List canonical names and aliases labelled with their merchant entity and category."""
+
     def update_merchant_entity_suggested_category_norm(
         self,
         *,
@@ -1095,6 +1110,35 @@ class SupabaseProfilesRepository:
                 return cleaned_name
         return None
 
+    def get_profile_category_names_by_ids(self, *, profile_id: UUID, category_ids: list[UUID]) -> dict[UUID, str]:
+        unique_ids = sorted({str(category_id) for category_id in category_ids if category_id})
+        if not unique_ids:
+            return {}
+
+        rows, _ = self._client.get_rows(
+            table="profile_categories",
+            query={
+                "select": "id,name",
+                "profile_id": f"eq.{profile_id}",
+                "id": f"in.({','.join(unique_ids)})",
+                "limit": len(unique_ids),
+            },
+            with_count=False,
+            use_anon_key=False,
+        )
+
+        names: dict[UUID, str] = {}
+        for row in rows:
+            raw_name = row.get("name")
+            if not isinstance(raw_name, str) or not raw_name.strip():
+                continue
+            try:
+                category_id = UUID(str(row.get("id")))
+            except (TypeError, ValueError):
+                continue
+            names[category_id] = raw_name.strip()
+        return names
+
     def get_merchant_entity_suggested_category_norm(self, *, merchant_entity_id: UUID) -> str | None:
         rows, _ = self._client.get_rows(
             table="merchant_entities",
@@ -1190,6 +1234,64 @@ class SupabaseProfilesRepository:
 
         return confidence_by_id
 
+    def list_merchant_categorizer_training_rows(self, *, limit: int = 50_000) -> list[dict[str, Any]]:
+        page_size = 1000
+        max_rows = max(1, limit)
+        training_rows: list[dict[str, Any]] = []
+
+        def _fetch_pages(table: str, select: str) -> list[dict[str, Any]]:
+            fetched: list[dict[str, Any]] = []
+            offset = 0
+            while len(fetched) < max_rows:
+                rows, _ = self._client.get_rows(
+                    table=table,
+                    query={
+                        "select": select,
+                        "order": "id.asc",
+                        "limit": min(page_size, max_rows - len(fetched)),
+                        "offset": offset,
+                    },
+                    with_count=False,
+                    use_anon_key=False,
+                )
+                fetched.extend(rows)
+                if len(rows) < page_size:
+                    break
+                offset += len(rows)
+            return fetched
+
+        for entity in _fetch_pages("merchant_entities", "id,canonical_name,suggested_category_norm"):
+            canonical_name = " ".join(str(entity.get("canonical_name") or "").split())
+            if not entity.get("id") or not canonical_name:
+                continue
+            training_rows.append(
+                {
+                    "merchant_entity_id": str(entity["id"]),
+                    "text": canonical_name,
+                    "canonical_name": canonical_name,
+                    "suggested_category_norm": entity.get("suggested_category_norm"),
+                }
+            )
+
+        for alias_row in _fetch_pages(
+            "merchant_aliases",
+            "id,merchant_entity_id,alias,merchant_entities(canonical_name,suggested_category_norm)",
+        ):
+            entity = alias_row.get("merchant_entities") if isinstance(alias_row.get("merchant_entities"), dict) else {}
+            alias = " ".join(str(alias_row.get("alias") or "").split())
+            if not alias_row.get("merchant_entity_id") or not alias:
+                continue
+            training_rows.append(
+                {
+                    "merchant_entity_id": str(alias_row["merchant_entity_id"]),
+                    "text": alias,
+                    "canonical_name": " ".join(str(entity.get("canonical_name") or "").split()) or alias,
+                    "suggested_category_norm": entity.get("suggested_category_norm"),
+                }
+            )
+
+        return training_rows[:max_rows]
+
     def list_merchant_entities_missing_suggested_category(self, *, limit: int = 200) -> list[dict[str, Any]]:
         rows, _ = self._client.get_rows(
             table="merchant_entities",
@@ -1409,6 +1511,7 @@ class SupabaseProfilesRepository:
                 query={"profile_id": f"eq.{profile_id}"},
                 use_anon_key=False,
             )
+        drop_profile_rollups(self._client, profile_id=profile_id)
 
     def update_merchant_category(self, *, merchant_id: UUID, category_name: str) -> None:
         cleaned = " ".join(category_name.strip().split())
@@ -1439,6 +1542,35 @@ class SupabaseProfilesRepository:
         )
         return rows
 
+    def list_merchant_aliases_for_index(
+        self,
+        *,
+        seen_after: str | None = None,
+        limit: int = 100_000,
+    ) -> list[dict[str, Any]]:
+        page_size = 1000
+        max_rows = max(1, limit)
+        aliases: list[dict[str, Any]] = []
+        while len(aliases) < max_rows:
+            query: list[tuple[str, str | int]] = [
+                ("select", "merchant_entity_id,alias,alias_norm,last_seen"),
+                ("order", "last_seen.asc,id.asc"),
+                ("limit", min(page_size, max_rows - len(aliases))),
+                ("offset", len(aliases)),
+            ]
+            if seen_after:
+                query.append(("last_seen", f"gte.{seen_after}"))
+            rows, _ = self._client.get_rows(
+                table="merchant_aliases",
+                query=query,
+                with_count=False,
+                use_anon_key=False,
+            )
+            aliases.extend(rows)
+            if len(rows) < page_size:
+                break
+        return aliases
+
     def find_merchant_entity_by_alias_norm(self, *, alias_norm: str) -> dict[str, Any] | None:
         cleaned_alias_norm = self._normalize_name_norm(alias_norm)
         if not cleaned_alias_norm:
@@ -1905,7 +2037,7 @@ class SupabaseProfilesRepository:
             matched_count = int(total or 0)
             if matched_count <= 0 and not rows:
                 return 0
-            self._client.patch_rows(
+            patched_rows = self._client.patch_rows(
                 table="releves_bancaires",
                 query={
                     "profile_id": f"eq.{profile_id}",
@@ -1915,6 +2047,8 @@ class SupabaseProfilesRepository:
                 payload=payload,
                 use_anon_key=False,
             )
+            if category_id is not None:
+                invalidate_rollup_months(self._client, patched_rows)
             if matched_count > 0:
                 return matched_count
             return len(rows)
@@ -1938,12 +2072,14 @@ class SupabaseProfilesRepository:
         payload: dict[str, Any] = {"merchant_entity_id": str(merchant_entity_id)}
         if category_id is not None:
             payload["category_id"] = str(category_id)
-        self._client.patch_rows(
+        patched_rows = self._client.patch_rows(
             table="releves_bancaires",
             query={"id": f"eq.{releve_id}"},
             payload=payload,
             use_anon_key=False,
         )
+        if category_id is not None:
+            invalidate_rollup_months(self._client, patched_rows)
 
     def upsert_merchant_by_name_norm(
         self,
@@ -0,0 +1,231 @@
+"""Columnar batches of releves for the spending trend.
+
+The trend aggregation used to walk lists of row dicts, parsing
+``Decimal(str(...))`` amounts again and re-deriving flow types and category
+labels on every pass. :class:`RelevesBatch` keeps one scan as parallel arrays
+instead:
+
+- ``day_ordinals``: ``date.toordinal()`` of each releve;
+- ``amount_cents``: its amount in integer centimes (sub-centime digits are
+  rounded half-even);
+- ``flow_codes``: :data:`FLOW_EXPENSE`, :data:`FLOW_INCOME` or
+  :data:`FLOW_TRANSFER_INTERNAL`;
+- ``category_codes``, ``merchant_codes`` and ``currency_codes``: indexes into
+  the interned ``categories``, ``merchants`` and ``currencies`` tables;
+- ``excluded``: 1 when the releve's category is excluded from totals.
+
+:func:`group_sum` and :func:`group_count` aggregate these columns by integer
+codes. For batches of :data:`NUMPY_MIN_ROWS` rows or more they use NumPy when
+it is installed, importing it lazily on first use; otherwise they run in
+plain Python. Both paths compute exact integer sums. Pydantic models stay at
+the API boundary.
+
+Only :mod:`backend.services.spending_trend` reads batches so far. The
+single-period spending report still builds its totals, categories and
+cashflow from the releves sum and aggregate tools and
+``compute_cashflow_summary``, which the result cache and the monthly rollups
+can serve.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+
+FLOW_EXPENSE = 0
+FLOW_INCOME = 1
+FLOW_TRANSFER_INTERNAL = 2
+FLOW_TYPES = ("expense", "income", "transfer_internal")
+_FLOW_CODES = {name: code for code, name in enumerate(FLOW_TYPES)}
+
+NUMPY_MIN_ROWS = 2048
+
+_CENT = Decimal("0.01")
+_ZERO = Decimal("0")
+_numpy: Any = None
+_numpy_checked = False
+
+
+def _load_numpy() -> Any:
+    global _numpy, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy, _numpy_checked = numpy, True
+    return _numpy
+
+
+def to_cents(amount: object) -> int:
+    """Return ``amount`` (Decimal, number or numeric text) in integer centimes."""
+
+    value = amount if isinstance(amount, Decimal) else Decimal(str(amount if amount is not None else "0"))
+    return int(value.quantize(_CENT, rounding=ROUND_HALF_EVEN).scaleb(2))
+
+
+def cents_to_decimal(cents: int) -> Decimal:
+    """Return ``cents`` as a two-decimal ``Decimal``; zero stays ``Decimal("0")`` as in empty sums."""
+
+    return Decimal(cents).scaleb(-2) if cents else _ZERO
+
+
+def flow_code(flow_type: str) -> int:
+    return _FLOW_CODES[flow_type]
+
+
+@dataclass(slots=True)
+class RelevesBatch:
+    """Parallel-array view of scanned releves (see the module docstring)."""
+
+    day_ordinals: array = field(default_factory=lambda: array("q"))
+    amount_cents: array = field(default_factory=lambda: array("q"))
+    flow_codes: array = field(default_factory=lambda: array("B"))
+    category_codes: array = field(default_factory=lambda: array("I"))
+    merchant_codes: array = field(default_factory=lambda: array("I"))
+    currency_codes: array = field(default_factory=lambda: array("I"))
+    excluded: bytearray = field(default_factory=bytearray)
+    categories: list[str] = field(default_factory=list)
+    merchants: list[str] = field(default_factory=list)
+    currencies: list[str | None] = field(default_factory=list)
+    _interned: dict[tuple[int, object], int] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.day_ordinals)
+
+    def _intern(self, table: list, table_id: int, value: object) -> int:
+        key = (table_id, value)
+        code = self._interned.get(key)
+        if code is None:
+            code = self._interned[key] = len(table)
+            table.append(value)
+        return code
+
+    def append(
+        self,
+        *,
+        day: date,
+        amount: object,
+        flow_type: str,
+        category: str,
+        merchant: str,
+        currency: str | None,
+        excluded: bool = False,
+    ) -> None:
+        self.day_ordinals.append(day.toordinal())
+        self.amount_cents.append(to_cents(amount))
+        self.flow_codes.append(_FLOW_CODES[flow_type])
+        self.category_codes.append(self._intern(self.categories, 0, category))
+        self.merchant_codes.append(self._intern(self.merchants, 1, merchant))
+        self.currency_codes.append(self._intern(self.currencies, 2, currency))
+        self.excluded.append(1 if excluded else 0)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, object]]) -> RelevesBatch:
+        """Build a batch from dict rows (``date``, ``montant``, ``devise``, ``flow_type``, ``category``, ``merchant``)."""
+
+        batch = cls()
+        for row in rows:
+            raw_day = row["date"]
+            batch.append(
+                day=raw_day if isinstance(raw_day, date) else date.fromisoformat(str(raw_day)[:10]),
+                amount=row.get("montant"),
+                flow_type=str(row.get("flow_type") or "expense"),
+                category=str(row.get("category") or "Autres"),
+                merchant=str(row.get("merchant") or "Inconnu"),
+                currency=row.get("devise") if isinstance(row.get("devise"), str) else None,
+                excluded=bool(row.get("excluded_from_totals")),
+            )
+        return batch
+
+    def to_rows(self) -> Iterator[dict[str, object]]:
+        """Yield the releves back as dict rows (the inverse of :meth:`from_rows`)."""
+
+        for index in range(len(self)):
+            yield {
+                "date": date.fromordinal(self.day_ordinals[index]),
+                "montant": cents_to_decimal(self.amount_cents[index]),
+                "devise": self.currencies[self.currency_codes[index]],
+                "flow_type": FLOW_TYPES[self.flow_codes[index]],
+                "category": self.categories[self.category_codes[index]],
+                "merchant": self.merchants[self.merchant_codes[index]],
+                "excluded_from_totals": bool(self.excluded[index]),
+            }
+
+    def first_currency(self) -> str | None:
+        """Return the currency of the first releve that has one."""
+
+        for code in self.currency_codes:
+            currency = self.currencies[code]
+            if currency is not None:
+                return currency
+        return None
+
+    def flow_mask(self, *flow_codes: int, include_excluded: bool = True) -> bytearray:
+        """Return a 0/1 mask of the releves with one of ``flow_codes``."""
+
+        wanted = set(flow_codes)
+        if include_excluded:
+            return bytearray(1 if code in wanted else 0 for code in self.flow_codes)
+        return bytearray(
+            1 if code in wanted and not excluded else 0 for code, excluded in zip(self.flow_codes, self.excluded)
+        )
+
+
+def _numpy_for(size: int) -> Any:
+    return _load_numpy() if size >= NUMPY_MIN_ROWS else None
+
+
+def group_sum(
+    codes: Sequence[int],
+    values: Sequence[int],
+    size: int,
+    mask: Sequence[int] | None = None,
+) -> list[int]:
+    """Return, for each group code ``0..size-1``, the sum of ``values`` of the (masked) rows."""
+
+    np = _numpy_for(len(codes))
+    if np is not None:
+        code_array = np.asarray(codes, dtype=np.int64)
+        value_array = np.asarray(values, dtype=np.int64)
+        if mask is not None:
+            selected = np.frombuffer(bytes(mask), dtype=np.uint8).astype(bool)
+            code_array, value_array = code_array[selected], value_array[selected]
+        totals = np.zeros(size, dtype=np.int64)
+        np.add.at(totals, code_array, value_array)
+        return [int(total) for total in totals]
+
+    totals = [0] * size
+    if mask is None:
+        for code, value in zip(codes, values):
+            totals[code] += value
+    else:
+        for code, value, selected in zip(codes, values, mask):
+            if selected:
+                totals[code] += value
+    return totals
+
+
+def group_count(codes: Sequence[int], size: int, mask: Sequence[int] | None = None) -> list[int]:
+    """Return, for each group code ``0..size-1``, how many (masked) rows have it."""
+
+    np = _numpy_for(len(codes))
+    if np is not None:
+        code_array = np.asarray(codes, dtype=np.int64)
+        if mask is not None:
+            code_array = code_array[np.frombuffer(bytes(mask), dtype=np.uint8).astype(bool)]
+        return [int(count) for count in np.bincount(code_array, minlength=size)[:size]]
+
+    counts = [0] * size
+    if mask is None:
+        for code in codes:
+            counts[code] += 1
+    else:
+        for code, selected in zip(codes, mask):
+            if selected:
+                counts[code] += 1
+    return counts
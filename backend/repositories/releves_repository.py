@@ -3,15 +3,26 @@
 from __future__ import annotations
 
 import json
-from datetime import date
+import logging
+from datetime import date, timedelta
 from decimal import Decimal
-from typing import Any, Protocol
+from typing import Any, Iterable, Iterator, Mapping, Protocol
 import unicodedata
 from uuid import UUID, uuid4
 
 from backend.db.supabase_client import SupabaseClient
 from backend.repositories.profiles_repository import ProfilesRepository, SupabaseProfilesRepository
+from backend.repositories.releves_batch import RelevesBatch
+from backend.repositories.releves_rollups_repository import (
+    MonthlyRollup,
+    SupabaseRelevesRollupsRepository,
+    build_monthly_rollups,
+    month_end,
+    month_start,
+    whole_months,
+)
 from backend.services.releves_import.classification import resolve_system_category_label
+from shared import config
 from shared.text_utils import normalize_category_name
 from shared.models import (
     DateRange,
@@ -23,6 +34,7 @@ from shared.models import (
 )
 
 
+logger = logging.getLogger(__name__)
 
 
 def _category_norm_candidates(value: str) -> tuple[str, ...]:
@@ -75,6 +87,25 @@ class RelevesRepository(Protocol):
     ) -> tuple[dict[str, tuple[Decimal, int]], str | None]:
         """Return grouped totals/counts plus optional currency."""
 
+    def load_releves_batch(
+        self,
+        *,
+        profile_id: UUID,
+        date_range: DateRange,
+        bank_account_id: UUID | None = None,
+    ) -> RelevesBatch:
+        """Return every releve of the range as a columnar batch with flow types and labels resolved."""
+
+    def iter_releves_for_export(
+        self,
+        *,
+        profile_id: UUID,
+        date_range: DateRange | None = None,
+        bank_account_id: UUID | None = None,
+        category_id: UUID | None = None,
+    ) -> Iterator[dict[str, object]]:
+        """Yield matching releves oldest first, with flow type, category and merchant labels resolved."""
+
     def list_pending_categorization_releves(
         self,
         *,
@@ -367,6 +398,65 @@ class InMemoryRelevesRepository:
         currency = filtered[0].devise if filtered else None
         return groups, currency
 
+    def load_releves_batch(
+        self,
+        *,
+        profile_id: UUID,
+        date_range: DateRange,
+        bank_account_id: UUID | None = None,
+    ) -> RelevesBatch:
+        filters = RelevesFilters(profile_id=profile_id, date_range=date_range, bank_account_id=bank_account_id)
+        excluded_categories = self.get_excluded_category_names(profile_id)
+        batch = RelevesBatch()
+        for item in self._apply_filters(filters):
+            if self._is_internal_transfer(item):
+                flow_type = "transfer_internal"
+            else:
+                flow_type = "income" if item.montant > 0 else "expense"
+            batch.append(
+                day=item.date,
+                amount=item.montant,
+                flow_type=flow_type,
+                category=item.categorie or "Autres",
+                merchant=item.merchant_entity_canonical_name or item.payee or "Inconnu",
+                currency=item.devise,
+                excluded=bool(item.categorie and normalize_category_name(item.categorie) in excluded_categories),
+            )
+        return batch
+
+    def iter_releves_for_export(
+        self,
+        *,
+        profile_id: UUID,
+        date_range: DateRange | None = None,
+        bank_account_id: UUID | None = None,
+        category_id: UUID | None = None,
+    ) -> Iterator[dict[str, object]]:
+        filters = RelevesFilters(
+            profile_id=profile_id,
+            date_range=date_range,
+            bank_account_id=bank_account_id,
+            category_id=category_id,
+        )
+        for item in sorted(self._apply_filters(filters), key=lambda item: (item.date, str(item.id))):
+            if self._is_internal_transfer(item):
+                flow_type = "transfer_internal"
+            else:
+                flow_type = "income" if item.montant > 0 else "expense"
+            yield {
+                "id": str(item.id),
+                "date": item.date.isoformat(),
+                "montant": item.montant,
+                "devise": item.devise,
+                "libelle": item.libelle,
+                "payee": item.payee,
+                "merchant": item.merchant_entity_canonical_name or item.payee or "Inconnu",
+                "category": item.categorie or "Autres",
+                "flow_type": flow_type,
+                "bank_account_id": str(item.bank_account_id) if item.bank_account_id else None,
+                "category_id": str(item.category_id) if item.category_id else None,
+            }
+
     def get_excluded_category_names(self, profile_id: UUID) -> set[str]:
         excluded: set[str] = set()
         for row in self._profile_categories_seed:
@@ -556,6 +646,7 @@ class SupabaseRelevesRepository:
     def __init__(self, client: SupabaseClient, profiles_repository: ProfilesRepository | None = None) -> None:
         self._client = client
         self._profiles_repository = profiles_repository or SupabaseProfilesRepository(client=client)
+        self._rollups = SupabaseRelevesRollupsRepository(client)
 
     # Keep embed wiring centralized: some PostgREST setups require explicit FK syntax.
     _CATEGORY_EMBED_DEFAULT = "profile_categories(name)"
@@ -719,6 +810,224 @@ class SupabaseRelevesRepository:
 
         return rows
 
+    _ROLLUP_SOURCE_SELECT = "date,montant,devise,categorie,category_id,bank_account_id,metadonnees"
+
+    @staticmethod
+    def _row_base_flow_type(row: Mapping[str, object]) -> str:
+        """Flow type from ``tx_kind`` and the amount sign, before the category-label transfer rule."""
+        if SupabaseRelevesRepository._row_tx_kind(dict(row)) == "transfer_internal":
+            return "transfer_internal"
+        return SupabaseRelevesRepository._row_effective_flow_type({"montant": row.get("montant")})
+
+    @staticmethod
+    def _row_category_key(row: Mapping[str, object]) -> str | None:
+        category_key = str(_coerce_json_dict(row.get("metadonnees")).get("category_key") or "").strip().lower()
+        return category_key or None
+
+    @staticmethod
+    def _row_count(row: Mapping[str, object]) -> int:
+        """Return how many releves a row stands for: one, or the count of a rollup row."""
+        return int(row.get("rollup_count") or 1)
+
+    def _build_rollups_from_releves(self, *, profile_id: UUID, months: list[date]) -> list[MonthlyRollup]:
+        filters = RelevesFilters(
+            profile_id=profile_id,
+            date_range=DateRange(start_date=months[0], end_date=month_end(months[-1])),
+        )
+        rows = self._list_releves_rows_paginated(
+            base_query=[*self._build_query(filters), ("select", self._ROLLUP_SOURCE_SELECT)]
+        )
+        wanted = set(months)
+        return build_monthly_rollups(
+            (row for row in rows if month_start(date.fromisoformat(str(row["date"])[:10])) in wanted),
+            base_flow_type=self._row_base_flow_type,
+            category_key=self._row_category_key,
+        )
+
+    def refresh_monthly_rollups(
+        self,
+        *,
+        profile_id: UUID,
+        months: Iterable[date],
+        renew: bool = True,
+    ) -> dict[date, str]:
+        """Rebuild the rollups of ``months`` from raw releves; return the generation of each month marked fresh.
+
+        ``renew`` gives every month a new write generation first, as after a
+        write; reads only rebuild the generation a writer left unbuilt. A month
+        written again during the rebuild is not marked fresh.
+        """
+        wanted = sorted({month_start(month) for month in months})
+        if not wanted:
+            return {}
+        states = self._rollups.start_rebuild(profile_id=profile_id, months=wanted, renew=renew)
+        rollups = self._build_rollups_from_releves(profile_id=profile_id, months=wanted)
+        return self._rollups.store_rebuild(profile_id=profile_id, states=states, rollups=rollups)
+
+    def check_monthly_rollups(
+        self,
+        *,
+        profile_id: UUID,
+        date_range: DateRange,
+        repair: bool = False,
+    ) -> list[date]:
+        """Return the months of ``date_range`` whose stored rollups differ from raw releves.
+
+        With ``repair``, those months are rebuilt from the raw rows.
+        """
+        months = whole_months(
+            DateRange(start_date=month_start(date_range.start_date), end_date=month_end(date_range.end_date))
+        ) or []
+        if not months:
+            return []
+        states = self._rollups.month_states(profile_id=profile_id, months=months)
+        expected = self._build_rollups_from_releves(profile_id=profile_id, months=months)
+        # Months never built for their current generation have no lines to compare.
+        stored = self._rollups.list_rollups(
+            profile_id=profile_id,
+            generations={
+                month: state.generation for month, state in states.items() if state.built_generation == state.generation
+            },
+        )
+
+        def _by_month(rollups: list[MonthlyRollup]) -> dict[date, dict[str, tuple[Decimal, int]]]:
+            grouped: dict[date, dict[str, tuple[Decimal, int]]] = {}
+            for rollup in rollups:
+                grouped.setdefault(rollup.key.month, {})[rollup.key.rollup_key] = (rollup.total, rollup.count)
+            return grouped
+
+        expected_by_month = _by_month(expected)
+        stored_by_month = _by_month(stored)
+        drifted = [month for month in months if expected_by_month.get(month, {}) != stored_by_month.get(month, {})]
+        if repair and drifted:
+            self.refresh_monthly_rollups(profile_id=profile_id, months=drifted)
+        return drifted
+
+    def _monthly_rollups_for(self, request: RelevesFilters | RelevesAggregateRequest) -> list[MonthlyRollup] | None:
+        """Return the rollups answering ``request``, or None when it must read raw releves.
+
+        Only whole-month ranges without text, merchant or label filters qualify;
+        stale months are rebuilt first.
+        """
+        if not config.releves_rollups_enabled():
+            return None
+        if request.categorie or request.merchant or request.merchant_id:
+            return None
+        months = whole_months(request.date_range)
+        if not months:
+            return None
+        try:
+            generations = self._rollups.fresh_months(
+                profile_id=request.profile_id,
+                months=months,
+                max_age=timedelta(hours=config.releves_rollups_max_age_hours()),
+            )
+            stale_months = [month for month in months if month not in generations]
+            if stale_months:
+                generations.update(
+                    self.refresh_monthly_rollups(profile_id=request.profile_id, months=stale_months, renew=False)
+                )
+            if len(generations) < len(months):
+                # A concurrent write won the rebuild of some month: read raw releves this time.
+                return None
+            return self._rollups.list_rollups(
+                profile_id=request.profile_id,
+                generations=generations,
+                bank_account_id=request.bank_account_id,
+                category_id=request.category_id,
+            )
+        except RuntimeError:
+            logger.warning("releves_rollups_read_failed profile_id=%s", request.profile_id, exc_info=True)
+            return None
+
+    def _profile_category_names(self, *, profile_id: UUID, category_ids: Iterable[object]) -> dict[UUID, str | None]:
+        """Resolve the profile category names of ``category_ids`` in one lookup.
+
+        The result seeds the ``category_names`` memo of :meth:`_row_category_label`;
+        unknown ids map to None. Repositories without the batched lookup get an
+        empty memo and are queried per id.
+        """
+        wanted: set[UUID] = set()
+        for raw_id in category_ids:
+            if raw_id is None:
+                continue
+            try:
+                wanted.add(raw_id if isinstance(raw_id, UUID) else UUID(str(raw_id)))
+            except (TypeError, ValueError):
+                continue
+        lookup = getattr(self._profiles_repository, "get_profile_category_names_by_ids", None)
+        if not wanted or lookup is None:
+            return {}
+        names = lookup(profile_id=profile_id, category_ids=sorted(wanted, key=str))
+        return {category_id: names.get(category_id) for category_id in wanted}
+
+    def _rollup_rows(
+        self,
+        rollups: list[MonthlyRollup],
+        *,
+        profile_id: UUID,
+        category_names: dict[UUID, str | None] | None = None,
+    ) -> list[dict[str, object]]:
+        """Shape rollups like hydrated releves rows so the raw-row rules apply unchanged.
+
+        Category names are resolved in one lookup and added to ``category_names`` when given.
+        """
+        names = self._profile_category_names(
+            profile_id=profile_id,
+            category_ids={rollup.key.category_id for rollup in rollups},
+        )
+        if category_names is not None:
+            category_names.update(names)
+        rows: list[dict[str, object]] = []
+        for rollup in rollups:
+            key = rollup.key
+            categorie = key.categorie
+            if not categorie and key.category_id:
+                category_id = UUID(key.category_id)
+                if category_id not in names:
+                    names[category_id] = self._profiles_repository.get_profile_category_name_by_id(
+                        profile_id=profile_id,
+                        category_id=category_id,
+                    )
+                categorie = names[category_id]
+            rows.append(
+                {
+                    "date": key.month.isoformat(),
+                    # An income rollup only sums positive amounts and an expense one non-positive
+                    # amounts, so the total keeps the sign the flow type rules look at.
+                    "montant": rollup.total,
+                    "devise": key.devise,
+                    "categorie": categorie,
+                    "category_id": key.category_id,
+                    "bank_account_id": key.bank_account_id,
+                    "metadonnees": {
+                        "tx_kind": "transfer_internal" if key.flow_type == "transfer_internal" else None,
+                        "category_key": key.category_key,
+                    },
+                    "rollup_count": rollup.count,
+                }
+            )
+        return rows
+
+    def _refresh_written_months(self, *, profile_id: UUID, dates: Iterable[object]) -> None:
+        if not config.releves_rollups_enabled():
+            return
+        months: set[date] = set()
+        for raw_date in dates:
+            try:
+                months.add(month_start(date.fromisoformat(str(raw_date)[:10])))
+            except ValueError:
+                continue
+        try:
+            self.refresh_monthly_rollups(profile_id=profile_id, months=months)
+        except RuntimeError:
+            logger.warning(
+                "releves_rollups_refresh_failed profile_id=%s months=%s",
+                profile_id,
+                len(months),
+                exc_info=True,
+            )
+
     def list_releves(self, filters: RelevesFilters) -> tuple[list[ReleveBancaire], int | None]:
         select_with_category, _ = self._select_with_category_embed(
             "id,profile_id,date,libelle,montant,devise,categorie,category_id,payee,merchant_id,merchant_entity_id,bank_account_id,merchant_entities(canonical_name,suggested_confidence)"
@@ -752,12 +1061,16 @@ class SupabaseRelevesRepository:
         return [ReleveBancaire.model_validate(row) for row in rows], total
 
     def sum_releves(self, filters: RelevesFilters) -> tuple[Decimal, int, str | None]:
-        select_with_category, _ = self._select_with_category_embed(
-            "montant,devise,categorie,category_id,bank_account_id,metadonnees"
-        )
-        query = [*self._build_query(filters), ("select", select_with_category)]
-        rows = self._list_releves_rows_paginated(base_query=query)
-        self._hydrate_category_label(rows)
+        rollups = self._monthly_rollups_for(filters)
+        if rollups is not None:
+            rows = self._rollup_rows(rollups, profile_id=filters.profile_id)
+        else:
+            select_with_category, _ = self._select_with_category_embed(
+                "montant,devise,categorie,category_id,bank_account_id,metadonnees"
+            )
+            query = [*self._build_query(filters), ("select", select_with_category)]
+            rows = self._list_releves_rows_paginated(base_query=query)
+            self._hydrate_category_label(rows)
 
         if filters.direction == RelevesDirection.DEBIT_ONLY:
             rows = [row for row in rows if self._row_effective_flow_type(row) == "expense"]
@@ -778,14 +1091,16 @@ class SupabaseRelevesRepository:
                 ]
 
         total = Decimal("0")
+        count = 0
         currency: str | None = None
         for row in rows:
             montant = Decimal(str(row["montant"]))
             total += montant
+            count += self._row_count(row)
             if currency is None:
                 currency = row.get("devise")
 
-        return total, len(rows), currency
+        return total, count, currency
 
     def compute_cashflow_summary(
         self,
@@ -807,8 +1122,11 @@ class SupabaseRelevesRepository:
         select_with_category, _ = self._select_with_category_embed(
             "montant,devise,metadonnees,categorie,category_id"
         )
+        rollups = self._monthly_rollups_for(filters)
+        if rollups is not None:
+            all_rows = self._rollup_rows(rollups, profile_id=profile_id)
 
-        while True:
+        while rollups is None:
             query = [
                 *self._build_query(filters),
                 ("select", select_with_category),
@@ -832,11 +1150,13 @@ class SupabaseRelevesRepository:
         total_income = Decimal("0")
         total_expense = Decimal("0")
         total_transfers = Decimal("0")
+        transaction_count = 0
         currency: str | None = None
 
         for row in all_rows:
             montant = Decimal(str(row.get("montant") or "0"))
             flow_type = self._row_effective_flow_type(row)
+            transaction_count += self._row_count(row)
 
             if flow_type == "transfer_internal":
                 total_transfers += montant
@@ -855,22 +1175,83 @@ class SupabaseRelevesRepository:
             "total_expense": total_expense,
             "net_cashflow": total_income + total_expense,
             "internal_transfers": total_transfers,
-            "transaction_count": len(all_rows),
+            "transaction_count": transaction_count,
             "currency": currency,
         }
 
+    def _row_category_label(
+        self,
+        row: dict[str, object],
+        *,
+        profile_id: UUID,
+        category_names: dict[UUID, str | None] | None = None,
+    ) -> str:
+        """Return the category label of a row: profile category, legacy label, system key, else Autres.
+
+        ``category_names`` memoizes the profile category lookups across the rows of one scan.
+        """
+        key: str | None = None
+        category_id_raw = row.get("category_id")
+        if category_id_raw is not None:
+            try:
+                category_id = category_id_raw if isinstance(category_id_raw, UUID) else UUID(str(category_id_raw))
+            except (TypeError, ValueError):
+                category_id = None
+            if category_id is not None:
+                if category_names is not None and category_id in category_names:
+                    key = category_names[category_id]
+                else:
+                    key = self._profiles_repository.get_profile_category_name_by_id(
+                        profile_id=profile_id,
+                        category_id=category_id,
+                    )
+                    if category_names is not None:
+                        category_names[category_id] = key
+                if isinstance(key, str) and key.strip():
+                    normalized_key = normalize_category_name(key)
+                    if normalized_key in {"autre", "autres", "sans categorie"}:
+                        key = None
+
+        raw_category = row.get("categorie")
+        if key is None and isinstance(raw_category, str) and raw_category.strip():
+            key = raw_category.strip()
+            if normalize_category_name(key) in {"autre", "autres"}:
+                key = "Autres"
+
+        if key is None:
+            meta_dict = _coerce_json_dict(row.get("metadonnees"))
+            category_key = str(meta_dict.get("category_key") or "").strip().lower()
+            if category_key and category_key != "other":
+                key = resolve_system_category_label(category_key)
+
+        return key or "Autres"
+
     def aggregate_releves(
         self, request: RelevesAggregateRequest
     ) -> tuple[dict[str, tuple[Decimal, int]], str | None]:
-        select_with_category, _ = self._select_with_category_embed(
-            "montant,devise,date,categorie,category_id,payee,bank_account_id,metadonnees"
+        rollups = (
+            self._monthly_rollups_for(request)
+            if request.group_by in {RelevesGroupBy.CATEGORIE, RelevesGroupBy.MONTH}
+            else None
         )
-        query = [
-            *self._build_query(request),
-            ("select", select_with_category),
-        ]
-        rows = self._list_releves_rows_paginated(base_query=query)
-        self._hydrate_category_label(rows)
+        category_names: dict[UUID, str | None] = {}
+        if rollups is not None:
+            rows = self._rollup_rows(rollups, profile_id=request.profile_id, category_names=category_names)
+        else:
+            select_with_category, _ = self._select_with_category_embed(
+                "montant,devise,date,categorie,category_id,payee,bank_account_id,metadonnees"
+            )
+            query = [
+                *self._build_query(request),
+                ("select", select_with_category),
+            ]
+            rows = self._list_releves_rows_paginated(base_query=query)
+            self._hydrate_category_label(rows)
+            if request.group_by == RelevesGroupBy.CATEGORIE:
+                category_names = self._profile_category_names(
+                    profile_id=request.profile_id,
+                    category_ids={row.get("category_id") for row in rows},
+                )
 
         if request.direction == RelevesDirection.DEBIT_ONLY:
             rows = [row for row in rows if self._row_effective_flow_type(row) == "expense"]
@@ -894,37 +1275,7 @@ class SupabaseRelevesRepository:
         currency: str | None = rows[0].get("devise") if rows else None
         for row in rows:
             if request.group_by == RelevesGroupBy.CATEGORIE:
-                key: str | None = None
-                category_id_raw = row.get("category_id")
-                if category_id_raw is not None:
-                    try:
-                        category_id = category_id_raw if isinstance(category_id_raw, UUID) else UUID(str(category_id_raw))
-                    except (TypeError, ValueError):
-                        category_id = None
-                    if category_id is not None:
-                        key = self._profiles_repository.get_profile_category_name_by_id(
-                            profile_id=request.profile_id,
-                            category_id=category_id,
-                        )
-                        if isinstance(key, str) and key.strip():
-                            normalized_key = normalize_category_name(key)
-                            if normalized_key in {"autre", "autres", "sans categorie"}:
-                                key = None
-
-                raw_category = row.get("categorie")
-                if key is None and isinstance(raw_category, str) and raw_category.strip():
-                    key = raw_category.strip()
-                    if normalize_category_name(key) in {"autre", "autres"}:
-                        key = "Autres"
-
-                if key is None:
-                    meta_dict = _coerce_json_dict(row.get("metadonnees"))
-                    category_key = str(meta_dict.get("category_key") or "").strip().lower()
-                    if category_key and category_key != "other":
-                        key = resolve_system_category_label(category_key)
-
-                if key is None:
-                    key = "Autres"
+                key = self._row_category_label(row, profile_id=request.profile_id, category_names=category_names)
             elif request.group_by == RelevesGroupBy.PAYEE:
                 key = row.get("payee") or "Inconnu"
             else:
@@ -932,10 +1283,119 @@ class SupabaseRelevesRepository:
 
             montant = Decimal(str(row["montant"]))
             current_total, current_count = groups.get(key, (Decimal("0"), 0))
-            groups[key] = (current_total + montant, current_count + 1)
+            groups[key] = (current_total + montant, current_count + self._row_count(row))
 
         return groups, currency
 
+    def load_releves_batch(
+        self,
+        *,
+        profile_id: UUID,
+        date_range: DateRange,
+        bank_account_id: UUID | None = None,
+    ) -> RelevesBatch:
+        filters = RelevesFilters(profile_id=profile_id, date_range=date_range, bank_account_id=bank_account_id)
+        select_with_category, _ = self._select_with_category_embed(
+            "date,montant,devise,categorie,category_id,payee,metadonnees,merchant_entities(canonical_name)"
+        )
+        rows = self._list_releves_rows_paginated(
+            base_query=[*self._build_query(filters), ("select", select_with_category)]
+        )
+        self._hydrate_category_label(rows)
+        excluded_categories = self.get_excluded_category_names(profile_id)
+
+        # Labels and exclusion depend only on a few columns shared by many rows: resolve each once.
+        category_names = self._profile_category_names(
+            profile_id=profile_id,
+            category_ids={row.get("category_id") for row in rows},
+        )
+        labels: dict[tuple[object, object, object], tuple[str, bool]] = {}
+        batch = RelevesBatch()
+        for row in rows:
+            raw_category = row.get("categorie")
+            label_key = (row.get("category_id"), raw_category, self._row_category_key(row))
+            label = labels.get(label_key)
+            if label is None:
+                label = labels[label_key] = (
+                    self._row_category_label(row, profile_id=profile_id, category_names=category_names),
+                    bool(raw_category and normalize_category_name(str(raw_category)) in excluded_categories),
+                )
+            batch.append(
+                day=date.fromisoformat(str(row["date"])[:10]),
+                amount=row.get("montant") or "0",
+                flow_type=self._row_effective_flow_type(row),
+                category=label[0],
+                merchant=self._row_merchant_label(row),
+                currency=row.get("devise") if isinstance(row.get("devise"), str) else None,
+                excluded=label[1],
+            )
+        return batch
+
+    @staticmethod
+    def _row_merchant_label(row: dict[str, object]) -> str:
+        """Return the merchant entity canonical name of a row, else its payee, else Inconnu."""
+        merchant_entities = row.get("merchant_entities")
+        if isinstance(merchant_entities, list):
+            merchant_entities = next((item for item in merchant_entities if isinstance(item, dict)), None)
+        canonical_name = merchant_entities.get("canonical_name") if isinstance(merchant_entities, dict) else None
+        return str(canonical_name or row.get("payee") or "Inconnu").strip() or "Inconnu"
+
+    def iter_releves_for_export(
+        self,
+        *,
+        profile_id: UUID,
+        date_range: DateRange | None = None,
+        bank_account_id: UUID | None = None,
+        category_id: UUID | None = None,
+        page_size: int = 1000,
+    ) -> Iterator[dict[str, object]]:
+        # Keyset pagination on (date, id): each page restarts after the last row
+        # returned, so deep pages cost the same as the first one and rows
+        # inserted meanwhile cannot shift the window.
+        filters = RelevesFilters(
+            profile_id=profile_id,
+            date_range=date_range,
+            bank_account_id=bank_account_id,
+            category_id=category_id,
+        )
+        select_with_category, _ = self._select_with_category_embed(
+            "id,date,libelle,montant,devise,categorie,category_id,payee,bank_account_id,metadonnees,"
+            "merchant_entities(canonical_name)"
+        )
+        base_query = [
+            *self._build_query(filters),
+            ("select", select_with_category),
+            ("order", "date.asc,id.asc"),
+            ("limit", page_size),
+        ]
+        category_names: dict[UUID, str | None] = {}
+        after: tuple[str, str] | None = None
+        while True:
+            query = list(base_query)
+            if after is not None:
+                last_date, last_id = after
+                query.append(("or", f"(date.gt.{last_date},and(date.eq.{last_date},id.gt.{last_id}))"))
+            page_rows, _ = self._client.get_rows(table="releves_bancaires", query=query, with_count=False)
+            self._hydrate_category_label(page_rows)
+            for row in page_rows:
+                yield {
+                    "id": str(row.get("id") or ""),
+                    "date": str(row.get("date") or "")[:10],
+                    "montant": Decimal(str(row.get("montant") or "0")),
+                    "devise": row.get("devise"),
+                    "libelle": row.get("libelle"),
+                    "payee": row.get("payee"),
+                    "merchant": self._row_merchant_label(row),
+                    "category": self._row_category_label(row, profile_id=profile_id, category_names=category_names),
+                    "flow_type": self._row_effective_flow_type(row),
+                    "bank_account_id": row.get("bank_account_id"),
+                    "category_id": row.get("category_id"),
+                }
+            if len(page_rows) < page_size:
+                return
+            last_row = page_rows[-1]
+            after = (str(last_row.get("date") or "")[:10], str(last_row.get("id") or ""))
+
     def get_excluded_category_names(self, profile_id: UUID) -> set[str]:
         rows, _ = self._client.get_rows(
             table="profile_categories",
@@ -1025,11 +1485,12 @@ class SupabaseRelevesRepository:
             query={
                 "profile_id": f"eq.{profile_id}",
                 "id": f"in.({ids_filter})",
-                "select": "id",
+                "select": "id,date",
             },
             payload={"bank_account_id": str(bank_account_id)},
             use_anon_key=False,
         )
+        self._refresh_written_months(profile_id=profile_id, dates=[row.get("date") for row in rows])
         return len(rows)
 
     def update_bank_account_id_by_filters(
@@ -1148,6 +1609,7 @@ class SupabaseRelevesRepository:
                 base_payload["contenu_brut"] = row.get("contenu_brut")
             payload.append(base_payload)
         inserted = self._client.post_rows(table="releves_bancaires", payload=payload, use_anon_key=False)
+        self._refresh_written_months(profile_id=profile_id, dates=[item["date"] for item in payload])
         return len(inserted)
 
     def delete_releves_by_ids(self, *, profile_id: UUID, releve_ids: list[UUID]) -> int:
@@ -1159,8 +1621,9 @@ class SupabaseRelevesRepository:
             query={
                 "profile_id": f"eq.{profile_id}",
                 "id": f"in.({ids_filter})",
-                "select": "id",
+                "select": "id,date",
             },
             use_anon_key=False,
         )
+        self._refresh_written_months(profile_id=profile_id, dates=[row.get("date") for row in rows])
         return len(rows)
@@ -0,0 +1,433 @@
+"""Monthly rollups of releves_bancaires, per profile.
+
+Totals, category breakdowns and cashflow summaries re-read every releve of the
+period. ``releves_monthly_rollups`` keeps, for each month, one line per flow
+type, category, bank account and currency with the sum and count of those
+releves, so whole-month requests read a few dozen lines instead.
+
+A line keeps the raw inputs of the report logic (``category_id``, the
+``categorie`` column and the ``category_key`` metadata) rather than resolved
+labels, so renaming a category does not make rollups stale. Its ``flow_type``
+comes from the amount sign and the ``tx_kind`` metadata only; the
+category-based internal transfer rule is applied when reading.
+
+``releves_rollup_months`` gives each month a write generation: a random
+token replaced whenever releves of the month change. Rollup lines are stored
+under the generation they were built for, and a rebuild marks the month fresh
+only with a conditional update on the generation it read before scanning the
+raw rows. A write landing during a rebuild therefore leaves the month stale
+instead of letting an older snapshot pass for fresh, and concurrent rebuilds
+of one generation upsert the same lines. Reads only use the lines of the
+generation a month was last built for.
+
+The releves repository renews and rebuilds the months it writes. Other
+writers (cluster apply, merchant re-linking, profile reset) call
+:func:`invalidate_rollup_months`, and the next read rebuilds the month from
+raw rows.
+"""
+
+from __future__ import annotations
+
+import calendar
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Mapping
+from uuid import UUID, uuid4
+
+from backend.db.supabase_client import SupabaseClient
+from shared import config
+from shared.models import DateRange
+
+
+logger = logging.getLogger(__name__)
+
+ROLLUPS_TABLE = "releves_monthly_rollups"
+ROLLUP_MONTHS_TABLE = "releves_rollup_months"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def month_end(month: date) -> date:
+    return month.replace(day=calendar.monthrange(month.year, month.month)[1])
+
+
+def whole_months(date_range: DateRange | None) -> list[date] | None:
+    """Return the first day of each month of ``date_range`` when it covers whole months only."""
+
+    if date_range is None:
+        return None
+    start, end = date_range.start_date, date_range.end_date
+    if start.day != 1 or end != month_end(end) or end < start:
+        return None
+    months: list[date] = []
+    cursor = start
+    while cursor <= end:
+        months.append(cursor)
+        cursor = month_end(cursor) + timedelta(days=1)
+    return months
+
+
+def _optional_text(value: object) -> str | None:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+@dataclass(frozen=True, slots=True)
+class MonthlyRollupKey:
+    """Grouping key of one rollup line."""
+
+    month: date
+    flow_type: str
+    category_id: str | None = None
+    categorie: str | None = None
+    category_key: str | None = None
+    bank_account_id: str | None = None
+    devise: str | None = None
+
+    @property
+    def rollup_key(self) -> str:
+        """Return the stable text identifier of the line within its month."""
+
+        return json.dumps(
+            [self.flow_type, self.category_id, self.categorie, self.category_key, self.bank_account_id, self.devise],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+
+@dataclass(slots=True)
+class MonthlyRollup:
+    """Sum and count of the releves sharing one :class:`MonthlyRollupKey`."""
+
+    key: MonthlyRollupKey
+    total: Decimal
+    count: int
+
+    def as_row(self) -> dict[str, Any]:
+        return {
+            "month": self.key.month.isoformat(),
+            "rollup_key": self.key.rollup_key,
+            "flow_type": self.key.flow_type,
+            "category_id": self.key.category_id,
+            "categorie": self.key.categorie,
+            "category_key": self.key.category_key,
+            "bank_account_id": self.key.bank_account_id,
+            "devise": self.key.devise,
+            "total": str(self.total),
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> MonthlyRollup:
+        return cls(
+            key=MonthlyRollupKey(
+                month=date.fromisoformat(str(row["month"])[:10]),
+                flow_type=str(row["flow_type"]),
+                category_id=_optional_text(row.get("category_id")),
+                categorie=_optional_text(row.get("categorie")),
+                category_key=_optional_text(row.get("category_key")),
+                bank_account_id=_optional_text(row.get("bank_account_id")),
+                devise=_optional_text(row.get("devise")),
+            ),
+            total=Decimal(str(row.get("total") or "0")),
+            count=int(row.get("count") or 0),
+        )
+
+
+def build_monthly_rollups(
+    rows: Iterable[Mapping[str, Any]],
+    *,
+    base_flow_type: Callable[[Mapping[str, Any]], str],
+    category_key: Callable[[Mapping[str, Any]], str | None],
+) -> list[MonthlyRollup]:
+    """Group raw releves rows (``date``, ``montant``, ``devise``, category columns) into rollups."""
+
+    rollups: dict[MonthlyRollupKey, MonthlyRollup] = {}
+    for row in rows:
+        key = MonthlyRollupKey(
+            month=month_start(date.fromisoformat(str(row["date"])[:10])),
+            flow_type=base_flow_type(row),
+            category_id=_optional_text(row.get("category_id")),
+            categorie=_optional_text(row.get("categorie")),
+            category_key=category_key(row),
+            bank_account_id=_optional_text(row.get("bank_account_id")),
+            devise=_optional_text(row.get("devise")),
+        )
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = rollups[key] = MonthlyRollup(key=key, total=Decimal("0"), count=0)
+        rollup.total += Decimal(str(row.get("montant") or "0"))
+        rollup.count += 1
+    return sorted(rollups.values(), key=lambda rollup: (rollup.key.month, rollup.key.rollup_key))
+
+
+def _months_filter(months: Iterable[date]) -> str:
+    return f"in.({','.join(sorted(month.isoformat() for month in months))})"
+
+
+def _parse_timestamp(value: object) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class RollupMonthState:
+    """Write generation of one month and the generations its stored lines were built for."""
+
+    month: date
+    generation: str
+    built_generation: str | None = None
+    previous_generation: str | None = None
+    refreshed_at: datetime | None = None
+
+    def is_fresh(self, oldest_allowed: datetime) -> bool:
+        return (
+            self.built_generation == self.generation
+            and self.refreshed_at is not None
+            and self.refreshed_at >= oldest_allowed
+        )
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> RollupMonthState:
+        return cls(
+            month=date.fromisoformat(str(row["month"])[:10]),
+            generation=str(row.get("generation") or ""),
+            built_generation=_optional_text(row.get("built_generation")),
+            previous_generation=_optional_text(row.get("previous_generation")),
+            refreshed_at=_parse_timestamp(row.get("refreshed_at")) if row.get("refreshed_at") else None,
+        )
+
+
+class SupabaseRelevesRollupsRepository:
+    """Read and replace the monthly rollups of a profile."""
+
+    def __init__(self, client: SupabaseClient) -> None:
+        self._client = client
+
+    def month_states(self, *, profile_id: UUID, months: Iterable[date]) -> dict[date, RollupMonthState]:
+        months = set(months)
+        if not months:
+            return {}
+        rows, _ = self._client.get_rows(
+            table=ROLLUP_MONTHS_TABLE,
+            query={
+                "select": "month,generation,built_generation,previous_generation,refreshed_at",
+                "profile_id": f"eq.{profile_id}",
+                "month": _months_filter(months),
+            },
+            with_count=False,
+            use_anon_key=False,
+        )
+        states = (RollupMonthState.from_row(row) for row in rows)
+        return {state.month: state for state in states}
+
+    def fresh_months(self, *, profile_id: UUID, months: list[date], max_age: timedelta) -> dict[date, str]:
+        """Return the built generation of each of ``months`` rebuilt less than ``max_age`` ago and unchanged since."""
+
+        oldest_allowed = datetime.now(timezone.utc) - max_age
+        return {
+            month: state.generation
+            for month, state in self.month_states(profile_id=profile_id, months=months).items()
+            if state.is_fresh(oldest_allowed)
+        }
+
+    def list_rollups(
+        self,
+        *,
+        profile_id: UUID,
+        generations: Mapping[date, str],
+        bank_account_id: UUID | None = None,
+        category_id: UUID | None = None,
+        page_size: int = 1000,
+    ) -> list[MonthlyRollup]:
+        """Return the lines each month of ``generations`` stores for its generation.
+
+        Generations are unique tokens, so one ``in`` filter selects every month's own lines.
+        """
+
+        if not generations:
+            return []
+        query: list[tuple[str, str | int]] = [
+            ("select", "month,flow_type,category_id,categorie,category_key,bank_account_id,devise,total,count"),
+            ("profile_id", f"eq.{profile_id}"),
+            ("month", _months_filter(generations)),
+            ("generation", f"in.({','.join(sorted(set(generations.values())))})"),
+        ]
+        if bank_account_id is not None:
+            query.append(("bank_account_id", f"eq.{bank_account_id}"))
+        if category_id is not None:
+            query.append(("category_id", f"eq.{category_id}"))
+        query.append(("order", "month.asc,rollup_key.asc"))
+
+        rollups: list[MonthlyRollup] = []
+        offset = 0
+        while True:
+            page_rows, _ = self._client.get_rows(
+                table=ROLLUPS_TABLE,
+                query=[*query, ("limit", page_size), ("offset", offset)],
+                with_count=False,
+                use_anon_key=False,
+            )
+            rollups.extend(MonthlyRollup.from_row(row) for row in page_rows)
+            if len(page_rows) < page_size:
+                return rollups
+            offset += page_size
+
+    def start_rebuild(self, *, profile_id: UUID, months: list[date], renew: bool) -> dict[date, RollupMonthState]:
+        """Return the state each of ``months`` is rebuilt for, read before the raw releves are scanned.
+
+        Months get a new generation first when ``renew`` is set (after a write),
+        when they have none yet, or when they expired by age at their built
+        generation, whose lines could miss keys that no longer exist.
+        """
+
+        states = self.month_states(profile_id=profile_id, months=months)
+        renewed = [
+            month
+            for month in months
+            if renew or month not in states or states[month].built_generation == states[month].generation
+        ]
+        for month, generation in self.invalidate_months(profile_id=profile_id, months=renewed).items():
+            previous = states.get(month)
+            states[month] = RollupMonthState(
+                month=month,
+                generation=generation,
+                built_generation=previous.built_generation if previous else None,
+                previous_generation=previous.previous_generation if previous else None,
+            )
+        return {month: states[month] for month in months}
+
+    def store_rebuild(
+        self,
+        *,
+        profile_id: UUID,
+        states: Mapping[date, RollupMonthState],
+        rollups: list[MonthlyRollup],
+    ) -> dict[date, str]:
+        """Store ``rollups`` under each month's generation and mark fresh the months still at it.
+
+        Returns the generation of each month marked fresh. Once a month is
+        marked, the lines of the generation built before the replaced one are
+        deleted; readers that just saw the replaced generation keep its lines.
+        """
+
+        if rollups:
+            self._client.upsert_row(
+                table=ROLLUPS_TABLE,
+                payload=[
+                    {**rollup.as_row(), "profile_id": str(profile_id), "generation": states[rollup.key.month].generation}
+                    for rollup in rollups
+                ],
+                on_conflict="profile_id,month,generation,rollup_key",
+            )
+        refreshed_at = datetime.now(timezone.utc).isoformat()
+        built: dict[date, str] = {}
+        for month, state in sorted(states.items()):
+            marked = self._client.patch_rows(
+                table=ROLLUP_MONTHS_TABLE,
+                query={
+                    "profile_id": f"eq.{profile_id}",
+                    "month": f"eq.{month.isoformat()}",
+                    "generation": f"eq.{state.generation}",
+                    "select": "month",
+                },
+                payload={
+                    "built_generation": state.generation,
+                    "previous_generation": state.built_generation,
+                    "refreshed_at": refreshed_at,
+                },
+            )
+            if marked:
+                built[month] = state.generation
+                dead = state.previous_generation
+                if dead in (state.generation, state.built_generation):
+                    dead = None
+            else:
+                # A write renewed the month meanwhile, so this generation is never used again,
+                # unless a concurrent rebuild of it got marked first and now owns its lines.
+                current = self.month_states(profile_id=profile_id, months=[month]).get(month)
+                owned = current is not None and state.generation in (current.built_generation, current.previous_generation)
+                dead = None if owned else state.generation
+            if dead:
+                self._client.delete_rows(
+                    table=ROLLUPS_TABLE,
+                    query={
+                        "profile_id": f"eq.{profile_id}",
+                        "month": f"eq.{month.isoformat()}",
+                        "generation": f"eq.{dead}",
+                        "select": "month",
+                    },
+                    use_anon_key=False,
+                )
+        return built
+
+    def invalidate_months(self, *, profile_id: UUID | str, months: Iterable[date]) -> dict[date, str]:
+        """Give ``months`` a new write generation, which makes them stale, and return it."""
+
+        generations = {month: uuid4().hex for month in sorted(set(months))}
+        if generations:
+            self._client.upsert_row(
+                table=ROLLUP_MONTHS_TABLE,
+                payload=[
+                    {"profile_id": str(profile_id), "month": month.isoformat(), "generation": generation}
+                    for month, generation in generations.items()
+                ],
+                on_conflict="profile_id,month",
+            )
+        return generations
+
+    def delete_profile_rollups(self, *, profile_id: UUID | str) -> None:
+        for table_name in (ROLLUP_MONTHS_TABLE, ROLLUPS_TABLE):
+            self._client.delete_rows(
+                table=table_name,
+                query={"profile_id": f"eq.{profile_id}", "select": "profile_id"},
+                use_anon_key=False,
+            )
+
+
+def invalidate_rollup_months(client: SupabaseClient, rows: Iterable[Mapping[str, Any]]) -> None:
+    """Mark the months of the written releves ``rows`` (``profile_id``, ``date``) as stale.
+
+    Does nothing unless rollups are enabled; a failure is logged, the stale
+    months then expire after ``AGENT_RELEVES_ROLLUPS_MAX_AGE_HOURS``.
+    """
+
+    if not config.releves_rollups_enabled():
+        return
+    months_by_profile: dict[str, set[date]] = {}
+    for row in rows:
+        profile_id = _optional_text(row.get("profile_id"))
+        raw_date = _optional_text(row.get("date"))
+        if profile_id is None or raw_date is None:
+            continue
+        try:
+            months_by_profile.setdefault(profile_id, set()).add(month_start(date.fromisoformat(raw_date[:10])))
+        except ValueError:
+            continue
+    repository = SupabaseRelevesRollupsRepository(client)
+    for profile_id, months in months_by_profile.items():
+        try:
+            repository.invalidate_months(profile_id=profile_id, months=months)
+        except RuntimeError:
+            logger.warning("releves_rollups_invalidate_failed profile_id=%s months=%s", profile_id, len(months))
+
+
+def drop_profile_rollups(client: SupabaseClient, *, profile_id: UUID | str) -> None:
+    """Delete every rollup of a profile whose releves were all deleted, when rollups are enabled."""
+
+    if not config.releves_rollups_enabled():
+        return
+    try:
+        SupabaseRelevesRollupsRepository(client).delete_profile_rollups(profile_id=profile_id)
+    except RuntimeError:
+        logger.warning("releves_rollups_drop_failed profile_id=%s", profile_id)
@@ -6,6 +6,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from backend.db.supabase_client import SupabaseClient
+from backend.repositories.releves_rollups_repository import invalidate_rollup_months
 
 
 class SupabaseTransactionClustersRepository:
@@ -178,12 +179,13 @@ class SupabaseTransactionClustersRepository:
         transaction_ids = [str(row["transaction_id"]) for row in item_rows if row.get("transaction_id")]
 
         if transaction_ids:
-            self._client.patch_rows(
+            patched_rows = self._client.patch_rows(
                 table="releves_bancaires",
                 query=[("id", f"in.({','.join(transaction_ids)})")],
                 payload={"category_id": category_id},
                 use_anon_key=False,
             )
+            invalidate_rollup_months(self._client, patched_rows)
 
         clusters_query = {"id": f"eq.{cluster_id}"}
         if normalized_profile_id:
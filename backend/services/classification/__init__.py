@@ -1,5 +1,14 @@
 """Classification services."""
 
+from backend.services.classification.alias_index import AliasMatch, MerchantAliasIndex, shared_merchant_alias_index
 from backend.services.classification.decision_engine import decide_releve_classification, normalize_merchant_alias
+from backend.services.classification.keyword_matcher import KeywordMatcher
 
-__all__ = ["decide_releve_classification", "normalize_merchant_alias"]
+__all__ = [
+    "AliasMatch",
+    "KeywordMatcher",
+    "MerchantAliasIndex",
+    "decide_releve_classification",
+    "normalize_merchant_alias",
+    "shared_merchant_alias_index",
+]
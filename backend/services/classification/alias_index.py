@@ -0,0 +1,189 @@
+"""In-process fuzzy index over known merchant aliases.
+
+Aliases are keyed with :func:`normalize_label_key`, which already strips
+variable tokens (references, long numbers, IBANs), so ``COOP-1234 LAUSANNE``
+and ``COOP 5678 LAUSANNE`` share the exact key ``coop lausanne``. Remaining
+variations are matched with trigram Dice similarity over an inverted index,
+guarded by a token-set check so that one shared word is never enough.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from backend.services.classification.recurrence import normalize_label_key
+from shared import config
+
+_TRIGRAM_SIZE = 3
+_AMBIGUOUS = ""
+
+
+@dataclass(frozen=True, slots=True)
+class AliasMatch:
+    """Merchant entity matched for an observed alias."""
+
+    merchant_entity_id: str
+    matched_key: str
+    similarity: float
+
+
+def alias_index_key(alias: str | None) -> str:
+    """Return the variable-token-free key used by the index."""
+
+    return normalize_label_key(alias, None)
+
+
+def _trigrams(key: str) -> frozenset[str]:
+    padded = f"  {key} "
+    return frozenset(padded[start:start + _TRIGRAM_SIZE] for start in range(len(padded) - _TRIGRAM_SIZE + 1))
+
+
+def _token_overlap(left: str, right: str) -> float:
+    left_tokens = set(left.split())
+    right_tokens = set(right.split())
+    if not left_tokens or not right_tokens:
+        return 0.0
+    return len(left_tokens & right_tokens) / min(len(left_tokens), len(right_tokens))
+
+
+class MerchantAliasIndex:
+    """Exact + trigram index mapping alias keys to merchant entity ids.
+
+    Keys claimed by several merchant entities are marked ambiguous and never
+    returned, so the index only short-circuits unambiguous aliases.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_similarity: float = 0.8,
+        min_token_overlap: float = 0.5,
+        refresh_interval_s: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_similarity = min_similarity
+        self.min_token_overlap = min_token_overlap
+        self.refresh_interval_s = (
+            config.merchant_alias_index_refresh_seconds() if refresh_interval_s is None else refresh_interval_s
+        )
+        self._clock = clock
+        self._entity_by_key: dict[str, str] = {}
+        self._keys: list[str] = []
+        self._key_trigrams: list[frozenset[str]] = []
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        self._watermark: str | None = None
+        self._last_refresh_at: float | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entity_by_key)
+
+    def add(self, *, alias: str | None, merchant_entity_id: str) -> None:
+        """Register one alias for a merchant entity (idempotent)."""
+
+        key = alias_index_key(alias)
+        entity_id = str(merchant_entity_id or "").strip()
+        if not key or not entity_id:
+            return
+        with self._lock:
+            self._add_locked(key, entity_id)
+
+    def _add_locked(self, key: str, entity_id: str) -> None:
+        existing = self._entity_by_key.get(key)
+        if existing is not None:
+            if existing != entity_id:
+                self._entity_by_key[key] = _AMBIGUOUS
+            return
+        self._entity_by_key[key] = entity_id
+        key_index = len(self._keys)
+        trigrams = _trigrams(key)
+        self._keys.append(key)
+        self._key_trigrams.append(trigrams)
+        for trigram in trigrams:
+            self._postings[trigram].append(key_index)
+
+    def lookup(self, alias: str | None) -> AliasMatch | None:
+        """Return the unambiguous merchant entity for ``alias`` or ``None``."""
+
+        key = alias_index_key(alias)
+        if not key:
+            return None
+
+        exact = self._entity_by_key.get(key)
+        if exact is not None:
+            return AliasMatch(merchant_entity_id=exact, matched_key=key, similarity=1.0) if exact else None
+
+        query_trigrams = _trigrams(key)
+        shared_counts: dict[int, int] = defaultdict(int)
+        for trigram in query_trigrams:
+            for key_index in self._postings.get(trigram, ()):
+                shared_counts[key_index] += 1
+
+        best_match: AliasMatch | None = None
+        best_tied = False
+        for key_index, shared in shared_counts.items():
+            candidate_trigrams = self._key_trigrams[key_index]
+            similarity = 2 * shared / (len(query_trigrams) + len(candidate_trigrams))
+            if similarity < self.min_similarity:
+                continue
+            candidate_key = self._keys[key_index]
+            if _token_overlap(key, candidate_key) < self.min_token_overlap:
+                continue
+            entity_id = self._entity_by_key.get(candidate_key)
+            if not entity_id:
+                continue
+            if best_match is None or similarity > best_match.similarity:
+                best_match = AliasMatch(merchant_entity_id=entity_id, matched_key=candidate_key, similarity=round(similarity, 6))
+                best_tied = False
+            elif similarity == best_match.similarity and entity_id != best_match.merchant_entity_id:
+                best_tied = True
+
+        return None if best_tied else best_match
+
+    def refresh(self, repository: Any) -> int:
+        """Load aliases seen since the last refresh and return how many were read."""
+
+        loader = getattr(repository, "list_merchant_aliases_for_index", None)
+        if loader is None:
+            return 0
+        rows = loader(seen_after=self._watermark)
+        with self._lock:
+            for row in rows:
+                entity_id = str(row.get("merchant_entity_id") or "").strip()
+                for raw_alias in (row.get("alias"), row.get("alias_norm")):
+                    key = alias_index_key(raw_alias)
+                    if key and entity_id:
+                        self._add_locked(key, entity_id)
+                last_seen = row.get("last_seen")
+                if isinstance(last_seen, str) and (self._watermark is None or last_seen > self._watermark):
+                    self._watermark = last_seen
+            self._last_refresh_at = self._clock()
+        return len(rows)
+
+    def ensure_fresh(self, repository: Any) -> int:
+        """Refresh the index when it was never loaded or is older than the interval."""
+
+        if (
+            self._last_refresh_at is not None
+            and self._clock() - self._last_refresh_at < self.refresh_interval_s
+        ):
+            return 0
+        return self.refresh(repository)
+
+
+_SHARED_INDEX: MerchantAliasIndex | None = None
+_SHARED_INDEX_LOCK = threading.Lock()
+
+
+def shared_merchant_alias_index() -> MerchantAliasIndex:
+    """Return the process-wide alias index (created lazily, loaded on first import)."""
+
+    global _SHARED_INDEX
+    with _SHARED_INDEX_LOCK:
+        if _SHARED_INDEX is None:
+            _SHARED_INDEX = MerchantAliasIndex()
+        return _SHARED_INDEX
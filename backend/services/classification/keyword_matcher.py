@@ -0,0 +1,117 @@
+"""Compiled multi-keyword matcher for deterministic rule tables.
+
+All keywords of a rule table are compiled once into a single prefix-factored
+regex wrapped in a zero-width lookahead, so one C-level scan reports every
+position where some keyword starts, together with the longest keyword
+starting there. Every other keyword starting at that position is one of its
+prefixes, precomputed at build time. The result is the full (overlapping) set
+of hits for one pass over the text, equivalent to ``keyword in text`` checks
+for every keyword.
+
+Keywords registered through ``word_groups`` additionally require word
+boundaries on both sides, matching ``\\bkeyword\\b`` semantics on normalized
+ASCII text.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Return a regex alternation factored by common prefixes.
+
+    ``re`` tries alternatives one by one, so sharing prefixes keeps the work at
+    each text position close to one character dispatch; longer continuations
+    are greedy, so the match is the longest keyword starting at the position.
+    """
+
+    trie: dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _render(node: dict[str, Any]) -> str:
+        branches = [re.escape(char) + _render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return _render(trie)
+
+
+class KeywordMatcher:
+    """Return the rule groups whose keywords occur in a text, in one pass."""
+
+    def __init__(
+        self,
+        groups: Mapping[str, Iterable[str]] | None = None,
+        *,
+        word_groups: Mapping[str, Iterable[str]] | None = None,
+    ) -> None:
+        plain_hits: dict[str, set[tuple[str, str]]] = defaultdict(set)
+        word_hits: dict[str, set[tuple[str, str]]] = defaultdict(set)
+        for target, source in ((plain_hits, groups or {}), (word_hits, word_groups or {})):
+            for group_name, keywords in source.items():
+                for keyword in keywords:
+                    if not keyword:
+                        raise ValueError(f"Empty keyword in group {group_name!r}")
+                    target[keyword].add((group_name, keyword))
+
+        keywords = sorted(set(plain_hits) | set(word_hits))
+        self.group_names = frozenset(
+            group_name for hits in (*plain_hits.values(), *word_hits.values()) for group_name, _ in hits
+        )
+        # The regex only reports the longest keyword starting at each position;
+        # the other keywords starting there are its prefixes, resolved once here.
+        # Word keywords found as substrings are confirmed with their own
+        # ``\b...\b`` regex, which only runs for the few candidates of a text.
+        self._plain_by_longest: dict[str, frozenset[tuple[str, str]]] = {}
+        self._word_by_longest: dict[str, tuple[tuple[re.Pattern[str], frozenset[tuple[str, str]]], ...]] = {}
+        for longest in keywords:
+            prefixes = [keyword for keyword in keywords if longest.startswith(keyword)]
+            self._plain_by_longest[longest] = frozenset(
+                hit for keyword in prefixes for hit in plain_hits.get(keyword, ())
+            )
+            word_checks = tuple(
+                (re.compile(rf"\b{re.escape(keyword)}\b"), frozenset(word_hits[keyword]))
+                for keyword in prefixes
+                if keyword in word_hits
+            )
+            if word_checks:
+                self._word_by_longest[longest] = word_checks
+        self._pattern = re.compile(f"(?=({_trie_pattern(keywords)}))") if keywords else None
+
+    def matches(self, text: str) -> set[tuple[str, str]]:
+        """Return every ``(group, keyword)`` pair whose keyword occurs in ``text``."""
+
+        matched: set[tuple[str, str]] = set()
+        if self._pattern is None or not text:
+            return matched
+        for longest in set(self._pattern.findall(text)):
+            matched |= self._plain_by_longest[longest]
+            word_checks = self._word_by_longest.get(longest)
+            if word_checks:
+                for pattern, hits in word_checks:
+                    if pattern.search(text):
+                        matched |= hits
+        return matched
+
+    def hits(self, text: str) -> frozenset[str]:
+        """Return the names of every group with at least one keyword in ``text``."""
+
+        return frozenset(group_name for group_name, _ in self.matches(text))
+
+    def group_counts(self, text: str) -> dict[str, int]:
+        """Return, per group, how many distinct keywords of that group occur in ``text``."""
+
+        counts: dict[str, int] = {}
+        for group_name, _ in self.matches(text):
+            counts[group_name] = counts.get(group_name, 0) + 1
+        return counts
@@ -0,0 +1,22 @@
+"""Local (pre-LLM) merchant categorizer services."""
+
+from backend.services.merchant_categorizer.model import (
+    MerchantCategorizer,
+    MerchantPrediction,
+    MerchantTrainingExample,
+    evaluate_categorizer,
+    split_examples,
+    training_examples_from_rows,
+)
+from backend.services.merchant_categorizer.service import load_default_merchant_categorizer, predict_confident_link
+
+__all__ = [
+    "MerchantCategorizer",
+    "MerchantPrediction",
+    "MerchantTrainingExample",
+    "evaluate_categorizer",
+    "load_default_merchant_categorizer",
+    "predict_confident_link",
+    "split_examples",
+    "training_examples_from_rows",
+]
@@ -0,0 +1,305 @@
+"""CPU-only merchant categorizer trained from known merchant entities.
+
+The model is a TF-IDF nearest-neighbour index over character n-grams and
+word tokens of canonical merchant names and known aliases. It predicts the
+closest merchant entity (for alias auto-linking) and a category voted by the
+nearest neighbours (``suggested_category_norm``).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from backend.services.classification.recurrence import normalize_label_key
+
+MODEL_FORMAT_VERSION = 1
+_CHAR_NGRAM_SIZE = 3
+_DEFAULT_NEIGHBOURS = 5
+
+
+@dataclass(frozen=True, slots=True)
+class MerchantTrainingExample:
+    """One labelled text (canonical name or alias) for a merchant entity."""
+
+    text: str
+    merchant_entity_id: str
+    canonical_name: str
+    category_norm: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class MerchantPrediction:
+    """Nearest merchant entity and voted category for an observed alias."""
+
+    merchant_entity_id: str
+    canonical_name: str
+    confidence: float
+    category_norm: str | None
+    category_confidence: float
+
+
+def normalize_categorizer_text(value: str | None) -> str:
+    """Normalize a label and drop variable tokens (references, long numbers)."""
+
+    return normalize_label_key(value, None)
+
+
+def _features(normalized_text: str) -> Counter[str]:
+    features: Counter[str] = Counter()
+    for token in normalized_text.split():
+        features[f"w:{token}"] += 1
+        padded = f" {token} "
+        if len(padded) <= _CHAR_NGRAM_SIZE:
+            features[f"c:{padded}"] += 1
+            continue
+        for start in range(len(padded) - _CHAR_NGRAM_SIZE + 1):
+            features[f"c:{padded[start:start + _CHAR_NGRAM_SIZE]}"] += 1
+    return features
+
+
+def _weighted_vector(features: Counter[str], idf: dict[str, float]) -> dict[str, float]:
+    vector: dict[str, float] = {}
+    for feature, count in features.items():
+        feature_idf = idf.get(feature)
+        if feature_idf is None:
+            continue
+        vector[feature] = (1.0 + math.log(count)) * feature_idf
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if norm <= 0:
+        return {}
+    return {feature: weight / norm for feature, weight in vector.items()}
+
+
+class MerchantCategorizer:
+    """TF-IDF nearest-neighbour index over labelled merchant texts."""
+
+    def __init__(self, *, documents: list[MerchantTrainingExample], idf: dict[str, float]) -> None:
+        self.documents = documents
+        self.idf = idf
+        self._postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        for doc_index, document in enumerate(documents):
+            vector = _weighted_vector(_features(document.text), idf)
+            for feature, weight in vector.items():
+                self._postings[feature].append((doc_index, weight))
+
+    @classmethod
+    def train(cls, examples: Iterable[MerchantTrainingExample]) -> MerchantCategorizer:
+        """Build the index from labelled examples (duplicates are collapsed)."""
+
+        documents: list[MerchantTrainingExample] = []
+        seen: set[tuple[str, str]] = set()
+        for example in examples:
+            normalized_text = normalize_categorizer_text(example.text)
+            if not normalized_text or not example.merchant_entity_id:
+                continue
+            dedup_key = (normalized_text, example.merchant_entity_id)
+            if dedup_key in seen:
+                continue
+            seen.add(dedup_key)
+            documents.append(
+                MerchantTrainingExample(
+                    text=normalized_text,
+                    merchant_entity_id=example.merchant_entity_id,
+                    canonical_name=example.canonical_name,
+                    category_norm=(example.category_norm or "").strip().lower() or None,
+                )
+            )
+
+        document_frequency: Counter[str] = Counter()
+        for document in documents:
+            document_frequency.update(set(_features(document.text)))
+        total_documents = len(documents)
+        idf = {
+            feature: math.log((1 + total_documents) / (1 + frequency)) + 1.0
+            for feature, frequency in document_frequency.items()
+        }
+        return cls(documents=documents, idf=idf)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def neighbours(self, text: str | None, *, k: int = _DEFAULT_NEIGHBOURS) -> list[tuple[int, float]]:
+        """Return the ``k`` most similar documents as ``(index, cosine)`` pairs."""
+
+        normalized_text = normalize_categorizer_text(text)
+        if not normalized_text or not self.documents:
+            return []
+        query = _weighted_vector(_features(normalized_text), self.idf)
+        scores: dict[int, float] = defaultdict(float)
+        for feature, weight in query.items():
+            for doc_index, doc_weight in self._postings.get(feature, ()):
+                scores[doc_index] += weight * doc_weight
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[: max(1, k)]
+
+    def predict(self, text: str | None, *, k: int = _DEFAULT_NEIGHBOURS) -> MerchantPrediction | None:
+        """Predict the nearest merchant entity and category for ``text``."""
+
+        ranked = self.neighbours(text, k=k)
+        if not ranked:
+            return None
+
+        best_index, best_score = ranked[0]
+        best_document = self.documents[best_index]
+
+        category_votes: dict[str, float] = defaultdict(float)
+        total_votes = 0.0
+        for doc_index, score in ranked:
+            total_votes += score
+            category_norm = self.documents[doc_index].category_norm
+            if category_norm:
+                category_votes[category_norm] += score
+
+        category_norm: str | None = None
+        category_confidence = 0.0
+        if category_votes and total_votes > 0:
+            category_norm, votes = max(category_votes.items(), key=lambda item: (item[1], item[0]))
+            category_confidence = min(1.0, votes / total_votes) * min(1.0, best_score)
+
+        return MerchantPrediction(
+            merchant_entity_id=best_document.merchant_entity_id,
+            canonical_name=best_document.canonical_name,
+            confidence=round(min(1.0, best_score), 6),
+            category_norm=category_norm,
+            category_confidence=round(category_confidence, 6),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": MODEL_FORMAT_VERSION,
+            "idf": self.idf,
+            "documents": [
+                [document.text, document.merchant_entity_id, document.canonical_name, document.category_norm]
+                for document in self.documents
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> MerchantCategorizer:
+        if payload.get("version") != MODEL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported merchant categorizer format: {payload.get('version')!r}")
+        documents = [
+            MerchantTrainingExample(
+                text=str(text),
+                merchant_entity_id=str(merchant_entity_id),
+                canonical_name=str(canonical_name),
+                category_norm=category_norm if isinstance(category_norm, str) else None,
+            )
+            for text, merchant_entity_id, canonical_name, category_norm in payload.get("documents", [])
+        ]
+        idf = {str(feature): float(weight) for feature, weight in dict(payload.get("idf") or {}).items()}
+        return cls(documents=documents, idf=idf)
+
+    def save(self, path: str | Path) -> None:
+        """Write the model as JSON atomically."""
+
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(self.to_dict(), handle, ensure_ascii=False)
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: str | Path) -> MerchantCategorizer:
+        with open(path, encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
+
+
+def training_examples_from_rows(rows: Iterable[dict[str, Any]]) -> list[MerchantTrainingExample]:
+    """Convert repository training rows into examples, skipping incomplete rows."""
+
+    examples: list[MerchantTrainingExample] = []
+    for row in rows:
+        merchant_entity_id = str(row.get("merchant_entity_id") or "").strip()
+        text = " ".join(str(row.get("text") or "").split())
+        canonical_name = " ".join(str(row.get("canonical_name") or "").split())
+        if not merchant_entity_id or not text:
+            continue
+        raw_category = row.get("suggested_category_norm")
+        examples.append(
+            MerchantTrainingExample(
+                text=text,
+                merchant_entity_id=merchant_entity_id,
+                canonical_name=canonical_name or text,
+                category_norm=raw_category if isinstance(raw_category, str) else None,
+            )
+        )
+    return examples
+
+
+def split_examples(
+    examples: list[MerchantTrainingExample],
+    *,
+    holdout_ratio: float = 0.2,
+    seed: int = 13,
+) -> tuple[list[MerchantTrainingExample], list[MerchantTrainingExample]]:
+    """Split examples into train/holdout keeping canonical names in the train set."""
+
+    aliases = [example for example in examples if example.text != example.canonical_name]
+    canonicals = [example for example in examples if example.text == example.canonical_name]
+    shuffled = list(aliases)
+    random.Random(seed).shuffle(shuffled)
+    holdout_size = int(len(shuffled) * max(0.0, min(1.0, holdout_ratio)))
+    return canonicals + shuffled[holdout_size:], shuffled[:holdout_size]
+
+
+def evaluate_categorizer(
+    categorizer: MerchantCategorizer,
+    examples: list[MerchantTrainingExample],
+    *,
+    link_threshold: float,
+) -> dict[str, float | int]:
+    """Measure entity/category accuracy, auto-link precision and per-query latency."""
+
+    latencies_us: list[float] = []
+    entity_hits = 0
+    category_hits = 0
+    category_total = 0
+    linked = 0
+    linked_correct = 0
+    for example in examples:
+        started = time.perf_counter()
+        prediction = categorizer.predict(example.text)
+        latencies_us.append((time.perf_counter() - started) * 1_000_000)
+        if prediction is None:
+            continue
+        is_correct_entity = prediction.merchant_entity_id == example.merchant_entity_id
+        entity_hits += int(is_correct_entity)
+        if example.category_norm:
+            category_total += 1
+            category_hits += int(prediction.category_norm == example.category_norm)
+        if prediction.confidence >= link_threshold:
+            linked += 1
+            linked_correct += int(is_correct_entity)
+
+    latencies_us.sort()
+
+    def _percentile(ratio: float) -> float:
+        if not latencies_us:
+            return 0.0
+        return round(latencies_us[min(len(latencies_us) - 1, int(ratio * len(latencies_us)))], 1)
+
+    total = len(examples)
+    return {
+        "examples": total,
+        "entity_accuracy": round(entity_hits / total, 4) if total else 0.0,
+        "category_accuracy": round(category_hits / category_total, 4) if category_total else 0.0,
+        "auto_link_coverage": round(linked / total, 4) if total else 0.0,
+        "auto_link_precision": round(linked_correct / linked, 4) if linked else 0.0,
+        "latency_p50_us": _percentile(0.50),
+        "latency_p95_us": _percentile(0.95),
+    }
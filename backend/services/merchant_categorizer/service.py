@@ -0,0 +1,56 @@
+"""Runtime access to the trained merchant categorizer."""
+
+from __future__ import annotations
+
+import logging
+import os
+from functools import lru_cache
+
+from backend.services.merchant_categorizer.model import MerchantCategorizer, MerchantPrediction
+from shared import config
+
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4)
+def _load_categorizer(path: str, mtime_ns: int) -> MerchantCategorizer | None:
+    try:
+        categorizer = MerchantCategorizer.load(path)
+    except (OSError, ValueError) as exc:
+        logger.warning("merchant_categorizer_load_failed path=%s error=%s", path, exc)
+        return None
+    logger.info("merchant_categorizer_loaded path=%s documents=%s", path, len(categorizer))
+    return categorizer
+
+
+def load_default_merchant_categorizer() -> MerchantCategorizer | None:
+    """Return the configured categorizer, reloading it when the model file changes."""
+
+    path = (config.merchant_categorizer_model_path() or "").strip()
+    if not path:
+        return None
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _load_categorizer(path, mtime_ns)
+
+
+def predict_confident_link(
+    categorizer: MerchantCategorizer | None,
+    observed_alias: str | None,
+    *,
+    threshold: float | None = None,
+) -> MerchantPrediction | None:
+    """Return a prediction only when it is confident enough to auto-link the alias."""
+
+    if categorizer is None or not observed_alias:
+        return None
+    prediction = categorizer.predict(observed_alias)
+    if prediction is None:
+        return None
+    min_confidence = config.merchant_categorizer_link_threshold() if threshold is None else threshold
+    if prediction.confidence < min_confidence:
+        return None
+    return prediction
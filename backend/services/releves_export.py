@@ -0,0 +1,114 @@
+"""Streaming CSV and NDJSON encoding of exported releves.
+
+:func:`encode_releves_export` turns the rows of
+``RelevesRepository.iter_releves_for_export`` into byte chunks of at most
+``batch_size`` rows. It consumes the rows lazily, so an export holds only one
+repository page and one chunk in memory, whatever the history size.
+
+Statement labels are partly written by third parties (payees, card
+terminals). In CSV, free-text cells that a spreadsheet would read as a
+formula are prefixed with a quote.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from decimal import Decimal
+from enum import Enum
+from typing import Iterable, Iterator, Mapping
+
+
+EXPORT_COLUMNS = (
+    "date",
+    "montant",
+    "devise",
+    "libelle",
+    "payee",
+    "merchant",
+    "category",
+    "flow_type",
+    "bank_account_id",
+    "category_id",
+    "id",
+)
+
+
+class RelevesExportFormat(str, Enum):
+    """File format of a releves export."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @property
+    def media_type(self) -> str:
+        if self == RelevesExportFormat.CSV:
+            return "text/csv; charset=utf-8"
+        return "application/x-ndjson"
+
+
+def _export_value(value: object) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, Decimal):
+        return format(value, "f")
+    return str(value)
+
+
+_FREE_TEXT_COLUMNS = frozenset({"libelle", "payee", "merchant"})
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(column: str, value: object) -> str:
+    text = _export_value(value) or ""
+    if column in _FREE_TEXT_COLUMNS and text.startswith(_FORMULA_PREFIXES):
+        return "'" + text
+    return text
+
+
+def _csv_chunks(rows: Iterable[Mapping[str, object]], batch_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_COLUMNS)
+    pending = 0
+    for row in rows:
+        writer.writerow([_csv_cell(column, row.get(column)) for column in EXPORT_COLUMNS])
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_chunks(rows: Iterable[Mapping[str, object]], batch_size: int) -> Iterator[bytes]:
+    lines: list[str] = []
+    for row in rows:
+        lines.append(
+            json.dumps({column: _export_value(row.get(column)) for column in EXPORT_COLUMNS}, ensure_ascii=False)
+        )
+        if len(lines) >= batch_size:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines.clear()
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def encode_releves_export(
+    rows: Iterable[Mapping[str, object]],
+    export_format: RelevesExportFormat,
+    *,
+    batch_size: int = 500,
+) -> Iterator[bytes]:
+    """Yield ``rows`` encoded as CSV (with a header line) or NDJSON, ``batch_size`` rows per chunk.
+
+    Amounts keep their exact decimal text; missing values are empty CSV cells
+    or JSON ``null``.
+    """
+
+    batch_size = max(1, batch_size)
+    if export_format == RelevesExportFormat.CSV:
+        return _csv_chunks(rows, batch_size)
+    return _ndjson_chunks(rows, batch_size)
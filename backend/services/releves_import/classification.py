@@ -16,7 +16,10 @@ import re
 import unicodedata
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, Literal
+from functools import lru_cache
+from typing import Any, Literal, Mapping
+
+from backend.services.classification.keyword_matcher import KeywordMatcher
 
 TxKind = Literal["expense", "income", "transfer_internal"]
 CategoryStatus = Literal["confirmed", "pending"]
@@ -85,24 +88,38 @@ _KNOWN_MERCHANT_MARKERS = (
     "starbucks",
 )
 
-_TWINT_P2P_MARKERS_REGEX = re.compile(r"\b(envoi|transfert|p2p|peer)\b")
+_INTERNAL_TRANSFER_MARKERS = (
+    "virement interne",
+    "transfert interne",
+    "entre comptes",
+    "internal transfer",
+    "transfer between accounts",
+)
+_TOPUP_MARKERS = ("top up", "topup", "recharge")
+_SALARY_MARKERS = ("salaire", "salary", "payroll", "lohn", "salar")
+_REFUND_MARKERS = ("refund", "remboursement", "retour", "chargeback", "storno")
+_INSURANCE_MARKERS = ("assurance", "insurance", "axa", "zurich", "helvetia", "mobiliar")
+_SUBSCRIPTIONS_MARKERS = ("subscription", "abonnement", "mensuel", "monthly", "spotify", "netflix", "apple", "google")
+
+_TWINT_P2P_MARKERS = ("envoi", "transfert", "p2p", "peer")
 _TWINT_P2P_NAME_REGEX = re.compile(r"\btwint\b.*\ba\b\s+([a-z]{2,})\s+([a-z]{2,})")
 _TWINT_NON_PERSON_TOKENS = frozenset({"la", "le", "les", "un", "une", "des", "du", "de", "d", "au", "aux"})
-_TAXES_REGEX = re.compile(r"\b(tax|impot|impots|steuer|estv|afc|vat)\b")
-
-_BANKING_FEE_STRONG_PATTERNS: tuple[re.Pattern[str], ...] = (
-    re.compile(r"\btenue de compte\b"),
-    re.compile(r"\bkontofuehrung(?:sgebuehr)?\b"),
-    re.compile(r"\bspesen\b"),
-    re.compile(r"\boverdraft fee\b"),
-    re.compile(r"\baccount maintenance(?: fee)?\b"),
-    re.compile(r"\bclosing fee\b"),
-    re.compile(r"\bfrais carte\b"),
-    re.compile(r"\bcommission carte\b"),
+_TAXES_MARKERS = ("tax", "impot", "impots", "steuer", "estv", "afc", "vat")
+
+_BANKING_FEE_STRONG_MARKERS = (
+    "tenue de compte",
+    "kontofuehrung",
+    "kontofuehrungsgebuehr",
+    "spesen",
+    "overdraft fee",
+    "account maintenance",
+    "account maintenance fee",
+    "closing fee",
+    "frais carte",
+    "commission carte",
 )
-
-_BANKING_FEE_GENERIC_FEE_REGEX = re.compile(r"\b(gebuehr|gebuehren|commission|frais|fee)\b")
-_BANKING_FEE_CONTEXT_REGEX = re.compile(r"\b(konto|compte|karte|card|zins|interest|spesen|atm|bargeld|withdrawal)\b")
+_BANKING_FEE_GENERIC_MARKERS = ("gebuehr", "gebuehren", "commission", "frais", "fee")
+_BANKING_FEE_CONTEXT_MARKERS = ("konto", "compte", "karte", "card", "zins", "interest", "spesen", "atm", "bargeld", "withdrawal")
 
 _BANKING_TRANSFER_EXCLUSION_MARKERS = (
     "ordre permanent",
@@ -119,15 +136,48 @@ _BANKING_TRANSFER_EXCLUSION_MARKERS = (
     "ebill",
 )
 
+_CLASSIFICATION_CACHE_SIZE = 8192
+
+_MERCHANT_RULE_GROUPS = tuple(f"merchant:{category_key}" for _, category_key in _MERCHANT_CATEGORY_RULES)
+
+# Every keyword table above is compiled into one matcher so each row is scanned
+# once; substring groups keep ``marker in text`` semantics and word groups keep
+# ``\b...\b`` semantics.
+_RULE_MATCHER = KeywordMatcher(
+    {
+        "internal_transfer": _INTERNAL_TRANSFER_MARKERS,
+        "bank": _KNOWN_BANK_MARKERS,
+        "topup": _TOPUP_MARKERS,
+        "twint": ("twint",),
+        "known_merchant": _KNOWN_MERCHANT_MARKERS,
+        "salary": _SALARY_MARKERS,
+        "refund": _REFUND_MARKERS,
+        "insurance": _INSURANCE_MARKERS,
+        "subscriptions": _SUBSCRIPTIONS_MARKERS,
+        "banking_transfer_exclusion": _BANKING_TRANSFER_EXCLUSION_MARKERS,
+        **{
+            group_name: keywords
+            for group_name, (keywords, _) in zip(_MERCHANT_RULE_GROUPS, _MERCHANT_CATEGORY_RULES)
+        },
+    },
+    word_groups={
+        "twint_p2p_marker": _TWINT_P2P_MARKERS,
+        "taxes": _TAXES_MARKERS,
+        "banking_fee_strong": _BANKING_FEE_STRONG_MARKERS,
+        "banking_fee_generic": _BANKING_FEE_GENERIC_MARKERS,
+        "banking_fee_context": _BANKING_FEE_CONTEXT_MARKERS,
+    },
+)
+
 
-def _is_banking_fee(text: str) -> bool:
-    if any(marker in text for marker in _BANKING_TRANSFER_EXCLUSION_MARKERS):
+def _is_banking_fee(hits: Mapping[str, int]) -> bool:
+    if "banking_transfer_exclusion" in hits:
         return False
 
-    if any(pattern.search(text) for pattern in _BANKING_FEE_STRONG_PATTERNS):
+    if "banking_fee_strong" in hits:
         return True
 
-    return bool(_BANKING_FEE_GENERIC_FEE_REGEX.search(text) and _BANKING_FEE_CONTEXT_REGEX.search(text))
+    return "banking_fee_generic" in hits and "banking_fee_context" in hits
 
 
 def _normalize_text(value: str) -> str:
@@ -145,36 +195,28 @@ def _to_decimal(value: Any) -> Decimal:
     return Decimal(str(value))
 
 
-def _is_internal_transfer(text: str) -> bool:
-    direct_markers = (
-        "virement interne",
-        "transfert interne",
-        "entre comptes",
-        "internal transfer",
-        "transfer between accounts",
-    )
-    if any(marker in text for marker in direct_markers):
+def _is_internal_transfer(hits: Mapping[str, int]) -> bool:
+    if "internal_transfer" in hits:
         return True
 
-    bank_hits = sum(1 for marker in _KNOWN_BANK_MARKERS if marker in text)
+    bank_hits = hits.get("bank", 0)
     if bank_hits >= 2:
         return True
 
-    topup_markers = ("top up", "topup", "recharge")
-    return any(marker in text for marker in topup_markers) and any(bank in text for bank in _KNOWN_BANK_MARKERS)
+    return "topup" in hits and bank_hits > 0
 
 
-def _is_twint_p2p(text: str) -> bool:
-    if "twint" not in text:
+def _is_twint_p2p(text: str, hits: Mapping[str, int]) -> bool:
+    if "twint" not in hits:
         return False
 
-    if _pick_fallback_category_key(text) != "other":
+    if _pick_fallback_category_key(hits) != "other":
         return False
 
-    if any(merchant in text for merchant in _KNOWN_MERCHANT_MARKERS):
+    if "known_merchant" in hits:
         return False
 
-    if _TWINT_P2P_MARKERS_REGEX.search(text):
+    if "twint_p2p_marker" in hits:
         return True
 
     name_match = _TWINT_P2P_NAME_REGEX.search(text)
@@ -185,9 +227,9 @@ def _is_twint_p2p(text: str) -> bool:
     return first_name_like not in _TWINT_NON_PERSON_TOKENS and last_name_like not in _TWINT_NON_PERSON_TOKENS
 
 
-def _pick_fallback_category_key(text: str) -> str:
-    for keywords, category_key in _MERCHANT_CATEGORY_RULES:
-        if any(keyword in text for keyword in keywords):
+def _pick_fallback_category_key(hits: Mapping[str, int]) -> str:
+    for group_name, (_, category_key) in zip(_MERCHANT_RULE_GROUPS, _MERCHANT_CATEGORY_RULES):
+        if group_name in hits:
             return category_key
     return "other"
 
@@ -200,39 +242,43 @@ def classify_and_categorize_transaction(row: dict[str, Any]) -> ClassifiedTransa
     so pending categories can be surfaced to users later.
     """
 
-    text = _joined_text(row)
     amount = _to_decimal(row.get("montant"))
+    amount_sign = (amount > 0) - (amount < 0)
+    return _classify_normalized_text(_joined_text(row), amount_sign)
+
+
+# Statement labels repeat heavily (same merchants, same TWINT wording), and the
+# result only depends on the normalized text and the sign of the amount.
+@lru_cache(maxsize=_CLASSIFICATION_CACHE_SIZE)
+def _classify_normalized_text(text: str, amount_sign: int) -> ClassifiedTransaction:
+    hits = _RULE_MATCHER.group_counts(text)
 
-    if _is_internal_transfer(text):
+    if _is_internal_transfer(hits):
         return ClassifiedTransaction("transfer_internal", "transfer_internal", _SYSTEM_CATEGORY_LABELS["transfer_internal"], "confirmed")
 
-    if _is_twint_p2p(text):
-        tx_kind: TxKind = "income" if amount > 0 else "expense"
+    if _is_twint_p2p(text, hits):
+        tx_kind: TxKind = "income" if amount_sign > 0 else "expense"
         return ClassifiedTransaction(tx_kind, "twint_p2p_pending", _SYSTEM_CATEGORY_LABELS["twint_p2p_pending"], "pending")
 
-    if amount > 0:
-        salary_markers = ("salaire", "salary", "payroll", "lohn", "salar")
-        refund_markers = ("refund", "remboursement", "retour", "chargeback", "storno")
-        if any(marker in text for marker in salary_markers) and not any(marker in text for marker in refund_markers):
+    if amount_sign > 0:
+        if "salary" in hits and "refund" not in hits:
             return ClassifiedTransaction("income", "income_salary", _SYSTEM_CATEGORY_LABELS["income_salary"], "confirmed")
         return ClassifiedTransaction("income", "income_other", _SYSTEM_CATEGORY_LABELS["income_other"], "confirmed")
 
-    if _is_banking_fee(text) and any(bank in text for bank in _KNOWN_BANK_MARKERS):
+    if _is_banking_fee(hits) and "bank" in hits:
         return ClassifiedTransaction("expense", "banking_fees", _SYSTEM_CATEGORY_LABELS["banking_fees"], "confirmed")
 
-    if _TAXES_REGEX.search(text):
+    if "taxes" in hits:
         return ClassifiedTransaction("expense", "taxes", _SYSTEM_CATEGORY_LABELS["taxes"], "confirmed")
 
-    insurance_markers = ("assurance", "insurance", "axa", "zurich", "helvetia", "mobiliar")
-    if any(marker in text for marker in insurance_markers):
+    if "insurance" in hits:
         return ClassifiedTransaction("expense", "insurance", _SYSTEM_CATEGORY_LABELS["insurance"], "confirmed")
 
-    subscriptions_markers = ("subscription", "abonnement", "mensuel", "monthly", "spotify", "netflix", "apple", "google")
-    if any(marker in text for marker in subscriptions_markers):
+    if "subscriptions" in hits:
         return ClassifiedTransaction("expense", "subscriptions", _SYSTEM_CATEGORY_LABELS["subscriptions"], "confirmed")
 
-    fallback_key = _pick_fallback_category_key(text)
-    if amount < 0:
+    fallback_key = _pick_fallback_category_key(hits)
+    if amount_sign < 0:
         return ClassifiedTransaction("expense", fallback_key, _SYSTEM_CATEGORY_LABELS.get(fallback_key, _SYSTEM_CATEGORY_LABELS["other"]), "confirmed")
     return ClassifiedTransaction("income", "income_other", _SYSTEM_CATEGORY_LABELS["income_other"], "confirmed")
 
@@ -15,8 +15,10 @@ from backend.repositories.profiles_repository import ProfilesRepository
 from backend.repositories.releves_repository import RelevesRepository
 from backend.repositories.shared_expenses_repository import SupabaseSharedExpensesRepository
 from backend.repositories.transaction_clusters_repository import SupabaseTransactionClustersRepository
+from backend.services.classification.alias_index import MerchantAliasIndex
 from backend.services.classification.recurrence import detect_monthly_recurring_clusters
 from backend.services.classification.decision_engine import decide_releve_classification, normalize_merchant_alias
+from backend.services.merchant_categorizer import MerchantCategorizer, predict_confident_link
 from backend.services.releves_import.classification import classify_and_categorize_transaction, resolve_system_category_label
 from backend.services.releves_import.dedup import compare_rows
 from backend.services.releves_import.routing import route_bank_parser
@@ -42,6 +44,8 @@ class RelevesImportService:
     releves_repository: RelevesRepository
     profiles_repository: ProfilesRepository | None = None
     transaction_clusters_repository: SupabaseTransactionClustersRepository | None = None
+    merchant_categorizer: MerchantCategorizer | None = None
+    alias_index: MerchantAliasIndex | None = None
 
     _MAX_RECURRING_CLUSTER_SCOPE_ROWS = 20_000
 
@@ -431,6 +435,35 @@ class RelevesImportService:
                     )
                     break
 
+            if merchant_entity_id is None and self.alias_index is not None:
+                alias_match = self.alias_index.lookup(observed_alias)
+                if alias_match is not None:
+                    merchant_entity_id = UUID(alias_match.merchant_entity_id)
+                    merchant_resolution = "resolved_fuzzy_alias"
+                    meta_dict["alias_index_similarity"] = alias_match.similarity
+                    self.profiles_repository.upsert_merchant_alias(
+                        merchant_entity_id=merchant_entity_id,
+                        alias=observed_alias,
+                        alias_norm=observed_alias_key_norm or observed_alias_norm,
+                        source="alias_index",
+                    )
+                    self.alias_index.add(alias=observed_alias, merchant_entity_id=alias_match.merchant_entity_id)
+
+            if merchant_entity_id is None:
+                prediction = predict_confident_link(self.merchant_categorizer, observed_alias)
+                if prediction is not None:
+                    merchant_entity_id = UUID(prediction.merchant_entity_id)
+                    merchant_resolution = "resolved_local_categorizer"
+                    meta_dict["merchant_categorizer_confidence"] = prediction.confidence
+                    self.profiles_repository.upsert_merchant_alias(
+                        merchant_entity_id=merchant_entity_id,
+                        alias=observed_alias,
+                        alias_norm=observed_alias_key_norm or observed_alias_norm,
+                        source="local_categorizer",
+                    )
+                    if self.alias_index is not None:
+                        self.alias_index.add(alias=observed_alias, merchant_entity_id=str(merchant_entity_id))
+
             if merchant_entity_id is None:
                 merchant_resolution = "unresolved"
                 meta_dict["llm_context"] = self._build_non_sensitive_llm_context(
@@ -584,6 +617,12 @@ class RelevesImportService:
         parsed_batches: list[tuple[str, str, list[dict[str, object]]]] = []
         total_rows_to_categorize = 0
 
+        if self.alias_index is not None and self.profiles_repository is not None:
+            try:
+                self.alias_index.ensure_fresh(self.profiles_repository)
+            except Exception:
+                logger.warning("merchant_alias_index_refresh_failed profile_id=%s", request.profile_id, exc_info=True)
+
         for file in request.files:
             try:
                 content = base64.b64decode(file.content_base64)
@@ -0,0 +1,140 @@
+"""Multi-period spending trend computed in one pass over the releves.
+
+Comparing N months with the single-period report costs N full report builds.
+:func:`aggregate_spending_trend` instead takes the releves of the whole range,
+read once by ``RelevesRepository.load_releves_batch`` into a columnar
+:class:`~backend.repositories.releves_batch.RelevesBatch`. It assigns each
+releve to its month or ISO week, then computes the report totals, the
+cashflow split, the category breakdown and the merchant totals as integer
+group sums over the batch columns.
+"""
+
+from __future__ import annotations
+
+import calendar
+from bisect import bisect_right
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, Sequence
+
+from backend.repositories.releves_batch import (
+    FLOW_EXPENSE,
+    FLOW_INCOME,
+    FLOW_TRANSFER_INTERNAL,
+    RelevesBatch,
+    cents_to_decimal,
+    group_count,
+    group_sum,
+)
+from shared.models import RelevesTrendGranularity, RelevesTrendRequest, RelevesTrendResult
+
+
+MAX_TREND_PERIODS = 120
+
+
+def trend_periods(start: date, end: date, granularity: RelevesTrendGranularity) -> list[tuple[str, date, date]]:
+    """Return ``(label, first day, last day)`` of each period of ``start``..``end``, clipped to the range."""
+
+    periods: list[tuple[str, date, date]] = []
+    if granularity == RelevesTrendGranularity.WEEK:
+        cursor = start - timedelta(days=start.weekday())
+        while cursor <= end:
+            iso_year, iso_week, _ = cursor.isocalendar()
+            periods.append(
+                (f"{iso_year}-W{iso_week:02d}", max(cursor, start), min(cursor + timedelta(days=6), end))
+            )
+            cursor += timedelta(days=7)
+        return periods
+
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        last_day = date(year, month, calendar.monthrange(year, month)[1])
+        periods.append((f"{year}-{month:02d}", max(date(year, month, 1), start), min(last_day, end)))
+        year, month = (year, month + 1) if month < 12 else (year + 1, 1)
+    return periods
+
+
+def _period_codes(batch: RelevesBatch, periods: list[tuple[str, date, date]]) -> tuple[list[int], bytearray]:
+    """Return the period code of each releve and a 0/1 mask of the releves inside the periods."""
+
+    starts = [first.toordinal() for _label, first, _last in periods]
+    first_day, last_day = starts[0], periods[-1][2].toordinal()
+    codes: list[int] = []
+    in_range = bytearray()
+    for ordinal in batch.day_ordinals:
+        if first_day <= ordinal <= last_day:
+            codes.append(bisect_right(starts, ordinal) - 1)
+            in_range.append(1)
+        else:
+            codes.append(0)
+            in_range.append(0)
+    return codes, in_range
+
+
+def _both(left: bytearray, right: bytearray) -> bytearray:
+    return bytearray(a & b for a, b in zip(left, right))
+
+
+def _ranked_series(
+    labels: list[str],
+    label_codes: Iterable[int],
+    period_codes: list[int],
+    amounts: Sequence[int],
+    mask: bytearray,
+    size: int,
+) -> list[tuple[str, list[Decimal]]]:
+    """Return ``(label, per-period spending)`` of the labels of the masked releves, biggest total first."""
+
+    composite = [label * size + period for label, period in zip(label_codes, period_codes)]
+    totals = group_sum(composite, amounts, len(labels) * size, mask)
+    present = group_count(list(label_codes), len(labels), mask)
+    series = [
+        (labels[code], totals[code * size : (code + 1) * size])
+        for code in range(len(labels))
+        if present[code]
+    ]
+    series.sort(key=lambda item: -sum(item[1]), reverse=True)
+    return [(label, [cents_to_decimal(-cents) for cents in values]) for label, values in series]
+
+
+def aggregate_spending_trend(batch: RelevesBatch, request: RelevesTrendRequest) -> RelevesTrendResult:
+    """Aggregate a releves batch (see ``load_releves_batch``) into columnar per-period series."""
+
+    start, end = request.date_range.start_date, request.date_range.end_date
+    if end < start:
+        raise ValueError(f"trend end_date {end.isoformat()} is before start_date {start.isoformat()}")
+    periods = trend_periods(start, end, request.granularity)
+    if len(periods) > MAX_TREND_PERIODS:
+        raise ValueError(f"trend spans {len(periods)} periods, at most {MAX_TREND_PERIODS} are allowed")
+
+    size = len(periods)
+    period_codes, in_range = _period_codes(batch, periods)
+    amounts = batch.amount_cents
+    income_mask = _both(in_range, batch.flow_mask(FLOW_INCOME))
+    expense_mask = _both(in_range, batch.flow_mask(FLOW_EXPENSE))
+    transfer_mask = _both(in_range, batch.flow_mask(FLOW_TRANSFER_INTERNAL))
+    spending_mask = _both(in_range, batch.flow_mask(FLOW_EXPENSE, include_excluded=False))
+
+    income = [cents_to_decimal(cents) for cents in group_sum(period_codes, amounts, size, income_mask)]
+    expense = [cents_to_decimal(cents) for cents in group_sum(period_codes, amounts, size, expense_mask)]
+    categories = _ranked_series(batch.categories, batch.category_codes, period_codes, amounts, spending_mask, size)
+    merchants = _ranked_series(batch.merchants, batch.merchant_codes, period_codes, amounts, spending_mask, size)
+    return RelevesTrendResult(
+        granularity=request.granularity,
+        periods=[label for label, _first, _last in periods],
+        period_starts=[first for _label, first, _last in periods],
+        period_ends=[last for _label, _first, last in periods],
+        spending=[cents_to_decimal(-cents) for cents in group_sum(period_codes, amounts, size, spending_mask)],
+        spending_count=group_count(period_codes, size, spending_mask),
+        income=income,
+        expense=expense,
+        net_cashflow=[period_income + period_expense for period_income, period_expense in zip(income, expense)],
+        internal_transfers=[
+            cents_to_decimal(cents) for cents in group_sum(period_codes, amounts, size, transfer_mask)
+        ],
+        transaction_count=group_count(period_codes, size, in_range),
+        categories=dict(categories),
+        top_merchants=dict(merchants[: request.top_merchants]),
+        currency=batch.first_currency(),
+        filters=request,
+    )
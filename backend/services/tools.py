@@ -18,7 +18,10 @@ from backend.repositories.profiles_repository import ProfilesRepository
 from backend.repositories.releves_repository import RelevesRepository
 from backend.repositories.transaction_clusters_repository import SupabaseTransactionClustersRepository
 from backend.repositories.transactions_repository import TransactionsRepository
+from backend.services.classification.alias_index import shared_merchant_alias_index
+from backend.services.merchant_categorizer import load_default_merchant_categorizer
 from backend.services.releves_import import RelevesImportService
+from backend.services.spending_trend import aggregate_spending_trend
 from backend.services.merchant_suggestions.apply_map_alias import apply_map_alias_suggestion
 from shared.text_utils import normalize_category_name
 from shared.models import (
@@ -43,6 +46,8 @@ from shared.models import (
     ReleveBancaire,
     RelevesSearchResult,
     RelevesSumResult,
+    RelevesTrendRequest,
+    RelevesTrendResult,
     ToolError,
     ToolErrorCode,
     TransactionFilters,
@@ -100,6 +105,8 @@ class BackendToolService:
                 releves_repository=self.releves_repository,
                 profiles_repository=self.profiles_repository,
                 transaction_clusters_repository=self.transaction_clusters_repository,
+                merchant_categorizer=load_default_merchant_categorizer(),
+                alias_index=shared_merchant_alias_index() if self.profiles_repository is not None else None,
             )
             return service.import_releves(request, on_progress=on_progress)
         except Exception as exc:
@@ -203,6 +210,19 @@ class BackendToolService:
         except Exception as exc:  # placeholder normalization at contract boundary
             return ToolError(code=ToolErrorCode.BACKEND_ERROR, message=str(exc))
 
+    def releves_trend(self, request: RelevesTrendRequest) -> RelevesTrendResult | ToolError:
+        try:
+            batch = self.releves_repository.load_releves_batch(
+                profile_id=request.profile_id,
+                date_range=request.date_range,
+                bank_account_id=request.bank_account_id,
+            )
+            return aggregate_spending_trend(batch, request)
+        except ValueError as exc:
+            return ToolError(code=ToolErrorCode.VALIDATION_ERROR, message=str(exc))
+        except Exception as exc:  # placeholder normalization at contract boundary
+            return ToolError(code=ToolErrorCode.BACKEND_ERROR, message=str(exc))
+
     def _apply_category_filter_resolution(
         self,
         request: RelevesFilters | RelevesAggregateRequest,
@@ -0,0 +1,4 @@
+"""Load-testing and benchmark suite for the agent API.
+
+Run ``python -m benchmarks.load_test --help`` for the chat load test.
+"""
@@ -0,0 +1,131 @@
+"""Compare the stdlib and orjson codecs on API and Supabase payloads.
+
+Usage:
+    python -m benchmarks.json_codec
+    python -m benchmarks.json_codec --rounds 50 --transactions 5000
+
+Payloads mirror the largest bodies of the app: a spending report with every
+transaction (API response), a page of releves as sent to and read back from
+PostgREST (``Decimal``, ``UUID`` and ``date`` values), and a list of merchant
+suggestions. Each codec reports the median encode and decode time per payload
+and the encoded size; orjson is skipped when it is not installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable
+from uuid import UUID, uuid5
+
+from shared.json_codec import ORJSON_CODEC, STDLIB_CODEC, JsonCodec
+
+_NAMESPACE = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+_CATEGORIES = ("Alimentation", "Logement", "Transport", "Loisirs", "Restaurants", "Santé", "Impôts", "Abonnements")
+
+
+def spending_report_payload(*, transactions: int) -> dict[str, Any]:
+    """Return a spending report body as the API renders it (amounts already text)."""
+
+    rows = [
+        {
+            "date": (date(2026, 1, 1) + timedelta(days=index % 31)).isoformat(),
+            "merchant": f"Marchand {index % 150}",
+            "category": _CATEGORIES[index % len(_CATEGORIES)],
+            "amount": f"-{10 + index % 90}.{index % 100:02d}",
+            "flow_type": "expense",
+        }
+        for index in range(transactions)
+    ]
+    return {
+        "period": {"start_date": "2026-01-01", "end_date": "2026-01-31", "label": "janvier 2026"},
+        "currency": "CHF",
+        "total": "48213.55",
+        "count": transactions,
+        "categories": [{"name": name, "amount": f"{900 - index * 50}.00"} for index, name in enumerate(_CATEGORIES)],
+        "transactions": rows,
+    }
+
+
+def releves_page(*, rows: int) -> list[dict[str, Any]]:
+    """Return releves rows with native ``Decimal``/``UUID``/``date`` values, as a bulk insert sends them."""
+
+    profile_id = uuid5(_NAMESPACE, "profile")
+    return [
+        {
+            "id": uuid5(_NAMESPACE, f"releve-{index}"),
+            "profile_id": profile_id,
+            "date": date(2025, 1, 1) + timedelta(days=index % 365),
+            "montant": Decimal(f"-{index % 500}.{index % 100:02d}"),
+            "devise": "CHF",
+            "libelle": f"Paiement carte {index} Migros Lausanne Gare",
+            "payee": "Migros",
+            "categorie": _CATEGORIES[index % len(_CATEGORIES)],
+            "metadonnees": {"source": "csv", "line": index, "tx_kind": "card"},
+            "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=index),
+        }
+        for index in range(rows)
+    ]
+
+
+def merchant_suggestions(*, suggestions: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": str(uuid5(_NAMESPACE, f"suggestion-{index}")),
+            "observed_alias": f"CARTE {index:06d} COOP PRONTO",
+            "suggested_name": "Coop Pronto",
+            "suggested_category": "Alimentation",
+            "confidence": 0.87,
+            "status": "pending",
+        }
+        for index in range(suggestions)
+    ]
+
+
+def _median_ms(action: Callable[[], object], rounds: int) -> float:
+    timings: list[float] = []
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def run(*, codec: JsonCodec, rounds: int = 20, transactions: int = 2000) -> dict[str, Any]:
+    """Measure ``codec`` on each payload."""
+
+    payloads = {
+        "spending_report": spending_report_payload(transactions=transactions),
+        "releves_page": releves_page(rows=1000),
+        "merchant_suggestions": merchant_suggestions(suggestions=500),
+    }
+    results: dict[str, Any] = {"codec": codec.name, "rounds": rounds}
+    for name, payload in payloads.items():
+        encoded = codec.dumps(payload)
+        results[name] = {
+            "bytes": len(encoded),
+            "encode_ms": _median_ms(lambda: codec.dumps(payload), rounds),
+            "decode_ms": _median_ms(lambda: codec.loads(encoded), rounds),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20, help="Encodes and decodes per payload.")
+    parser.add_argument("--transactions", type=int, default=2000, help="Transactions in the spending report.")
+    args = parser.parse_args()
+    for codec in (STDLIB_CODEC, ORJSON_CODEC):
+        if codec is None:
+            print("json_codec: orjson is not installed, skipped")
+            continue
+        report = run(codec=codec, rounds=args.rounds, transactions=args.transactions)
+        print(f"json_codec: {json.dumps(report, sort_keys=True)}")
+
+
+if __name__ == "__main__":
+    main()
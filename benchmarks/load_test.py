@@ -0,0 +1,335 @@
+"""Replay scripted conversations against the API with concurrent virtual users.
+
+Usage:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --users 20 --iterations 5 --llm-latency-ms 800
+    python -m benchmarks.load_test --save-baseline benchmarks/baselines/local.json
+    python -m benchmarks.load_test --baseline benchmarks/baselines/local.json
+
+The app runs in-process behind ``TestClient``; Supabase is served by the fake
+PostgREST of ``tests.fake_postgrest`` with ``--postgrest-latency-ms`` per
+round-trip and the LLM planner by a stub sleeping ``--llm-latency-ms`` per
+completion. Background LLM jobs and alias auto-resolution are disabled so no
+run ever reaches OpenAI.
+
+The report gives throughput, p50/p95/p99 latency overall and per scenario
+step, and, from request traces, the mean per-stage time, Supabase round-trips
+and LLM calls of every endpoint. ``--baseline`` compares p95 latency and
+throughput with a saved report and exits non-zero past ``--max-regression``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from benchmarks.scenarios import SCENARIOS, VirtualUser, seed_user
+from benchmarks.stub_llm import StubLLMClient
+from shared.tracing import Trace, add_trace_listener
+from tests.fake_postgrest import FakePostgrest
+
+
+_BENCHMARK_ENV = {
+    "SUPABASE_SERVICE_ROLE_KEY": "bench-service-role-key",
+    "SUPABASE_ANON_KEY": "bench-anon-key",
+    "OPENAI_API_KEY": "",
+    "AGENT_LLM_ENABLED": "1",
+    "AGENT_LLM_GATED": "0",
+    "AGENT_LLM_SHADOW": "0",
+    "AGENT_LLM_BACKGROUND_ENABLED": "0",
+    "AGENT_AUTO_RESOLVE_MERCHANT_ALIASES": "0",
+    "TRACE_LOG_SAMPLE_RATE": "0",
+    "TRACE_EXPORTER": "",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Sample:
+    scenario: str
+    step: str
+    ms: float
+    status: int
+
+
+def percentile(values: list[float], fraction: float) -> float | None:
+    """Return the nearest-rank percentile of ``values`` (``fraction`` in 0..1)."""
+
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return round(ordered[rank - 1], 2)
+
+
+def _latency_stats(samples: list[Sample]) -> dict[str, Any]:
+    latencies = [sample.ms for sample in samples]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if sample.status >= 400),
+        "mean": round(sum(latencies) / len(latencies), 2) if latencies else None,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+    }
+
+
+class _Session:
+    """Per-thread HTTP session recording one sample per call."""
+
+    def __init__(self, client: Any, scenario: str, samples: list[Sample], lock: threading.Lock) -> None:
+        self._client = client
+        self._scenario = scenario
+        self._samples = samples
+        self._lock = lock
+
+    def call(self, step: str, method: str, path: str, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        response = self._client.request(method, path, **kwargs)
+        sample = Sample(self._scenario, step, (time.perf_counter() - started) * 1000, response.status_code)
+        with self._lock:
+            self._samples.append(sample)
+        return response
+
+
+_PATH_ID_PATTERN = re.compile(r"/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(?=/|$)")
+
+
+class _EndpointStats:
+    """Aggregates finished request traces per endpoint (path ids folded to ``{id}``)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_endpoint: dict[str, dict[str, Any]] = {}
+
+    def __call__(self, trace: Trace) -> None:
+        summary = trace.summary()
+        with self._lock:
+            stats = self._by_endpoint.setdefault(
+                _PATH_ID_PATTERN.sub("/{id}", trace.name),
+                {"requests": 0, "ms": 0.0, "supabase_calls": 0, "supabase_ms": 0.0, "llm_calls": 0, "stages": {}},
+            )
+            stats["requests"] += 1
+            stats["ms"] += summary["total_ms"]
+            stats["supabase_calls"] += summary["supabase"]["calls"]
+            stats["supabase_ms"] += summary["supabase"]["ms"]
+            stats["llm_calls"] += summary["llm"]["calls"]
+            for stage, stage_stats in summary["stages"].items():
+                stats["stages"][stage] = stats["stages"].get(stage, 0.0) + stage_stats["ms"]
+
+    def report(self) -> dict[str, Any]:
+        with self._lock:
+            items = sorted(self._by_endpoint.items())
+        report: dict[str, Any] = {}
+        for endpoint, stats in items:
+            count = stats["requests"]
+            report[endpoint] = {
+                "requests": count,
+                "mean_ms": round(stats["ms"] / count, 2),
+                "supabase_calls_per_request": round(stats["supabase_calls"] / count, 2),
+                "supabase_ms_per_request": round(stats["supabase_ms"] / count, 2),
+                "llm_calls_per_request": round(stats["llm_calls"] / count, 2),
+                "stages_mean_ms": {
+                    stage: round(total_ms / count, 2)
+                    for stage, total_ms in sorted(stats["stages"].items(), key=lambda item: -item[1])
+                },
+            }
+        return report
+
+
+@contextmanager
+def _benchmark_environment(server_url: str, llm_latency_ms: float) -> Iterator[None]:
+    """Point the app at the fake backends and restore env and singletons afterwards."""
+
+    import agent.api as agent_api
+    from agent.backend_client import BackendClient
+    from agent.llm_planner import LLMPlanner
+    from agent.loop import AgentLoop
+    from agent.tool_cache import shared_tool_result_cache
+    from agent.tool_router import ToolRouter
+    from backend.factory import build_backend_tool_service
+
+    overrides = {**_BENCHMARK_ENV, "SUPABASE_URL": server_url}
+    if (os.environ.get("APP_ENV") or "").strip().lower() in {"test", "ci"}:
+        # The LLM planner is hard-disabled in test/ci environments.
+        overrides["APP_ENV"] = "local"
+    previous_env = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    original_get_agent_loop = agent_api.get_agent_loop
+    for factory in (agent_api.get_profiles_repository, agent_api.get_tool_router, original_get_agent_loop):
+        factory.cache_clear()
+    shared_tool_result_cache().clear()
+
+    tool_router = ToolRouter(
+        backend_client=BackendClient(tool_service=build_backend_tool_service()),
+        result_cache=shared_tool_result_cache(),
+    )
+    loop = AgentLoop(tool_router=tool_router, llm_planner=LLMPlanner(client=StubLLMClient(latency_ms=llm_latency_ms)))
+    agent_api.get_agent_loop = lambda: loop
+    try:
+        yield
+    finally:
+        agent_api.get_agent_loop = original_get_agent_loop
+        for name, value in previous_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        for factory in (agent_api.get_profiles_repository, agent_api.get_tool_router, original_get_agent_loop):
+            factory.cache_clear()
+        shared_tool_result_cache().clear()
+
+
+def run(
+    *,
+    scenarios: list[str] | None = None,
+    users: int = 10,
+    iterations: int = 3,
+    rows: int = 300,
+    llm_latency_ms: float = 400.0,
+    postgrest_latency_ms: float = 15.0,
+) -> dict[str, Any]:
+    from fastapi.testclient import TestClient
+
+    from agent.api import app
+
+    selected = [SCENARIOS[name] for name in (scenarios or list(SCENARIOS))]
+    server = FakePostgrest(latency_ms=postgrest_latency_ms).start()
+    samples: list[Sample] = []
+    samples_lock = threading.Lock()
+    endpoint_stats = _EndpointStats()
+
+    def _virtual_user(index: int) -> None:
+        client = TestClient(app, raise_server_exceptions=False)
+        onboarded_user: VirtualUser | None = None
+        for iteration in range(iterations):
+            for scenario in selected:
+                if scenario.onboarded:
+                    if onboarded_user is None:
+                        onboarded_user = seed_user(server, index, onboarded=True, rows=rows)
+                    user = onboarded_user
+                else:
+                    user = seed_user(server, (iteration + 1) * users + index, onboarded=False, rows=0)
+                scenario.run(_Session(client, scenario.name, samples, samples_lock), user)
+
+    try:
+        with _benchmark_environment(server.url, llm_latency_ms):
+            remove_listener = add_trace_listener(endpoint_stats)
+            started = time.perf_counter()
+            try:
+                with ThreadPoolExecutor(max_workers=users, thread_name_prefix="bench-user") as executor:
+                    for future in [executor.submit(_virtual_user, index) for index in range(users)]:
+                        future.result()
+            finally:
+                remove_listener()
+            duration_s = time.perf_counter() - started
+    finally:
+        server.stop()
+
+    steps: dict[str, list[Sample]] = {}
+    for sample in samples:
+        steps.setdefault(f"{sample.scenario}/{sample.step}", []).append(sample)
+    return {
+        "config": {
+            "scenarios": [scenario.name for scenario in selected],
+            "users": users,
+            "iterations": iterations,
+            "rows": rows,
+            "llm_latency_ms": llm_latency_ms,
+            "postgrest_latency_ms": postgrest_latency_ms,
+        },
+        "duration_s": round(duration_s, 3),
+        "throughput_rps": round(len(samples) / duration_s, 2) if duration_s > 0 else None,
+        "latency_ms": _latency_stats(samples),
+        "steps": {name: _latency_stats(step_samples) for name, step_samples in sorted(steps.items())},
+        "endpoints": endpoint_stats.report(),
+        "supabase_round_trips": server.stats()["round_trips"],
+    }
+
+
+def compare_with_baseline(report: dict[str, Any], baseline: dict[str, Any], *, max_regression: float) -> list[str]:
+    """Return one message per p95 latency or throughput regression beyond ``max_regression``."""
+
+    regressions: list[str] = []
+    base_rps = baseline.get("throughput_rps")
+    rps = report.get("throughput_rps")
+    if base_rps and rps is not None and rps < base_rps * (1 - max_regression):
+        regressions.append(f"throughput {rps} rps < baseline {base_rps} rps")
+
+    latencies = {"overall": report["latency_ms"], **report.get("steps", {})}
+    base_latencies = {"overall": baseline.get("latency_ms", {}), **baseline.get("steps", {})}
+    for name, stats in latencies.items():
+        base_p95 = base_latencies.get(name, {}).get("p95")
+        p95 = stats.get("p95")
+        if base_p95 and p95 is not None and p95 > base_p95 * (1 + max_regression):
+            regressions.append(f"{name} p95 {p95} ms > baseline {base_p95} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help=f"Comma-separated scenarios to replay ({', '.join(SCENARIOS)}).",
+    )
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users.")
+    parser.add_argument("--iterations", type=int, default=3, help="Times each user replays the scenarios.")
+    parser.add_argument("--rows", type=int, default=300, help="Transactions seeded per onboarded user.")
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0, help="Stub LLM latency per completion.")
+    parser.add_argument(
+        "--postgrest-latency-ms",
+        type=float,
+        default=15.0,
+        help="Latency injected per fake PostgREST round-trip.",
+    )
+    parser.add_argument("--save-baseline", type=Path, help="Write the report to this JSON file.")
+    parser.add_argument("--baseline", type=Path, help="Compare the report with this saved JSON report.")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="Tolerated relative p95/throughput regression against --baseline.",
+    )
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios.split(",") if name and name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    report = run(
+        scenarios=[name for name in args.scenarios.split(",") if name],
+        users=args.users,
+        iterations=args.iterations,
+        rows=args.rows,
+        llm_latency_ms=args.llm_latency_ms,
+        postgrest_latency_ms=args.postgrest_latency_ms,
+    )
+    print(f"load_test: {json.dumps(report, sort_keys=True)}")
+
+    if args.save_baseline is not None:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    if args.baseline is not None:
+        regressions = compare_with_baseline(
+            report,
+            json.loads(args.baseline.read_text(encoding="utf-8")),
+            max_regression=args.max_regression,
+        )
+        for regression in regressions:
+            print(f"regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
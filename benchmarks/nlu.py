@@ -0,0 +1,105 @@
+"""Benchmark the per-message cost of the deterministic NLU routers.
+
+Usage:
+    python -m benchmarks.nlu
+    python -m benchmarks.nlu --rounds 2000
+
+Every message of a small chat corpus goes through the routers a chat turn
+consults (intent parser, deterministic planner, follow-up detection and
+planning, period extraction). Shared message-analysis caches are cleared
+before each round so each message pays its normalization once, like a new
+chat turn would.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any
+
+from agent.deterministic_nlu import parse_intent
+from agent.memory import QueryMemory, followup_plan_from_message, is_followup_message, period_payload_from_message
+from agent.planner import deterministic_plan_from_message
+
+CORPUS = (
+    "Combien j'ai dépensé chez Migros en janvier 2026 ?",
+    "Mes dépenses en alimentation en février 2026",
+    "dépenses par catégorie",
+    "Et chez Coop ?",
+    "et en mars ?",
+    "Montre-moi mes dernières dépenses",
+    "cherche coop ubs",
+    "recherche migros en janvier 2025",
+    "liste mes catégories",
+    "liste mes comptes bancaires",
+    "renomme la catégorie « Resto » en « Restaurants »",
+    "supprime la catégorie Loisirs",
+    "crée un compte Revolut",
+    "je veux importer un relevé csv",
+    "dépenses ces 3 derniers mois",
+    "total des dépenses le mois dernier",
+    "oui",
+    "non merci",
+    "ok",
+    "Quel est mon prénom ?",
+    "mets à jour mon profil ville Lausanne",
+    "dépenses en décembre 2025 et janvier 2026",
+    "et en transport ?",
+    "search: coop from:2026-01-01 to:2026-01-31",
+    "Salut, comment ça va ?",
+)
+
+_MEMORY = QueryMemory(
+    date_range={"start_date": "2026-01-01", "end_date": "2026-01-31"},
+    last_tool_name="finance_releves_sum",
+    last_intent="sum",
+    filters={"direction": "DEBIT_ONLY"},
+)
+_KNOWN_CATEGORIES = ["Alimentation", "Transport", "Logement", "Loisirs", "Restaurants", "Santé"]
+
+
+def _clear_message_caches() -> None:
+    try:
+        from agent.message_features import clear_message_caches
+    except ImportError:
+        return
+    clear_message_caches()
+
+
+def route_message(message: str) -> None:
+    """Run ``message`` through the deterministic routers of one chat turn."""
+
+    parse_intent(message)
+    deterministic_plan_from_message(message)
+    is_followup_message(message)
+    followup_plan_from_message(message, _MEMORY, known_categories=_KNOWN_CATEGORIES)
+    period_payload_from_message(message)
+
+
+def run(*, rounds: int = 1_000) -> dict[str, Any]:
+    elapsed_s = 0.0
+    for _ in range(rounds):
+        _clear_message_caches()
+        started = time.perf_counter()
+        for message in CORPUS:
+            route_message(message)
+        elapsed_s += time.perf_counter() - started
+    messages = rounds * len(CORPUS)
+    return {
+        "rounds": rounds,
+        "messages": messages,
+        "elapsed_ms": round(elapsed_s * 1000, 1),
+        "us_per_message": round(elapsed_s * 1_000_000 / messages, 2) if messages else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=1_000, help="Passes over the message corpus.")
+    args = parser.parse_args()
+    print(f"nlu: {json.dumps(run(rounds=args.rounds), sort_keys=True)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Compare the matplotlib and vector chart renderers of the spending report PDF.
+
+Usage:
+    python -m benchmarks.report_render
+    python -m benchmarks.report_render --rounds 50 --categories 12
+
+Each renderer is measured in a fresh interpreter so that import cost and
+memory are not shared: time to import its dependencies, first and median
+render time, peak Python allocations during a render (``tracemalloc``),
+process peak RSS and PDF size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from typing import Any
+
+RENDERERS = ("matplotlib", "vector")
+
+_CATEGORY_NAMES = (
+    "Alimentation",
+    "Logement",
+    "Transport",
+    "Assurances",
+    "Loisirs",
+    "Restaurants",
+    "Santé",
+    "Impôts",
+    "Shopping",
+    "Abonnements",
+    "Voyages",
+    "Cadeaux",
+)
+
+
+def sample_report(*, categories: int = 10, transactions: int = 40) -> Any:
+    """Return a representative :class:`SpendingReportData`."""
+
+    from backend.reporting.models import SpendingCategoryRow, SpendingReportData, SpendingTransactionRow
+
+    category_rows = [
+        SpendingCategoryRow(
+            name=_CATEGORY_NAMES[index] if index < len(_CATEGORY_NAMES) else f"Catégorie {index}",
+            amount=Decimal(900 // (index + 1)),
+        )
+        for index in range(categories)
+    ]
+    transaction_rows = [
+        SpendingTransactionRow(
+            date=f"2026-01-{(index % 28) + 1:02d}",
+            merchant=f"Marchand {index}",
+            category=category_rows[index % len(category_rows)].name if category_rows else "Autres",
+            amount=Decimal(f"-{10 + index}.50"),
+            flow_type="expense",
+        )
+        for index in range(transactions)
+    ]
+    total = sum((row.amount for row in category_rows), Decimal("0"))
+    return SpendingReportData(
+        period_label="janvier 2026",
+        start_date="2026-01-01",
+        end_date="2026-01-31",
+        total=total,
+        count=transactions,
+        currency="CHF",
+        categories=category_rows,
+        transactions=transaction_rows,
+    )
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run(*, renderer: str, rounds: int = 20, categories: int = 10) -> dict[str, Any]:
+    """Measure ``renderer`` in the current interpreter."""
+
+    started = time.perf_counter()
+    if renderer == "matplotlib":
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot  # noqa: F401
+    from backend.reporting.spending_report import generate_spending_report_pdf
+
+    import_ms = (time.perf_counter() - started) * 1000
+    data = sample_report(categories=categories)
+
+    timings_ms: list[float] = []
+    pdf = b""
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        pdf = generate_spending_report_pdf(data, chart_renderer=renderer)
+        timings_ms.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    generate_spending_report_pdf(data, chart_renderer=renderer)
+    _current, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "renderer": renderer,
+        "rounds": len(timings_ms),
+        "import_ms": round(import_ms, 1),
+        "first_render_ms": round(timings_ms[0], 1),
+        "median_render_ms": round(statistics.median(timings_ms), 1),
+        "peak_alloc_kb": round(peak_bytes / 1024, 1),
+        "peak_rss_mb": _peak_rss_mb(),
+        "pdf_bytes": len(pdf),
+    }
+
+
+def run_isolated(*, renderer: str, rounds: int, categories: int) -> dict[str, Any]:
+    """Run :func:`run` for ``renderer`` in a fresh interpreter."""
+
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.report_render",
+            "--renderer",
+            renderer,
+            "--rounds",
+            str(rounds),
+            "--categories",
+            str(categories),
+            "--in-process",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--renderer", choices=RENDERERS, help="Measure a single renderer.")
+    parser.add_argument("--rounds", type=int, default=20, help="Renders per renderer.")
+    parser.add_argument("--categories", type=int, default=10, help="Categories in the sample report.")
+    parser.add_argument("--in-process", action="store_true", help="Measure in this interpreter and print JSON only.")
+    args = parser.parse_args()
+
+    if args.in_process:
+        print(json.dumps(run(renderer=args.renderer or "vector", rounds=args.rounds, categories=args.categories)))
+        return
+    for renderer in [args.renderer] if args.renderer else RENDERERS:
+        report = run_isolated(renderer=renderer, rounds=args.rounds, categories=args.categories)
+        print(f"report_render: {json.dumps(report, sort_keys=True)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Scripted conversations replayed by the load test.
+
+Each scenario seeds one virtual user in the fake PostgREST store and then
+drives the API through ``session.call(step, method, path, ...)`` like the UI
+would. Scenarios do not assert on replies: a non-2xx status is recorded as an
+error by the session and the conversation carries on.
+"""
+
+from __future__ import annotations
+
+import base64
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Protocol
+from uuid import UUID, uuid4
+
+from tests.fake_postgrest import FakePostgrest
+
+
+_MERCHANTS = ("COOP", "MIGROS", "DENNER", "SBB CFF FFS", "SPOTIFY", "CAFE CENTRAL", "GALAXUS", "TWINT ENVOI")
+
+
+class Session(Protocol):
+    def call(self, step: str, method: str, path: str, **kwargs: Any) -> Any:
+        """Send one request as the virtual user and record its latency."""
+
+
+@dataclass(frozen=True, slots=True)
+class VirtualUser:
+    """Auth user, profile and bank account seeded for one simulated client."""
+
+    index: int
+    token: str
+    auth_user_id: UUID
+    profile_id: UUID
+    bank_account_id: str
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+def seed_user(server: FakePostgrest, index: int, *, onboarded: bool, rows: int, seed: int = 7) -> VirtualUser:
+    """Create the auth user and, for onboarded users, profile, state and transactions."""
+
+    user = VirtualUser(
+        index=index,
+        token=f"bench-user-{index}",
+        auth_user_id=uuid4(),
+        profile_id=uuid4(),
+        bank_account_id=str(uuid4()),
+    )
+    email = f"bench-{index}@example.com"
+    server.add_user(user.token, user_id=user.auth_user_id, email=email)
+    if not onboarded:
+        return user
+
+    server.seed(
+        "profils",
+        [
+            {
+                "id": str(user.profile_id),
+                "account_id": str(user.auth_user_id),
+                "email": email,
+                "first_name": "Bench",
+                "last_name": f"User {index}",
+                "birth_date": "1990-01-01",
+            }
+        ],
+    )
+    server.seed(
+        "chat_state",
+        [
+            {
+                "conversation_id": str(user.profile_id),
+                "profile_id": str(user.profile_id),
+                "user_id": str(user.auth_user_id),
+                "active_task": None,
+                "state": {
+                    "global_state": {
+                        "mode": "free_chat",
+                        "onboarding_step": None,
+                        "onboarding_substep": None,
+                        "has_bank_accounts": True,
+                        "has_imported_transactions": True,
+                        "budget_created": False,
+                    }
+                },
+            }
+        ],
+    )
+    server.seed("bank_accounts", [{"id": user.bank_account_id, "profile_id": str(user.profile_id), "name": "UBS"}])
+    generator = random.Random(seed * 1_000 + index)
+    server.seed(
+        "releves_bancaires",
+        [
+            {
+                "id": str(uuid4()),
+                "profile_id": str(user.profile_id),
+                "bank_account_id": user.bank_account_id,
+                "date": f"2026-{generator.randint(1, 3):02d}-{generator.randint(1, 28):02d}",
+                "libelle": f"{generator.choice(_MERCHANTS)} {generator.randint(100, 999)}",
+                "montant": round(-generator.uniform(3, 180), 2),
+                "devise": "CHF",
+                "categorie": None,
+            }
+            for _ in range(rows)
+        ],
+    )
+    return user
+
+
+def ubs_csv(rows: int, *, seed: int = 7) -> bytes:
+    """Return a UBS-format statement with ``rows`` debit lines in January 2026."""
+
+    generator = random.Random(seed)
+    lines = [
+        "Numéro de compte: CH00 0000 0000 0000 0000 0",
+        "IBAN: CH00 0000 0000 0000 0000 0",
+        "Du: 01.01.2026",
+        "Au: 31.01.2026",
+        "Date de transaction;Date de comptabilisation;Description1;Description2;Description3;Débit;Crédit;Monnaie",
+    ]
+    for _ in range(rows):
+        day = f"{generator.randint(1, 28):02d}.01.2026"
+        amount = f"{generator.uniform(3, 180):.2f}".replace(".", ",")
+        lines.append(f"{day};{day};{generator.choice(_MERCHANTS)} {generator.randint(100, 999)};;;{amount};;CHF")
+    return "\n".join(lines).encode("utf-8")
+
+
+def onboarding(session: Session, user: VirtualUser) -> None:
+    """New user going through profile and bank account collection."""
+
+    for message in ("Bonjour", "Bench", "User", "01.01.1990", "oui", "UBS", "oui"):
+        session.call("chat.onboarding", "POST", "/agent/chat", json={"message": message}, headers=user.headers)
+
+
+def csv_import(session: Session, user: VirtualUser, *, import_rows: int = 40) -> None:
+    """Async import: create a job, upload one CSV, poll its status."""
+
+    created = session.call("imports.create_job", "POST", "/imports/jobs", headers=user.headers)
+    job_id = created.json().get("job_id") if created.status_code == 200 else None
+    if job_id is None:
+        return
+    content = base64.b64encode(ubs_csv(import_rows, seed=user.index)).decode("ascii")
+    session.call(
+        "imports.upload",
+        "POST",
+        f"/imports/jobs/{job_id}/files",
+        json={
+            "files": [{"filename": "ubs.csv", "content_base64": content}],
+            "bank_account_id": user.bank_account_id,
+            "import_mode": "commit",
+        },
+        headers=user.headers,
+    )
+    session.call("imports.status", "GET", f"/imports/jobs/{job_id}", headers=user.headers)
+
+
+def spending_questions(session: Session, user: VirtualUser) -> None:
+    """Search, sum, follow-up and free-text (LLM-planned) spending questions."""
+
+    for message in (
+        "search: coop",
+        "Combien j'ai dépensé chez Migros en janvier 2026 ?",
+        "Et chez Coop ?",
+        "Montre-moi mes dernières dépenses",
+    ):
+        session.call("chat.spending", "POST", "/agent/chat", json={"message": message}, headers=user.headers)
+
+
+def pdf_report(session: Session, user: VirtualUser) -> None:
+    """JSON spending report followed by the PDF download of the same month."""
+
+    params = {"month": "2026-01"}
+    session.call("reports.spending", "GET", "/finance/reports/spending", params=params, headers=user.headers)
+    session.call("reports.spending_pdf", "GET", "/finance/reports/spending.pdf", params=params, headers=user.headers)
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    name: str
+    run: Callable[[Session, VirtualUser], None]
+    onboarded: bool = True
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("onboarding", onboarding, onboarded=False),
+        Scenario("import", csv_import),
+        Scenario("spending", spending_questions),
+        Scenario("report", pdf_report),
+    )
+}
@@ -0,0 +1,61 @@
+"""Deterministic stand-in for the OpenAI planner client with configurable latency."""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from shared.tracing import LLM_SPAN, set_llm_usage, trace_span
+
+
+@dataclass(slots=True)
+class StubLLMClient:
+    """Planner client answering every message with a releves search tool call.
+
+    ``latency_ms`` is slept per completion to model the provider round-trip;
+    usage figures are fixed so traces report plausible token counts.
+    """
+
+    latency_ms: float = 0.0
+    prompt_tokens: int = 1_200
+    completion_tokens: int = 40
+
+    def create_chat_completion(
+        self,
+        model: str,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        tool_choice: str,
+    ) -> dict[str, Any]:
+        del messages, tools, tool_choice
+        with trace_span(LLM_SPAN, model=model, purpose="planner") as span:
+            if self.latency_ms > 0:
+                time.sleep(self.latency_ms / 1000)
+            response = {
+                "choices": [
+                    {
+                        "message": {
+                            "content": None,
+                            "tool_calls": [
+                                {
+                                    "id": "call_stub",
+                                    "type": "function",
+                                    "function": {
+                                        "name": "finance_releves_search",
+                                        "arguments": json.dumps({"limit": 20, "offset": 0}),
+                                    },
+                                }
+                            ],
+                        }
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": self.prompt_tokens,
+                    "completion_tokens": self.completion_tokens,
+                    "total_tokens": self.prompt_tokens + self.completion_tokens,
+                },
+            }
+            set_llm_usage(span, response)
+        return response
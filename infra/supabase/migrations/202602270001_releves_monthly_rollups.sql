@@ -0,0 +1,37 @@
+-- Per-profile monthly rollups of releves_bancaires.
+-- One line per (month, flow type, category, bank account, currency) with the
+-- sum and count of its releves. Every write of a month replaces
+-- `releves_rollup_months.generation` with a new token; rollup lines are stored
+-- under the generation they were built for and a month is fresh only while
+-- `built_generation = generation`. A month without a fresh row is rebuilt from
+-- raw rows.
+
+create table if not exists public.releves_monthly_rollups (
+    profile_id uuid not null references public.profils(id) on delete cascade,
+    month date not null check (extract(day from month) = 1),
+    generation text not null,
+    rollup_key text not null,
+    flow_type text not null check (flow_type in ('expense', 'income', 'transfer_internal')),
+    category_id uuid null,
+    categorie text null,
+    category_key text null,
+    bank_account_id uuid null,
+    devise text null,
+    total numeric not null default 0,
+    count integer not null default 0,
+    updated_at timestamptz not null default now(),
+    primary key (profile_id, month, generation, rollup_key)
+);
+
+create index if not exists idx_releves_monthly_rollups_profile_account_month
+    on public.releves_monthly_rollups (profile_id, bank_account_id, month);
+
+create table if not exists public.releves_rollup_months (
+    profile_id uuid not null references public.profils(id) on delete cascade,
+    month date not null check (extract(day from month) = 1),
+    generation text not null,
+    built_generation text null,
+    previous_generation text null,
+    refreshed_at timestamptz null,
+    primary key (profile_id, month)
+);
@@ -102,6 +102,231 @@ def llm_model() -> str:
     return (get_env("AGENT_LLM_MODEL", "gpt-5") or "gpt-5").strip() or "gpt-5"
 
 
+def llm_cache_ttl_seconds() -> float:
+    """Return TTL for cached planner/judge responses (0 disables the cache)."""
+
+    default_ttl = 600.0
+    raw_value = (get_env("AGENT_LLM_CACHE_TTL_SECONDS", str(default_ttl)) or str(default_ttl)).strip()
+    try:
+        return max(0.0, float(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_llm_cache_ttl_seconds value=%s default=%s",
+            raw_value,
+            default_ttl,
+        )
+        return default_ttl
+
+
+def llm_cache_max_entries() -> int:
+    """Return max number of cached planner/judge responses (0 disables the cache)."""
+
+    default_limit = 256
+    raw_value = (get_env("AGENT_LLM_CACHE_MAX_ENTRIES", str(default_limit)) or str(default_limit)).strip()
+    try:
+        return max(0, int(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_llm_cache_max_entries value=%s default=%s",
+            raw_value,
+            default_limit,
+        )
+        return default_limit
+
+
+def tool_cache_ttl_seconds() -> float:
+    """Return TTL for cached read-tool results (0 disables the cache)."""
+
+    default_ttl = 300.0
+    raw_value = (get_env("AGENT_TOOL_CACHE_TTL_SECONDS", str(default_ttl)) or str(default_ttl)).strip()
+    try:
+        return max(0.0, float(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_tool_cache_ttl_seconds value=%s default=%s",
+            raw_value,
+            default_ttl,
+        )
+        return default_ttl
+
+
+def tool_cache_max_entries() -> int:
+    """Return max number of cached read-tool results (0 disables the cache)."""
+
+    default_limit = 512
+    raw_value = (get_env("AGENT_TOOL_CACHE_MAX_ENTRIES", str(default_limit)) or str(default_limit)).strip()
+    try:
+        return max(0, int(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_tool_cache_max_entries value=%s default=%s",
+            raw_value,
+            default_limit,
+        )
+        return default_limit
+
+
+def report_cache_max_bytes() -> int:
+    """Return the byte budget of cached finance reports (0 disables the cache)."""
+
+    default_limit = 32 * 1024 * 1024
+    raw_value = (get_env("AGENT_REPORT_CACHE_MAX_BYTES", str(default_limit)) or str(default_limit)).strip()
+    try:
+        return max(0, int(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_report_cache_max_bytes value=%s default=%s",
+            raw_value,
+            default_limit,
+        )
+        return default_limit
+
+
+def report_store_url() -> str:
+    """Return where rendered reports are shared between workers (directory or ``redis://`` URL)."""
+
+    return (get_env("AGENT_REPORT_STORE_URL", "") or "").strip()
+
+
+def report_store_max_bytes() -> int:
+    """Return the byte budget of the on-disk report artifact store."""
+
+    default_limit = 256 * 1024 * 1024
+    raw_value = (get_env("AGENT_REPORT_STORE_MAX_BYTES", str(default_limit)) or str(default_limit)).strip()
+    try:
+        return max(0, int(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_report_store_max_bytes value=%s default=%s",
+            raw_value,
+            default_limit,
+        )
+        return default_limit
+
+
+def report_chart_renderer() -> str:
+    """Return how report charts are drawn: ``matplotlib`` (PNG) or ``vector`` (ReportLab)."""
+
+    raw_value = (get_env("AGENT_REPORT_CHART_RENDERER", "matplotlib") or "matplotlib").strip().lower()
+    if raw_value not in {"matplotlib", "vector"}:
+        logger.warning("invalid_report_chart_renderer value=%s default=matplotlib", raw_value)
+        return "matplotlib"
+    return raw_value
+
+
+def json_codec() -> str:
+    """Return the JSON codec: ``auto`` (orjson when installed), ``orjson`` or ``stdlib``."""
+
+    raw_value = (get_env("AGENT_JSON_CODEC", "auto") or "auto").strip().lower()
+    if raw_value not in {"auto", "orjson", "stdlib"}:
+        logger.warning("invalid_json_codec value=%s default=auto", raw_value)
+        return "auto"
+    return raw_value
+
+
+def report_render_workers() -> int:
+    """Return how many processes render report PDFs (0 renders on the request thread)."""
+
+    default_workers = 2
+    raw_value = (get_env("AGENT_REPORT_RENDER_WORKERS", str(default_workers)) or str(default_workers)).strip()
+    try:
+        return max(0, int(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_report_render_workers value=%s default=%s",
+            raw_value,
+            default_workers,
+        )
+        return default_workers
+
+
+def report_render_timeout_seconds() -> float:
+    """Return how long a request waits for a pooled PDF render."""
+
+    default_timeout = 30.0
+    raw_value = (
+        get_env("AGENT_REPORT_RENDER_TIMEOUT_SECONDS", str(default_timeout)) or str(default_timeout)
+    ).strip()
+    try:
+        return max(0.1, float(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_report_render_timeout_seconds value=%s default=%s",
+            raw_value,
+            default_timeout,
+        )
+        return default_timeout
+
+
+def request_read_memo_enabled() -> bool:
+    """Return whether identical Supabase reads are memoized within one chat turn."""
+
+    raw_value = get_env("AGENT_REQUEST_READ_MEMO_ENABLED", "1") or "1"
+    return raw_value.strip().lower() in _TRUE_VALUES
+
+
+def report_precompute_enabled() -> bool:
+    """Return whether finished imports pre-compute the reports of the imported months."""
+
+    raw_value = get_env("AGENT_REPORT_PRECOMPUTE_ENABLED", "true") or "true"
+    return raw_value.strip().lower() in _TRUE_VALUES
+
+
+def report_precompute_max_months() -> int:
+    """Return how many of the most recent imported months get their report pre-computed."""
+
+    default_months = 3
+    raw_value = (
+        get_env("AGENT_REPORT_PRECOMPUTE_MAX_MONTHS", str(default_months)) or str(default_months)
+    ).strip()
+    try:
+        return max(0, int(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_report_precompute_max_months value=%s default=%s",
+            raw_value,
+            default_months,
+        )
+        return default_months
+
+
+def report_precompute_pdf_enabled() -> bool:
+    """Return whether report pre-computation also renders the PDFs."""
+
+    raw_value = get_env("AGENT_REPORT_PRECOMPUTE_PDF", "") or ""
+    return raw_value.strip().lower() in _TRUE_VALUES
+
+
+def releves_rollups_enabled() -> bool:
+    """Return whether whole-month releves totals are read from the monthly rollup table."""
+
+    raw_value = get_env("AGENT_RELEVES_ROLLUPS_ENABLED", "") or ""
+    return raw_value.strip().lower() in _TRUE_VALUES
+
+
+def releves_rollups_max_age_hours() -> float:
+    """Return how long a month's rollups are trusted before they are rebuilt from raw rows."""
+
+    default_hours = 24.0
+    raw_value = (get_env("AGENT_RELEVES_ROLLUPS_MAX_AGE_HOURS", str(default_hours)) or str(default_hours)).strip()
+    try:
+        return max(0.0, float(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_releves_rollups_max_age_hours value=%s default=%s",
+            raw_value,
+            default_hours,
+        )
+        return default_hours
+
+
+def startup_warmup_enabled() -> bool:
+    """Return whether the API pre-builds its caches in the background after startup."""
+
+    raw_value = get_env("AGENT_STARTUP_WARMUP_ENABLED", "") or ""
+    return raw_value.strip().lower() in _TRUE_VALUES
+
+
 def llm_background_enabled() -> bool:
     """Return whether background LLM tasks (non-chat) are enabled.
 
@@ -169,6 +394,105 @@ def auto_resolve_merchant_aliases_max_per_run() -> int:
         return default_limit
 
 
+def merchant_cleanup_chunk_size() -> int:
+    """Return max merchants sent to the LLM in one cleanup prompt."""
+
+    default_size = 150
+    raw_value = (get_env("MERCHANT_CLEANUP_CHUNK_SIZE", str(default_size)) or str(default_size)).strip()
+    try:
+        return max(1, int(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_merchant_cleanup_chunk_size value=%s default=%s",
+            raw_value,
+            default_size,
+        )
+        return default_size
+
+
+def merchant_cleanup_max_workers() -> int:
+    """Return how many merchant cleanup chunks are sent to the LLM concurrently."""
+
+    default_workers = 4
+    raw_value = (get_env("MERCHANT_CLEANUP_MAX_WORKERS", str(default_workers)) or str(default_workers)).strip()
+    try:
+        return max(1, int(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_merchant_cleanup_max_workers value=%s default=%s",
+            raw_value,
+            default_workers,
+        )
+        return default_workers
+
+
+def merchant_categorizer_model_path() -> str | None:
+    """Return the path of the trained local merchant categorizer, if any."""
+    return get_env("MERCHANT_CATEGORIZER_MODEL_PATH")
+
+
+def merchant_categorizer_link_threshold() -> float:
+    """Return the minimum similarity to auto-link an alias without the LLM."""
+
+    default_threshold = 0.9
+    raw_value = (
+        get_env("MERCHANT_CATEGORIZER_LINK_THRESHOLD", str(default_threshold)) or str(default_threshold)
+    ).strip()
+    try:
+        return max(0.0, min(1.0, float(raw_value)))
+    except ValueError:
+        logger.warning(
+            "invalid_merchant_categorizer_link_threshold value=%s default=%s",
+            raw_value,
+            default_threshold,
+        )
+        return default_threshold
+
+
+def merchant_alias_index_refresh_seconds() -> float:
+    """Return how often the in-process merchant alias index reloads new aliases."""
+
+    default_interval = 300.0
+    raw_value = (
+        get_env("MERCHANT_ALIAS_INDEX_REFRESH_SECONDS", str(default_interval)) or str(default_interval)
+    ).strip()
+    try:
+        return max(0.0, float(raw_value))
+    except ValueError:
+        logger.warning(
+            "invalid_merchant_alias_index_refresh_seconds value=%s default=%s",
+            raw_value,
+            default_interval,
+        )
+        return default_interval
+
+
+def trace_log_sample_rate() -> float:
+    """Return the fraction of request traces logged as structured summaries."""
+
+    default_rate = 0.01
+    raw_value = (get_env("TRACE_LOG_SAMPLE_RATE", str(default_rate)) or str(default_rate)).strip()
+    try:
+        return max(0.0, min(1.0, float(raw_value)))
+    except ValueError:
+        logger.warning(
+            "invalid_trace_log_sample_rate value=%s default=%s",
+            raw_value,
+            default_rate,
+        )
+        return default_rate
+
+
+def trace_exporter() -> str:
+    """Return the request trace exporter (``otlp`` or empty for none)."""
+    return (get_env("TRACE_EXPORTER", "") or "").strip().lower()
+
+
+def trace_service_name() -> str:
+    """Return the service name attached to exported traces."""
+    return (get_env("OTEL_SERVICE_NAME", "agent-api") or "agent-api").strip() or "agent-api"
+
+
 def llm_strict() -> bool:
     """Return whether strict LLM clarification behavior is enabled."""
     raw_value = get_env("AGENT_LLM_STRICT", "") or ""
@@ -0,0 +1,116 @@
+"""JSON encoding shared by the API responses and the Supabase client.
+
+:func:`json_dumps` and :func:`json_loads` use ``orjson`` when it is installed
+and the stdlib ``json`` module otherwise (``AGENT_JSON_CODEC`` forces one).
+Both codecs write compact UTF-8 and encode ``Decimal`` as its exact text
+(like Pydantic's JSON mode), ``UUID`` as text and dates/times in ISO 8601.
+Whatever ``orjson`` refuses (integers beyond 64 bits, unknown types) is
+retried with the stdlib encoder, so both codecs accept the same values.
+``NaN`` and infinities have no JSON form: both codecs write them as ``null``.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable
+from uuid import UUID
+
+from shared import config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _without_non_finite_floats(value: Any) -> Any:
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _without_non_finite_floats(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_without_non_finite_floats(item) for item in value]
+    return value
+
+
+_stdlib_encoder = json.JSONEncoder(
+    ensure_ascii=False,
+    separators=(",", ":"),
+    default=_default,
+    allow_nan=False,
+)
+
+
+def _stdlib_dumps(value: Any) -> bytes:
+    try:
+        return _stdlib_encoder.encode(value).encode("utf-8")
+    except ValueError as exc:
+        if "Out of range float" not in str(exc):
+            raise
+        # Rare, so only then walk the value to write null like orjson does.
+        return _stdlib_encoder.encode(_without_non_finite_floats(value)).encode("utf-8")
+
+
+def _stdlib_loads(data: bytes | str) -> Any:
+    return json.loads(data)
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    try:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return _stdlib_dumps(value)
+
+
+@dataclass(frozen=True, slots=True)
+class JsonCodec:
+    """A named pair of JSON encode (to UTF-8 bytes) and decode functions."""
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes | str], Any]
+
+
+STDLIB_CODEC = JsonCodec(name="stdlib", dumps=_stdlib_dumps, loads=_stdlib_loads)
+ORJSON_CODEC = (
+    JsonCodec(name="orjson", dumps=_orjson_dumps, loads=orjson.loads) if orjson is not None else None
+)
+
+
+@lru_cache(maxsize=1)
+def get_json_codec() -> JsonCodec:
+    """Return the configured codec; ``orjson`` falls back to stdlib when it is not installed."""
+
+    if config.json_codec() != "stdlib" and ORJSON_CODEC is not None:
+        return ORJSON_CODEC
+    return STDLIB_CODEC
+
+
+def json_dumps(value: Any) -> bytes:
+    """Encode ``value`` as compact UTF-8 JSON."""
+
+    return get_json_codec().dumps(value)
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Decode JSON text; malformed input raises ``json.JSONDecodeError`` with both codecs."""
+
+    return get_json_codec().loads(data)
@@ -369,6 +369,52 @@ class RelevesAggregateResult(BaseModel):
     filters: RelevesAggregateRequest | None = None
 
 
+class RelevesTrendGranularity(str, Enum):
+    """Period size of a spending trend."""
+
+    MONTH = "month"
+    WEEK = "week"
+
+
+class RelevesTrendRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    profile_id: UUID
+    date_range: DateRange
+    granularity: RelevesTrendGranularity = RelevesTrendGranularity.MONTH
+    bank_account_id: UUID | None = None
+    top_merchants: int = Field(default=5, ge=0, le=20)
+
+
+class RelevesTrendResult(BaseModel):
+    """Per-period series in columnar form: every list is aligned with ``periods``.
+
+    ``spending`` follows the spending report total (expenses without internal
+    transfers nor categories excluded from totals, as positive amounts);
+    ``income``, ``expense``, ``net_cashflow`` and ``internal_transfers``
+    follow the report cashflow (signed amounts). ``categories`` and
+    ``top_merchants`` split ``spending``.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    granularity: RelevesTrendGranularity
+    periods: list[str]
+    period_starts: list[date]
+    period_ends: list[date]
+    spending: list[Decimal]
+    spending_count: list[int]
+    income: list[Decimal]
+    expense: list[Decimal]
+    net_cashflow: list[Decimal]
+    internal_transfers: list[Decimal]
+    transaction_count: list[int]
+    categories: dict[str, list[Decimal]]
+    top_merchants: dict[str, list[Decimal]]
+    currency: str | None = None
+    filters: RelevesTrendRequest | None = None
+
+
 class RelevesImportMode(str, Enum):
     ANALYZE = "analyze"
     COMMIT = "commit"
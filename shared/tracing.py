@@ -0,0 +1,299 @@
+"""Lightweight in-process span tracing.
+
+A trace is bound to the current context with :func:`start_trace` (one per HTTP
+request); :func:`trace_span` records nested spans into it. Without an active
+trace, spans cost one context-var lookup and record nothing, so library code
+(Supabase client, LLM calls, tool router) is instrumented unconditionally.
+
+Context vars follow ``asyncio`` tasks and Starlette's thread pool; work handed
+to other executors must be submitted through ``contextvars.copy_context().run``
+to land in the caller's trace.
+
+Finished traces are summarized (per-stage timings, Supabase round-trips, LLM
+calls and tokens), logged for a sampled fraction of requests and, when
+``TRACE_EXPORTER=otlp`` and the OpenTelemetry SDK is installed, replayed to an
+OTLP collector. In-process consumers (benchmarks) can also subscribe with
+:func:`add_trace_listener`.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from shared import config
+
+
+logger = logging.getLogger(__name__)
+
+SUPABASE_SPAN = "supabase.request"
+LLM_SPAN = "llm.chat_completion"
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed operation of a trace."""
+
+    name: str
+    span_id: int
+    parent_id: int | None
+    start_ns: int
+    start_unix_ns: int
+    attributes: dict[str, Any] = field(default_factory=dict)
+    duration_ms: float | None = None
+    error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        """Attach attributes known only once the operation ran (rows, tokens...)."""
+        self.attributes.update(attributes)
+
+
+class _NoopSpan:
+    """Span stand-in returned when no trace is active."""
+
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        del attributes
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Spans recorded for one request, safe to append from worker threads."""
+
+    def __init__(self, name: str, *, attributes: dict[str, Any] | None = None) -> None:
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.spans: list[Span] = []
+        self._start_ns = time.perf_counter_ns()
+        self._end_ns: int | None = None
+        self._next_span_id = 1
+        self._lock = threading.Lock()
+
+    def _open_span(self, name: str, parent_id: int | None, attributes: dict[str, Any]) -> Span:
+        with self._lock:
+            span = Span(
+                name=name,
+                span_id=self._next_span_id,
+                parent_id=parent_id,
+                start_ns=time.perf_counter_ns(),
+                start_unix_ns=time.time_ns(),
+                attributes=attributes,
+            )
+            self._next_span_id += 1
+            self.spans.append(span)
+        return span
+
+    @property
+    def elapsed_ms(self) -> float:
+        end_ns = self._end_ns if self._end_ns is not None else time.perf_counter_ns()
+        return (end_ns - self._start_ns) / 1_000_000
+
+    def summary(self) -> dict[str, Any]:
+        """Return per-stage timings plus Supabase and LLM totals."""
+
+        stages: dict[str, dict[str, Any]] = {}
+        supabase: dict[str, Any] = {"calls": 0, "rows": 0, "bytes": 0, "ms": 0.0, "errors": 0, "by_table": {}}
+        llm: dict[str, Any] = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "ms": 0.0}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            duration_ms = span.duration_ms or 0.0
+            if span.name == SUPABASE_SPAN:
+                table = str(span.attributes.get("table") or "?")
+                table_stats = supabase["by_table"].setdefault(table, {"calls": 0, "rows": 0, "bytes": 0, "ms": 0.0})
+                for stats in (supabase, table_stats):
+                    stats["calls"] += 1
+                    stats["rows"] += int(span.attributes.get("rows") or 0)
+                    stats["bytes"] += int(span.attributes.get("bytes") or 0)
+                    stats["ms"] += duration_ms
+                if span.error is not None:
+                    supabase["errors"] += 1
+                continue
+            if span.name == LLM_SPAN:
+                llm["calls"] += 1
+                llm["ms"] += duration_ms
+                for token_name in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                    llm[token_name] += int(span.attributes.get(token_name) or 0)
+                continue
+            stage = stages.setdefault(span.name, {"count": 0, "ms": 0.0})
+            stage["count"] += 1
+            stage["ms"] += duration_ms
+
+        for stats in (supabase, llm, *stages.values(), *supabase["by_table"].values()):
+            stats["ms"] = round(stats["ms"], 2)
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "total_ms": round(self.elapsed_ms, 2),
+            "stages": stages,
+            "supabase": supabase,
+            "llm": llm,
+        }
+
+
+_CURRENT_TRACE: contextvars.ContextVar[Trace | None] = contextvars.ContextVar("current_trace", default=None)
+_CURRENT_SPAN: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+def current_trace() -> Trace | None:
+    """Return the trace bound to the current context, if any."""
+
+    return _CURRENT_TRACE.get()
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Trace]:
+    """Bind a new trace to the current context and finish it on exit."""
+
+    trace = Trace(name, attributes=attributes)
+    trace_token = _CURRENT_TRACE.set(trace)
+    span_token = _CURRENT_SPAN.set(None)
+    try:
+        yield trace
+    finally:
+        trace._end_ns = time.perf_counter_ns()
+        _CURRENT_SPAN.reset(span_token)
+        _CURRENT_TRACE.reset(trace_token)
+        finish_trace(trace)
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+    """Record ``name`` as a child of the current span when a trace is active."""
+
+    trace = _CURRENT_TRACE.get()
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+    parent = _CURRENT_SPAN.get()
+    span = trace._open_span(name, parent.span_id if parent is not None else None, attributes)
+    token = _CURRENT_SPAN.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.error = type(exc).__name__
+        raise
+    finally:
+        span.duration_ms = round((time.perf_counter_ns() - span.start_ns) / 1_000_000, 3)
+        _CURRENT_SPAN.reset(token)
+
+
+def set_llm_usage(span: Span | _NoopSpan, response: Any) -> None:
+    """Copy token usage of an OpenAI response (object or dumped dict) onto ``span``."""
+
+    usage = response.get("usage") if isinstance(response, dict) else getattr(response, "usage", None)
+    if usage is None:
+        return
+    for token_name in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        value = usage.get(token_name) if isinstance(usage, dict) else getattr(usage, token_name, None)
+        if isinstance(value, int):
+            span.set(**{token_name: value})
+
+
+_TRACE_LISTENERS: list[Callable[[Trace], None]] = []
+
+
+def add_trace_listener(listener: Callable[[Trace], None]) -> Callable[[], None]:
+    """Call ``listener`` with every finished trace; return a function removing it."""
+
+    _TRACE_LISTENERS.append(listener)
+
+    def _remove() -> None:
+        if listener in _TRACE_LISTENERS:
+            _TRACE_LISTENERS.remove(listener)
+
+    return _remove
+
+
+def finish_trace(trace: Trace) -> None:
+    """Log a sampled summary of ``trace`` and hand it to the configured exporter."""
+
+    for listener in list(_TRACE_LISTENERS):
+        try:
+            listener(trace)
+        except Exception:
+            logger.exception("trace_listener_failed trace_id=%s", trace.trace_id)
+    sample_rate = config.trace_log_sample_rate()
+    if sample_rate > 0 and (sample_rate >= 1 or random.random() < sample_rate):
+        logger.info(
+            "request_trace trace_id=%s name=%s summary=%s",
+            trace.trace_id,
+            trace.name,
+            json.dumps(trace.summary(), sort_keys=True, separators=(",", ":")),
+        )
+    if config.trace_exporter() == "otlp":
+        _export_otlp(trace)
+
+
+_OTLP_TRACER: Any = None
+_OTLP_UNAVAILABLE = False
+_OTLP_LOCK = threading.Lock()
+
+
+def _otlp_tracer() -> Any:
+    global _OTLP_TRACER, _OTLP_UNAVAILABLE
+    with _OTLP_LOCK:
+        if _OTLP_TRACER is not None or _OTLP_UNAVAILABLE:
+            return _OTLP_TRACER
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            logger.warning("opentelemetry_sdk_missing exporter=otlp")
+            _OTLP_UNAVAILABLE = True
+            return None
+        provider = TracerProvider(resource=Resource.create({"service.name": config.trace_service_name()}))
+        # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables.
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        _OTLP_TRACER = provider.get_tracer(__name__)
+        return _OTLP_TRACER
+
+
+def _otel_attributes(attributes: dict[str, Any]) -> dict[str, Any]:
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
+
+
+def _export_otlp(trace: Trace) -> None:
+    tracer = _otlp_tracer()
+    if tracer is None:
+        return
+    from opentelemetry import trace as otel_trace
+
+    start_unix_ns = time.time_ns() - int(trace.elapsed_ms * 1_000_000)
+    root = tracer.start_span(
+        trace.name,
+        start_time=start_unix_ns,
+        attributes=_otel_attributes({**trace.attributes, "trace_id": trace.trace_id}),
+    )
+    exported: dict[int, Any] = {}
+    for span in sorted(trace.spans, key=lambda item: item.span_id):
+        parent = exported.get(span.parent_id) if span.parent_id is not None else root
+        otel_span = tracer.start_span(
+            span.name,
+            context=otel_trace.set_span_in_context(parent if parent is not None else root),
+            start_time=span.start_unix_ns,
+            attributes=_otel_attributes(span.attributes),
+        )
+        if span.error is not None:
+            otel_span.set_attribute("error.type", span.error)
+        otel_span.end(end_time=span.start_unix_ns + int((span.duration_ms or 0.0) * 1_000_000))
+        exported[span.span_id] = otel_span
+    root.end(end_time=start_unix_ns + int(trace.elapsed_ms * 1_000_000))
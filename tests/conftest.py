@@ -0,0 +1,33 @@
+"""Shared pytest configuration."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+pytest_plugins = ("tests.roundtrip_budget",)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_report_rendering(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Give each test its own on-disk report artifact store and render PDFs inline.
+
+    Tests replace ``generate_spending_report_pdf`` with local fakes, which a
+    process pool could not pickle; the pool has its own tests. Post-import
+    report pre-computation is off so that no background thread outlives the
+    test's fakes.
+    """
+
+    import agent.api as agent_api
+
+    monkeypatch.setenv("AGENT_REPORT_STORE_URL", str(tmp_path / "reports"))
+    monkeypatch.setenv("AGENT_REPORT_RENDER_WORKERS", "0")
+    monkeypatch.setenv("AGENT_REPORT_PRECOMPUTE_ENABLED", "0")
+    factories = (agent_api.get_report_store, agent_api.get_report_render_pool, agent_api.get_report_precomputer)
+    for factory in factories:
+        factory.cache_clear()
+    yield
+    for factory in factories:
+        factory.cache_clear()
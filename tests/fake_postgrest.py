@@ -0,0 +1,383 @@
+"""Local HTTP stand-in for Supabase PostgREST and Auth used by round-trip tests.
+
+The server keeps every table in memory (tables are created on first use) and
+implements the subset of PostgREST the repositories rely on: ``eq``/``neq``/
+``gt``/``gte``/``lt``/``lte``/``in``/``is``/``like``/``ilike`` filters and
+their ``not.`` forms, ``or=(...)`` groups (which may nest ``and(...)``),
+``select`` projections on reads and write representations (embedded resources
+come back as ``null``),
+``order``/``limit``/``offset``, ``Prefer: count=exact`` and upserts through
+``on_conflict``. ``GET /auth/v1/user`` resolves bearer tokens registered with
+:meth:`add_user`.
+
+Every request is recorded as a :class:`RoundTrip` and can be delayed by
+``latency_ms`` to make the cost of chatty endpoints visible in wall time.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+# Tables whose primary key is a bigserial rather than a uuid.
+_SERIAL_ID_TABLES = {"import_job_events"}
+
+
+@dataclass(frozen=True, slots=True)
+class RoundTrip:
+    """One HTTP request served by the fake."""
+
+    method: str
+    table: str
+    status: int
+    request_bytes: int
+    response_bytes: int
+    ms: float
+
+
+def _split_top_level(raw: str) -> list[str]:
+    """Split ``raw`` on commas that are outside parentheses and double quotes."""
+
+    parts: list[str] = []
+    depth = 0
+    quoted = False
+    current: list[str] = []
+    for char in raw:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return [part for part in parts if part != ""]
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"')
+    return value
+
+
+def _comparable(left: Any, right: str) -> tuple[Any, Any]:
+    if isinstance(left, bool):
+        return str(left).lower(), right.lower()
+    if isinstance(left, (int, float)):
+        try:
+            return float(left), float(right)
+        except ValueError:
+            return str(left), right
+    if isinstance(left, str):
+        try:
+            return float(left), float(right)
+        except ValueError:
+            return left, right
+    return json.dumps(left, sort_keys=True) if isinstance(left, (dict, list)) else str(left), right
+
+
+def _like_pattern(pattern: str, *, case_insensitive: bool) -> re.Pattern[str]:
+    regex = "^" + ".*".join(re.escape(part) for part in re.split(r"[*%]", pattern)) + "$"
+    return re.compile(regex, re.IGNORECASE | re.DOTALL if case_insensitive else re.DOTALL)
+
+
+def _matches(row: dict[str, Any], column: str, expression: str) -> bool:
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    operator, _, operand = expression.partition(".")
+    value = row.get(column)
+    if operator == "is":
+        expected = {"null": None, "true": True, "false": False}.get(operand.lower(), operand)
+        result = value is expected if expected is None else value == expected
+    elif operator == "in":
+        members = {_unquote(member) for member in _split_top_level(operand.strip("()"))}
+        result = value is not None and str(value) in members
+    elif operator in {"like", "ilike"}:
+        result = value is not None and bool(
+            _like_pattern(_unquote(operand), case_insensitive=operator == "ilike").match(str(value))
+        )
+    elif value is None:
+        result = False
+    else:
+        left, right = _comparable(value, _unquote(operand))
+        try:
+            result = {
+                "eq": left == right,
+                "neq": left != right,
+                "gt": left > right,
+                "gte": left >= right,
+                "lt": left < right,
+                "lte": left <= right,
+            }[operator]
+        except TypeError:
+            result = False
+        except KeyError as exc:
+            raise ValueError(f"Unsupported PostgREST operator: {operator}") from exc
+    return not result if negate else result
+
+
+def _matches_condition(row: dict[str, Any], condition: str) -> bool:
+    if condition.startswith("and(") and condition.endswith(")"):
+        return all(_matches_condition(row, part) for part in _split_top_level(condition[4:-1]))
+    column, _, expression = condition.partition(".")
+    return _matches(row, column, expression)
+
+
+def _matches_or_group(row: dict[str, Any], group: str) -> bool:
+    return any(_matches_condition(row, condition) for condition in _split_top_level(group[1:-1]))
+
+
+def _project(row: dict[str, Any], select: str | None) -> dict[str, Any]:
+    if not select or select == "*":
+        return dict(row)
+    projected: dict[str, Any] = {}
+    for field_spec in _split_top_level(select):
+        if "(" in field_spec:
+            name = field_spec.split("(", 1)[0]
+            alias = name.split(":", 1)[0] if ":" in name else name.split("!", 1)[0]
+            projected[alias] = None
+            continue
+        if field_spec == "*":
+            projected.update(row)
+            continue
+        alias, _, column = field_spec.partition(":")
+        projected[alias] = row.get(column or alias)
+    return projected
+
+
+def _sort_key(value: Any) -> tuple[int, Any]:
+    if value is None:
+        return (1, "")
+    if isinstance(value, (int, float)):
+        return (0, float(value))
+    return (0, str(value))
+
+
+class FakePostgrest:
+    """In-memory PostgREST/Auth server listening on a local port."""
+
+    def __init__(self, *, latency_ms: float = 0.0) -> None:
+        self.latency_ms = latency_ms
+        self.tables: dict[str, list[dict[str, Any]]] = {}
+        self.users_by_token: dict[str, dict[str, Any]] = {}
+        self.round_trips: list[RoundTrip] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> FakePostgrest:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-postgrest", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self) -> None:
+        """Drop every table, user and recorded round-trip."""
+        with self._lock:
+            self.tables.clear()
+            self.users_by_token.clear()
+            self.round_trips.clear()
+
+    def seed(self, table: str, rows: list[dict[str, Any]]) -> None:
+        """Insert ``rows`` directly, without recording round-trips."""
+        with self._lock:
+            self.tables.setdefault(table, []).extend(dict(row) for row in rows)
+
+    def rows(self, table: str) -> list[dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self.tables.get(table, [])]
+
+    def add_user(self, token: str, *, user_id: uuid.UUID | str, email: str | None = None) -> None:
+        self.users_by_token[token] = {"id": str(user_id), "email": email}
+
+    def stats(self) -> dict[str, Any]:
+        """Return round-trips, bytes and time spent, overall and per table."""
+        with self._lock:
+            round_trips = list(self.round_trips)
+        return {
+            "round_trips": len(round_trips),
+            "bytes": sum(trip.request_bytes + trip.response_bytes for trip in round_trips),
+            "server_ms": round(sum(trip.ms for trip in round_trips), 2),
+            "by_table": dict(Counter(f"{trip.method} {trip.table}" for trip in round_trips)),
+        }
+
+    # -- request handling -------------------------------------------------
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+                del format, args
+
+            def _serve(self) -> None:
+                started = time.perf_counter()
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                if fake.latency_ms > 0:
+                    time.sleep(fake.latency_ms / 1000)
+                parts = urlsplit(self.path)
+                table = parts.path.rsplit("/", 1)[-1]
+                try:
+                    status, headers, payload = fake._dispatch(self.command, parts.path, parts.query, body, self.headers)
+                except ValueError as exc:
+                    status, headers, payload = 400, {}, {"message": str(exc)}
+                data = b"" if payload is None else json.dumps(payload, default=str).encode("utf-8")
+                # Recorded before replying so the client never observes a missing round-trip.
+                with fake._lock:
+                    fake.round_trips.append(
+                        RoundTrip(
+                            method=self.command,
+                            table=table,
+                            status=status,
+                            request_bytes=len(self.path) + len(body),
+                            response_bytes=len(data),
+                            ms=(time.perf_counter() - started) * 1000,
+                        )
+                    )
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _serve
+
+        return _Handler
+
+    def _dispatch(
+        self,
+        method: str,
+        path: str,
+        raw_query: str,
+        body: bytes,
+        headers: Any,
+    ) -> tuple[int, dict[str, str], Any]:
+        if path == "/auth/v1/user":
+            token = (headers.get("Authorization") or "").removeprefix("Bearer ").strip()
+            user = self.users_by_token.get(token)
+            return (200, {}, user) if user is not None else (401, {}, {"message": "invalid token"})
+        if not path.startswith("/rest/v1/"):
+            return 404, {}, {"message": f"unknown path {path}"}
+
+        table = path.removeprefix("/rest/v1/")
+        params = parse_qsl(raw_query, keep_blank_values=True)
+        prefer = headers.get("Prefer") or ""
+        payload = json.loads(body) if body else None
+        with self._lock:
+            rows = self.tables.setdefault(table, [])
+            if method == "GET":
+                return self._select(rows, params, prefer)
+            if method == "POST":
+                return self._insert(table, rows, params, payload, prefer)
+            matched = [row for row in rows if self._row_matches(row, params)]
+            select = dict(params).get("select")
+            if method == "PATCH":
+                for row in matched:
+                    row.update(payload or {})
+                return 200, {}, [_project(row, select) for row in matched]
+            if method == "DELETE":
+                rows[:] = [row for row in rows if not any(row is match for match in matched)]
+                return 200, {}, [_project(row, select) for row in matched]
+        return 405, {}, {"message": f"unsupported method {method}"}
+
+    @staticmethod
+    def _row_matches(row: dict[str, Any], params: list[tuple[str, str]]) -> bool:
+        for key, value in params:
+            if key in _RESERVED_PARAMS:
+                continue
+            if key in {"or", "and"}:
+                if key == "or" and not _matches_or_group(row, value):
+                    return False
+                continue
+            if not _matches(row, key, value):
+                return False
+        return True
+
+    def _select(
+        self,
+        rows: list[dict[str, Any]],
+        params: list[tuple[str, str]],
+        prefer: str,
+    ) -> tuple[int, dict[str, str], Any]:
+        matched = [row for row in rows if self._row_matches(row, params)]
+        options = dict(params)
+        for clause in reversed([item for item in options.get("order", "").split(",") if item]):
+            column, _, direction = clause.partition(".")
+            matched.sort(key=lambda row: _sort_key(row.get(column)), reverse=direction.startswith("desc"))
+        total = len(matched)
+        offset = int(options.get("offset") or 0)
+        limit = options.get("limit")
+        page = matched[offset:offset + int(limit)] if limit is not None else matched[offset:]
+        headers: dict[str, str] = {}
+        if "count=exact" in prefer:
+            headers["Content-Range"] = f"{offset}-{offset + len(page) - 1}/{total}" if page else f"*/{total}"
+        return 200, headers, [_project(row, options.get("select")) for row in page]
+
+    @staticmethod
+    def _next_id(rows: list[dict[str, Any]], table: str) -> int | str:
+        if table in _SERIAL_ID_TABLES:
+            return max((int(row["id"]) for row in rows if isinstance(row.get("id"), int)), default=0) + 1
+        return str(uuid.uuid4())
+
+    def _insert(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        params: list[tuple[str, str]],
+        payload: Any,
+        prefer: str,
+    ) -> tuple[int, dict[str, str], Any]:
+        incoming = payload if isinstance(payload, list) else [payload or {}]
+        conflict_columns = [column for column in dict(params).get("on_conflict", "").split(",") if column]
+        now = datetime.now(timezone.utc).isoformat()
+        stored: list[dict[str, Any]] = []
+        for item in incoming:
+            existing = None
+            if conflict_columns and "merge-duplicates" in prefer:
+                existing = next(
+                    (
+                        row
+                        for row in rows
+                        if all(str(row.get(column)) == str(item.get(column)) for column in conflict_columns)
+                    ),
+                    None,
+                )
+            if existing is not None:
+                existing.update(item)
+                stored.append(existing)
+                continue
+            row = {"id": self._next_id(rows, table), "created_at": now, **item}
+            rows.append(row)
+            stored.append(row)
+        if "return=minimal" in prefer:
+            return 201, {}, None
+        return 201, {}, [_project(row, dict(params).get("select")) for row in stored]
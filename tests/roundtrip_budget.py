@@ -0,0 +1,167 @@
+"""Pytest plugin enforcing Supabase round-trip budgets per endpoint scenario.
+
+Tests opt in with the ``fake_postgrest`` fixture, which points the app at a
+local :class:`~tests.fake_postgrest.FakePostgrest`, and declare a budget::
+
+    @pytest.mark.roundtrip_budget(max_round_trips=6, scenario="chat search")
+    def test_chat_search(fake_postgrest): ...
+
+The call phase of such a test fails when the fake served more requests (or
+bytes, or the test took more wall time) than declared; the failure lists the
+requests per table. A summary of every budgeted scenario is printed at the
+end of the run. ``--postgrest-latency-ms`` injects a delay per request to
+reproduce production-like round-trip costs locally.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+import pytest
+
+from tests.fake_postgrest import FakePostgrest
+
+
+FAKE_SERVICE_ROLE_KEY = "fake-service-role-key"
+FAKE_ANON_KEY = "fake-anon-key"
+
+_SERVER_KEY = pytest.StashKey[FakePostgrest]()
+_RESULTS_KEY = pytest.StashKey[list["ScenarioResult"]]()
+
+
+@dataclass(frozen=True, slots=True)
+class ScenarioResult:
+    """Measured cost of one budgeted test."""
+
+    scenario: str
+    round_trips: int
+    max_round_trips: int
+    bytes: int
+    wall_ms: float
+    by_table: dict[str, int]
+
+    @property
+    def within_budget(self) -> bool:
+        return self.round_trips <= self.max_round_trips
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--postgrest-latency-ms",
+        action="store",
+        type=float,
+        default=0.0,
+        help="Latency injected by the fake PostgREST server before each response.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "roundtrip_budget(max_round_trips, max_bytes=None, max_wall_ms=None, scenario=None): "
+        "fail when the test issues more Supabase round-trips than declared",
+    )
+    config.stash[_RESULTS_KEY] = []
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    server = config.stash.get(_SERVER_KEY, None)
+    if server is not None:
+        server.stop()
+
+
+def _session_server(config: pytest.Config) -> FakePostgrest:
+    server = config.stash.get(_SERVER_KEY, None)
+    if server is None:
+        server = FakePostgrest(latency_ms=config.getoption("--postgrest-latency-ms")).start()
+        config.stash[_SERVER_KEY] = server
+    return server
+
+
+def _reset_app_singletons() -> None:
+    import agent.api as agent_api
+    from agent.tool_cache import shared_tool_result_cache
+
+    for factory in (agent_api.get_profiles_repository, agent_api.get_tool_router, agent_api.get_agent_loop):
+        factory.cache_clear()
+    shared_tool_result_cache().clear()
+    agent_api._SPENDING_REPORT_CACHE.clear()
+
+
+@pytest.fixture
+def fake_postgrest(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> Iterator[FakePostgrest]:
+    """Point the app's Supabase settings at an empty fake PostgREST server."""
+
+    server = _session_server(request.config)
+    server.reset()
+    monkeypatch.setenv("SUPABASE_URL", server.url)
+    monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", FAKE_SERVICE_ROLE_KEY)
+    monkeypatch.setenv("SUPABASE_ANON_KEY", FAKE_ANON_KEY)
+    _reset_app_singletons()
+    yield server
+    _reset_app_singletons()
+
+
+def _format_breakdown(by_table: dict[str, int]) -> str:
+    return ", ".join(f"{name}={count}" for name, count in sorted(by_table.items())) or "none"
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item) -> Iterator[Any]:
+    marker = item.get_closest_marker("roundtrip_budget")
+    if marker is None or "fake_postgrest" not in getattr(item, "fixturenames", ()):
+        return (yield)
+
+    server = item.config.stash[_SERVER_KEY]
+    # Fixture setup may seed rows; only the test body counts against the budget.
+    with server._lock:
+        server.round_trips.clear()
+    started = time.perf_counter()
+    outcome = yield
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    stats = server.stats()
+    max_round_trips = int(marker.kwargs.get("max_round_trips", marker.args[0] if marker.args else 0))
+    result = ScenarioResult(
+        scenario=str(marker.kwargs.get("scenario") or item.name),
+        round_trips=stats["round_trips"],
+        max_round_trips=max_round_trips,
+        bytes=stats["bytes"],
+        wall_ms=round(wall_ms, 1),
+        by_table=stats["by_table"],
+    )
+    item.config.stash[_RESULTS_KEY].append(result)
+
+    breaches: list[str] = []
+    if not result.within_budget:
+        breaches.append(f"{result.round_trips} round-trips > budget {max_round_trips}")
+    max_bytes = marker.kwargs.get("max_bytes")
+    if max_bytes is not None and result.bytes > max_bytes:
+        breaches.append(f"{result.bytes} bytes > budget {max_bytes}")
+    max_wall_ms = marker.kwargs.get("max_wall_ms")
+    if max_wall_ms is not None and wall_ms > max_wall_ms:
+        breaches.append(f"{wall_ms:.1f} ms > budget {max_wall_ms} ms")
+    if breaches:
+        pytest.fail(
+            f"round-trip budget exceeded for {result.scenario!r}: "
+            f"{'; '.join(breaches)} ({_format_breakdown(result.by_table)})",
+            pytrace=False,
+        )
+    return outcome
+
+
+def pytest_terminal_summary(terminalreporter: Any, exitstatus: int, config: pytest.Config) -> None:
+    del exitstatus
+    results = config.stash.get(_RESULTS_KEY, [])
+    if not results:
+        return
+    latency_ms = config.getoption("--postgrest-latency-ms")
+    terminalreporter.section(f"supabase round-trip budgets (latency {latency_ms:g} ms)")
+    for result in results:
+        terminalreporter.write_line(
+            f"{'ok  ' if result.within_budget else 'FAIL'} {result.scenario}: "
+            f"{result.round_trips}/{result.max_round_trips} round-trips, "
+            f"{result.bytes} bytes, {result.wall_ms} ms ({_format_breakdown(result.by_table)})"
+        )
@@ -80,7 +80,7 @@ def test_get_agent_loop_uses_agent_loop_module(monkeypatch) -> None:
     monkeypatch.setattr(
         agent_api,
         "ToolRouter",
-        lambda backend_client: _DummyToolRouter(),
+        lambda backend_client, **_kwargs: _DummyToolRouter(),
     )
     monkeypatch.setattr(agent_api._config, "llm_enabled", lambda: False)
 
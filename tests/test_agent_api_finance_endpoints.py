@@ -21,8 +21,8 @@ client = TestClient(app)
 
 
 @pytest.fixture(autouse=True)
-def _clear_spending_pdf_cache() -> None:
-    agent_api._SPENDING_PDF_CACHE.clear()
+def _clear_spending_report_cache() -> None:
+    agent_api._SPENDING_REPORT_CACHE.clear()
 
 AUTH_USER_ID = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
 PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
@@ -959,7 +959,7 @@ def test_spending_report_pdf_returns_pdf_two_pages_and_calls_search(monkeypatch)
 
 def test_spending_report_pdf_uses_ttl_cache(monkeypatch) -> None:
     _mock_authenticated(monkeypatch)
-    agent_api._SPENDING_PDF_CACHE.clear()
+    agent_api._SPENDING_REPORT_CACHE.clear()
 
     class _Repo:
         def get_profile_id_for_auth_user(self, *, auth_user_id: UUID, email: str | None):
@@ -1010,7 +1010,7 @@ def test_spending_report_pdf_uses_ttl_cache(monkeypatch) -> None:
     assert first.status_code == 200
     assert second.status_code == 200
     assert calls["count"] == 1
-    agent_api._SPENDING_PDF_CACHE.clear()
+    agent_api._SPENDING_REPORT_CACHE.clear()
 
 
 def test_spending_report_pdf_uses_last_query_filters_date_range(monkeypatch) -> None:
@@ -0,0 +1,125 @@
+"""Tests for the SSE variant of the chat endpoint."""
+
+from __future__ import annotations
+
+import json
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+
+import agent.api as agent_api
+from agent.api import app
+from agent.chat_stream import ChatStateWriteBuffer, buffered_chat_state, reply_chunks, with_chat_state_buffer
+from agent.loop import AgentLoop
+
+
+client = TestClient(app)
+AUTH_USER_ID = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
+PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+
+
+class _Repo:
+    def __init__(self) -> None:
+        self.chat_state: dict[str, object] = {}
+        self.update_calls: list[dict[str, object]] = []
+
+    def get_profile_id_for_auth_user(self, *, auth_user_id: UUID, email: str | None):
+        return PROFILE_ID
+
+    def get_chat_state(self, *, profile_id: UUID, user_id: UUID):
+        return dict(self.chat_state)
+
+    def update_chat_state(self, *, profile_id: UUID, user_id: UUID, chat_state: dict[str, object]) -> None:
+        self.chat_state = {**self.chat_state, **chat_state}
+        self.update_calls.append(dict(chat_state))
+
+
+class _Router:
+    def call(self, tool_name: str, payload: dict[str, object], *, profile_id: UUID | None = None):
+        assert tool_name == "finance_releves_sum"
+        return {"ok": True, "total": 123.45}
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict[str, object]]]:
+    events: list[tuple[str, dict[str, object]]] = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _patch_api(monkeypatch, repo: _Repo) -> None:
+    monkeypatch.setattr(
+        agent_api,
+        "get_user_from_bearer_token",
+        lambda _token: {"id": str(AUTH_USER_ID), "email": "user@example.com"},
+    )
+    monkeypatch.setattr(agent_api, "get_profiles_repository", lambda: repo)
+    monkeypatch.setattr(agent_api, "get_agent_loop", lambda: AgentLoop(tool_router=_Router()))
+
+
+def test_chat_stream_emits_typed_events_then_persists_state(monkeypatch) -> None:
+    repo = _Repo()
+    _patch_api(monkeypatch, repo)
+
+    response = client.post(
+        "/agent/chat/stream",
+        json={"message": "Total dépenses en janvier 2026"},
+        headers={"Authorization": "Bearer test-token"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    names = [name for name, _data in events]
+    assert names[:3] == ["ack", "plan", "tool_result"]
+    assert names[-1] == "done"
+    assert events[1][1]["tool_name"] == "finance_releves_sum"
+    assert events[2][1] == {"tool_name": "finance_releves_sum", "ok": True}
+
+    done = events[-1][1]
+    deltas = "".join(str(data["text"]) for name, data in events if name == "reply_delta")
+    assert deltas == done["reply"]
+    assert set(done) >= {"reply", "tool_result", "plan"}
+
+    # Every write of the turn was merged into one upsert issued after the stream.
+    assert len(repo.update_calls) == 1
+    assert repo.chat_state["state"]["last_query"]["date_range"] == {
+        "start_date": "2026-01-01",
+        "end_date": "2026-01-31",
+    }
+
+
+def test_chat_stream_rejects_unauthenticated_requests_before_streaming() -> None:
+    response = client.post("/agent/chat/stream", json={"message": "salut"})
+
+    assert response.status_code == 401
+
+
+def test_chat_state_write_buffer_merges_writes_and_overlays_reads() -> None:
+    repo = _Repo()
+    repo.chat_state = {"active_task": {"type": "old"}, "state": {"a": 1}}
+    buffer = ChatStateWriteBuffer()
+
+    with buffered_chat_state(buffer):
+        wrapped = with_chat_state_buffer(repo)
+    wrapped.update_chat_state(profile_id=PROFILE_ID, user_id=AUTH_USER_ID, chat_state={"state": {"a": 2}})
+    wrapped.update_chat_state(profile_id=PROFILE_ID, user_id=AUTH_USER_ID, chat_state={"active_task": None})
+
+    assert repo.update_calls == []
+    assert wrapped.get_chat_state(profile_id=PROFILE_ID, user_id=AUTH_USER_ID) == {"state": {"a": 2}}
+    assert wrapped.get_profile_id_for_auth_user(auth_user_id=AUTH_USER_ID, email=None) == PROFILE_ID
+
+    assert buffer.flush() == 1
+    assert repo.update_calls == [{"state": {"a": 2}, "active_task": None}]
+    assert with_chat_state_buffer(repo) is repo
+
+
+def test_reply_chunks_split_on_words_and_round_trip() -> None:
+    reply = "Tu as dépensé 123.45 CHF en janvier 2026.\n\nVeux-tu le détail par catégorie ?"
+
+    chunks = reply_chunks(reply, max_chars=16)
+
+    assert "".join(chunks) == reply
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 16 or " " not in chunk.strip() for chunk in chunks)
@@ -0,0 +1,43 @@
+"""Tests for the chat load-test benchmark."""
+
+from __future__ import annotations
+
+import os
+
+from benchmarks.load_test import compare_with_baseline, percentile, run
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile([7.0], 0.99) == 7.0
+    assert percentile([], 0.5) is None
+
+
+def test_load_test_reports_latency_and_stage_breakdown() -> None:
+    env_before = dict(os.environ)
+
+    report = run(scenarios=["spending", "report"], users=2, iterations=1, rows=20, llm_latency_ms=0, postgrest_latency_ms=0)
+
+    assert report["latency_ms"]["requests"] == 2 * (4 + 2)
+    assert report["latency_ms"]["errors"] == 0
+    assert set(report["steps"]) == {"spending/chat.spending", "report/reports.spending", "report/reports.spending_pdf"}
+    chat = report["endpoints"]["POST /agent/chat"]
+    assert chat["requests"] == 8
+    assert chat["supabase_calls_per_request"] > 0
+    assert "chat.auth" in chat["stages_mean_ms"]
+    assert dict(os.environ) == env_before
+
+
+def test_compare_with_baseline_flags_p95_and_throughput_regressions() -> None:
+    baseline = {"throughput_rps": 100.0, "latency_ms": {"p95": 50.0}, "steps": {"spending/chat.spending": {"p95": 40.0}}}
+    report = {"throughput_rps": 70.0, "latency_ms": {"p95": 55.0}, "steps": {"spending/chat.spending": {"p95": 80.0}}}
+
+    regressions = compare_with_baseline(report, baseline, max_regression=0.25)
+
+    assert regressions == [
+        "throughput 70.0 rps < baseline 100.0 rps",
+        "spending/chat.spending p95 80.0 ms > baseline 40.0 ms",
+    ]
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from uuid import UUID
+from uuid import NAMESPACE_URL, UUID, uuid5
 
 from fastapi.testclient import TestClient
 import pytest
@@ -10,6 +10,9 @@ import pytest
 import agent.api as agent_api
 from agent.api import app
 from agent.loop import AgentReply
+from agent.tool_cache import shared_tool_result_cache
+from agent.tool_router import ToolRouter
+from shared.models import BankAccount, BankAccountsListResult
 
 
 client = TestClient(app)
@@ -589,10 +592,12 @@ def test_categories_bootstrap_creates_categories_classifies_merchants_and_skips_
     loop = _LoopSpy()
     monkeypatch.setattr(agent_api, "get_profiles_repository", lambda: repo)
     monkeypatch.setattr(agent_api, "get_agent_loop", lambda: loop)
+    version_before = shared_tool_result_cache().data_version(PROFILE_ID)
 
     response = client.post("/agent/chat", json={"message": "go"}, headers=_auth_headers())
 
     assert response.status_code == 200
+    assert shared_tool_result_cache().data_version(PROFILE_ID) == version_before + 1
     payload = response.json()
     assert payload["reply"] == (
         "Import terminé ✅\n\n"
@@ -1463,6 +1468,48 @@ def test_onboarding_bank_accounts_submit_moves_to_confirm_and_returns_recap(monk
 
 
 
+class _BankAccountsBackend:
+    def __init__(self, repo: _Repo) -> None:
+        self.repo = repo
+
+    def finance_bank_accounts_list(self, *, profile_id: UUID) -> BankAccountsListResult:
+        return BankAccountsListResult(
+            items=[
+                BankAccount(id=uuid5(NAMESPACE_URL, str(row["name"])), profile_id=profile_id, name=str(row["name"]))
+                for row in self.repo.list_bank_accounts(profile_id=profile_id)
+            ]
+        )
+
+
+def test_onboarding_bank_accounts_submit_refreshes_the_cached_account_list(monkeypatch) -> None:
+    _mock_auth(monkeypatch)
+    repo = _Repo(
+        initial_chat_state={
+            "state": {
+                "global_state": {
+                    "mode": "onboarding",
+                    "onboarding_step": "bank_accounts",
+                    "onboarding_substep": "bank_accounts_collect",
+                }
+            }
+        },
+    )
+    repo.bank_accounts = [{"id": "bank-1", "name": "BCV"}]
+    router = ToolRouter(backend_client=_BankAccountsBackend(repo), result_cache=shared_tool_result_cache())
+    monkeypatch.setattr(agent_api, "get_profiles_repository", lambda: repo)
+    monkeypatch.setattr(agent_api, "get_agent_loop", lambda: _LoopSpy())
+    monkeypatch.setattr(agent_api, "get_tool_router", lambda: router)
+
+    before = client.get("/finance/bank-accounts", headers=_auth_headers())
+    message = '__ui_form_submit__:{"form_id":"onboarding_bank_accounts","values":{"selected_banks":["UBS","Revolut"]}}'
+    response = client.post("/agent/chat", json={"message": message}, headers=_auth_headers())
+    after = client.get("/finance/bank-accounts", headers=_auth_headers())
+
+    assert response.status_code == 200
+    assert [item["name"] for item in before.json()["items"]] == ["BCV"]
+    assert [item["name"] for item in after.json()["items"]] == ["UBS", "Revolut"]
+
+
 def test_onboarding_bank_accounts_submit_replaces_existing_selection(monkeypatch) -> None:
     _mock_auth(monkeypatch)
     repo = _Repo(
@@ -0,0 +1,84 @@
+"""Tests for the shared JSON codec and the API default response class."""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agent.api import app
+from agent.responses import CodecJSONResponse
+from shared import json_codec
+from shared.json_codec import ORJSON_CODEC, STDLIB_CODEC, get_json_codec
+
+
+PAYLOAD = {
+    "id": UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"),
+    "date": date(2026, 1, 31),
+    "created_at": datetime(2026, 1, 31, 8, 30, tzinfo=timezone.utc),
+    "montant": Decimal("-12.40"),
+    "libelle": "Café « Zürich »",
+    "count": 2**70,
+    "by_month": {1: "janvier"},
+    "items": [None, True, 1.5],
+}
+
+
+@pytest.mark.parametrize("codec", [STDLIB_CODEC, ORJSON_CODEC], ids=["stdlib", "orjson"])
+def test_codecs_encode_native_values_identically(codec) -> None:
+    if codec is None:
+        pytest.skip("orjson is not installed")
+
+    encoded = codec.dumps(PAYLOAD)
+
+    assert encoded == STDLIB_CODEC.dumps(PAYLOAD)
+    assert codec.loads(encoded) == {
+        "id": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa",
+        "date": "2026-01-31",
+        "created_at": "2026-01-31T08:30:00+00:00",
+        "montant": "-12.40",
+        "libelle": "Café « Zürich »",
+        "count": 2**70,
+        "by_month": {"1": "janvier"},
+        "items": [None, True, 1.5],
+    }
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b"{not json")
+    with pytest.raises(TypeError):
+        codec.dumps({"value": object()})
+
+
+@pytest.mark.parametrize("codec", [STDLIB_CODEC, ORJSON_CODEC], ids=["stdlib", "orjson"])
+def test_codecs_write_non_finite_floats_as_null(codec) -> None:
+    if codec is None:
+        pytest.skip("orjson is not installed")
+    payload = {"ratio": float("nan"), "bounds": (float("-inf"), 2.5, float("inf")), "big": 2**70}
+
+    assert codec.dumps(payload) == b'{"ratio":null,"bounds":[null,2.5,null],"big":1180591620717411303424}'
+    assert CodecJSONResponse({"ratio": float("nan")}).body == b'{"ratio":null}'
+
+
+def test_codec_selection_follows_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    get_json_codec.cache_clear()
+    monkeypatch.setenv("AGENT_JSON_CODEC", "stdlib")
+    assert get_json_codec() is STDLIB_CODEC
+
+    get_json_codec.cache_clear()
+    monkeypatch.setenv("AGENT_JSON_CODEC", "orjson")
+    monkeypatch.setattr(json_codec, "ORJSON_CODEC", None)
+    assert get_json_codec() is STDLIB_CODEC
+    get_json_codec.cache_clear()
+
+
+def test_api_renders_responses_with_the_codec() -> None:
+    assert app.router.default_response_class is CodecJSONResponse
+
+    response = TestClient(app).get("/health")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == json_codec.json_dumps(response.json())
@@ -0,0 +1,65 @@
+"""Tests for the compiled multi-keyword rule matcher."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.jobs.benchmark_classification import run as run_classification_benchmark
+from backend.services.classification.keyword_matcher import KeywordMatcher
+
+
+def _substring_reference(groups: dict[str, tuple[str, ...]], text: str) -> dict[str, int]:
+    counts = {group: sum(1 for keyword in keywords if keyword in text) for group, keywords in groups.items()}
+    return {group: count for group, count in counts.items() if count}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "salaire salary",
+        "transfert interne ubs revolut",
+        "ubsbb",
+        "top up raiffeisen",
+        "",
+        "atlas",
+    ],
+)
+def test_matcher_reports_overlapping_and_prefix_hits_like_substring_checks(text: str) -> None:
+    groups = {
+        "salary": ("salaire", "salary", "salar"),
+        "bank": ("ubs", "raiffeisen", "revolut"),
+        "transfer": ("transfert", "transfert interne", "transfer"),
+        "transport": ("sbb", "tl"),
+        "topup": ("top up", "topup"),
+    }
+
+    assert KeywordMatcher(groups).group_counts(text) == _substring_reference(groups, text)
+
+
+def test_matcher_word_groups_require_boundaries() -> None:
+    matcher = KeywordMatcher(
+        {"exclusion": ("transfert",)},
+        word_groups={
+            "fees": ("kontofuehrung", "kontofuehrungsgebuehr", "account maintenance", "account maintenance fee"),
+            "twint_p2p": ("transfert",),
+            "taxes": ("tax",),
+        },
+    )
+
+    assert matcher.hits("taxi transferts") == {"exclusion"}
+    assert matcher.hits("tax transfert") == {"exclusion", "twint_p2p", "taxes"}
+    assert matcher.group_counts("kontofuehrungsgebuehr") == {"fees": 1}
+    assert matcher.group_counts("account maintenance fee") == {"fees": 2}
+
+
+def test_matcher_rejects_empty_keywords() -> None:
+    with pytest.raises(ValueError):
+        KeywordMatcher({"broken": ("",)})
+
+
+def test_classification_benchmark_reports_throughput() -> None:
+    report = run_classification_benchmark(rows=500, distinct_labels=50)
+
+    assert report["rows"] == 500
+    assert sum(report["categories"].values()) == 500
+    assert report["rows_per_s"] > 0
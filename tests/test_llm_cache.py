@@ -0,0 +1,158 @@
+"""Tests for the planner/judge LLM response cache."""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from agent.llm_cache import LLMResponseCache, build_cache_key, normalize_cache_message
+from agent.llm_judge import LLMJudge
+from agent.llm_planner import LLMPlanner
+from agent.planner import ToolCallPlan
+
+
+class CountingClient:
+    """Fake chat client returning a fixed payload and counting calls."""
+
+    def __init__(self, response: dict[str, Any]) -> None:
+        self.response = response
+        self.calls = 0
+
+    def create_chat_completion(
+        self,
+        model: str,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        tool_choice: str,
+    ) -> dict[str, Any]:
+        self.calls += 1
+        return self.response
+
+
+def _tool_call_response(name: str, arguments: str) -> dict[str, Any]:
+    return {
+        "choices": [
+            {
+                "message": {
+                    "content": None,
+                    "tool_calls": [{"function": {"name": name, "arguments": arguments}}],
+                }
+            }
+        ]
+    }
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_normalize_cache_message_folds_case_accents_and_spacing() -> None:
+    assert normalize_cache_message("  Combien j’ai DÉPENSÉ   ce mois ? ") == "combien j ai depense ce mois"
+
+
+def test_cache_key_is_date_sensitive_only_for_relative_periods() -> None:
+    kwargs = {"kind": "planner", "model": "m", "tools_hash": "t"}
+
+    relative_day_1 = build_cache_key(message="combien ce mois", today=date(2026, 3, 1), **kwargs)
+    relative_day_2 = build_cache_key(message="combien ce mois", today=date(2026, 3, 2), **kwargs)
+    absolute_day_1 = build_cache_key(message="combien en mars 2026", today=date(2026, 3, 1), **kwargs)
+    absolute_day_2 = build_cache_key(message="combien en mars 2026", today=date(2026, 3, 2), **kwargs)
+
+    assert relative_day_1 != relative_day_2
+    assert absolute_day_1 == absolute_day_2
+
+
+def test_cache_key_changes_with_model_and_tools_hash() -> None:
+    base = build_cache_key(kind="planner", message="x", model="m1", tools_hash="t1")
+
+    assert base != build_cache_key(kind="planner", message="x", model="m2", tools_hash="t1")
+    assert base != build_cache_key(kind="planner", message="x", model="m1", tools_hash="t2")
+
+
+def test_response_cache_expires_entries_and_evicts_lru() -> None:
+    clock = _Clock()
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=10, clock=clock)
+
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_response_cache_returns_independent_copies() -> None:
+    cache = LLMResponseCache(max_entries=4, ttl_seconds=10)
+    cache.set("a", {"v": [1]})
+
+    first = cache.get("a")
+    first["v"].append(2)
+
+    assert cache.get("a") == {"v": [1]}
+
+
+def test_llm_planner_reuses_cached_plan_for_equivalent_message(monkeypatch) -> None:
+    monkeypatch.setenv("AGENT_LLM_ENABLED", "true")
+    monkeypatch.setenv("APP_ENV", "dev")
+    client = CountingClient(_tool_call_response("finance_releves_sum", '{"direction": "DEBIT_ONLY"}'))
+    planner = LLMPlanner(client=client, cache=LLMResponseCache(max_entries=8, ttl_seconds=60))
+
+    first = planner.plan("Combien j'ai dépensé ?")
+    assert isinstance(first, ToolCallPlan)
+    first.payload["direction"] = "mutated"
+    second = planner.plan("combien j'ai depense")
+
+    assert client.calls == 1
+    assert isinstance(second, ToolCallPlan)
+    assert second.payload == {"direction": "DEBIT_ONLY"}
+
+
+def test_llm_planner_does_not_cache_write_tools(monkeypatch) -> None:
+    monkeypatch.setenv("AGENT_LLM_ENABLED", "true")
+    monkeypatch.setenv("APP_ENV", "dev")
+    client = CountingClient(
+        _tool_call_response("finance_categories_delete", '{"category_name": "Restaurants"}')
+    )
+    planner = LLMPlanner(client=client, cache=LLMResponseCache(max_entries=8, ttl_seconds=60))
+
+    planner.plan("Supprime la catégorie Restaurants")
+    planner.plan("Supprime la catégorie Restaurants")
+
+    assert client.calls == 2
+
+
+def test_llm_planner_tool_definitions_are_memoized_copies() -> None:
+    first = LLMPlanner._tool_definition()
+    first[0]["function"]["name"] = "mutated"
+
+    assert LLMPlanner._tool_definition()[0]["function"]["name"] == "finance_releves_search"
+    assert LLMPlanner.tool_definitions_hash() == LLMPlanner.tool_definitions_hash()
+
+
+def test_llm_judge_reuses_cached_verdict() -> None:
+    client = CountingClient(
+        _tool_call_response("guardian_verdict", '{"verdict": "approve", "reason": "ok"}')
+    )
+    judge = LLMJudge(model="m", client=client, cache=LLMResponseCache(max_entries=8, ttl_seconds=60))
+    kwargs = {
+        "user_message": "et en restaurants ?",
+        "deterministic_plan": {"tool_name": "finance_releves_sum", "payload": {"categorie": "Restaurants"}},
+        "conversation_context": {"last_tool_name": "finance_releves_sum"},
+    }
+
+    first = judge.judge(**kwargs)
+    second = judge.judge(**kwargs)
+    judge.judge(**{**kwargs, "deterministic_plan": {"tool_name": "finance_releves_search", "payload": {}}})
+
+    assert first.verdict == second.verdict == "approve"
+    assert second.meta["cache"] == "hit"
+    assert client.calls == 2
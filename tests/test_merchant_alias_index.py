@@ -0,0 +1,113 @@
+"""Tests for the in-process fuzzy merchant alias index."""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+from backend.repositories.releves_repository import InMemoryRelevesRepository
+from backend.services.classification.alias_index import MerchantAliasIndex, alias_index_key
+from backend.services.releves_import.importer import RelevesImportService
+from tests.test_releves_import_classification_integration import (
+    PROFILE_ID,
+    _build_request,
+    _build_single_coop_csv,
+    _ProfilesStub,
+)
+
+
+COOP_ID = "11111111-aaaa-aaaa-aaaa-111111111111"
+MIGROS_ID = "22222222-aaaa-aaaa-aaaa-222222222222"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_alias_index_key_strips_variable_tokens() -> None:
+    assert alias_index_key("COOP-1234 LAUSANNE") == alias_index_key("COOP 5678 LAUSANNE") == "coop lausanne"
+
+
+def test_alias_index_matches_exact_key_and_fuzzy_variants() -> None:
+    index = MerchantAliasIndex(refresh_interval_s=60)
+    index.add(alias="COOP-1234 LAUSANNE", merchant_entity_id=COOP_ID)
+    index.add(alias="MIGROS MMM CRISSIER", merchant_entity_id=MIGROS_ID)
+
+    exact = index.lookup("COOP 5678 LAUSANNE")
+    fuzzy = index.lookup("MIGROS MM CRISSIER")
+
+    assert exact is not None and exact.merchant_entity_id == COOP_ID and exact.similarity == 1.0
+    assert fuzzy is not None and fuzzy.merchant_entity_id == MIGROS_ID and fuzzy.similarity < 1.0
+    assert index.lookup("BOULANGERIE MARTIN") is None
+
+
+def test_alias_index_never_returns_ambiguous_keys() -> None:
+    index = MerchantAliasIndex(refresh_interval_s=60)
+    index.add(alias="SHOP 1234", merchant_entity_id=COOP_ID)
+    index.add(alias="SHOP 9999", merchant_entity_id=MIGROS_ID)
+
+    assert index.lookup("SHOP 5555") is None
+
+
+class _AliasRowsRepository:
+    def __init__(self) -> None:
+        self.calls: list[str | None] = []
+        self.rows = [
+            {"merchant_entity_id": COOP_ID, "alias": "COOP-1234 LAUSANNE", "alias_norm": "coop lausanne", "last_seen": "2026-01-01T00:00:00+00:00"},
+        ]
+
+    def list_merchant_aliases_for_index(self, *, seen_after: str | None = None):
+        self.calls.append(seen_after)
+        return [row for row in self.rows if seen_after is None or row["last_seen"] >= seen_after]
+
+
+def test_alias_index_refreshes_incrementally_from_watermark() -> None:
+    clock = _Clock()
+    repository = _AliasRowsRepository()
+    index = MerchantAliasIndex(refresh_interval_s=60, clock=clock)
+
+    assert index.ensure_fresh(repository) == 1
+    assert index.ensure_fresh(repository) == 0
+
+    repository.rows.append(
+        {"merchant_entity_id": MIGROS_ID, "alias": "MIGROS SION", "alias_norm": "migros sion", "last_seen": "2026-02-01T00:00:00+00:00"}
+    )
+    clock.now = 61
+    index.ensure_fresh(repository)
+
+    assert repository.calls == [None, "2026-01-01T00:00:00+00:00"]
+    assert index.lookup("MIGROS SION 42").merchant_entity_id == MIGROS_ID
+
+
+class _ProfilesStubWithAliases(_ProfilesStub):
+    def __init__(self) -> None:
+        super().__init__()
+        self.upserted_aliases: list[dict] = []
+
+    def upsert_merchant_alias(self, **kwargs) -> None:
+        self.upserted_aliases.append(kwargs)
+
+
+def test_importer_uses_alias_index_before_creating_pending_suggestion() -> None:
+    repository = InMemoryRelevesRepository()
+    profiles_repository = _ProfilesStubWithAliases()
+    index = MerchantAliasIndex(refresh_interval_s=60)
+    index.add(alias="COOP MONTHEY 4521", merchant_entity_id=COOP_ID)
+    service = RelevesImportService(
+        releves_repository=repository,
+        profiles_repository=profiles_repository,
+        alias_index=index,
+    )
+
+    result = service.import_releves(_build_request(_build_single_coop_csv()))
+
+    assert result.imported_count == 1
+    imported_rows = repository.list_releves_for_import(profile_id=PROFILE_ID, bank_account_id=None)
+    coop_row = [row for row in imported_rows if row.get("libelle") == "COOP MONTHEY"][0]
+    assert coop_row["merchant_entity_id"] == UUID(COOP_ID)
+    assert coop_row["meta"]["merchant_resolution"] == "resolved_fuzzy_alias"
+    assert profiles_repository.pending_alias_norms == set()
+    assert profiles_repository.upserted_aliases[0]["source"] == "alias_index"
@@ -0,0 +1,189 @@
+"""Tests for the local pre-LLM merchant categorizer."""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+from agent import merchant_alias_resolver as resolver
+from backend.repositories.releves_repository import InMemoryRelevesRepository
+from backend.services.merchant_categorizer import (
+    MerchantCategorizer,
+    MerchantTrainingExample,
+    evaluate_categorizer,
+    predict_confident_link,
+    split_examples,
+    training_examples_from_rows,
+)
+from backend.services.releves_import.importer import RelevesImportService
+from tests.test_releves_import_classification_integration import (
+    PROFILE_ID,
+    _build_request,
+    _build_single_coop_csv,
+    _ProfilesStub,
+)
+
+
+COOP_ID = "11111111-aaaa-aaaa-aaaa-111111111111"
+SBB_ID = "22222222-aaaa-aaaa-aaaa-222222222222"
+NETFLIX_ID = "33333333-aaaa-aaaa-aaaa-333333333333"
+
+
+def _examples() -> list[MerchantTrainingExample]:
+    return [
+        MerchantTrainingExample("Coop", COOP_ID, "Coop", "food"),
+        MerchantTrainingExample("COOP-1234 LAUSANNE", COOP_ID, "Coop", "food"),
+        MerchantTrainingExample("COOP MONTHEY 4521", COOP_ID, "Coop", "food"),
+        MerchantTrainingExample("SBB CFF FFS", SBB_ID, "SBB", "transport"),
+        MerchantTrainingExample("SBB Mobile Ticket", SBB_ID, "SBB", "transport"),
+        MerchantTrainingExample("Netflix", NETFLIX_ID, "Netflix", "subscriptions"),
+        MerchantTrainingExample("NETFLIX.COM Los Gatos", NETFLIX_ID, "Netflix", "subscriptions"),
+    ]
+
+
+def test_categorizer_predicts_nearest_entity_and_category() -> None:
+    categorizer = MerchantCategorizer.train(_examples())
+
+    prediction = categorizer.predict("COOP-5678 LAUSANNE")
+
+    assert prediction is not None
+    assert prediction.merchant_entity_id == COOP_ID
+    assert prediction.category_norm == "food"
+    assert prediction.confidence > 0.8
+    assert categorizer.predict("") is None
+
+
+def test_categorizer_confident_link_respects_threshold() -> None:
+    categorizer = MerchantCategorizer.train(_examples())
+
+    assert predict_confident_link(categorizer, "NETFLIX.COM Los Gatos", threshold=0.9) is not None
+    assert predict_confident_link(categorizer, "Boulangerie du coin", threshold=0.9) is None
+    assert predict_confident_link(None, "Netflix", threshold=0.1) is None
+
+
+def test_categorizer_round_trips_through_json(tmp_path) -> None:
+    categorizer = MerchantCategorizer.train(_examples())
+    model_path = tmp_path / "model.json"
+
+    categorizer.save(model_path)
+    loaded = MerchantCategorizer.load(model_path)
+
+    assert len(loaded) == len(categorizer)
+    assert loaded.predict("sbb cff ffs") == categorizer.predict("sbb cff ffs")
+
+
+def test_training_rows_split_and_evaluation_report() -> None:
+    examples = training_examples_from_rows(
+        [
+            {"merchant_entity_id": COOP_ID, "text": "Coop", "canonical_name": "Coop", "suggested_category_norm": "food"},
+            {"merchant_entity_id": COOP_ID, "text": "COOP 1234 SION", "canonical_name": "Coop", "suggested_category_norm": "food"},
+            {"merchant_entity_id": SBB_ID, "text": "SBB", "canonical_name": "SBB", "suggested_category_norm": "transport"},
+            {"merchant_entity_id": "", "text": "ignored"},
+        ]
+    )
+    train, holdout = split_examples(examples, holdout_ratio=1.0)
+
+    assert len(examples) == 3
+    assert {example.text for example in holdout} == {"COOP 1234 SION"}
+
+    report = evaluate_categorizer(MerchantCategorizer.train(train), holdout, link_threshold=0.5)
+
+    assert report["examples"] == 1
+    assert report["entity_accuracy"] == 1.0
+    assert report["category_accuracy"] == 1.0
+    assert report["latency_p95_us"] >= 0
+
+
+class _ProfilesStubWithAliases(_ProfilesStub):
+    def __init__(self) -> None:
+        super().__init__()
+        self.upserted_aliases: list[dict] = []
+
+    def upsert_merchant_alias(self, **kwargs) -> None:
+        self.upserted_aliases.append(kwargs)
+
+
+def test_importer_auto_links_alias_predicted_by_local_categorizer(monkeypatch) -> None:
+    monkeypatch.setenv("MERCHANT_CATEGORIZER_LINK_THRESHOLD", "0.5")
+    repository = InMemoryRelevesRepository()
+    profiles_repository = _ProfilesStubWithAliases()
+    service = RelevesImportService(
+        releves_repository=repository,
+        profiles_repository=profiles_repository,
+        merchant_categorizer=MerchantCategorizer.train(_examples()),
+    )
+
+    result = service.import_releves(_build_request(_build_single_coop_csv()))
+
+    assert result.imported_count == 1
+    imported_rows = repository.list_releves_for_import(profile_id=PROFILE_ID, bank_account_id=None)
+    imported_row = [row for row in imported_rows if row.get("libelle") == "COOP MONTHEY"][0]
+    assert imported_row["merchant_entity_id"] == UUID(COOP_ID)
+    assert imported_row["meta"]["merchant_resolution"] == "resolved_local_categorizer"
+    assert profiles_repository.pending_alias_norms == set()
+    assert profiles_repository.upserted_aliases[0]["source"] == "local_categorizer"
+
+
+class _ResolverRepoStub:
+    def __init__(self) -> None:
+        self.updates: list[dict] = []
+        self.aliases: list[dict] = []
+
+    def list_map_alias_suggestions(self, *, profile_id: UUID, limit: int, include_failed: bool = False):
+        return [
+            {
+                "id": "44444444-4444-4444-4444-444444444444",
+                "observed_alias": "COOP-9999 LAUSANNE",
+                "observed_alias_norm": "coop 9999 lausanne",
+            },
+            {
+                "id": "55555555-5555-5555-5555-555555555555",
+                "observed_alias": "Boulangerie Martin",
+                "observed_alias_norm": "boulangerie martin",
+            },
+        ]
+
+    def ensure_system_categories(self, **_kwargs):
+        return {}
+
+    def list_profile_categories(self, *, profile_id: UUID):
+        return [{"id": "66666666-6666-6666-6666-666666666666", "system_key": "food", "name_norm": "alimentation"}]
+
+    def upsert_merchant_alias(self, **kwargs):
+        self.aliases.append(kwargs)
+
+    def upsert_profile_merchant_override(self, **_kwargs):
+        return None
+
+    def apply_entity_to_profile_transactions(self, **_kwargs):
+        return 1
+
+    def update_merchant_suggestion_after_resolve(self, **kwargs):
+        self.updates.append(kwargs)
+
+
+def test_resolver_links_confident_aliases_locally_and_sends_residue_to_llm(monkeypatch) -> None:
+    prompts: list[str] = []
+
+    def _fake_llm(prompt: str):
+        prompts.append(prompt)
+        return {"resolutions": []}, "run_1", {}
+
+    monkeypatch.setattr(resolver, "_call_llm_json", _fake_llm)
+    repo = _ResolverRepoStub()
+
+    stats = resolver.resolve_pending_map_alias(
+        profile_id=PROFILE_ID,
+        profiles_repository=repo,
+        limit=10,
+        categorizer=MerchantCategorizer.train(_examples()),
+    )
+
+    assert stats["local_resolved"] == 1
+    assert stats["applied"] == 1
+    assert repo.aliases[0]["merchant_entity_id"] == UUID(COOP_ID)
+    assert repo.aliases[0]["source"] == "local_categorizer"
+    assert len(prompts) == 1
+    assert "Boulangerie Martin" in prompts[0]
+    assert "COOP-9999" not in prompts[0]
+    applied_update = next(update for update in repo.updates if update["status"] == "applied")
+    assert applied_update["llm_model"] == "local_categorizer"
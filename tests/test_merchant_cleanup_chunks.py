@@ -0,0 +1,98 @@
+"""Tests for chunked, concurrent merchant cleanup."""
+
+from __future__ import annotations
+
+import json
+import threading
+from uuid import UUID, uuid4
+
+from agent import merchant_cleanup
+from agent.merchant_cleanup import partition_merchants, run_merchant_cleanup
+
+
+PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+
+
+def _merchant(name: str) -> dict[str, object]:
+    return {"id": str(uuid4()), "name": name, "name_norm": name.lower(), "aliases": [], "category": ""}
+
+
+def _prompt_merchants(prompt: str) -> list[dict[str, object]]:
+    return json.loads(prompt.split("Marchands: ", 1)[1])
+
+
+def test_partition_keeps_similar_names_in_the_same_chunk() -> None:
+    merchants = [
+        _merchant("Coop City"),
+        _merchant("Migros"),
+        _merchant("SBB"),
+        _merchant("COOP-1234 Lausanne"),
+        _merchant("Migrolino"),
+        _merchant("Netflix"),
+    ]
+
+    chunks = partition_merchants(merchants, chunk_size=2)
+
+    names_by_chunk = [{merchant["name"] for merchant in chunk} for chunk in chunks]
+    assert {"Coop City", "COOP-1234 Lausanne"} in names_by_chunk
+    assert {"Migros", "Migrolino"} in names_by_chunk
+    assert sum(len(chunk) for chunk in chunks) == len(merchants)
+    assert all(len(chunk) <= 2 for chunk in chunks)
+
+
+def test_partition_splits_oversized_blocks() -> None:
+    merchants = [_merchant(f"Coop {city}") for city in ("Sion", "Bulle", "Nyon", "Aigle", "Morges")]
+
+    chunks = partition_merchants(merchants, chunk_size=2)
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+def test_run_cleanup_streams_chunks_merges_duplicates_and_survives_failures(monkeypatch) -> None:
+    merchants = [
+        _merchant("Coop City"),
+        _merchant("Coop Pronto"),
+        _merchant("Migros"),
+        _merchant("Netflix"),
+        _merchant("Zalando"),
+    ]
+    coop_city, coop_pronto = merchants[0]["id"], merchants[1]["id"]
+    lock = threading.Lock()
+    calls: list[int] = []
+
+    def _fake_llm(prompt: str):
+        chunk = _prompt_merchants(prompt)
+        with lock:
+            calls.append(len(chunk))
+        names = {merchant["name"] for merchant in chunk}
+        if "Zalando" in names:
+            raise RuntimeError("llm down")
+        if "Coop City" in names:
+            merge = {"action": "merge", "source_merchant_id": coop_pronto, "target_merchant_id": coop_city, "confidence": 0.97}
+            duplicate = {"action": "merge", "source_merchant_id": coop_city, "target_merchant_id": coop_pronto, "confidence": 0.5}
+            return {"suggestions": [merge, duplicate]}, "run_coop", {"total_tokens": 10}
+        keep = {"action": "keep", "source_merchant_id": chunk[0]["id"], "confidence": 0.9}
+        return {"suggestions": [keep]}, "run_other", {"total_tokens": 5}
+
+    monkeypatch.setattr(merchant_cleanup, "_call_llm_json", _fake_llm)
+    streamed: list[tuple[int, str | None]] = []
+
+    suggestions, llm_run_id, usage, stats = run_merchant_cleanup(
+        profile_id=PROFILE_ID,
+        profiles_repository=None,
+        merchants=merchants,
+        on_suggestions=lambda chunk, run_id: streamed.append((len(chunk), run_id)),
+        chunk_size=2,
+        max_workers=3,
+    )
+
+    assert sorted(calls) == [1, 2, 2]
+    assert [suggestion.action for suggestion in suggestions].count("merge") == 1
+    assert len(suggestions) == 2
+    assert sorted(streamed, key=lambda item: str(item[1])) == [(1, "run_coop"), (1, "run_other")]
+    assert llm_run_id == "run_coop"
+    assert usage == {"total_tokens": 15}
+    assert stats["chunks_count"] == 3
+    assert stats["chunks_failed"] == 1
+    assert stats["duplicates_dropped"] == 1
+    assert stats["parsed_count"] == 3
@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+import pytest
+
+from agent.memory import period_payload_from_message
+from agent.message_features import analyze_message, ascii_text, basic_text, fold_text
+
+
+def test_analyze_message_extracts_month_year_pairs_in_order() -> None:
+    features = analyze_message("Dépenses en décembre 2025 et janv. 2026, puis mars")
+
+    assert features.month_years == ((12, 2025), (1, 2026), (3, None))
+    assert features.months == (12, 1, 3)
+    assert features.years == (2025, 2026)
+
+
+def test_month_year_pairs_skip_link_tokens() -> None:
+    assert analyze_message("janvier et mars 2026").month_years == ((1, None), (3, 2026))
+    assert analyze_message("janvier en 2026").month_years == ((1, 2026),)
+
+
+@pytest.mark.parametrize(
+    ("message", "tag"),
+    [
+        ("Liste mes catégories", "category_list"),
+        ("renomme la catégorie « Resto » en « Restaurants »", "category_rename"),
+        ("montre moi mes comptes bancaires", "bank_account_list"),
+        ("Mes DÉPENSES du mois", "expense"),
+        ("dépenses par mois", "group_by_month"),
+    ],
+)
+def test_analyze_message_tags_keyword_phrases(message: str, tag: str) -> None:
+    assert analyze_message(message).has(tag)
+
+
+def test_keyword_phrases_only_match_at_word_starts() -> None:
+    features = analyze_message("superdépenses")
+
+    assert not features.has("expense")
+
+
+def test_analyze_message_collects_amounts_and_quoted_values() -> None:
+    features = analyze_message("renomme 'Resto' en «Restaurants» pour 12,50 ou 3")
+
+    assert features.quoted == ("Resto", "Restaurants")
+    assert features.amounts == (Decimal("12.50"), Decimal("3"))
+
+
+@pytest.mark.parametrize(
+    ("message", "answer"),
+    [("Oui", "yes"), ("  C'est prêt ", "yes"), ("✅ parfait", "yes"), ("non", "no"), ("❌", "no"), ("oui merci", None)],
+)
+def test_analyze_message_detects_yes_no_answers(message: str, answer: str | None) -> None:
+    assert analyze_message(message).answer == answer
+
+
+def test_text_normalizers_keep_their_semantics() -> None:
+    assert fold_text("  Énergie   ÉTÉ ") == "energie ete"
+    assert ascii_text(" Prêt ✅ ") == "pret"
+    assert basic_text("C’est  Noël") == "c'est noel"
+
+
+def test_period_payload_uses_smallest_month_with_first_year() -> None:
+    assert period_payload_from_message("mars et janvier 2026") == {
+        "date_range": {"start_date": "2026-01-01", "end_date": "2026-01-31"}
+    }
+    assert period_payload_from_message("en 2025") == {"year": 2025}
+    assert period_payload_from_message("en mars") == {}
@@ -0,0 +1,108 @@
+"""Tests for precomputed category and bank-account name indexes."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from difflib import get_close_matches
+from uuid import UUID
+
+from agent.api import _match_bank_account_name
+from agent.name_index import NameIndex
+from agent.tool_cache import ToolResultCache
+from agent.tool_router import ToolRouter, normalize_bank_account_name
+from shared.models import BankAccount, ProfileCategory, ToolError, ToolErrorCode
+from shared.text_utils import normalize_category_name
+from tests.fakes import FakeBackendClient
+
+
+PROFILE_ID = UUID("11111111-1111-1111-1111-111111111111")
+
+
+def _category(index: int, name: str) -> ProfileCategory:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return ProfileCategory(
+        id=UUID(int=index),
+        profile_id=PROFILE_ID,
+        name=name,
+        name_norm=normalize_category_name(name),
+        exclude_from_totals=False,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@dataclass
+class _CountingBackendClient(FakeBackendClient):
+    categories_list_calls: int = 0
+    bank_accounts_list_calls: int = 0
+
+    def finance_categories_list(self, profile_id: UUID):
+        self.categories_list_calls += 1
+        return super().finance_categories_list(profile_id)
+
+    def finance_bank_accounts_list(self, *, profile_id: UUID):
+        self.bank_accounts_list_calls += 1
+        return super().finance_bank_accounts_list(profile_id=profile_id)
+
+
+def test_lookup_groups_items_by_normalized_name() -> None:
+    accounts = [
+        BankAccount(id=UUID(int=1), profile_id=PROFILE_ID, name="UBS"),
+        BankAccount(id=UUID(int=2), profile_id=PROFILE_ID, name=" ubs "),
+        BankAccount(id=UUID(int=3), profile_id=PROFILE_ID, name="Revolut"),
+    ]
+
+    index = NameIndex(accounts, name=lambda account: account.name, normalize=normalize_bank_account_name)
+
+    assert [account.id for account in index.lookup("Ubs")] == [UUID(int=1), UUID(int=2)]
+    assert index.lookup("Neon") == ()
+    assert index.first_name("ubs") == "UBS"
+    assert index.norms() == ("ubs", "revolut")
+    assert len(index) == 3
+
+
+def test_close_norms_match_difflib_and_are_memoized() -> None:
+    names = ["Alimentation", "Restaurants", "Transport", "Logement", "Loisirs", "Santé", "Assurances", "Impôts"]
+    index = NameIndex(names, name=lambda name: name, normalize=normalize_category_name)
+    norms = [normalize_category_name(name) for name in names]
+
+    for query in ("alimentaton", "restau", "loisir", "transports publics", "x", "assurance maladie"):
+        expected = tuple(get_close_matches(normalize_category_name(query), norms, n=3, cutoff=0.6))
+        assert index.close_norms(query) == expected
+
+    assert index.close_norms("alimentaton") is index.close_norms("Alimentaton")
+
+
+def test_router_reuses_name_index_until_profile_data_changes() -> None:
+    backend_client = _CountingBackendClient(categories=[_category(1, "Alimentation"), _category(2, "Transport")])
+    cache = ToolResultCache(max_entries=10, ttl_seconds=60)
+    router = ToolRouter(backend_client=backend_client, result_cache=cache)
+
+    first = router._find_category_by_name(profile_id=PROFILE_ID, category_name="alimentation")
+    stats_after_build = cache.stats()
+    missing = router._find_category_by_name(profile_id=PROFILE_ID, category_name="Alimentaton")
+
+    assert cache.stats() == stats_after_build == {"hits": 0, "misses": 1, "invalidations": 0, "size": 1}
+
+    assert isinstance(first, ProfileCategory) and first.id == UUID(int=1)
+    assert isinstance(missing, ToolError) and missing.code == ToolErrorCode.NOT_FOUND
+    assert missing.details["close_category_names"] == ["Alimentation"]
+    assert backend_client.categories_list_calls == 1
+
+    cache.bump_data_version(PROFILE_ID)
+    router._find_category_by_name(profile_id=PROFILE_ID, category_name="transport")
+
+    assert backend_client.categories_list_calls == 2
+
+
+def test_bank_account_name_match_keeps_the_first_matching_account() -> None:
+    accounts = [
+        {"id": "a", "name": "Compte UBS"},
+        {"id": "b", "name": "UBS"},
+        {"id": "c", "name": "ubs"},
+    ]
+
+    assert _match_bank_account_name("ubs", accounts) == {"id": "b", "name": "UBS"}
+    assert _match_bank_account_name("Compte UBS", accounts) == {"id": "a", "name": "Compte UBS"}
+    assert _match_bank_account_name("Revolut", accounts) is None
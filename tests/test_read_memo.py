@@ -0,0 +1,142 @@
+"""Tests for request-scoped memoization of PostgREST reads."""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+
+from agent.api import app
+from backend.db.read_memo import current_read_memo, request_read_memo
+from backend.db.supabase_client import SupabaseClient, SupabaseSettings
+from backend.repositories.bank_accounts_repository import SupabaseBankAccountsRepository
+from backend.repositories.categories_repository import SupabaseCategoriesRepository
+from shared.models import BankAccountUpdateRequest, CategoryUpdateRequest
+from tests.fake_postgrest import FakePostgrest
+
+
+PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+ACCOUNT_ID = "11111111-1111-1111-1111-111111111111"
+CATEGORY_ID = "22222222-2222-2222-2222-222222222222"
+
+
+def _client(server: FakePostgrest) -> SupabaseClient:
+    return SupabaseClient(SupabaseSettings(url=server.url, service_role_key="key"))
+
+
+def _list_accounts(client: SupabaseClient) -> list[dict[str, object]]:
+    rows, _ = client.get_rows(
+        table="bank_accounts",
+        query={"select": "id,name", "profile_id": f"eq.{PROFILE_ID}", "order": "name.asc"},
+        with_count=False,
+    )
+    return rows
+
+
+def test_identical_reads_hit_postgrest_once_per_request(fake_postgrest: FakePostgrest) -> None:
+    fake_postgrest.seed("bank_accounts", [{"id": "1", "profile_id": str(PROFILE_ID), "name": "UBS"}])
+    client = _client(fake_postgrest)
+
+    with request_read_memo() as memo:
+        first = _list_accounts(client)
+        first[0]["name"] = "mutated by caller"
+        second = _list_accounts(client)
+
+    assert second == [{"id": "1", "name": "UBS"}]
+    assert fake_postgrest.stats()["by_table"] == {"GET bank_accounts": 1}
+    assert memo is not None
+    assert memo.stats() == {
+        "reads": 2,
+        "deduplicated": 1,
+        "invalidations": 0,
+        "deduplicated_by_table": {"bank_accounts": 1},
+    }
+    assert current_read_memo() is None
+
+
+def test_writes_invalidate_memoized_reads(fake_postgrest: FakePostgrest) -> None:
+    fake_postgrest.seed("bank_accounts", [{"id": "1", "profile_id": str(PROFILE_ID), "name": "UBS"}])
+    client = _client(fake_postgrest)
+
+    with request_read_memo():
+        assert len(_list_accounts(client)) == 1
+        client.post_rows(table="bank_accounts", payload={"id": "2", "profile_id": str(PROFILE_ID), "name": "Neon"})
+        after_write = _list_accounts(client)
+
+    assert [row["name"] for row in after_write] == ["Neon", "UBS"]
+    assert fake_postgrest.stats()["by_table"] == {"GET bank_accounts": 2, "POST bank_accounts": 1}
+
+
+def test_reads_are_not_memoized_outside_a_request_or_when_disabled(fake_postgrest: FakePostgrest, monkeypatch) -> None:
+    client = _client(fake_postgrest)
+
+    _list_accounts(client)
+    _list_accounts(client)
+    monkeypatch.setenv("AGENT_REQUEST_READ_MEMO_ENABLED", "0")
+    with request_read_memo() as memo:
+        _list_accounts(client)
+        _list_accounts(client)
+
+    assert memo is None
+    assert fake_postgrest.stats()["by_table"] == {"GET bank_accounts": 4}
+
+
+def test_chat_debug_reports_deduplicated_reads(fake_postgrest: FakePostgrest) -> None:
+    fake_postgrest.add_user("memo-token", user_id=UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"), email="new@example.com")
+
+    response = TestClient(app).post(
+        "/agent/chat",
+        json={"message": "Bonjour"},
+        headers={"Authorization": "Bearer memo-token", "X-Debug": "1"},
+    )
+
+    assert response.status_code == 200
+    read_memo = response.json()["debug"]["read_memo"]
+    assert read_memo["reads"] >= read_memo["deduplicated"] >= 1
+    assert read_memo["deduplicated_by_table"]["profils"] >= 1
+
+
+def test_repository_writes_outside_the_client_invalidate_memoized_reads(fake_postgrest: FakePostgrest) -> None:
+    fake_postgrest.seed(
+        "bank_accounts",
+        [
+            {
+                "id": ACCOUNT_ID,
+                "profile_id": str(PROFILE_ID),
+                "name": "UBS",
+                "kind": "individual",
+                "account_kind": None,
+                "is_system": False,
+            }
+        ],
+    )
+    fake_postgrest.seed(
+        "profile_categories",
+        [
+            {
+                "id": CATEGORY_ID,
+                "profile_id": str(PROFILE_ID),
+                "name": "Courses",
+                "name_norm": "courses",
+                "exclude_from_totals": False,
+                "created_at": "2026-01-01T00:00:00+00:00",
+                "updated_at": "2026-01-01T00:00:00+00:00",
+            }
+        ],
+    )
+    client = _client(fake_postgrest)
+    accounts = SupabaseBankAccountsRepository(client=client)
+    categories = SupabaseCategoriesRepository(client=client)
+
+    with request_read_memo():
+        assert [account.name for account in accounts.list_bank_accounts(PROFILE_ID)] == ["UBS"]
+        assert [category.name for category in categories.list_categories(PROFILE_ID)] == ["Courses"]
+        accounts.update_bank_account(
+            BankAccountUpdateRequest(profile_id=PROFILE_ID, bank_account_id=UUID(ACCOUNT_ID), set={"name": "UBS Epargne"})
+        )
+        categories.update_category(
+            CategoryUpdateRequest(profile_id=PROFILE_ID, category_id=UUID(CATEGORY_ID), name="Alimentation")
+        )
+
+        assert [account.name for account in accounts.list_bank_accounts(PROFILE_ID)] == ["UBS Epargne"]
+        assert [category.name for category in categories.list_categories(PROFILE_ID)] == ["Alimentation"]
@@ -0,0 +1,72 @@
+"""Tests for the columnar releves batch and its group-by helpers."""
+
+from __future__ import annotations
+
+import random
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+import backend.repositories.releves_batch as releves_batch
+from backend.repositories.releves_batch import (
+    FLOW_EXPENSE,
+    RelevesBatch,
+    cents_to_decimal,
+    group_count,
+    group_sum,
+    to_cents,
+)
+
+
+def test_batch_interns_labels_and_round_trips_rows() -> None:
+    rows = [
+        {"date": date(2026, 1, 3), "montant": Decimal("-42.50"), "devise": "CHF", "flow_type": "expense", "category": "Alimentation", "merchant": "Migros", "excluded_from_totals": False},
+        {"date": "2026-01-04", "montant": "-7.125", "devise": "CHF", "flow_type": "expense", "category": "Alimentation", "merchant": "Coop", "excluded_from_totals": False},
+        {"date": date(2026, 1, 25), "montant": Decimal("5000"), "devise": "CHF", "flow_type": "income", "category": "Salaire", "merchant": "Employeur", "excluded_from_totals": False},
+        {"date": date(2026, 1, 28), "montant": Decimal("-500.00"), "devise": None, "flow_type": "expense", "category": "Épargne", "merchant": "Migros", "excluded_from_totals": True},
+    ]
+
+    batch = RelevesBatch.from_rows(rows)
+
+    assert len(batch) == 4
+    assert batch.categories == ["Alimentation", "Salaire", "Épargne"]
+    assert batch.merchants == ["Migros", "Coop", "Employeur"]
+    assert list(batch.amount_cents) == [-4250, -712, 500000, -50000]
+    assert batch.first_currency() == "CHF"
+    assert list(batch.flow_mask(FLOW_EXPENSE, include_excluded=False)) == [1, 1, 0, 0]
+    back = list(batch.to_rows())
+    assert back[1]["date"] == date(2026, 1, 4)
+    assert back[1]["montant"] == Decimal("-7.12")
+    assert back[3]["excluded_from_totals"] is True
+    assert to_cents("0.005") == 0
+    assert str(cents_to_decimal(-4250)) == "-42.50"
+    assert str(cents_to_decimal(0)) == "0"
+
+
+@pytest.mark.parametrize("numpy_enabled", [False, True])
+def test_group_helpers_give_identical_exact_results_with_and_without_numpy(
+    numpy_enabled: bool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    if numpy_enabled:
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(releves_batch, "NUMPY_MIN_ROWS", 1)
+    else:
+        monkeypatch.setattr(releves_batch, "_load_numpy", lambda: None)
+    generator = random.Random(7)
+    codes = [generator.randrange(5) for _ in range(3000)]
+    values = [generator.randrange(-10**9, 10**9) for _ in range(3000)]
+    mask = bytearray(generator.randrange(2) for _ in range(3000))
+
+    expected_sums = [0] * 6
+    expected_counts = [0] * 6
+    for code, value, selected in zip(codes, values, mask):
+        if selected:
+            expected_sums[code] += value
+            expected_counts[code] += 1
+
+    assert group_sum(codes, values, 6, mask) == expected_sums
+    assert group_count(codes, 6, mask) == expected_counts
+    assert group_sum(codes, values, 6) == [sum(v for c, v in zip(codes, values) if c == code) for code in range(6)]
+    assert group_count(codes, 6)[5] == 0
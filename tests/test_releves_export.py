@@ -0,0 +1,143 @@
+"""Tests for the streaming releves export (keyset scan, encoders, endpoint)."""
+
+from __future__ import annotations
+
+import json
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+
+import agent.api as agent_api
+from agent.api import app
+from backend.db.supabase_client import SupabaseClient, SupabaseSettings
+from backend.repositories.profiles_repository import SupabaseProfilesRepository
+from backend.repositories.releves_repository import InMemoryRelevesRepository, SupabaseRelevesRepository
+from backend.services.releves_export import EXPORT_COLUMNS, RelevesExportFormat, encode_releves_export
+from shared.models import DateRange
+from tests.fake_postgrest import FakePostgrest
+
+
+client = TestClient(app)
+AUTH_USER_ID = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
+PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+GROCERIES_ID = "22222222-2222-2222-2222-222222222222"
+
+
+def test_supabase_export_walks_pages_by_date_and_id(fake_postgrest: FakePostgrest) -> None:
+    fake_postgrest.seed(
+        "profile_categories",
+        [{"id": GROCERIES_ID, "profile_id": str(PROFILE_ID), "name": "Courses"}],
+    )
+    fake_postgrest.seed(
+        "releves_bancaires",
+        [
+            {"id": "r5", "profile_id": str(PROFILE_ID), "date": "2026-02-01", "montant": "2500.00", "devise": "CHF", "payee": "Employeur"},
+            {"id": "r2", "profile_id": str(PROFILE_ID), "date": "2026-01-10", "montant": "-12.40", "devise": "CHF", "payee": "Migros", "category_id": GROCERIES_ID},
+            {"id": "r1", "profile_id": str(PROFILE_ID), "date": "2026-01-10", "montant": "-3.10", "devise": "CHF", "payee": "Coop", "category_id": GROCERIES_ID},
+            {"id": "r3", "profile_id": str(PROFILE_ID), "date": "2026-01-10", "montant": "-200.00", "devise": "CHF", "metadonnees": {"tx_kind": "transfer_internal"}},
+            {"id": "r4", "profile_id": str(PROFILE_ID), "date": "2026-01-20", "montant": "-8.00", "devise": "CHF", "categorie": "Loisirs"},
+            {"id": "r0", "profile_id": str(PROFILE_ID), "date": "2025-12-31", "montant": "-1.00", "devise": "CHF"},
+        ],
+    )
+    supabase_client = SupabaseClient(SupabaseSettings(url=fake_postgrest.url, service_role_key="key"))
+    profiles_repository = SupabaseProfilesRepository(client=supabase_client)
+    repository = SupabaseRelevesRepository(client=supabase_client, profiles_repository=profiles_repository)
+
+    rows = list(
+        repository.iter_releves_for_export(
+            profile_id=PROFILE_ID,
+            date_range=DateRange(start_date=date(2026, 1, 1), end_date=date(2026, 2, 28)),
+            page_size=2,
+        )
+    )
+
+    assert [row["id"] for row in rows] == ["r1", "r2", "r3", "r4", "r5"]
+    assert rows[0]["category"] == "Courses"
+    assert rows[0]["merchant"] == "Coop"
+    assert rows[0]["montant"] == Decimal("-3.10")
+    assert rows[2]["flow_type"] == "transfer_internal"
+    assert rows[4]["flow_type"] == "income"
+    stats = fake_postgrest.stats()["by_table"]
+    assert stats["GET releves_bancaires"] == 3
+    assert stats["GET profile_categories"] == 1
+
+
+def test_encoders_stream_batches_with_exact_amounts() -> None:
+    rows = [
+        {"id": "r1", "date": "2026-01-10", "montant": Decimal("-3.10"), "devise": "CHF", "libelle": 'Coop "City", Bern', "merchant": "Coop", "category": "Courses", "flow_type": "expense"},
+        {"id": "r2", "date": "2026-01-11", "montant": Decimal("2500"), "devise": "CHF", "merchant": "Employeur", "category": "Salaire", "flow_type": "income"},
+    ]
+
+    csv_chunks = list(encode_releves_export(iter(rows), RelevesExportFormat.CSV, batch_size=1))
+    assert len(csv_chunks) == 3
+    lines = b"".join(csv_chunks).decode("utf-8").splitlines()
+    assert lines[0] == ",".join(EXPORT_COLUMNS)
+    assert lines[1] == '2026-01-10,-3.10,CHF,"Coop ""City"", Bern",,Coop,Courses,expense,,,r1'
+
+    ndjson_chunks = list(encode_releves_export(iter(rows), RelevesExportFormat.NDJSON, batch_size=5))
+    assert len(ndjson_chunks) == 1
+    records = [json.loads(line) for line in ndjson_chunks[0].decode("utf-8").splitlines()]
+    assert records[1]["montant"] == "2500"
+    assert records[1]["payee"] is None
+    assert list(records[0]) == list(EXPORT_COLUMNS)
+
+    assert list(encode_releves_export(iter([]), RelevesExportFormat.NDJSON)) == []
+
+    hostile = [{"libelle": '=HYPERLINK("http://x")', "payee": "@SUM(A1)", "merchant": "\tcmd", "montant": Decimal("-1.00")}]
+    cells = b"".join(encode_releves_export(iter(hostile), RelevesExportFormat.CSV)).decode("utf-8").splitlines()[1]
+    assert cells.startswith(',-1.00,,"\'=HYPERLINK(""http://x"")",\'@SUM(A1),\'\tcmd,')
+
+
+def test_export_endpoint_streams_filtered_csv_and_ndjson(monkeypatch) -> None:
+    monkeypatch.setattr(
+        agent_api,
+        "get_user_from_bearer_token",
+        lambda _token: {"id": str(AUTH_USER_ID), "email": "user@example.com"},
+    )
+
+    class _ProfilesRepo:
+        def get_profile_id_for_auth_user(self, *, auth_user_id: UUID, email: str | None):
+            return PROFILE_ID
+
+    repository = InMemoryRelevesRepository()
+    router = SimpleNamespace(backend_client=SimpleNamespace(tool_service=SimpleNamespace(releves_repository=repository)))
+    monkeypatch.setattr(agent_api, "get_profiles_repository", lambda: _ProfilesRepo())
+    monkeypatch.setattr(agent_api, "get_tool_router", lambda: router)
+    headers = {"Authorization": "Bearer token"}
+
+    response = client.get("/finance/releves/export?start_date=2025-01-01&end_date=2025-01-31", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].startswith('attachment; filename="releves-')
+    lines = response.text.splitlines()
+    expected = list(
+        repository.iter_releves_for_export(
+            profile_id=PROFILE_ID,
+            date_range=DateRange(start_date=date(2025, 1, 1), end_date=date(2025, 1, 31)),
+        )
+    )
+    assert lines[0].split(",") == list(EXPORT_COLUMNS)
+    assert len(lines) == len(expected) + 1
+    assert lines[1].startswith(f"{expected[0]['date']},{expected[0]['montant']},")
+
+    ndjson = client.get("/finance/releves/export?format=ndjson", headers=headers)
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    dates = [json.loads(line)["date"] for line in ndjson.text.splitlines()]
+    assert dates == sorted(dates)
+
+    partial = client.get("/finance/releves/export?start_date=2025-01-01", headers=headers)
+    assert partial.status_code == 400
+    unknown_format = client.get("/finance/releves/export?format=xlsx", headers=headers)
+    assert unknown_format.status_code == 422
+
+    for export_format, expected_body in (("ndjson", ""), ("csv", ",".join(EXPORT_COLUMNS) + "\n")):
+        empty = client.get(
+            f"/finance/releves/export?format={export_format}&start_date=1990-01-01&end_date=1990-01-31",
+            headers=headers,
+        )
+        assert empty.status_code == 200
+        assert empty.text == expected_body
@@ -0,0 +1,296 @@
+"""Tests for the monthly releves rollups (build, reads, write maintenance, checker)."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from backend.db.supabase_client import SupabaseClient, SupabaseSettings
+from backend.repositories.profiles_repository import SupabaseProfilesRepository
+from backend.repositories.releves_repository import SupabaseRelevesRepository
+from backend.repositories.releves_rollups_repository import ROLLUP_MONTHS_TABLE, ROLLUPS_TABLE, whole_months
+from backend.repositories.transaction_clusters_repository import SupabaseTransactionClustersRepository
+from shared.models import (
+    DateRange,
+    RelevesAggregateRequest,
+    RelevesDirection,
+    RelevesFilters,
+    RelevesGroupBy,
+)
+from tests.fake_postgrest import FakePostgrest
+
+
+PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+ACCOUNT_ID = "11111111-1111-1111-1111-111111111111"
+HOUSING_ID = "22222222-2222-2222-2222-222222222222"
+Q1 = DateRange(start_date=date(2026, 1, 1), end_date=date(2026, 2, 28))
+
+
+def _releve(releve_id: str, day: str, montant: str, **extra: object) -> dict[str, object]:
+    return {
+        "id": releve_id,
+        "profile_id": str(PROFILE_ID),
+        "date": day,
+        "montant": montant,
+        "devise": "CHF",
+        "bank_account_id": ACCOUNT_ID,
+        "categorie": None,
+        "category_id": None,
+        "metadonnees": {},
+        **extra,
+    }
+
+
+@pytest.fixture
+def repository(fake_postgrest: FakePostgrest) -> SupabaseRelevesRepository:
+    fake_postgrest.seed(
+        "profile_categories",
+        [
+            {"id": HOUSING_ID, "profile_id": str(PROFILE_ID), "name": "Logement", "exclude_from_totals": False},
+            {
+                "id": "33333333-3333-3333-3333-333333333333",
+                "profile_id": str(PROFILE_ID),
+                "name": "Épargne",
+                "name_norm": "épargne",
+                "exclude_from_totals": True,
+            },
+        ],
+    )
+    fake_postgrest.seed(
+        "releves_bancaires",
+        [
+            _releve("r1", "2026-01-03", "-42.50", categorie="Alimentation"),
+            _releve("r2", "2026-01-05", "-1200.00", category_id=HOUSING_ID),
+            _releve("r3", "2026-01-25", "5000.00", categorie="Salaire"),
+            _releve("r4", "2026-01-28", "-500.00", categorie="Épargne"),
+            _releve("r5", "2026-02-02", "-300.00", metadonnees={"tx_kind": "transfer_internal"}),
+            _releve("r6", "2026-02-10", "-80.00", categorie="Transferts internes"),
+            _releve("r7", "2026-02-12", "-19.90", metadonnees={"category_key": "food"}),
+            _releve("r8", "2026-02-14", "-7.00", bank_account_id=None, devise="EUR"),
+            _releve("r9", "2026-03-01", "-1.00", categorie="Alimentation"),
+        ],
+    )
+    client = SupabaseClient(SupabaseSettings(url=fake_postgrest.url, service_role_key="key"))
+    return SupabaseRelevesRepository(client=client, profiles_repository=SupabaseProfilesRepository(client=client))
+
+
+def _read_everything(repository: SupabaseRelevesRepository) -> list[object]:
+    results: list[object] = []
+    for direction in RelevesDirection:
+        for include_internal_transfers in (False, True):
+            results.append(
+                repository.sum_releves(
+                    RelevesFilters(
+                        profile_id=PROFILE_ID,
+                        date_range=Q1,
+                        direction=direction,
+                        include_internal_transfers=include_internal_transfers,
+                    )
+                )
+            )
+        for group_by in (RelevesGroupBy.CATEGORIE, RelevesGroupBy.MONTH):
+            results.append(
+                repository.aggregate_releves(
+                    RelevesAggregateRequest(profile_id=PROFILE_ID, group_by=group_by, date_range=Q1, direction=direction)
+                )
+            )
+    results.append(repository.compute_cashflow_summary(profile_id=PROFILE_ID, date_range=Q1))
+    results.append(
+        repository.sum_releves(
+            RelevesFilters(profile_id=PROFILE_ID, date_range=Q1, bank_account_id=UUID(ACCOUNT_ID), category_id=UUID(HOUSING_ID))
+        )
+    )
+    return results
+
+
+def test_whole_months_only_accepts_month_aligned_ranges() -> None:
+    assert whole_months(Q1) == [date(2026, 1, 1), date(2026, 2, 1)]
+    assert whole_months(DateRange(start_date=date(2024, 2, 1), end_date=date(2024, 2, 29))) == [date(2024, 2, 1)]
+    assert whole_months(DateRange(start_date=date(2026, 1, 2), end_date=date(2026, 1, 31))) is None
+    assert whole_months(DateRange(start_date=date(2026, 1, 1), end_date=date(2026, 1, 30))) is None
+    assert whole_months(None) is None
+
+
+def test_rollup_reads_match_raw_reads_and_skip_the_releves_scan(
+    repository: SupabaseRelevesRepository,
+    fake_postgrest: FakePostgrest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    raw_results = _read_everything(repository)
+
+    monkeypatch.setenv("AGENT_RELEVES_ROLLUPS_ENABLED", "1")
+    first_pass = _read_everything(repository)
+    assert {row["month"] for row in fake_postgrest.rows(ROLLUP_MONTHS_TABLE)} == {"2026-01-01", "2026-02-01"}
+
+    fake_postgrest.round_trips.clear()
+    second_pass = _read_everything(repository)
+
+    assert first_pass == raw_results
+    assert second_pass == raw_results
+    assert "GET releves_bancaires" not in fake_postgrest.stats()["by_table"]
+    cashflow = second_pass[-2]
+    assert cashflow["transaction_count"] == 8
+    assert cashflow["internal_transfers"] == Decimal("-380.00")
+
+    partial_month = RelevesFilters(
+        profile_id=PROFILE_ID,
+        date_range=DateRange(start_date=date(2026, 1, 1), end_date=date(2026, 1, 15)),
+    )
+    fake_postgrest.round_trips.clear()
+    assert repository.sum_releves(partial_month) == (Decimal("-1242.50"), 2, "CHF")
+    assert "GET releves_bancaires" in fake_postgrest.stats()["by_table"]
+
+
+def test_writers_refresh_or_invalidate_the_touched_months(
+    repository: SupabaseRelevesRepository,
+    fake_postgrest: FakePostgrest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("AGENT_RELEVES_ROLLUPS_ENABLED", "1")
+    january = RelevesFilters(
+        profile_id=PROFILE_ID,
+        date_range=DateRange(start_date=date(2026, 1, 1), end_date=date(2026, 1, 31)),
+        direction=RelevesDirection.DEBIT_ONLY,
+    )
+    assert repository.sum_releves(january) == (Decimal("-1242.50"), 2, "CHF")
+
+    repository.insert_releves_bulk(
+        profile_id=PROFILE_ID,
+        rows=[{"date": date(2026, 1, 20), "montant": Decimal("-10.00"), "categorie": "Alimentation"}],
+    )
+    assert repository.sum_releves(january) == (Decimal("-1252.50"), 3, "CHF")
+
+    fake_postgrest.seed("transaction_cluster_items", [{"cluster_id": "c1", "transaction_id": "r1"}])
+    fake_postgrest.seed("transaction_clusters", [{"id": "c1", "profile_id": str(PROFILE_ID), "status": "pending"}])
+    clusters = SupabaseTransactionClustersRepository(
+        client=SupabaseClient(SupabaseSettings(url=fake_postgrest.url, service_role_key="key"))
+    )
+    clusters.apply_cluster_category(cluster_id="c1", category_id=HOUSING_ID, profile_id=str(PROFILE_ID))
+    assert [
+        row["month"] for row in fake_postgrest.rows(ROLLUP_MONTHS_TABLE) if row["built_generation"] == row["generation"]
+    ] == []
+
+    by_category = repository.aggregate_releves(
+        RelevesAggregateRequest(
+            profile_id=PROFILE_ID,
+            group_by=RelevesGroupBy.CATEGORIE,
+            date_range=january.date_range,
+            direction=RelevesDirection.DEBIT_ONLY,
+        )
+    )
+    assert by_category == ({"Logement": (Decimal("-1242.50"), 2), "Alimentation": (Decimal("-10.00"), 1)}, "CHF")
+
+
+def test_a_write_during_a_rebuild_keeps_the_month_stale(
+    repository: SupabaseRelevesRepository,
+    fake_postgrest: FakePostgrest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("AGENT_RELEVES_ROLLUPS_ENABLED", "1")
+    january = RelevesFilters(
+        profile_id=PROFILE_ID,
+        date_range=DateRange(start_date=date(2026, 1, 1), end_date=date(2026, 1, 31)),
+        direction=RelevesDirection.DEBIT_ONLY,
+    )
+    build = repository._build_rollups_from_releves
+    interleaved: list[bool] = []
+
+    def build_then_write(**kwargs: object) -> object:
+        snapshot = build(**kwargs)
+        if not interleaved:
+            interleaved.append(True)
+            repository.insert_releves_bulk(
+                profile_id=PROFILE_ID,
+                rows=[{"date": date(2026, 1, 20), "montant": Decimal("-10.00"), "categorie": "Alimentation"}],
+            )
+        return snapshot
+
+    monkeypatch.setattr(repository, "_build_rollups_from_releves", build_then_write)
+
+    # The reader's snapshot predates the insert: it is neither served nor marked fresh.
+    assert repository.sum_releves(january) == (Decimal("-1252.50"), 3, "CHF")
+    (month_row,) = fake_postgrest.rows(ROLLUP_MONTHS_TABLE)
+    lines = fake_postgrest.rows(ROLLUPS_TABLE)
+    assert {row["generation"] for row in lines} == {month_row["built_generation"]} == {month_row["generation"]}
+
+    fake_postgrest.round_trips.clear()
+    assert repository.sum_releves(january) == (Decimal("-1252.50"), 3, "CHF")
+    assert "GET releves_bancaires" not in fake_postgrest.stats()["by_table"]
+
+
+def test_concurrent_rebuilds_of_a_generation_upsert_the_same_lines(
+    repository: SupabaseRelevesRepository,
+    fake_postgrest: FakePostgrest,
+) -> None:
+    rollups = repository._rollups
+    january = [date(2026, 1, 1)]
+    rollups.invalidate_months(profile_id=PROFILE_ID, months=january)
+
+    first = rollups.start_rebuild(profile_id=PROFILE_ID, months=january, renew=False)
+    second = rollups.start_rebuild(profile_id=PROFILE_ID, months=january, renew=False)
+    assert first == second
+    built = repository._build_rollups_from_releves(profile_id=PROFILE_ID, months=january)
+
+    assert rollups.store_rebuild(profile_id=PROFILE_ID, states=first, rollups=built) == {
+        date(2026, 1, 1): first[date(2026, 1, 1)].generation
+    }
+    assert rollups.store_rebuild(profile_id=PROFILE_ID, states=second, rollups=built) == {
+        date(2026, 1, 1): first[date(2026, 1, 1)].generation
+    }
+    assert len(fake_postgrest.rows(ROLLUPS_TABLE)) == len(built)
+
+
+def test_rollup_sum_resolves_category_names_in_one_lookup(
+    repository: SupabaseRelevesRepository,
+    fake_postgrest: FakePostgrest,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    category_ids = [str(UUID(int=index + 1)) for index in range(15)]
+    fake_postgrest.seed(
+        "profile_categories",
+        [
+            {"id": category_id, "profile_id": str(PROFILE_ID), "name": f"Catégorie {index}", "exclude_from_totals": False}
+            for index, category_id in enumerate(category_ids)
+        ],
+    )
+    fake_postgrest.seed(
+        "releves_bancaires",
+        [
+            _releve(f"c{index}", "2026-03-10", "-10.00", category_id=category_id)
+            for index, category_id in enumerate(category_ids)
+        ],
+    )
+    march = RelevesFilters(
+        profile_id=PROFILE_ID,
+        date_range=DateRange(start_date=date(2026, 3, 1), end_date=date(2026, 3, 31)),
+    )
+    monkeypatch.setenv("AGENT_RELEVES_ROLLUPS_ENABLED", "1")
+    expected = repository.sum_releves(march)
+
+    fake_postgrest.round_trips.clear()
+    assert repository.sum_releves(march) == expected == (Decimal("-151.00"), 16, "CHF")
+
+    # Month state, rollup lines and one batched category lookup.
+    assert fake_postgrest.stats()["round_trips"] <= 3
+    assert fake_postgrest.stats()["by_table"].get("GET profile_categories") == 1
+
+
+def test_checker_reports_and_repairs_drifted_months(
+    repository: SupabaseRelevesRepository,
+    fake_postgrest: FakePostgrest,
+) -> None:
+    repository.refresh_monthly_rollups(profile_id=PROFILE_ID, months=[date(2026, 1, 1), date(2026, 2, 1)])
+    assert repository.check_monthly_rollups(profile_id=PROFILE_ID, date_range=Q1) == []
+
+    rollups = fake_postgrest.tables[ROLLUPS_TABLE]
+    next(row for row in rollups if row["month"] == "2026-02-01")["total"] = "-1.00"
+    assert repository.check_monthly_rollups(profile_id=PROFILE_ID, date_range=Q1) == [date(2026, 2, 1)]
+
+    assert repository.check_monthly_rollups(profile_id=PROFILE_ID, date_range=Q1, repair=True) == [date(2026, 2, 1)]
+    assert repository.check_monthly_rollups(profile_id=PROFILE_ID, date_range=Q1) == []
+    # Months without any releve simply have no rollup lines.
+    march_to_april = DateRange(start_date=date(2026, 3, 10), end_date=date(2026, 4, 5))
+    assert repository.check_monthly_rollups(profile_id=PROFILE_ID, date_range=march_to_april) == [date(2026, 3, 1)]
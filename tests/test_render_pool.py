@@ -0,0 +1,125 @@
+"""Tests for the PDF render process pool."""
+
+from __future__ import annotations
+
+import asyncio
+import pickle
+import time
+from decimal import Decimal
+from typing import Iterator
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+
+import agent.api as agent_api
+from backend.reporting import SpendingCategoryRow, SpendingReportData, SpendingTransactionRow
+from backend.reporting.render_pool import ReportRenderPool, ReportRenderUnavailable, render_spending_report
+
+
+def _report(period_label: str = "janvier 2026") -> SpendingReportData:
+    return SpendingReportData(
+        period_label=period_label,
+        start_date="2026-01-01",
+        end_date="2026-01-31",
+        total=Decimal("42.50"),
+        count=2,
+        currency="CHF",
+        categories=[SpendingCategoryRow(name="Alimentation", amount=Decimal("30")), SpendingCategoryRow(name="Transport", amount=Decimal("12.50"))],
+        transactions=[SpendingTransactionRow(date="2026-01-03", merchant="Coop", category="Alimentation", amount=Decimal("-30"), flow_type="expense")],
+    )
+
+
+def _render_or_sleep(data: SpendingReportData) -> bytes:
+    if data.period_label == "slow":
+        time.sleep(0.3)
+        return b"%PDF slow"
+    return render_spending_report(data)
+
+
+@pytest.fixture(scope="module")
+def pool() -> Iterator[ReportRenderPool]:
+    render_pool = ReportRenderPool(workers=1, max_pending=2, timeout_seconds=30, renderer=_render_or_sleep)
+    render_pool.warm()
+    yield render_pool
+    render_pool.shutdown()
+
+
+def test_report_data_survives_pickling() -> None:
+    data = _report()
+
+    assert pickle.loads(pickle.dumps(data)) == data
+
+
+def test_pool_renders_pdf_in_another_process_sync_and_async(pool: ReportRenderPool) -> None:
+    pdf = pool.render(_report())
+    async_pdf = asyncio.run(pool.render_async(_report("février 2026")))
+
+    assert pdf.startswith(b"%PDF")
+    assert async_pdf.startswith(b"%PDF")
+
+
+def test_pool_bounds_its_queue_and_times_out(pool: ReportRenderPool) -> None:
+    first = pool.submit(_report("slow"))
+    second = pool.submit(_report("slow"))
+
+    with pytest.raises(ReportRenderUnavailable, match="queue is full"):
+        pool.submit(_report("slow"))
+    assert first.result(timeout=10) == b"%PDF slow"
+    with pytest.raises(ReportRenderUnavailable, match="timed out"):
+        pool.render(_report("slow"), timeout=0.01)
+    second.result(timeout=10)
+
+
+def test_a_broken_pool_is_replaced_once_by_concurrent_failures() -> None:
+    render_pool = ReportRenderPool(workers=1, renderer=_render_or_sleep)
+    broken = render_pool._executor
+    try:
+        render_pool._replace_broken_executor(broken)
+        replacement = render_pool._executor
+        render_pool._replace_broken_executor(broken)
+
+        assert replacement is not broken
+        assert render_pool._executor is replacement
+    finally:
+        render_pool.shutdown()
+
+
+def test_spending_pdf_endpoint_returns_503_when_rendering_is_saturated(monkeypatch) -> None:
+    monkeypatch.setattr(
+        agent_api,
+        "get_user_from_bearer_token",
+        lambda _token: {"id": "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb", "email": "user@example.com"},
+    )
+
+    class _Repo:
+        def get_profile_id_for_auth_user(self, *, auth_user_id: UUID, email: str | None):
+            return UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+
+        def get_chat_state(self, *, profile_id: UUID, user_id: UUID):
+            return {}
+
+    class _Router:
+        def call(self, tool_name: str, payload: dict, *, profile_id: UUID | None = None):
+            if tool_name == "finance_releves_sum":
+                return {"total": "0", "count": 0, "average": "0", "currency": "CHF"}
+            if tool_name == "finance_releves_aggregate":
+                return {"group_by": payload.get("group_by"), "currency": "CHF", "groups": {}}
+            return {"items": [], "limit": 500, "offset": 0, "total": 0}
+
+    class _SaturatedPool:
+        def render(self, data: SpendingReportData) -> bytes:
+            raise ReportRenderUnavailable("report render queue is full (8 pending)")
+
+    monkeypatch.setattr(agent_api, "get_profiles_repository", lambda: _Repo())
+    monkeypatch.setattr(agent_api, "get_tool_router", lambda: _Router())
+    monkeypatch.setattr(agent_api, "get_report_render_pool", lambda: _SaturatedPool())
+    agent_api._SPENDING_REPORT_CACHE.clear()
+
+    response = TestClient(agent_api.app).get(
+        "/finance/reports/spending.pdf?start_date=2097-05-01&end_date=2097-05-31",
+        headers={"Authorization": "Bearer test-token"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
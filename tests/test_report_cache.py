@@ -0,0 +1,205 @@
+"""Tests for the content-addressed finance report cache."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+import agent.api as agent_api
+from agent.api import app
+from agent.report_cache import ReportCache, ReportCacheKey, content_etag, etag_matches
+from agent.tool_cache import bump_profile_data_version
+from backend.repositories.shared_expenses_repository import SharedExpenseRow
+
+
+AUTH_USER_ID = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
+PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+URL = "/finance/reports/spending?start_date=2099-01-01&end_date=2099-01-31"
+
+
+@pytest.fixture(autouse=True)
+def _clear_spending_report_cache() -> None:
+    agent_api._SPENDING_REPORT_CACHE.clear()
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _key(month: int, *, data_version: int = 0) -> ReportCacheKey:
+    return ReportCacheKey(
+        profile_id=str(PROFILE_ID),
+        start_date=f"2026-{month:02d}-01",
+        end_date=f"2026-{month:02d}-28",
+        bank_account_id="",
+        data_version=data_version,
+    )
+
+
+def test_cache_evicts_least_recently_used_reports_by_total_bytes() -> None:
+    cache = ReportCache(max_bytes=100, ttl_seconds=60)
+    january = cache.put_payload(_key(1), {"month": 1}, b"j" * 40)
+    cache.put_payload(_key(2), {"month": 2}, b"f" * 40)
+    assert cache.get(_key(1)) is january
+
+    cache.put_pdf(_key(2), cache.get(_key(2)), b"%PDF" + b"x" * 30)
+
+    assert cache.get(_key(1)) is None
+    assert cache.get(_key(2)).pdf_etag == content_etag(b"%PDF" + b"x" * 30)
+    assert cache.stats() == {"hits": 3, "misses": 1, "evictions": 1, "size": 1, "bytes": 74}
+
+    cache.put_payload(_key(3), {"month": 3}, b"m" * 101)
+    assert cache.get(_key(3)) is None
+
+
+def test_cache_entries_expire_and_are_scoped_by_data_version() -> None:
+    clock = _Clock()
+    cache = ReportCache(max_bytes=1000, ttl_seconds=10, clock=clock)
+    cache.put_payload(_key(1), {"month": 1}, b"{}")
+
+    assert cache.get(_key(1, data_version=1)) is None
+    clock.now = 10
+    assert cache.get(_key(1)) is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_etag_matching_follows_if_none_match_semantics() -> None:
+    etag = content_etag(b"report")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def _patch_api(monkeypatch) -> dict[str, Any]:
+    monkeypatch.setattr(
+        agent_api,
+        "get_user_from_bearer_token",
+        lambda _token: {"id": str(AUTH_USER_ID), "email": "user@example.com"},
+    )
+    recorded: dict[str, Any] = {"tool_calls": 0, "state_writes": 0, "state": {}}
+
+    class _Repo:
+        def get_profile_id_for_auth_user(self, *, auth_user_id: UUID, email: str | None):
+            return PROFILE_ID
+
+        def get_chat_state(self, *, profile_id: UUID, user_id: UUID):
+            return {"state": dict(recorded["state"])}
+
+        def update_chat_state(self, *, profile_id: UUID, user_id: UUID, chat_state: dict[str, Any]) -> None:
+            recorded["state_writes"] += 1
+            recorded["state"] = chat_state["state"]
+
+    class _Router:
+        def call(self, tool_name: str, payload: dict, *, profile_id: UUID | None = None):
+            recorded["tool_calls"] += 1
+            if tool_name == "finance_releves_sum":
+                return {"total": "12.50", "count": 1, "average": "12.50", "currency": "CHF"}
+            if tool_name == "finance_releves_aggregate":
+                return {"group_by": payload.get("group_by"), "currency": "CHF", "groups": {}}
+            if tool_name == "finance_releves_search":
+                return {"items": [], "limit": 500, "offset": 0, "total": 0}
+            raise AssertionError(tool_name)
+
+    monkeypatch.setattr(agent_api, "get_profiles_repository", lambda: _Repo())
+    monkeypatch.setattr(agent_api, "get_tool_router", lambda: _Router())
+    return recorded
+
+
+def test_spending_report_is_served_from_cache_and_revalidated_with_etag(monkeypatch) -> None:
+    recorded = _patch_api(monkeypatch)
+    client = TestClient(app)
+    headers = {"Authorization": "Bearer test-token"}
+
+    first = client.get(URL, headers=headers)
+    calls_after_first = recorded["tool_calls"]
+    second = client.get(URL, headers=headers)
+    revalidated = client.get(URL, headers={**headers, "If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["total"] == "12.50"
+    assert second.content == first.content
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert calls_after_first > 0
+    assert recorded["tool_calls"] == calls_after_first
+    assert recorded["state_writes"] == 1
+
+    bump_profile_data_version(PROFILE_ID)
+    refreshed = client.get(URL, headers={**headers, "If-None-Match": first.headers["etag"]})
+
+    assert recorded["tool_calls"] == 2 * calls_after_first
+    assert refreshed.status_code == 304
+
+
+def test_applying_a_shared_expense_refreshes_the_spending_report(monkeypatch) -> None:
+    _patch_api(monkeypatch)
+    shared_expenses: list[SharedExpenseRow] = []
+
+    class _SharedExpensesRepo:
+        def list_shared_expenses_for_period(self, *, profile_id: UUID, start_date, end_date) -> list[SharedExpenseRow]:
+            return list(shared_expenses)
+
+        def get_suggestion_by_id(self, *, profile_id: UUID, suggestion_id: UUID):
+            return None
+
+        def create_shared_expense_from_suggestion(self, *, profile_id: UUID, suggestion_id: UUID, amount: Decimal):
+            shared_expenses.append(
+                SharedExpenseRow(
+                    from_profile_id=profile_id,
+                    to_profile_id=None,
+                    transaction_id=None,
+                    amount=amount,
+                    created_at=None,
+                    status="pending",
+                    split_ratio_other=Decimal("0.5"),
+                )
+            )
+            return uuid4()
+
+    shared_repository = _SharedExpensesRepo()
+    monkeypatch.setattr(agent_api, "_try_get_shared_expenses_repository", lambda: shared_repository)
+    monkeypatch.setattr(agent_api, "_get_shared_expenses_repository_or_501", lambda: shared_repository)
+    client = TestClient(app)
+    headers = {"Authorization": "Bearer test-token"}
+
+    before = client.get(URL, headers=headers)
+    applied = client.post(f"/finance/shared-expenses/suggestions/{uuid4()}/apply", headers=headers, json={"amount": "5.00"})
+    after = client.get(URL, headers={**headers, "If-None-Match": before.headers["etag"]})
+
+    assert applied.status_code == 200
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+    assert after.json()["effective_spending"] != before.json()["effective_spending"]
+
+
+def test_spending_report_pdf_reuses_cached_payload(monkeypatch) -> None:
+    recorded = _patch_api(monkeypatch)
+    renders: list[object] = []
+    monkeypatch.setattr(agent_api, "generate_spending_report_pdf", lambda data: renders.append(data) or b"%PDF-1.4 cached")
+    client = TestClient(app)
+    headers = {"Authorization": "Bearer test-token"}
+
+    client.get(URL, headers=headers)
+    calls_after_json = recorded["tool_calls"]
+    pdf = client.get(URL.replace("/spending?", "/spending.pdf?"), headers=headers)
+    revalidated = client.get(
+        URL.replace("/spending?", "/spending.pdf?"),
+        headers={**headers, "If-None-Match": pdf.headers["etag"]},
+    )
+
+    assert pdf.content == b"%PDF-1.4 cached"
+    assert revalidated.status_code == 304
+    assert recorded["tool_calls"] == calls_after_json
+    assert len(renders) == 1
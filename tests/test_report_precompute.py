@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+from datetime import date
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+
+import agent.api as agent_api
+from agent.report_precompute import ReportPrecomputer, months_in_range
+
+
+PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+
+
+@pytest.fixture
+def precomputer():
+    precomputer = ReportPrecomputer()
+    yield precomputer
+    precomputer.shutdown()
+
+
+def test_months_in_range_lists_most_recent_months_first() -> None:
+    assert months_in_range(date(2025, 11, 20), date(2026, 2, 3), max_months=3) == [
+        (date(2026, 2, 1), date(2026, 2, 28)),
+        (date(2026, 1, 1), date(2026, 1, 31)),
+        (date(2025, 12, 1), date(2025, 12, 31)),
+    ]
+    assert months_in_range(date(2024, 2, 10), date(2024, 2, 10), max_months=3) == [
+        (date(2024, 2, 1), date(2024, 2, 29)),
+    ]
+    assert months_in_range(date(2026, 1, 1), date(2026, 3, 1), max_months=0) == []
+
+
+def test_rescheduling_a_profile_cancels_its_pending_steps(precomputer: ReportPrecomputer) -> None:
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[str] = []
+
+    def _blocking_step() -> None:
+        calls.append("first")
+        started.set()
+        release.wait(timeout=5)
+
+    first = precomputer.schedule(PROFILE_ID, [_blocking_step, lambda: calls.append("stale")])
+    assert started.wait(timeout=5)
+    second = precomputer.schedule(PROFILE_ID, [lambda: calls.append("fresh")])
+    release.set()
+
+    assert first.result(timeout=5) == 1
+    assert second.result(timeout=5) == 1
+    assert calls == ["first", "fresh"]
+    assert precomputer.pending() == 0
+
+
+def test_cancel_skips_queued_steps_and_failing_steps_do_not_stop_a_run(precomputer: ReportPrecomputer) -> None:
+    other_profile_id = uuid4()
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[str] = []
+
+    def _failing_step() -> None:
+        raise RuntimeError("boom")
+
+    blocker = precomputer.schedule(other_profile_id, [lambda: (started.set(), release.wait(timeout=5))])
+    assert started.wait(timeout=5)
+    queued = precomputer.schedule(PROFILE_ID, [lambda: calls.append("cancelled")])
+    assert precomputer.cancel(PROFILE_ID) is True
+    assert precomputer.cancel(PROFILE_ID) is False
+    release.set()
+    assert blocker.result(timeout=5) == 1
+    assert queued.result(timeout=5) == 0
+
+    assert precomputer.schedule(PROFILE_ID, [_failing_step, lambda: calls.append("after")]).result(timeout=5) == 2
+    assert calls == ["after"]
+
+
+def test_finished_import_precomputes_reports_of_imported_months(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AGENT_REPORT_PRECOMPUTE_ENABLED", "1")
+    monkeypatch.setenv("AGENT_REPORT_PRECOMPUTE_MAX_MONTHS", "2")
+    agent_api.get_report_precomputer.cache_clear()
+    agent_api._SPENDING_REPORT_CACHE.clear()
+    built: list[tuple[date, date]] = []
+
+    def _fake_build_spending_report_payload(*, profile_id: UUID, period_start: date, period_end: date, bank_account_id: str | None) -> dict[str, Any]:
+        built.append((period_start, period_end))
+        return {"start_date": period_start.isoformat(), "end_date": period_end.isoformat(), "total": 0}
+
+    class _BackendClient:
+        def finance_releves_import_files(self, *, request: Any, on_progress: Any):
+            return {"imported_count": 3, "import_start_date": "2025-12-03", "import_end_date": "2026-02-14"}
+
+    class _Router:
+        backend_client = _BackendClient()
+
+    class _ProfilesRepo:
+        def list_bank_accounts(self, *, profile_id: UUID) -> list[dict[str, Any]]:
+            return [{"id": "11111111-1111-1111-1111-111111111111", "name": "UBS"}]
+
+    class _Repo:
+        def __init__(self) -> None:
+            self.patches: list[dict[str, Any]] = []
+
+        def get_job(self, *, profile_id: UUID, job_id: UUID):
+            return None
+
+        def patch_job(self, *, profile_id: UUID, job_id: UUID, payload: dict[str, Any]) -> None:
+            self.patches.append(payload)
+
+        def next_event_seq(self, *, job_id: UUID) -> int:
+            return 1
+
+        def create_event(self, **kwargs: Any) -> None:
+            return None
+
+    monkeypatch.setattr(agent_api, "_build_spending_report_payload", _fake_build_spending_report_payload)
+    monkeypatch.setattr(agent_api, "get_tool_router", lambda: _Router())
+    monkeypatch.setattr(agent_api, "get_profiles_repository", lambda: _ProfilesRepo())
+    repository = _Repo()
+
+    agent_api._run_import_job_pipeline(
+        repository=repository,
+        profile_id=PROFILE_ID,
+        payload=agent_api.ImportRequestPayload(
+            files=[agent_api.ImportFilePayload(filename="sample.csv", content_base64="ZGF0ZSxtb250YW50")]
+        ),
+        job_id=uuid4(),
+    )
+    precomputer = agent_api.get_report_precomputer()
+    assert precomputer is not None
+    precomputer._executor.shutdown(wait=True)
+
+    assert repository.patches[-1]["status"] == "done"
+    assert built == [(date(2026, 2, 1), date(2026, 2, 28)), (date(2026, 1, 1), date(2026, 1, 31))]
+
+    _key, report = agent_api._get_or_build_spending_report(
+        profile_id=PROFILE_ID,
+        period_start=date(2026, 2, 1),
+        period_end=date(2026, 2, 28),
+        bank_account_id=None,
+    )
+    assert report.payload["start_date"] == "2026-02-01"
+    assert len(built) == 2
+    agent_api._SPENDING_REPORT_CACHE.clear()
@@ -0,0 +1,183 @@
+"""Tests for the shared report artifact stores."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+
+import agent.api as agent_api
+from agent.api import app
+from agent.report_store import DiskReportStore, RedisReportStore, build_report_store
+
+
+AUTH_USER_ID = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
+PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+
+
+class _FakeRedis:
+    """In-memory stand-in for the subset of the redis client the store uses."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    def set(self, key: str, value: bytes, *, ex: int | None = None, px: int | None = None, nx: bool = False) -> bool:
+        with self._lock:
+            if nx and key in self.values:
+                return False
+            self.values[key] = value
+            return True
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    def scan_iter(self, match: str):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.values) if key.startswith(prefix)]
+
+
+def _render_concurrently(stores: list[Any], *, threads: int = 8) -> tuple[list[bytes], int]:
+    renders = {"count": 0}
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+    results: list[bytes] = []
+
+    def _create() -> bytes:
+        with lock:
+            renders["count"] += 1
+        time.sleep(0.05)
+        return b"%PDF rendered"
+
+    def _worker(index: int) -> None:
+        barrier.wait()
+        data = stores[index % len(stores)].get_or_create("spending/report.pdf", _create)
+        with lock:
+            results.append(data)
+
+    workers = [threading.Thread(target=_worker, args=(index,)) for index in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results, renders["count"]
+
+
+def test_disk_store_writes_atomically_and_evicts_least_recently_used(tmp_path: Path) -> None:
+    store = DiskReportStore(tmp_path, max_bytes=25)
+    store.put("a", b"a" * 10)
+    store.put("b", b"b" * 10)
+    os.utime(store._path("a"), (1, 1))
+    os.utime(store._path("b"), (2, 2))
+    assert store.get("a") == b"a" * 10
+
+    store.put("c", b"c" * 10)
+    store.put("huge", b"h" * 26)
+
+    assert store.get("b") is None
+    assert store.get("a") == b"a" * 10
+    assert store.get("c") == b"c" * 10
+    assert store.get("huge") is None
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_disk_store_renders_once_across_threads_and_workers(tmp_path: Path) -> None:
+    workers = [DiskReportStore(tmp_path, max_bytes=1024), DiskReportStore(tmp_path, max_bytes=1024)]
+
+    results, renders = _render_concurrently(workers)
+
+    assert renders == 1
+    assert results == [b"%PDF rendered"] * 8
+    assert DiskReportStore(tmp_path, max_bytes=1024).get("spending/report.pdf") == b"%PDF rendered"
+
+
+def test_redis_store_renders_once_and_clears_its_prefix() -> None:
+    client = _FakeRedis()
+    client.values["other:key"] = b"kept"
+    workers = [RedisReportStore(client, poll_seconds=0.01), RedisReportStore(client, poll_seconds=0.01)]
+
+    results, renders = _render_concurrently(workers)
+
+    assert renders == 1
+    assert results == [b"%PDF rendered"] * 8
+    assert client.get("reports:spending/report.pdf") == b"%PDF rendered"
+    assert "reports:lock:spending/report.pdf" not in client.values
+
+    workers[0].clear()
+    assert client.values == {"other:key": b"kept"}
+
+
+class _UnreachableRedis(_FakeRedis):
+    def get(self, key: str) -> bytes | None:
+        raise ConnectionError("redis is down")
+
+    def set(self, key: str, value: bytes, **kwargs: Any) -> bool:
+        raise ConnectionError("redis is down")
+
+
+def test_redis_outage_falls_back_to_rendering_without_the_store() -> None:
+    store = RedisReportStore(_UnreachableRedis(), poll_seconds=0.01)
+    renders: list[int] = []
+
+    def _create() -> bytes:
+        renders.append(1)
+        return b"%PDF rendered"
+
+    assert store.get_or_create("spending/report.pdf", _create) == b"%PDF rendered"
+    assert store.get_or_create("spending/report.pdf", _create) == b"%PDF rendered"
+    assert len(renders) == 2
+    assert store.stats() == {"hits": 0, "misses": 2}
+
+
+def test_build_report_store_defaults_to_a_directory(tmp_path: Path) -> None:
+    store = build_report_store(f"file://{tmp_path}/reports", max_bytes=10)
+
+    assert isinstance(store, DiskReportStore)
+    assert store.directory == tmp_path / "reports"
+
+
+def test_spending_pdf_rendered_by_one_worker_is_reused_by_another(monkeypatch) -> None:
+    monkeypatch.setattr(
+        agent_api,
+        "get_user_from_bearer_token",
+        lambda _token: {"id": str(AUTH_USER_ID), "email": "user@example.com"},
+    )
+
+    class _Repo:
+        def get_profile_id_for_auth_user(self, *, auth_user_id: UUID, email: str | None):
+            return PROFILE_ID
+
+        def get_chat_state(self, *, profile_id: UUID, user_id: UUID):
+            return {}
+
+    class _Router:
+        def call(self, tool_name: str, payload: dict, *, profile_id: UUID | None = None):
+            if tool_name == "finance_releves_sum":
+                return {"total": "0", "count": 0, "average": "0", "currency": "CHF"}
+            if tool_name == "finance_releves_aggregate":
+                return {"group_by": payload.get("group_by"), "currency": "CHF", "groups": {}}
+            return {"items": [], "limit": 500, "offset": 0, "total": 0}
+
+    renders: list[object] = []
+    monkeypatch.setattr(agent_api, "get_profiles_repository", lambda: _Repo())
+    monkeypatch.setattr(agent_api, "get_tool_router", lambda: _Router())
+    monkeypatch.setattr(agent_api, "generate_spending_report_pdf", lambda data: renders.append(data) or b"%PDF shared")
+    client = TestClient(app)
+    url = "/finance/reports/spending.pdf?start_date=2098-03-01&end_date=2098-03-31"
+
+    agent_api._SPENDING_REPORT_CACHE.clear()
+    first = client.get(url, headers={"Authorization": "Bearer test-token"})
+    # A second worker starts with an empty in-process cache.
+    agent_api._SPENDING_REPORT_CACHE.clear()
+    second = client.get(url, headers={"Authorization": "Bearer test-token"})
+
+    assert first.content == second.content == b"%PDF shared"
+    assert len(renders) == 1
@@ -0,0 +1,112 @@
+"""Tests for request span tracing and its debug summary."""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+
+import agent.api as agent_api
+from agent.api import app
+from agent.loop import AgentLoop
+from backend.db.supabase_client import SupabaseClient, SupabaseSettings
+from shared.tracing import LLM_SPAN, current_trace, set_llm_usage, start_trace, trace_span
+
+
+AUTH_USER_ID = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
+PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+
+
+class _Response:
+    headers = {"content-range": "0-1/2"}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def read(self) -> bytes:
+        return b'[{"id": 1}, {"id": 2}]'
+
+
+def test_spans_are_noops_without_active_trace() -> None:
+    with trace_span("agent.nlu") as span:
+        span.set(ignored=True)
+
+    assert current_trace() is None
+
+
+def test_trace_summary_groups_stages_supabase_and_llm(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("backend.db.supabase_client.urlopen", lambda _request: _Response())
+    client = SupabaseClient(SupabaseSettings(url="https://example.supabase.co", service_role_key="key"))
+
+    with start_trace("POST /agent/chat") as trace:
+        with trace_span("chat.state_load"):
+            rows, total = client.get_rows(table="chat_state", query={"id": "eq.1"}, with_count=True)
+        with trace_span(LLM_SPAN, model="gpt-5", purpose="planner") as span:
+            set_llm_usage(span, {"usage": {"prompt_tokens": 120, "completion_tokens": 30, "total_tokens": 150}})
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(contextvars.copy_context().run, client.get_rows, table="merchants", query={}, with_count=False).result()
+
+    assert (len(rows), total) == (2, 2)
+    summary = trace.summary()
+    assert summary["stages"]["chat.state_load"]["count"] == 1
+    assert summary["supabase"]["calls"] == 2
+    assert summary["supabase"]["rows"] == 4
+    assert summary["supabase"]["by_table"]["chat_state"]["bytes"] == len(_Response().read())
+    assert summary["llm"]["calls"] == 1
+    assert summary["llm"]["total_tokens"] == 150
+    supabase_span = next(span for span in trace.spans if span.attributes.get("table") == "chat_state")
+    stage_span = next(span for span in trace.spans if span.name == "chat.state_load")
+    assert supabase_span.parent_id == stage_span.span_id
+
+
+def test_sampled_trace_summary_is_logged(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+    monkeypatch.setenv("TRACE_LOG_SAMPLE_RATE", "1")
+
+    with caplog.at_level(logging.INFO, logger="shared.tracing"):
+        with start_trace("GET /health"):
+            with trace_span("stage"):
+                pass
+
+    assert any("request_trace" in record.getMessage() for record in caplog.records)
+
+
+def test_agent_chat_debug_payload_includes_trace_summary(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _Repo:
+        def get_profile_id_for_auth_user(self, *, auth_user_id: UUID, email: str | None):
+            return PROFILE_ID
+
+        def get_chat_state(self, *, profile_id: UUID, user_id: UUID):
+            return {}
+
+        def update_chat_state(self, *, profile_id: UUID, user_id: UUID, chat_state: dict[str, object]) -> None:
+            return None
+
+    class _Router:
+        def call(self, tool_name: str, payload: dict[str, object], *, profile_id: UUID | None = None):
+            return {"ok": True, "items": []}
+
+    monkeypatch.setattr(
+        agent_api,
+        "get_user_from_bearer_token",
+        lambda _token: {"id": str(AUTH_USER_ID), "email": "user@example.com"},
+    )
+    monkeypatch.setattr(agent_api, "get_profiles_repository", lambda: _Repo())
+    monkeypatch.setattr(agent_api, "get_agent_loop", lambda: AgentLoop(tool_router=_Router()))
+
+    response = TestClient(app).post(
+        "/agent/chat",
+        json={"message": "search: coop"},
+        headers={"Authorization": "Bearer test-token", "X-Debug": "1"},
+    )
+
+    assert response.status_code == 200
+    trace = response.json()["debug"]["trace"]
+    assert trace["name"] == "POST /agent/chat"
+    assert {"chat.auth", "chat.state_load", "agent.handle_user_message", "agent.nlu"} <= set(trace["stages"])
@@ -0,0 +1,190 @@
+"""Supabase round-trip budgets of the main endpoints against the fake PostgREST.
+
+Budgets are the current counts: an endpoint change adding a round-trip must
+either remove another one or raise the budget here deliberately.
+"""
+
+from __future__ import annotations
+
+import base64
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agent.api import app
+from tests.fake_postgrest import FakePostgrest
+
+
+AUTH_USER_ID = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
+PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+TOKEN = "roundtrip-token"
+AUTH_HEADERS = {"Authorization": f"Bearer {TOKEN}"}
+UBS_SAMPLE = Path(__file__).parent / "fixtures" / "ubs_sample.csv"
+
+
+def _seed_onboarded_profile(server: FakePostgrest) -> str:
+    server.add_user(TOKEN, user_id=AUTH_USER_ID, email="user@example.com")
+    server.seed(
+        "profils",
+        [
+            {
+                "id": str(PROFILE_ID),
+                "account_id": str(AUTH_USER_ID),
+                "email": "user@example.com",
+                "first_name": "Ana",
+                "last_name": "Muster",
+                "birth_date": "1990-01-01",
+            }
+        ],
+    )
+    server.seed(
+        "chat_state",
+        [
+            {
+                "conversation_id": str(PROFILE_ID),
+                "profile_id": str(PROFILE_ID),
+                "user_id": str(AUTH_USER_ID),
+                "active_task": None,
+                "state": {
+                    "global_state": {
+                        "mode": "free_chat",
+                        "onboarding_step": None,
+                        "onboarding_substep": None,
+                        "has_bank_accounts": True,
+                        "has_imported_transactions": True,
+                        "budget_created": False,
+                    }
+                },
+            }
+        ],
+    )
+    bank_account_id = str(uuid4())
+    server.seed("bank_accounts", [{"id": bank_account_id, "profile_id": str(PROFILE_ID), "name": "UBS"}])
+    server.seed(
+        "releves_bancaires",
+        [
+            {
+                "id": str(uuid4()),
+                "profile_id": str(PROFILE_ID),
+                "date": f"2026-01-{day:02d}",
+                "libelle": f"COOP {day}",
+                "montant": -10 - day,
+                "devise": "CHF",
+                "categorie": None,
+            }
+            for day in range(1, 6)
+        ],
+    )
+    return bank_account_id
+
+
+def test_fake_postgrest_applies_filters_order_and_count(fake_postgrest: FakePostgrest) -> None:
+    from backend.db.supabase_client import SupabaseClient, SupabaseSettings
+
+    _seed_onboarded_profile(fake_postgrest)
+    client = SupabaseClient(SupabaseSettings(url=fake_postgrest.url, service_role_key="key"))
+
+    rows, total = client.get_rows(
+        table="releves_bancaires",
+        query={
+            "select": "libelle,montant",
+            "profile_id": f"eq.{PROFILE_ID}",
+            "or": "(libelle.ilike.*coop 1*,montant.lte.-14)",
+            "order": "date.desc",
+            "limit": 2,
+        },
+        with_count=True,
+    )
+
+    assert total == 3
+    assert rows == [{"libelle": "COOP 5", "montant": -15}, {"libelle": "COOP 4", "montant": -14}]
+    assert fake_postgrest.stats()["by_table"] == {"GET releves_bancaires": 1}
+
+
+@pytest.mark.roundtrip_budget(max_round_trips=8, scenario="POST /agent/chat search")
+def test_agent_chat_search_budget(fake_postgrest: FakePostgrest) -> None:
+    _seed_onboarded_profile(fake_postgrest)
+
+    response = TestClient(app).post("/agent/chat", json={"message": "search: coop"}, headers=AUTH_HEADERS)
+
+    assert response.status_code == 200
+    assert len(response.json()["tool_result"]["items"]) == 5
+
+
+@pytest.mark.roundtrip_budget(max_round_trips=8, scenario="POST /agent/chat/stream search")
+def test_agent_chat_stream_search_budget(fake_postgrest: FakePostgrest) -> None:
+    _seed_onboarded_profile(fake_postgrest)
+
+    response = TestClient(app).post("/agent/chat/stream", json={"message": "search: coop"}, headers=AUTH_HEADERS)
+
+    assert response.status_code == 200
+    assert "event: done" in response.text
+    assert fake_postgrest.stats()["by_table"]["POST chat_state"] == 1
+
+
+@pytest.mark.roundtrip_budget(max_round_trips=11, scenario="GET /finance/reports/spending")
+def test_spending_report_budget(fake_postgrest: FakePostgrest) -> None:
+    _seed_onboarded_profile(fake_postgrest)
+
+    response = TestClient(app).get("/finance/reports/spending", params={"month": "2026-01"}, headers=AUTH_HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 5
+
+
+@pytest.mark.roundtrip_budget(max_round_trips=14, scenario="GET /finance/reports/spending x2 (If-None-Match)")
+def test_spending_report_revalidation_budget(fake_postgrest: FakePostgrest) -> None:
+    _seed_onboarded_profile(fake_postgrest)
+    client = TestClient(app)
+
+    first = client.get("/finance/reports/spending", params={"month": "2026-01"}, headers=AUTH_HEADERS)
+    second = client.get(
+        "/finance/reports/spending",
+        params={"month": "2026-01"},
+        headers={**AUTH_HEADERS, "If-None-Match": first.headers["etag"]},
+    )
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert fake_postgrest.stats()["by_table"]["GET releves_bancaires"] == 4
+
+
+@pytest.mark.roundtrip_budget(max_round_trips=7, scenario="GET /imports/jobs/{job_id}/events (SSE)")
+def test_import_events_stream_budget(fake_postgrest: FakePostgrest) -> None:
+    _seed_onboarded_profile(fake_postgrest)
+    job_id = str(uuid4())
+    fake_postgrest.seed("import_jobs", [{"id": job_id, "profile_id": str(PROFILE_ID), "status": "done"}])
+    fake_postgrest.seed(
+        "import_job_events",
+        [
+            {"id": seq, "job_id": job_id, "seq": seq, "kind": "progress", "message": "step", "progress": seq / 3, "payload": None}
+            for seq in (1, 2, 3)
+        ],
+    )
+
+    response = TestClient(app).get(f"/imports/jobs/{job_id}/events", headers=AUTH_HEADERS)
+
+    assert response.status_code == 200
+    assert response.text.count("event: progress") == 3
+
+
+@pytest.mark.roundtrip_budget(max_round_trips=63, scenario="POST /finance/releves/import (2 rows)")
+def test_releves_import_budget(fake_postgrest: FakePostgrest, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AGENT_AUTO_RESOLVE_MERCHANT_ALIASES", "0")
+    bank_account_id = _seed_onboarded_profile(fake_postgrest)
+    content = base64.b64encode(UBS_SAMPLE.read_bytes()).decode("ascii")
+
+    response = TestClient(app).post(
+        "/finance/releves/import",
+        json={
+            "files": [{"filename": "ubs.csv", "content_base64": content}],
+            "bank_account_id": bank_account_id,
+            "import_mode": "commit",
+        },
+        headers=AUTH_HEADERS,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["imported_count"] == 2
@@ -130,6 +130,20 @@ def test_apply_shared_expense_suggestion_with_amount(monkeypatch) -> None:
     called: dict[str, object] = {}
 
     class _FakeRepository:
+        def get_suggestion_by_id(self, *, profile_id: UUID, suggestion_id: UUID):
+            return SharedExpenseSuggestionRow(
+                id=SUGGESTION_ID,
+                profile_id=PROFILE_ID,
+                transaction_id=TRANSACTION_ID,
+                suggested_to_profile_id=OTHER_PROFILE_ID,
+                suggested_split_ratio_other=Decimal("0.5"),
+                status="pending",
+                confidence=0.8,
+                rationale=None,
+                link_id=None,
+                link_pair_id=None,
+            )
+
         def create_shared_expense_from_suggestion(self, *, profile_id: UUID, suggestion_id: UUID, amount: Decimal):
             called["profile_id"] = profile_id
             called["suggestion_id"] = suggestion_id
@@ -137,6 +151,8 @@ def test_apply_shared_expense_suggestion_with_amount(monkeypatch) -> None:
             return created_shared_expense_id
 
     monkeypatch.setattr(agent_api, "_get_shared_expenses_repository_or_501", lambda: _FakeRepository())
+    cache = agent_api.shared_tool_result_cache()
+    versions_before = (cache.data_version(PROFILE_ID), cache.data_version(OTHER_PROFILE_ID))
 
     response = client.post(
         f"/finance/shared-expenses/suggestions/{SUGGESTION_ID}/apply",
@@ -145,6 +161,10 @@ def test_apply_shared_expense_suggestion_with_amount(monkeypatch) -> None:
     )
 
     assert response.status_code == 200
+    assert (cache.data_version(PROFILE_ID), cache.data_version(OTHER_PROFILE_ID)) == (
+        versions_before[0] + 1,
+        versions_before[1] + 1,
+    )
     assert response.json() == {"ok": True, "shared_expense_id": str(created_shared_expense_id)}
     assert called == {
         "profile_id": PROFILE_ID,
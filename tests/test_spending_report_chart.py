@@ -0,0 +1,57 @@
+"""Tests for the spending report chart renderers."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.charts.piecharts import Pie
+
+from backend.reporting.models import SpendingCategoryRow
+from backend.reporting.spending_report import _build_vector_pie_chart, generate_spending_report_pdf
+from benchmarks.report_render import run, sample_report
+from shared import config
+
+
+def test_vector_chart_matches_the_matplotlib_donut_layout() -> None:
+    categories = [SpendingCategoryRow(name=f"Catégorie {index}", amount=Decimal(100 - index)) for index in range(10)]
+    categories.append(SpendingCategoryRow(name="autres", amount=Decimal("1")))
+
+    drawing = _build_vector_pie_chart(categories)
+
+    pie = next(node for node in drawing.contents if isinstance(node, Pie))
+    legend = next(node for node in drawing.contents if isinstance(node, Legend))
+    assert len(pie.data) == 9
+    assert pie.innerRadiusFraction == 0.55
+    assert pie.labels[0] == "10.5%"
+    assert [name for _color, name in legend.colorNamePairs][-1] == "Autres"
+    assert str(pie.slices[0].fillColor) == str(legend.colorNamePairs[0][0])
+
+
+def test_vector_renderer_embeds_no_raster_image() -> None:
+    data = sample_report(categories=6, transactions=3)
+
+    vector_pdf = generate_spending_report_pdf(data, chart_renderer="vector")
+    matplotlib_pdf = generate_spending_report_pdf(data, chart_renderer="matplotlib")
+
+    assert vector_pdf.startswith(b"%PDF")
+    assert b"/Subtype /Image" not in vector_pdf
+    assert b"/Subtype /Image" in matplotlib_pdf
+    assert len(vector_pdf) < len(matplotlib_pdf)
+
+
+def test_chart_renderer_config_falls_back_to_matplotlib(monkeypatch) -> None:
+    assert config.report_chart_renderer() == "matplotlib"
+    monkeypatch.setenv("AGENT_REPORT_CHART_RENDERER", "Vector")
+    assert config.report_chart_renderer() == "vector"
+    monkeypatch.setenv("AGENT_REPORT_CHART_RENDERER", "svg")
+    assert config.report_chart_renderer() == "matplotlib"
+
+
+def test_report_render_benchmark_reports_time_memory_and_size() -> None:
+    report = run(renderer="vector", rounds=1, categories=4)
+
+    assert report["renderer"] == "vector"
+    assert report["pdf_bytes"] > 0
+    assert report["median_render_ms"] > 0
+    assert report["peak_alloc_kb"] > 0
@@ -0,0 +1,192 @@
+"""Tests for the multi-period spending trend (aggregation, repository scan, endpoint)."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi.testclient import TestClient
+
+import agent.api as agent_api
+from agent.api import app
+from backend.repositories.releves_repository import InMemoryRelevesRepository, SupabaseRelevesRepository
+from backend.services.spending_trend import aggregate_spending_trend, trend_periods
+from backend.services.tools import BackendToolService
+from shared.models import (
+    DateRange,
+    RelevesDirection,
+    RelevesFilters,
+    RelevesTrendGranularity,
+    RelevesTrendRequest,
+    ToolError,
+    ToolErrorCode,
+)
+
+
+client = TestClient(app)
+AUTH_USER_ID = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
+PROFILE_ID = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+
+
+def _request(start: date, end: date, **kwargs) -> RelevesTrendRequest:
+    return RelevesTrendRequest(profile_id=PROFILE_ID, date_range=DateRange(start_date=start, end_date=end), **kwargs)
+
+
+def test_trend_periods_are_clipped_to_the_range() -> None:
+    assert trend_periods(date(2025, 12, 15), date(2026, 2, 10), RelevesTrendGranularity.MONTH) == [
+        ("2025-12", date(2025, 12, 15), date(2025, 12, 31)),
+        ("2026-01", date(2026, 1, 1), date(2026, 1, 31)),
+        ("2026-02", date(2026, 2, 1), date(2026, 2, 10)),
+    ]
+    assert trend_periods(date(2025, 12, 31), date(2026, 1, 12), RelevesTrendGranularity.WEEK) == [
+        ("2026-W01", date(2025, 12, 31), date(2026, 1, 4)),
+        ("2026-W02", date(2026, 1, 5), date(2026, 1, 11)),
+        ("2026-W03", date(2026, 1, 12), date(2026, 1, 12)),
+    ]
+
+
+def test_trend_matches_single_period_totals_of_the_repository() -> None:
+    repository = InMemoryRelevesRepository()
+    request = _request(date(2024, 12, 1), date(2025, 1, 31), top_merchants=2)
+
+    trend = aggregate_spending_trend(
+        repository.load_releves_batch(profile_id=PROFILE_ID, date_range=request.date_range),
+        request,
+    )
+    january = DateRange(start_date=date(2025, 1, 1), end_date=date(2025, 1, 31))
+    spending_total, spending_count, _currency = repository.sum_releves(
+        RelevesFilters(profile_id=PROFILE_ID, date_range=january, direction=RelevesDirection.DEBIT_ONLY)
+    )
+    cashflow = repository.compute_cashflow_summary(profile_id=PROFILE_ID, date_range=january)
+
+    assert trend.periods == ["2024-12", "2025-01"]
+    assert trend.spending == [Decimal("0"), abs(spending_total)]
+    assert trend.spending_count == [0, spending_count]
+    assert trend.income == [Decimal("0"), cashflow["total_income"]]
+    assert trend.expense == [Decimal("0"), cashflow["total_expense"]]
+    assert trend.net_cashflow == [Decimal("0"), cashflow["net_cashflow"]]
+    assert trend.internal_transfers == [Decimal("0"), cashflow["internal_transfers"]]
+    assert trend.transaction_count == [0, cashflow["transaction_count"]]
+    assert trend.categories == {
+        "Logement": [Decimal("0"), Decimal("900.00")],
+        "alimentation": [Decimal("0"), Decimal("66.50")],
+    }
+    assert list(trend.top_merchants) == ["Agence immobilière", "Carrefour"]
+    assert trend.currency == "EUR"
+
+
+def test_trend_tool_rejects_an_inverted_date_range() -> None:
+    service = BackendToolService(
+        transactions_repository=object(),
+        releves_repository=InMemoryRelevesRepository(),
+        categories_repository=object(),
+    )
+
+    result = service.releves_trend(_request(date(2025, 2, 1), date(2025, 1, 31)))
+
+    assert isinstance(result, ToolError)
+    assert result.code == ToolErrorCode.VALIDATION_ERROR
+    assert "before start_date" in result.message
+
+
+def test_supabase_trend_reads_the_whole_range_in_one_paginated_scan() -> None:
+    releves_queries: list[list[tuple[str, object]]] = []
+    rows = [
+        {
+            "date": f"2025-{month:02d}-0{day}",
+            "montant": "-10.00",
+            "devise": "CHF",
+            "categorie": "Alimentation",
+            "category_id": None,
+            "payee": "Migros",
+            "metadonnees": None,
+            "merchant_entities": {"canonical_name": "Migros"} if day == 1 else None,
+        }
+        for month in range(1, 13)
+        for day in (1, 2)
+    ]
+    rows.append(
+        {
+            "date": "2025-06-15",
+            "montant": "-300.00",
+            "devise": "CHF",
+            "categorie": "Épargne",
+            "category_id": None,
+            "payee": "Compte épargne",
+            "metadonnees": {"tx_kind": "transfer_internal"},
+        }
+    )
+
+    class _ClientStub:
+        def get_rows(self, *, table, query, with_count, use_anon_key=False):
+            if table != "releves_bancaires":
+                return [], None
+            releves_queries.append(list(query))
+            return rows, None
+
+    repository = SupabaseRelevesRepository(client=_ClientStub(), profiles_repository=object())
+    request = _request(date(2025, 1, 1), date(2025, 12, 31))
+    trend = aggregate_spending_trend(
+        repository.load_releves_batch(profile_id=PROFILE_ID, date_range=request.date_range),
+        request,
+    )
+
+    assert len(releves_queries) == 1
+    assert ("date", "gte.2025-01-01") in releves_queries[0]
+    assert ("date", "lte.2025-12-31") in releves_queries[0]
+    assert trend.spending == [Decimal("20.00")] * 12
+    assert trend.internal_transfers[5] == Decimal("-300.00")
+    assert trend.top_merchants == {"Migros": [Decimal("20.00")] * 12}
+
+
+def test_spending_trend_endpoint_returns_columnar_json_with_etag(monkeypatch) -> None:
+    monkeypatch.setattr(
+        agent_api,
+        "get_user_from_bearer_token",
+        lambda _token: {"id": str(AUTH_USER_ID), "email": "user@example.com"},
+    )
+
+    class _ProfilesRepo:
+        def get_profile_id_for_auth_user(self, *, auth_user_id: UUID, email: str | None):
+            return PROFILE_ID
+
+    calls: list[dict] = []
+
+    class _Router:
+        def call(self, tool_name: str, payload: dict, *, profile_id: UUID | None = None):
+            assert tool_name == "finance_releves_trend"
+            assert profile_id == PROFILE_ID
+            calls.append(payload)
+            repository = InMemoryRelevesRepository()
+            request = RelevesTrendRequest.model_validate({**payload, "profile_id": str(profile_id)})
+            return aggregate_spending_trend(
+                repository.load_releves_batch(profile_id=PROFILE_ID, date_range=request.date_range),
+                request,
+            )
+
+    monkeypatch.setattr(agent_api, "get_profiles_repository", lambda: _ProfilesRepo())
+    monkeypatch.setattr(agent_api, "get_tool_router", lambda: _Router())
+
+    url = "/finance/reports/spending/trend?start_date=2025-01-01&end_date=2025-02-28"
+    response = client.get(url, headers={"Authorization": "Bearer token"})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert "filters" not in payload
+    assert payload["periods"] == ["2025-01", "2025-02"]
+    assert payload["spending"] == ["966.50", "0"]
+    assert payload["categories"]["Logement"] == ["900.00", "0"]
+    assert calls[0]["granularity"] == "month"
+
+    revalidated = client.get(
+        url,
+        headers={"Authorization": "Bearer token", "If-None-Match": response.headers["ETag"]},
+    )
+    assert revalidated.status_code == 304
+
+    invalid = client.get(
+        "/finance/reports/spending/trend?start_date=2025-03-01&end_date=2025-01-01",
+        headers={"Authorization": "Bearer token"},
+    )
+    assert invalid.status_code == 400
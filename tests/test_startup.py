@@ -0,0 +1,76 @@
+"""Tests for API import time and the optional startup warm-up."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+import agent.api as agent_api
+from agent.warmup import run_warmup
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Measured at ~0.7 s locally; the budget leaves room for slow CI machines while
+# still catching a heavy dependency creeping back into the import graph.
+IMPORT_BUDGET_SECONDS = 3.0
+LAZY_MODULES = ("matplotlib", "reportlab", "openai")
+
+
+def _import_times(module: str) -> dict[str, int]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self_us, total_us, name = line.removeprefix("import time:").split("|")
+        if total_us.strip().isdigit():
+            cumulative_us[name.strip()] = int(total_us)
+    return cumulative_us
+
+
+def test_agent_api_import_stays_within_budget_and_skips_heavy_dependencies() -> None:
+    cumulative_us = _import_times("agent.api")
+
+    assert "agent.api" in cumulative_us
+    assert cumulative_us["agent.api"] / 1_000_000 < IMPORT_BUDGET_SECONDS
+    eager = sorted(name for name in cumulative_us if name.split(".")[0] in LAZY_MODULES)
+    assert eager == []
+
+
+def test_run_warmup_times_steps_and_skips_failures() -> None:
+    calls: list[str] = []
+
+    def _fail() -> None:
+        raise RuntimeError("not configured")
+
+    durations = run_warmup({"first": lambda: calls.append("first"), "broken": _fail, "last": lambda: calls.append("last")})
+
+    assert calls == ["first", "last"]
+    assert list(durations) == ["first", "broken", "last"]
+    assert durations["broken"] is None
+    assert durations["first"] is not None and durations["first"] >= 0
+
+
+def test_startup_warmup_runs_only_when_enabled(monkeypatch) -> None:
+    started: list[list[str]] = []
+    monkeypatch.setattr(agent_api, "start_warmup", lambda steps: started.append(list(steps)))
+
+    with TestClient(agent_api.app):
+        pass
+    monkeypatch.setenv("AGENT_STARTUP_WARMUP_ENABLED", "1")
+    with TestClient(agent_api.app):
+        pass
+
+    assert started == [
+        ["loop_registry", "agent_loop", "tool_definitions", "message_analysis", "merchant_categorizer", "report_renderers"]
+    ]
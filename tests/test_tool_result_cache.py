@@ -0,0 +1,155 @@
+"""Tests for the per-profile read-tool result cache."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+
+import agent.api as agent_api
+from agent.tool_cache import ToolResultCache
+from agent.tool_router import ToolRouter
+from shared.models import RelevesSumResult, ToolError, ToolErrorCode
+
+
+PROFILE_ID = UUID("11111111-1111-1111-1111-111111111111")
+OTHER_PROFILE_ID = UUID("22222222-2222-2222-2222-222222222222")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _CountingBackendClient:
+    def __init__(self) -> None:
+        self.sum_calls = 0
+        self.rename_calls = 0
+        self.fail_sum = False
+
+    def releves_sum(self, filters):
+        self.sum_calls += 1
+        if self.fail_sum:
+            return ToolError(code=ToolErrorCode.BACKEND_ERROR, message="boom")
+        return RelevesSumResult(total=Decimal("-42.50"), count=self.sum_calls, average=Decimal("-42.50"))
+
+    def finance_merchants_rename(self, *, profile_id, merchant_id, name):
+        self.rename_calls += 1
+        return {"ok": True}
+
+
+def _router(cache: ToolResultCache) -> tuple[ToolRouter, _CountingBackendClient]:
+    backend_client = _CountingBackendClient()
+    return ToolRouter(backend_client=backend_client, result_cache=cache), backend_client
+
+
+def test_read_tool_results_are_cached_per_profile_and_canonical_payload() -> None:
+    cache = ToolResultCache(max_entries=10, ttl_seconds=60)
+    router, backend_client = _router(cache)
+
+    first = router.call("finance_releves_sum", {"direction": "DEBIT_ONLY", "date_range": None}, profile_id=PROFILE_ID)
+    second = router.call("finance_transactions_sum", {"direction": "DEBIT_ONLY"}, profile_id=PROFILE_ID)
+    router.call("finance_releves_sum", {"direction": "DEBIT_ONLY"}, profile_id=OTHER_PROFILE_ID)
+
+    assert backend_client.sum_calls == 2
+    assert second == first and second is not first
+    assert cache.stats(PROFILE_ID) == {"hits": 1, "misses": 2, "invalidations": 0, "size": 2, "data_version": 0}
+
+
+def test_write_tools_bump_the_profile_data_version() -> None:
+    cache = ToolResultCache(max_entries=10, ttl_seconds=60)
+    router, backend_client = _router(cache)
+
+    router.call("finance_releves_sum", {}, profile_id=PROFILE_ID)
+    router.call(
+        "finance_merchants_rename",
+        {"merchant_id": "33333333-3333-3333-3333-333333333333", "name": "Coop"},
+        profile_id=PROFILE_ID,
+    )
+    refreshed = router.call("finance_releves_sum", {}, profile_id=PROFILE_ID)
+
+    assert backend_client.rename_calls == 1
+    assert backend_client.sum_calls == 2
+    assert refreshed.count == 2
+    assert cache.data_version(PROFILE_ID) == 1
+    assert cache.data_version(OTHER_PROFILE_ID) == 0
+
+
+def test_errors_are_not_cached_and_entries_expire() -> None:
+    clock = _Clock()
+    cache = ToolResultCache(max_entries=10, ttl_seconds=30, clock=clock)
+    router, backend_client = _router(cache)
+
+    backend_client.fail_sum = True
+    assert isinstance(router.call("finance_releves_sum", {}, profile_id=PROFILE_ID), ToolError)
+    backend_client.fail_sum = False
+    router.call("finance_releves_sum", {}, profile_id=PROFILE_ID)
+    router.call("finance_releves_sum", {}, profile_id=PROFILE_ID)
+    clock.now = 31
+    router.call("finance_releves_sum", {}, profile_id=PROFILE_ID)
+
+    assert backend_client.sum_calls == 3
+
+
+def test_result_computed_across_a_write_is_not_served_afterwards() -> None:
+    cache = ToolResultCache(max_entries=10, ttl_seconds=60)
+    version_before = cache.data_version(PROFILE_ID)
+    cache.bump_data_version(PROFILE_ID)
+
+    cache.set(PROFILE_ID, "finance_releves_sum", {}, {"stale": True}, data_version=version_before)
+
+    assert cache.get(PROFILE_ID, "finance_releves_sum", {}) is None
+
+
+@pytest.mark.parametrize("fail_import", [False, True], ids=["done", "failed"])
+def test_import_job_bumps_the_profile_data_version(monkeypatch, fail_import: bool) -> None:
+    class _BackendClient:
+        def finance_releves_import_files(self, *, request: Any, on_progress: Any):
+            if fail_import:
+                raise RuntimeError("insert failed after the first batch")
+            return {"imported_count": 2}
+
+    class _Router:
+        backend_client = _BackendClient()
+
+    class _ProfilesRepo:
+        def list_bank_accounts(self, *, profile_id: UUID) -> list[dict[str, Any]]:
+            return [{"id": "33333333-3333-3333-3333-333333333333", "name": "UBS"}]
+
+    class _JobsRepo:
+        def __init__(self) -> None:
+            self.patches: list[dict[str, Any]] = []
+
+        def get_job(self, *, profile_id: UUID, job_id: UUID):
+            return None
+
+        def patch_job(self, *, profile_id: UUID, job_id: UUID, payload: dict[str, Any]) -> None:
+            self.patches.append(payload)
+
+        def next_event_seq(self, *, job_id: UUID) -> int:
+            return 1
+
+        def create_event(self, **kwargs: Any) -> None:
+            return None
+
+    monkeypatch.setattr(agent_api, "get_tool_router", lambda: _Router())
+    monkeypatch.setattr(agent_api, "get_profiles_repository", lambda: _ProfilesRepo())
+    version_before = agent_api.shared_tool_result_cache().data_version(PROFILE_ID)
+    jobs_repository = _JobsRepo()
+
+    agent_api._run_import_job_pipeline(
+        repository=jobs_repository,
+        profile_id=PROFILE_ID,
+        payload=agent_api.ImportRequestPayload(
+            files=[agent_api.ImportFilePayload(filename="sample.csv", content_base64="ZGF0ZSxtb250YW50")]
+        ),
+        job_id=uuid4(),
+    )
+
+    assert jobs_repository.patches[-1]["status"] == ("error" if fail_import else "done")
+    assert agent_api.shared_tool_result_cache().data_version(PROFILE_ID) == version_before + 1
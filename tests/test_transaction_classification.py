@@ -78,3 +78,19 @@ def test_insurance_category() -> None:
 def test_subscriptions_category() -> None:
     result = classify_and_categorize_transaction(_tx(montant="-14.99", libelle="Spotify subscription"))
     assert result.category_key == "subscriptions"
+
+
+def test_word_rules_do_not_match_inside_longer_words() -> None:
+    taxi = classify_and_categorize_transaction(_tx(montant="-30.00", libelle="Taxi Lausanne"))
+    envoi_twint = classify_and_categorize_transaction(_tx(montant="-30.00", libelle="TWINT envois groupés"))
+
+    assert taxi.category_key == "other"
+    assert envoi_twint.category_key == "other"
+
+
+def test_repeated_label_returns_same_classification_for_each_sign() -> None:
+    expense = classify_and_categorize_transaction(_tx(montant="-12.00", libelle="Migros Sion"))
+    income = classify_and_categorize_transaction(_tx(montant="12.00", libelle="Migros Sion"))
+
+    assert (expense.tx_kind, expense.category_key) == ("expense", "food")
+    assert (income.tx_kind, income.category_key) == ("income", "income_other")